@@ -0,0 +1,35 @@
+"""add_price_cache_unchanged_refreshes
+
+Adds ``price_cache.unchanged_refreshes``: the number of consecutive
+``prices_refresh`` cycles that wrote the same price.  The refresher resets it
+in its bulk upsert whenever the price moves and refreshes symbols at or above
+``QUIET_AFTER_UNCHANGED`` less often (see ``staleness_tier`` in
+``apps/backend/app/services/price_cache.py``).
+
+Prod uses Supabase migration 20260603090000; this Alembic file keeps the dev
+chain valid.
+
+Revision ID: a7b8c9d0e1f2
+Revises: d1d2d3d4d5d6
+Create Date: 2026-06-03 09:00:00.000000
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a7b8c9d0e1f2"
+down_revision = "d1d2d3d4d5d6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "price_cache",
+        sa.Column("unchanged_refreshes", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("price_cache", "unchanged_refreshes")
@@ -0,0 +1,60 @@
+"""add_expense_monthly_rollups
+
+Creates ``expense_monthly_rollups`` — household × month × category spend
+totals, kept current by the trigger added in ``e1f2a3b4c5d6`` — backfills it from
+``credit_card_transactions``, and adds the composite indexes used by the
+sargable date-range filters in ``app/api/expenses.py``.
+
+Prod uses Supabase migration 20260604090000 (including RLS); this Alembic
+file keeps the dev chain valid.
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-06-04 09:00:00.000000
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b8c9d0e1f2a3"
+down_revision = "a7b8c9d0e1f2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "expense_monthly_rollups",
+        sa.Column("household_id", sa.UUID(), sa.ForeignKey("households.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False, comment="First day of the calendar month."),
+        sa.Column("category_id", sa.UUID(), sa.ForeignKey("expense_categories.id"), nullable=False),
+        sa.Column("amount_ils", sa.Numeric(14, 2), nullable=False, server_default="0"),
+        sa.Column("txn_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("household_id", "month", "category_id"),
+    )
+    op.execute(
+        """
+        INSERT INTO expense_monthly_rollups (household_id, month, category_id, amount_ils, txn_count)
+        SELECT household_id, date_trunc('month', txn_date)::date, category_id, sum(amount_ils), count(*)
+          FROM credit_card_transactions
+         WHERE category_id IS NOT NULL
+         GROUP BY household_id, date_trunc('month', txn_date)::date, category_id
+        """
+    )
+    op.create_index(
+        "credit_card_transactions_household_category_txn_date_idx",
+        "credit_card_transactions",
+        ["household_id", "category_id", sa.text("txn_date DESC")],
+    )
+    op.create_index(
+        "credit_card_statements_household_period_idx",
+        "credit_card_statements",
+        ["household_id", sa.text("period_from DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("credit_card_statements_household_period_idx", table_name="credit_card_statements")
+    op.drop_index("credit_card_transactions_household_category_txn_date_idx", table_name="credit_card_transactions")
+    op.drop_table("expense_monthly_rollups")
@@ -0,0 +1,44 @@
+"""add_analyze_cache
+
+Creates the UNLOGGED ``analyze_cache`` table — the shared (L2) tier of the
+analyze-page cache used with ``ANALYZE_CACHE_L2=postgres`` (see
+``apps/backend/app/services/cache_store.py``).
+
+Prod uses Supabase migration 20260605090000 (including RLS); this Alembic
+file keeps the dev chain valid.
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-06-05 09:00:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c9d0e1f2a3b4"
+down_revision = "b8c9d0e1f2a3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE UNLOGGED TABLE IF NOT EXISTS analyze_cache (
+            namespace   text        NOT NULL,
+            key         text        NOT NULL,
+            value       jsonb       NOT NULL,
+            negative    boolean     NOT NULL DEFAULT false,
+            fresh_until timestamptz NOT NULL,
+            stale_until timestamptz NOT NULL,
+            PRIMARY KEY (namespace, key)
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS analyze_cache_namespace_fresh_idx ON analyze_cache (namespace, fresh_until DESC)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS analyze_cache")
@@ -0,0 +1,37 @@
+"""add backtest daily snapshot
+
+Creates ``backtestdailysnapshot``: one row per simulated day of a backtest
+run (equity, cash, realized/unrealized PnL), bulk-written by
+``BacktestEngine.save_results`` together with the run's trades.
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-06-06 09:00:00.000000
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d0e1f2a3b4c5"
+down_revision = "c9d0e1f2a3b4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "backtestdailysnapshot",
+        sa.Column("run_id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.DateTime(), nullable=False),
+        sa.Column("equity", sa.Numeric(18, 6), nullable=True),
+        sa.Column("cash", sa.Numeric(18, 6), nullable=True),
+        sa.Column("realized_pnl", sa.Numeric(18, 6), nullable=True),
+        sa.Column("unrealized_pnl", sa.Numeric(18, 6), nullable=True),
+        sa.ForeignKeyConstraint(["run_id"], ["backtestrun.id"]),
+        sa.PrimaryKeyConstraint("run_id", "date"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("backtestdailysnapshot")
@@ -0,0 +1,90 @@
+"""expense monthly rollups trigger
+
+Maintains ``expense_monthly_rollups`` with a row trigger on
+``credit_card_transactions`` (insert, delete, and updates of household,
+category, amount or date) instead of application-side deltas, so direct
+category updates from the frontend and cascaded statement deletes keep the
+rollup current.  Rebuilds the rollup from the transactions.
+
+Prod uses Supabase migration 20260609090000; this Alembic file keeps the dev
+chain valid.
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-06-09 09:00:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e1f2a3b4c5d6"
+down_revision = "d0e1f2a3b4c5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION tg_expense_monthly_rollup()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+          IF TG_OP = 'UPDATE'
+             AND (OLD.household_id, OLD.category_id, OLD.amount_ils, OLD.txn_date)
+                 IS NOT DISTINCT FROM (NEW.household_id, NEW.category_id, NEW.amount_ils, NEW.txn_date) THEN
+            RETURN NULL;
+          END IF;
+
+          IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.category_id IS NOT NULL THEN
+            UPDATE expense_monthly_rollups
+               SET amount_ils = amount_ils - OLD.amount_ils,
+                   txn_count  = txn_count - 1
+             WHERE household_id = OLD.household_id
+               AND month = date_trunc('month', OLD.txn_date)::date
+               AND category_id = OLD.category_id;
+            DELETE FROM expense_monthly_rollups
+             WHERE household_id = OLD.household_id
+               AND month = date_trunc('month', OLD.txn_date)::date
+               AND category_id = OLD.category_id
+               AND txn_count <= 0;
+          END IF;
+
+          IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.category_id IS NOT NULL THEN
+            INSERT INTO expense_monthly_rollups (household_id, month, category_id, amount_ils, txn_count)
+            VALUES (NEW.household_id, date_trunc('month', NEW.txn_date)::date, NEW.category_id, NEW.amount_ils, 1)
+            ON CONFLICT (household_id, month, category_id) DO UPDATE
+               SET amount_ils = expense_monthly_rollups.amount_ils + excluded.amount_ils,
+                   txn_count  = expense_monthly_rollups.txn_count + excluded.txn_count;
+          END IF;
+
+          RETURN NULL;
+        END;
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_credit_card_transactions_monthly_rollup
+          AFTER INSERT OR DELETE OR UPDATE OF household_id, category_id, amount_ils, txn_date
+          ON credit_card_transactions
+          FOR EACH ROW EXECUTE FUNCTION tg_expense_monthly_rollup()
+        """
+    )
+    op.execute("LOCK TABLE credit_card_transactions IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("DELETE FROM expense_monthly_rollups")
+    op.execute(
+        """
+        INSERT INTO expense_monthly_rollups (household_id, month, category_id, amount_ils, txn_count)
+        SELECT household_id, date_trunc('month', txn_date)::date, category_id, sum(amount_ils), count(*)
+          FROM credit_card_transactions
+         WHERE category_id IS NOT NULL
+         GROUP BY household_id, date_trunc('month', txn_date)::date, category_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_credit_card_transactions_monthly_rollup ON credit_card_transactions")
+    op.execute("DROP FUNCTION IF EXISTS tg_expense_monthly_rollup()")
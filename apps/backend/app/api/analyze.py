@@ -7,15 +7,22 @@ Includes Copilot SDK-powered growth story analysis.
 
 import logging
 import math
+from collections.abc import Awaitable, Callable
 from datetime import datetime, date
 from typing import Optional
 
-import yfinance as yf
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
-from app.services.cache import get_cached, set_cached, get_cache_stats
+from app.services.cache import CacheNotFound, get_cache_stats, get_or_load
+from app.services.market_data import (
+    FinancialStatements,
+    MarketDataProvider,
+    MarketDataTimeout,
+    OptionChainData,
+    market_data_gateway,
+)
 from app.services.analysis import (
     calculate_roic,
     calculate_wacc,
@@ -24,14 +31,10 @@ from app.services.analysis import (
     calculate_forward_pe,
     calculate_peg_ratio,
     calculate_ev_fcf,
-    calculate_ema,
-    calculate_bollinger_bands,
-    calculate_rsi,
-    calculate_macd,
-    detect_support_resistance,
     calculate_iv_percentile,
     calculate_iv_rank,
 )
+from app.services.analysis import technicals_engine
 from app.services.growth_story import generate_growth_story
 
 logger = logging.getLogger("trading_journal.analyze")
@@ -91,6 +94,65 @@ def _latest_value(df, row_label: str, default: float = 0.0) -> float:
     return vals[-1] if vals else default
 
 
+def _has_quote(info: dict) -> bool:
+    return bool(info) and not (info.get("regularMarketPrice") is None and info.get("currentPrice") is None)
+
+
+def _gateway_http_error(exc: Exception, detail: str) -> HTTPException:
+    """Map a market-data failure to the HTTP error returned to the client."""
+    if isinstance(exc, MarketDataTimeout):
+        return HTTPException(status_code=504, detail=f"{detail} (timed out)")
+    return HTTPException(status_code=502, detail=detail)
+
+
+async def _cached_response(
+    cache_type: str,
+    key: str,
+    build: Callable[[], Awaitable[dict]],
+    max_age: int,
+) -> JSONResponse:
+    """Serve *key* from the analyze cache, calling *build* on a miss.
+
+    ``X-Cache`` is HIT, STALE (served while refreshing in the background) or
+    MISS.  Unknown tickers (``CacheNotFound``) are cached and returned as 404.
+    """
+    try:
+        result, status = await get_or_load(cache_type, key, build)
+    except CacheNotFound as e:
+        raise HTTPException(status_code=404, detail=e.detail) from None
+    return JSONResponse(content=result, headers={"X-Cache": status, "Cache-Control": f"max-age={max_age}"})
+
+
+# ---------------------------------------------------------------------------
+# Market-data loaders — run on the gateway's thread pool, never on the loop
+# ---------------------------------------------------------------------------
+
+
+def _load_fundamentals(provider: MarketDataProvider, ticker: str) -> tuple[dict, FinancialStatements]:
+    info = provider.info(ticker)
+    if not _has_quote(info):
+        return info, FinancialStatements()
+    try:
+        statements = provider.financial_statements(ticker)
+    except Exception as e:
+        logger.warning(f"Could not fetch financial statements for {ticker}: {e}")
+        statements = FinancialStatements()
+    return info, statements
+
+
+def _load_history(provider: MarketDataProvider, ticker: str, period: str, interval: str):
+    return provider.history(ticker, period, interval)
+
+
+def _load_expirations(provider: MarketDataProvider, ticker: str) -> tuple[str, ...]:
+    return provider.options(ticker)
+
+
+def _load_option_chain(provider: MarketDataProvider, ticker: str, expiry: str) -> tuple[OptionChainData, dict]:
+    chain = provider.option_chain(ticker, expiry)
+    return chain, provider.info(ticker) or {}
+
+
 # ---------------------------------------------------------------------------
 # 1. GET /api/analyze/fundamentals/{ticker}
 # ---------------------------------------------------------------------------
@@ -100,29 +162,22 @@ def _latest_value(df, row_label: str, default: float = 0.0) -> float:
 async def get_fundamentals(ticker: str):
     """Company fundamentals with calculated financial metrics."""
     ticker = ticker.upper().strip()
-    cache_key = ticker
+    return await _cached_response("fundamentals", ticker, lambda: _build_fundamentals(ticker), max_age=3600)
 
-    cached = get_cached("fundamentals", cache_key)
-    if cached is not None:
-        return JSONResponse(content=cached, headers={"X-Cache": "HIT", "Cache-Control": "max-age=3600"})
 
+async def _build_fundamentals(ticker: str) -> dict:
     try:
-        t = yf.Ticker(ticker)
-        info = t.info or {}
+        info, statements = await market_data_gateway.fetch("fundamentals", ticker, _load_fundamentals)
     except Exception as e:
         logger.error(f"yfinance error for {ticker}: {e}")
-        raise HTTPException(status_code=502, detail=f"Failed to fetch data for {ticker}")
+        raise _gateway_http_error(e, f"Failed to fetch data for {ticker}")
 
-    if not info or info.get("regularMarketPrice") is None and info.get("currentPrice") is None:
-        raise HTTPException(status_code=404, detail=f"Ticker '{ticker}' not found")
+    if not _has_quote(info):
+        raise CacheNotFound(f"Ticker '{ticker}' not found")
 
-    try:
-        financials = t.financials
-        cashflow = t.cashflow
-        balance_sheet = t.balance_sheet
-    except Exception as e:
-        logger.warning(f"Could not fetch financial statements for {ticker}: {e}")
-        financials = cashflow = balance_sheet = None
+    financials = statements.financials
+    cashflow = statements.cashflow
+    balance_sheet = statements.balance_sheet
 
     # --- Extract raw data from info ---
     market_cap = _safe_float(info.get("marketCap"))
@@ -255,8 +310,7 @@ async def get_fundamentals(ticker: str):
         },
     }
 
-    set_cached("fundamentals", cache_key, result)
-    return JSONResponse(content=result, headers={"X-Cache": "MISS", "Cache-Control": "max-age=3600"})
+    return result
 
 
 # ---------------------------------------------------------------------------
@@ -272,21 +326,20 @@ async def get_price_history(
 ):
     """OHLCV price history for charting."""
     ticker = ticker.upper().strip()
-    cache_key = f"{ticker}:{period}:{interval}"
+    return await _cached_response(
+        "price", f"{ticker}:{period}:{interval}", lambda: _build_price_history(ticker, period, interval), max_age=300
+    )
 
-    cached = get_cached("price", cache_key)
-    if cached is not None:
-        return JSONResponse(content=cached, headers={"X-Cache": "HIT", "Cache-Control": "max-age=300"})
 
+async def _build_price_history(ticker: str, period: str, interval: str) -> dict:
     try:
-        t = yf.Ticker(ticker)
-        hist = t.history(period=period, interval=interval)
+        hist = await market_data_gateway.fetch("price_history", ticker, _load_history, period, interval)
     except Exception as e:
         logger.error(f"yfinance price history error for {ticker}: {e}")
-        raise HTTPException(status_code=502, detail=f"Failed to fetch price history for {ticker}")
+        raise _gateway_http_error(e, f"Failed to fetch price history for {ticker}")
 
     if hist is None or hist.empty:
-        raise HTTPException(status_code=404, detail=f"No price data for '{ticker}'")
+        raise CacheNotFound(f"No price data for '{ticker}'")
 
     data = []
     for idx, row in hist.iterrows():
@@ -309,8 +362,7 @@ async def get_price_history(
         "data": data,
     }
 
-    set_cached("price", cache_key, result)
-    return JSONResponse(content=result, headers={"X-Cache": "MISS", "Cache-Control": "max-age=300"})
+    return result
 
 
 # ---------------------------------------------------------------------------
@@ -322,41 +374,38 @@ async def get_price_history(
 async def get_technicals(ticker: str):
     """Technical indicators calculated from 6 months of daily OHLCV."""
     ticker = ticker.upper().strip()
-    cache_key = ticker
+    return await _cached_response("technicals", ticker, lambda: _build_technicals(ticker), max_age=300)
 
-    cached = get_cached("technicals", cache_key)
-    if cached is not None:
-        return JSONResponse(content=cached, headers={"X-Cache": "HIT", "Cache-Control": "max-age=300"})
 
+async def _build_technicals(ticker: str) -> dict:
     try:
-        t = yf.Ticker(ticker)
-        hist = t.history(period="6mo", interval="1d")
+        hist = await market_data_gateway.fetch("price_history", ticker, _load_history, "6mo", "1d")
     except Exception as e:
         logger.error(f"yfinance error for technicals {ticker}: {e}")
-        raise HTTPException(status_code=502, detail=f"Failed to fetch data for {ticker}")
+        raise _gateway_http_error(e, f"Failed to fetch data for {ticker}")
 
     if hist is None or hist.empty:
-        raise HTTPException(status_code=404, detail=f"No price data for '{ticker}'")
+        raise CacheNotFound(f"No price data for '{ticker}'")
 
     closes = [_safe_float(c) for c in hist["Close"].tolist()]
 
-    ema_50 = calculate_ema(closes, 50)
-    ema_200 = calculate_ema(closes, 200)
-    rsi_values = calculate_rsi(closes, 14)
-    macd_result = calculate_macd(closes)
-    bollinger = calculate_bollinger_bands(closes, 20, 2.0)
-    sr_levels = detect_support_resistance(closes)
+    ema_50 = technicals_engine.ema(closes, 50).tolist()
+    ema_200 = technicals_engine.ema(closes, 200).tolist()
+    rsi_values = technicals_engine.rsi(closes, 14).round(2).tolist()
+    macd_line, signal_line, histogram = (v.tolist() for v in technicals_engine.macd(closes))
+    bb_upper, bb_middle, bb_lower = (v.tolist() for v in technicals_engine.bollinger_bands(closes, 20, 2.0))
+    (sr_levels,) = technicals_engine.support_resistance(closes)
 
     # Get latest non-NaN values
     latest_ema_50 = _last_valid(ema_50)
     latest_ema_200 = _last_valid(ema_200)
     latest_rsi = _last_valid(rsi_values)
-    latest_macd = _last_valid(macd_result.macd_line)
-    latest_signal = _last_valid(macd_result.signal_line)
-    latest_histogram = _last_valid(macd_result.histogram)
-    latest_bb_upper = _last_valid(bollinger.upper)
-    latest_bb_middle = _last_valid(bollinger.middle)
-    latest_bb_lower = _last_valid(bollinger.lower)
+    latest_macd = _last_valid(macd_line)
+    latest_signal = _last_valid(signal_line)
+    latest_histogram = _last_valid(histogram)
+    latest_bb_upper = _last_valid(bb_upper)
+    latest_bb_middle = _last_valid(bb_middle)
+    latest_bb_lower = _last_valid(bb_lower)
 
     # Bandwidth = (upper - lower) / middle
     bb_bandwidth = None
@@ -406,8 +455,7 @@ async def get_technicals(ticker: str):
         },
     }
 
-    set_cached("technicals", cache_key, result)
-    return JSONResponse(content=result, headers={"X-Cache": "MISS", "Cache-Control": "max-age=300"})
+    return result
 
 
 def _last_valid(values: list[float]) -> Optional[float]:
@@ -430,32 +478,30 @@ async def get_option_chain(
 ):
     """Option chain with IV analytics."""
     ticker = ticker.upper().strip()
-    cache_key = f"{ticker}:{expiry or 'default'}"
+    return await _cached_response(
+        "options", f"{ticker}:{expiry or 'default'}", lambda: _build_option_chain(ticker, expiry), max_age=300
+    )
 
-    cached = get_cached("options", cache_key)
-    if cached is not None:
-        return JSONResponse(content=cached, headers={"X-Cache": "HIT", "Cache-Control": "max-age=300"})
 
+async def _build_option_chain(ticker: str, expiry: Optional[str]) -> dict:
     try:
-        t = yf.Ticker(ticker)
-        expirations = t.options  # tuple of date strings
+        expirations = await market_data_gateway.fetch("options", ticker, _load_expirations)  # tuple of date strings
     except Exception as e:
         logger.error(f"yfinance options error for {ticker}: {e}")
-        raise HTTPException(status_code=502, detail=f"Failed to fetch options for {ticker}")
+        raise _gateway_http_error(e, f"Failed to fetch options for {ticker}")
 
     if not expirations:
-        raise HTTPException(status_code=404, detail=f"No options data for '{ticker}'")
+        raise CacheNotFound(f"No options data for '{ticker}'")
 
     # Select expiry
     selected_expiry = expiry if expiry and expiry in expirations else expirations[0]
 
     try:
-        chain = t.option_chain(selected_expiry)
+        chain, info = await market_data_gateway.fetch("option_chain", ticker, _load_option_chain, selected_expiry)
     except Exception as e:
         logger.error(f"yfinance option chain error for {ticker} {selected_expiry}: {e}")
-        raise HTTPException(status_code=502, detail=f"Failed to fetch option chain for {ticker}")
+        raise _gateway_http_error(e, f"Failed to fetch option chain for {ticker}")
 
-    info = t.info or {}
     current_price = _safe_float(info.get("currentPrice", info.get("regularMarketPrice")))
 
     # --- Format calls ---
@@ -496,8 +542,7 @@ async def get_option_chain(
         "puts": puts,
     }
 
-    set_cached("options", cache_key, result)
-    return JSONResponse(content=result, headers={"X-Cache": "MISS", "Cache-Control": "max-age=300"})
+    return result
 
 
 def _format_option_row(row) -> dict:
@@ -543,13 +588,12 @@ async def get_synthesis(ticker: str):
     """
     ticker = ticker.upper().strip()
     try:
-        t = yf.Ticker(ticker)
-        info = t.info or {}
+        info = await market_data_gateway.info(ticker)
     except Exception as e:
         logger.error(f"yfinance error for synthesis {ticker}: {e}")
-        raise HTTPException(status_code=502, detail=f"Failed to fetch data for {ticker}")
+        raise _gateway_http_error(e, f"Failed to fetch data for {ticker}")
 
-    if not info or info.get("regularMarketPrice") is None and info.get("currentPrice") is None:
+    if not _has_quote(info):
         raise HTTPException(status_code=404, detail=f"Ticker '{ticker}' not found")
 
     name = info.get("longName", info.get("shortName", ticker))
@@ -693,7 +737,7 @@ async def post_growth_story(ticker: str, body: Optional[GrowthStoryRequest] = No
     # Auto-fill from yfinance when not supplied
     if not company_name or not sector:
         try:
-            info = yf.Ticker(ticker).info or {}
+            info = await market_data_gateway.info(ticker)
             if not company_name:
                 company_name = info.get("longName", info.get("shortName", ""))
             if not sector:
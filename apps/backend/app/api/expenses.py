@@ -3,7 +3,7 @@
 Five endpoints:
     GET  /api/expenses/unresolved          — paginated unresolved transactions
     POST /api/expenses/resolve             — categorize a transaction (with mapping)
-    GET  /api/expenses/monthly-summary     — aggregate by month × category
+    GET  /api/expenses/monthly-summary     — aggregate by month × category (rollup)
     GET  /api/expenses/by-category/{slug}  — drill-down into a category
     GET  /api/expenses/statements          — list ingested statements
 
@@ -23,6 +23,10 @@ Rate-limit note (Rabin §4.3):
 Error responses: must NOT include merchant_raw or transaction line content
 (Rabin §3.2).  Only generic error codes + statement_id are returned.
 
+Date filters: month / day query parameters are converted to half-open
+``[start, end)`` bounds on the raw date column so the household composite
+indexes stay usable (no ``substr(cast(...))`` over the column).
+
 Decimal serialization: amount_ils exposed as float (number in JSON).  The
 global ``ENCODERS_BY_TYPE[Decimal] = float`` (decimal_encoder.py) handles this
 for Pydantic model fields; we also convert explicitly in model constructors.
@@ -32,14 +36,14 @@ from __future__ import annotations
 
 import logging
 import time
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional
 from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from sqlalchemy import String, cast, func
+from sqlalchemy import func
 from sqlmodel import Session, select
 
 from app.dal.database import get_session
@@ -48,6 +52,7 @@ from app.schema.expenses import (
     CreditCardStatement,
     CreditCardTransaction,
     ExpenseCategory,
+    ExpenseMonthlyRollup,
     MerchantCategoryMapping,
 )
 from app.services.household_service import get_user_household_id
@@ -83,13 +88,25 @@ def _require_household(db: Session, user_id: UUID) -> UUID:
     return hh_id
 
 
-def _month_expr(date_col):  # type: ignore[no-untyped-def]
-    """SQLAlchemy expression: SUBSTR(CAST(date_col AS VARCHAR), 1, 7) → 'YYYY-MM'.
+def _parse_month(value: str, param: str) -> date:
+    """Parse a ``YYYY-MM`` query parameter into the first day of that month."""
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"'{param}' must be YYYY-MM") from None
+
+
+def _parse_day(value: str, param: str) -> datetime:
+    """Parse a ``YYYY-MM-DD`` query parameter into midnight of that day."""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"'{param}' must be YYYY-MM-DD") from None
 
-    Works in both SQLite (stores datetimes as ISO strings) and PostgreSQL
-    (casts DATE/TIMESTAMP to text).
-    """
-    return func.substr(cast(date_col, String), 1, 7)
+
+def _next_month(month: date) -> date:
+    """First day of the month after *month* (itself a first-of-month date)."""
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
 
 
 # ---------------------------------------------------------------------------
@@ -470,6 +487,10 @@ def get_monthly_summary(
 ) -> List[MonthlySummaryItem]:
     """Aggregate credit-card spend by month × category.
 
+    Reads ``expense_monthly_rollups`` (one row per household × month ×
+    category), so the cost depends on the months requested, not on the
+    number of transactions.
+
     Default: excludes transfer categories (``is_transfer = true``).
     Override with ``?exclude_transfers=false``.
 
@@ -478,45 +499,38 @@ def get_monthly_summary(
     """
     household_id = _require_household(db, user_id)
 
-    month_col = _month_expr(CreditCardTransaction.txn_date)
-
     stmt = (
         select(
-            month_col.label("month"),
+            ExpenseMonthlyRollup.month,
             ExpenseCategory.slug.label("category_slug"),
             ExpenseCategory.name.label("category_name"),
             ExpenseCategory.name_he.label("category_name_he"),
-            func.sum(CreditCardTransaction.amount_ils).label("amount_ils"),
-            func.count(CreditCardTransaction.id).label("txn_count"),
+            ExpenseMonthlyRollup.amount_ils,
+            ExpenseMonthlyRollup.txn_count,
         )
         .join(
             ExpenseCategory,
-            CreditCardTransaction.category_id == ExpenseCategory.id,
+            ExpenseMonthlyRollup.category_id == ExpenseCategory.id,
         )
-        .where(CreditCardTransaction.household_id == household_id)
+        .where(ExpenseMonthlyRollup.household_id == household_id)
+        .where(ExpenseMonthlyRollup.txn_count > 0)
     )
 
     if exclude_transfers:
         stmt = stmt.where(ExpenseCategory.is_transfer == False)  # noqa: E712
 
     if from_:
-        stmt = stmt.where(month_col >= from_)
+        stmt = stmt.where(ExpenseMonthlyRollup.month >= _parse_month(from_, "from"))
     if to:
-        stmt = stmt.where(month_col <= to)
+        stmt = stmt.where(ExpenseMonthlyRollup.month <= _parse_month(to, "to"))
 
-    stmt = stmt.group_by(
-        month_col,
-        ExpenseCategory.id,
-        ExpenseCategory.slug,
-        ExpenseCategory.name,
-        ExpenseCategory.name_he,
-    ).order_by(month_col.desc(), func.sum(CreditCardTransaction.amount_ils).desc())
+    stmt = stmt.order_by(ExpenseMonthlyRollup.month.desc(), ExpenseMonthlyRollup.amount_ils.desc())
 
     rows = db.execute(stmt).mappings().all()
 
     return [
         MonthlySummaryItem(
-            month=row["month"],
+            month=row["month"].strftime("%Y-%m"),
             category_slug=row["category_slug"],
             category_name=row["category_name"],
             category_name_he=row["category_name_he"],
@@ -552,38 +566,49 @@ def get_by_category(
             detail=f"Category '{category_slug}' not found",
         )
 
-    # Reusable date-string expression (first 10 chars = YYYY-MM-DD)
-    date_str_col = func.substr(cast(CreditCardTransaction.txn_date, String), 1, 10)
-
     base_filters = [
         CreditCardTransaction.household_id == household_id,
         CreditCardTransaction.category_id == category.id,
     ]
     if from_:
-        base_filters.append(date_str_col >= from_)
+        base_filters.append(CreditCardTransaction.txn_date >= _parse_day(from_, "from"))
     if to:
-        base_filters.append(date_str_col <= to)
+        base_filters.append(CreditCardTransaction.txn_date < _parse_day(to, "to") + timedelta(days=1))
 
     if subcategory_slug:
         subcat = db.exec(select(ExpenseCategory).where(ExpenseCategory.slug == subcategory_slug)).first()
         if subcat is not None:
             base_filters.append(CreditCardTransaction.subcategory_id == subcat.id)
 
-    total: int = db.execute(select(func.count(CreditCardTransaction.id)).where(*base_filters)).scalar_one()
-
-    subtotal_raw = db.execute(
-        select(func.sum(CreditCardTransaction.amount_ils)).where(*base_filters)
-    ).scalar_one_or_none()
-    subtotal = float(subtotal_raw) if subtotal_raw is not None else 0.0
-
-    rows = db.exec(
-        select(CreditCardTransaction)
+    # One round-trip: window aggregates are computed over the whole filtered
+    # set before OFFSET/LIMIT, so every page row carries the total + subtotal.
+    page_rows = db.execute(
+        select(
+            CreditCardTransaction,
+            func.count().over().label("total"),
+            func.sum(CreditCardTransaction.amount_ils).over().label("subtotal"),
+        )
         .where(*base_filters)
-        .order_by(CreditCardTransaction.txn_date.desc())
+        .order_by(CreditCardTransaction.txn_date.desc(), CreditCardTransaction.id)
         .offset((page - 1) * page_size)
         .limit(page_size)
     ).all()
 
+    if page_rows:
+        total: int = page_rows[0].total
+        subtotal_raw = page_rows[0].subtotal
+    elif page > 1:
+        # Past the last page: no row to carry the window values.
+        total, subtotal_raw = db.execute(
+            select(func.count(CreditCardTransaction.id), func.sum(CreditCardTransaction.amount_ils)).where(
+                *base_filters
+            )
+        ).one()
+    else:
+        total, subtotal_raw = 0, None
+    subtotal = float(subtotal_raw) if subtotal_raw is not None else 0.0
+    rows = [row[0] for row in page_rows]
+
     items = [
         TransactionDetail(
             id=txn.id,
@@ -631,8 +656,6 @@ def get_statements(
     """
     household_id = _require_household(db, user_id)
 
-    period_month_col = _month_expr(CreditCardStatement.period_from)
-
     base_filters = [CreditCardStatement.household_id == household_id]
 
     if cardholder:
@@ -640,9 +663,11 @@ def get_statements(
     if issuer:
         base_filters.append(CreditCardStatement.issuer == issuer)
     if from_:
-        base_filters.append(period_month_col >= from_)
+        period_start = _parse_month(from_, "from")
+        base_filters.append(CreditCardStatement.period_from >= datetime.combine(period_start, datetime.min.time()))
     if to:
-        base_filters.append(period_month_col <= to)
+        period_end = _next_month(_parse_month(to, "to"))
+        base_filters.append(CreditCardStatement.period_from < datetime.combine(period_end, datetime.min.time()))
 
     total: int = db.execute(select(func.count(CreditCardStatement.id)).where(*base_filters)).scalar_one()
 
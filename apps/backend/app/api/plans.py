@@ -13,6 +13,7 @@ from app.schema.plan_models import Plan, PlanData
 from app.schema.finance_models import FinanceSnapshot
 from app.services.household_service import get_user_household_id
 from app.services.plan_service import PlanService
+from app.services.plan_monte_carlo import MonteCarloOptions, MonteCarloResult
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/api/plans", tags=["plans"])
@@ -32,6 +33,8 @@ class SimulationRequest(BaseModel):
     plan: PlanData
     finances: Optional[Union[FinanceSnapshot, Dict[str, Any]]] = None
     settings: Dict[str, Any] = {}
+    # When set, run the Monte Carlo engine and return percentile bands instead of one projection.
+    monte_carlo: Optional[MonteCarloOptions] = None
 
 class ProjectionPoint(BaseModel):
     year: int
@@ -53,7 +56,7 @@ class ProjectionPoint(BaseModel):
     milestones_hit: List[str] = []
     liquid_net_worth: Optional[float] = 0.0
     total_dividend_income: Optional[float] = 0.0
-@router.post("/simulate", response_model=List[ProjectionPoint])
+@router.post("/simulate", response_model=Union[List[ProjectionPoint], MonteCarloResult])
 def simulate_plan(
     request: SimulationRequest, 
     db: Session = Depends(get_session),
@@ -61,6 +64,7 @@ def simulate_plan(
 ):
     """
     Run a projection simulation based on the plan, optional finance snapshot, and user settings.
+    With ``monte_carlo`` options, returns net-worth percentile bands and the probability of depletion.
     """
     household_id = get_user_household_id(db, user_id)
     if not household_id:
@@ -83,6 +87,14 @@ def simulate_plan(
     simulation_request_counter.add(1)
     start_time = time.perf_counter()
     try:
+        if request.monte_carlo is not None:
+            return PlanService.simulate_monte_carlo(
+                request.plan.model_dump(),
+                finances,
+                request.settings,
+                options=request.monte_carlo,
+                db=db
+            )
         result = PlanService.calculate_projection(
             request.plan.model_dump(),
             finances,
@@ -0,0 +1,101 @@
+"""Postgres ``LISTEN`` on a background thread.
+
+:class:`NotificationListener` holds a dedicated, detached connection from the
+direct (session-mode) engine, because transaction-mode poolers drop
+``LISTEN`` registrations, and calls ``on_notify(payload)`` for every
+``NOTIFY`` on its channel.  Connection errors are logged and retried;
+``on_connect`` runs after every (re)connect so callers can catch up on
+notifications sent while the listener was down.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import select
+import threading
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+LISTEN_RECONNECT_SECONDS = 5.0
+
+
+class NotificationListener:
+    """Background ``LISTEN <channel>`` that hands each payload to *on_notify*."""
+
+    def __init__(
+        self,
+        channel: str,
+        on_notify: Callable[[str], None],
+        connect: Callable[[], Any] | None = None,
+        on_connect: Callable[[], None] | None = None,
+        reconnect_seconds: float = LISTEN_RECONNECT_SECONDS,
+    ) -> None:
+        self.channel = channel
+        self.on_notify = on_notify
+        self.connect = connect or direct_listen_connection
+        self.on_connect = on_connect
+        self.reconnect_seconds = reconnect_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"{self.channel}-listen", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                connection = self.connect()
+                if connection is None:
+                    raise ConnectionError("no LISTEN connection returned")
+            except Exception:  # noqa: BLE001 - callers have a polling / TTL fallback
+                logger.warning("%s LISTEN connect failed; retrying", self.channel, exc_info=True)
+                self._stop.wait(self.reconnect_seconds)
+                continue
+            try:
+                self._listen(connection)
+            except Exception:  # noqa: BLE001 - reconnect on any driver error
+                logger.warning("%s LISTEN connection lost; reconnecting", self.channel, exc_info=True)
+                self._stop.wait(self.reconnect_seconds)
+            finally:
+                with contextlib.suppress(Exception):
+                    connection.close()
+
+    def _listen(self, connection: Any) -> None:
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {self.channel}")
+        logger.info("Listening for notifications on %s", self.channel)
+        if self.on_connect is not None:
+            self.on_connect()
+        while not self._stop.is_set():
+            readable, _, _ = select.select([connection], [], [], 1.0)
+            if not readable:
+                continue
+            connection.poll()
+            while connection.notifies:
+                self.on_notify(connection.notifies.pop(0).payload)
+
+
+def direct_listen_connection() -> Any:
+    """Return a raw DBAPI connection that is not shared with the pool.
+
+    The DBAPI connection is taken before ``detach()``: the pool wrapper drops
+    its reference on detach, leaving ``driver_connection`` as ``None``.
+    """
+
+    from app.dal.database import direct_engine
+
+    pooled = direct_engine.raw_connection()
+    connection = pooled.dbapi_connection
+    pooled.detach()
+    return connection
@@ -2,13 +2,16 @@ from __future__ import annotations
 
 from datetime import date, datetime
 from pathlib import Path
-from typing import Iterable, List
-
-from openpyxl import Workbook, load_workbook
-from openpyxl.worksheet.worksheet import Worksheet  # type: ignore[import]
+from typing import TYPE_CHECKING, Iterable, List
 
 from .bonds_types import BondHolding
 
+if TYPE_CHECKING:
+    from openpyxl.worksheet.worksheet import Worksheet  # type: ignore[import]
+
+# openpyxl is imported inside the functions that touch the workbook: it costs
+# ~0.3s at import time and the ladder router only needs it when bonds change.
+
 
 DATA_DIR = Path(__file__).resolve().parent
 XLSX_PATH = DATA_DIR / "bonds.xlsx"
@@ -36,6 +39,8 @@ def _ensure_workbook_exists(initial_bonds: Iterable[BondHolding]) -> None:
     if XLSX_PATH.exists():
         return
 
+    from openpyxl import Workbook
+
     wb = Workbook()
     ws = wb.active
     ws.title = SHEET_NAME
@@ -63,6 +68,8 @@ def _ensure_workbook_exists(initial_bonds: Iterable[BondHolding]) -> None:
 
 
 def _get_sheet() -> Worksheet:
+    from openpyxl import load_workbook
+
     wb = load_workbook(XLSX_PATH)
     if SHEET_NAME in wb.sheetnames:
         return wb[SHEET_NAME]  # type: ignore[return-value]
@@ -155,6 +162,8 @@ def save_bonds_to_xlsx(bonds: Iterable[BondHolding]) -> None:
 
     _ensure_workbook_exists(initial_bonds=[])
 
+    from openpyxl import load_workbook
+
     wb = load_workbook(XLSX_PATH)
     if SHEET_NAME in wb.sheetnames:
         ws = wb[SHEET_NAME]
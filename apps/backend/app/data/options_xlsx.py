@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List
-
-from openpyxl import Workbook, load_workbook
-from openpyxl.worksheet.worksheet import Worksheet  # type: ignore[import]
+from typing import TYPE_CHECKING, List
 
 from app.schema.options_models import OptionsRecord
 
+if TYPE_CHECKING:
+    from openpyxl.worksheet.worksheet import Worksheet  # type: ignore[import]
+
 
 DATA_DIR = Path(__file__).resolve().parent
 XLSX_PATH = DATA_DIR / "bonds.xlsx"
@@ -19,6 +19,8 @@ HEADERS = ["year", "amount"]
 def _ensure_workbook_exists() -> None:
     """Ensure the bonds.xlsx workbook and options sheet exist on disk."""
 
+    from openpyxl import Workbook, load_workbook
+
     if XLSX_PATH.exists():
         wb = load_workbook(XLSX_PATH)
     else:
@@ -36,6 +38,8 @@ def _ensure_workbook_exists() -> None:
 
 
 def _get_sheet() -> Worksheet:
+    from openpyxl import load_workbook
+
     _ensure_workbook_exists()
     wb = load_workbook(XLSX_PATH)
     if SHEET_NAME in wb.sheetnames:
@@ -82,6 +86,8 @@ def load_options() -> List[OptionsRecord]:
 def save_options(records: List[OptionsRecord]) -> None:
     """Persist the given options income records to the options sheet."""
 
+    from openpyxl import load_workbook
+
     _ensure_workbook_exists()
     wb = load_workbook(XLSX_PATH)
 
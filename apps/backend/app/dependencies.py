@@ -14,6 +14,10 @@ Provides ready-to-use ``Depends(...)`` callables for protected endpoints::
     ):
         ...
 
+Verified token claims and household memberships are cached in-process (see
+:mod:`app.request_context`); ``get_request_context`` hands handlers both in
+one dependency.
+
 The existing ``app/auth/dependencies.py`` (local-user JWT system) is left
 untouched.  Once the Supabase cutover is complete, that module will be retired
 in a separate ticket.
@@ -27,7 +31,11 @@ from typing import Callable
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, Request, status
+from sqlmodel import Session
 
+from app.dal.database import get_session
+from app.request_context import RequestContext, token_cache
+from app.services.household_service import get_user_household_id
 from app.supabase_auth import (
     JWKSCache,
     SupabaseAuthSettings,
@@ -100,8 +108,17 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    cache: JWKSCache | None = get_jwks_cache()
-    return await verify_supabase_jwt(token, settings, cache)
+    return await _verify_token(token, settings)
+
+
+async def _verify_token(token: str, settings: SupabaseAuthSettings) -> SupabaseClaims:
+    """Return the token's claims from the verified-token cache or by verifying it."""
+    claims = token_cache.get(token)
+    if claims is None:
+        cache: JWKSCache | None = get_jwks_cache()
+        claims = await verify_supabase_jwt(token, settings, cache)
+        token_cache.put(token, claims)
+    return claims
 
 
 # ---------------------------------------------------------------------------
@@ -125,6 +142,31 @@ async def get_current_user_id(
     return claims.sub
 
 
+# ---------------------------------------------------------------------------
+# Caller + household in one dependency
+# ---------------------------------------------------------------------------
+
+
+def get_request_context(
+    claims: SupabaseClaims = Depends(get_current_user),
+    db: Session = Depends(get_session),
+) -> RequestContext:
+    """Dependency returning the caller's claims and household together.
+
+    Both come from the in-process caches when warm, so a handler needs no
+    extra verification or membership query of its own.
+
+    Example::
+
+        @router.get("/dividends")
+        def list_dividends(ctx: RequestContext = Depends(get_request_context)):
+            if ctx.household_id is None:
+                raise HTTPException(status_code=404, detail="No household")
+            ...
+    """
+    return RequestContext(claims=claims, household_id=get_user_household_id(db, claims.sub))
+
+
 # ---------------------------------------------------------------------------
 # Optional authentication (for telemetry and other public-ish endpoints)
 # ---------------------------------------------------------------------------
@@ -169,9 +211,8 @@ async def get_current_user_optional(
     if not token:
         return None
 
-    cache: JWKSCache | None = get_jwks_cache()
     try:
-        return await verify_supabase_jwt(token, settings, cache)
+        return await _verify_token(token, settings)
     except HTTPException:
         # Token invalid/expired — degrade to anonymous
         logger.debug(
@@ -0,0 +1,117 @@
+"""Routers imported on first use instead of at process start.
+
+Several API modules pull heavy dependencies in at import time (copilot,
+scipy, yfinance/pandas, ib_async).  Registering them with a
+:class:`LazyRouterRegistry` keeps ``import main`` cheap: a router is imported
+and included the first time a request reaches one of its path prefixes (via
+:class:`LazyRouterMiddleware`), when the OpenAPI schema is built, or by the
+background warmup started once the server accepts health checks.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LazyRouter:
+    """A router module and the ``include_router`` arguments it is mounted with."""
+
+    module: str
+    path_prefixes: tuple[str, ...]
+    include_kwargs: dict[str, Any]
+    loaded: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def serves(self, path: str) -> bool:
+        return path.startswith(self.path_prefixes)
+
+
+class LazyRouterRegistry:
+    """Routers included into *app* on demand rather than at import time."""
+
+    def __init__(self, app: FastAPI) -> None:
+        self.app = app
+        self._routers: list[LazyRouter] = []
+
+    def add(self, module: str, *, path_prefixes: Iterable[str], **include_kwargs: Any) -> None:
+        """Register *module*'s ``router``, served under *path_prefixes* once loaded."""
+        self._routers.append(LazyRouter(module, tuple(path_prefixes), include_kwargs))
+
+    @property
+    def pending(self) -> list[str]:
+        """Modules not imported yet."""
+        return [router.module for router in self._routers if not router.loaded]
+
+    def needs_load(self, path: str) -> bool:
+        return any(not router.loaded and router.serves(path) for router in self._routers)
+
+    def load_for_path(self, path: str) -> None:
+        """Import and include every pending router serving *path*."""
+        for router in self._routers:
+            if router.serves(path):
+                self._load(router)
+
+    def load_all(self) -> None:
+        for router in self._routers:
+            self._load(router)
+
+    def start_warmup(self) -> threading.Thread | None:
+        """Import the pending routers on a daemon thread; ``None`` if nothing is pending."""
+        if not self.pending:
+            return None
+        thread = threading.Thread(target=self._warmup, name="router-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def _warmup(self) -> None:
+        start = time.perf_counter()
+        try:
+            self.load_all()
+        except Exception:
+            logger.exception("Router warmup failed; remaining routers load on first request")
+            return
+        logger.info("Router warmup finished in %.0f ms", (time.perf_counter() - start) * 1000)
+
+    def _load(self, router: LazyRouter) -> None:
+        if router.loaded:
+            return
+        with router.lock:
+            if router.loaded:
+                return
+            start = time.perf_counter()
+            module = importlib.import_module(router.module)
+            self.app.include_router(module.router, **router.include_kwargs)
+            self.app.openapi_schema = None
+            router.loaded = True
+        logger.info("Loaded router %s in %.0f ms", router.module, (time.perf_counter() - start) * 1000)
+
+
+class LazyRouterMiddleware:
+    """Loads the lazy router serving a request's path before routing it.
+
+    Loading happens before any route dependency runs, so unauthenticated
+    requests can trigger an import; authentication still applies to the
+    request once the router is included.
+    """
+
+    def __init__(self, app: ASGIApp, registry: LazyRouterRegistry) -> None:
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket") and self.registry.needs_load(scope["path"]):
+            await run_in_threadpool(self.registry.load_for_path, scope["path"])
+        await self.app(scope, receive, send)
@@ -0,0 +1,182 @@
+"""Per-process caches behind request authentication.
+
+Every protected request verifies its bearer token and most then resolve the
+caller's household.  A dashboard fans out to many API calls carrying the same
+token, so both results are cached in-process:
+
+- :class:`VerifiedTokenCache` keeps the claims of successfully verified
+  tokens, keyed by a SHA-256 of the token, until the token's ``exp``.  It is a
+  bounded LRU (``AUTH_TOKEN_CACHE_SIZE``); failed verifications are never
+  cached.
+- :class:`HouseholdCache` keeps user → household membership for
+  ``HOUSEHOLD_CACHE_TTL_SECONDS``.  Memberships are edited through Supabase
+  rather than this API, so a trigger on ``household_members`` sends
+  ``NOTIFY household_members`` with the changed user id and
+  :func:`household_membership_listener` drops that user's entry; the TTL
+  bounds staleness only while the listener is disconnected.  Users without a
+  household are not cached, so joining one takes effect on the next request.
+
+Both caches are thread-safe: sync endpoints resolve households from the
+threadpool.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from app.dal.notifications import NotificationListener
+from app.supabase_auth import SupabaseClaims
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKEN_CACHE_SIZE = 1024
+DEFAULT_HOUSEHOLD_CACHE_TTL_SECONDS = 60.0
+MEMBERSHIP_NOTIFY_CHANNEL = "household_members"
+
+
+@dataclass(frozen=True)
+class RequestContext:
+    """Authenticated caller and their household, resolved once per request."""
+
+    claims: SupabaseClaims
+    household_id: UUID | None
+
+    @property
+    def user_id(self) -> UUID:
+        return self.claims.sub
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified token claims, each valid until the token expires."""
+
+    def __init__(self, maxsize: int = DEFAULT_TOKEN_CACHE_SIZE) -> None:
+        self.maxsize = max(0, maxsize)
+        self._entries: OrderedDict[str, SupabaseClaims] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> SupabaseClaims | None:
+        """Return cached claims for *token*, or ``None`` if absent or expired."""
+        key = _token_key(token)
+        with self._lock:
+            claims = self._entries.get(key)
+            if claims is None:
+                return None
+            if claims.exp <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def put(self, token: str, claims: SupabaseClaims) -> None:
+        """Remember *claims* for *token* until ``claims.exp``."""
+        if self.maxsize == 0 or claims.exp <= time.time():
+            return
+        key = _token_key(token)
+        with self._lock:
+            self._entries[key] = claims
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class HouseholdCache:
+    """User → household membership with a TTL and explicit invalidation."""
+
+    def __init__(self, ttl_seconds: float = DEFAULT_HOUSEHOLD_CACHE_TTL_SECONDS) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[UUID, tuple[UUID, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: UUID) -> UUID | None:
+        """Return the cached household for *user_id*, or ``None`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            household_id, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            return household_id
+
+    def put(self, user_id: UUID, household_id: UUID) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (household_id, time.monotonic() + self.ttl_seconds)
+
+    def invalidate(self, user_id: UUID | None = None) -> None:
+        """Drop *user_id*'s entry, or every entry when *user_id* is ``None``."""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _env_number(name: str, default: float) -> float:
+    raw_value = os.getenv(name, str(default))
+    try:
+        return float(raw_value)
+    except ValueError:
+        logger.warning("Invalid %s=%s; using default", name, raw_value)
+        return default
+
+
+token_cache = VerifiedTokenCache(int(_env_number("AUTH_TOKEN_CACHE_SIZE", DEFAULT_TOKEN_CACHE_SIZE)))
+household_cache = HouseholdCache(_env_number("HOUSEHOLD_CACHE_TTL_SECONDS", DEFAULT_HOUSEHOLD_CACHE_TTL_SECONDS))
+
+
+def invalidate_household_membership(user_id: UUID | None = None) -> None:
+    """Forget cached membership for *user_id* (or everyone) after it changes."""
+    household_cache.invalidate(user_id)
+
+
+def household_membership_listener(connect: Callable[[], Any] | None = None) -> NotificationListener:
+    """Listener that invalidates cached memberships on ``NOTIFY household_members``.
+
+    Each notification carries the user id whose membership changed.  Every
+    entry is dropped after a (re)connect, since changes made while the
+    listener was down were missed.
+    """
+    return NotificationListener(
+        MEMBERSHIP_NOTIFY_CHANNEL,
+        on_notify=_invalidate_notified_membership,
+        connect=connect,
+        on_connect=household_cache.invalidate,
+    )
+
+
+def _invalidate_notified_membership(payload: str) -> None:
+    try:
+        user_id = UUID(payload)
+    except ValueError:
+        logger.warning("Unexpected %s payload %r; dropping every membership", MEMBERSHIP_NOTIFY_CHANNEL, payload)
+        user_id = None
+    invalidate_household_membership(user_id)
+
+
+def clear_request_caches() -> None:
+    """Empty both caches (tests, or after rotating signing keys)."""
+    token_cache.clear()
+    household_cache.invalidate()
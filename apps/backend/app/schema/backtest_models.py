@@ -59,3 +59,12 @@ class BacktestTrade(SQLModel, table=True):
     price: Decimal = Field(sa_column=Column("price", Numeric(18, 6)))
     commission: Decimal = Field(sa_column=Column("commission", Numeric(18, 6)))
     notes: Optional[str] = None
+
+class BacktestDailySnapshot(SQLModel, table=True):
+    """End-of-day portfolio state of a run; ``equity`` over ``date`` is the equity curve."""
+    run_id: int = Field(foreign_key="backtestrun.id", primary_key=True)
+    date: datetime = Field(primary_key=True)
+    equity: Decimal = Field(sa_column=Column("equity", Numeric(18, 6)))
+    cash: Decimal = Field(sa_column=Column("cash", Numeric(18, 6)))
+    realized_pnl: Decimal = Field(sa_column=Column("realized_pnl", Numeric(18, 6)))
+    unrealized_pnl: Decimal = Field(sa_column=Column("unrealized_pnl", Numeric(18, 6)))
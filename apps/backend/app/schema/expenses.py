@@ -6,6 +6,7 @@ Tables:
     - CreditCardTransaction      (credit_card_transactions)
     - ExpenseCategory            (expense_categories)
     - MerchantCategoryMapping    (merchant_category_mappings)
+    - ExpenseMonthlyRollup       (expense_monthly_rollups)
 
 AMOUNT CONVENTIONS:
     amount_ils      Decimal  NUMERIC(12,2)  — shekels (ILS). NOT agorot.
@@ -13,7 +14,7 @@ AMOUNT CONVENTIONS:
     fx_rate         Decimal  NUMERIC(12,8)  — ILS per 1 unit of original_currency
 """
 
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from typing import List, Optional
 from uuid import UUID
@@ -312,3 +313,31 @@ class MerchantCategoryMapping(SQLModel, table=True):
         index=True,
         description="NULL=global fallback. Non-NULL=household-scoped, takes precedence.",
     )
+
+
+class ExpenseMonthlyRollup(SQLModel, table=True):
+    """Materialized household × month × category spend totals.
+
+    One row per (household, month, category) with the summed ``amount_ils``
+    and transaction count of the categorized transactions in that month.
+    ``month`` is the first day of the calendar month.  Backs
+    ``GET /api/expenses/monthly-summary``; maintained by the
+    ``trg_credit_card_transactions_monthly_rollup`` trigger on
+    ``credit_card_transactions`` (Supabase migration 20260609090000).
+    """
+
+    __tablename__ = "expense_monthly_rollups"
+
+    household_id: UUID = Field(primary_key=True, foreign_key="households.id")
+    month: date = Field(primary_key=True, description="First day of the calendar month.")
+    category_id: UUID = Field(primary_key=True, foreign_key="expense_categories.id")
+    amount_ils: Decimal = Field(
+        default=Decimal(0),
+        sa_column=Column(
+            Numeric(14, 2),
+            nullable=False,
+            server_default="0",
+            comment="Sum of credit_card_transactions.amount_ils for the cell (ILS shekels). NUMERIC(14,2).",
+        ),
+    )
+    txn_count: int = Field(default=0, description="Number of transactions in the cell.")
@@ -3,6 +3,9 @@ Technical Indicators — EMA, Bollinger Bands, RSI, MACD, Support/Resistance.
 
 Operates on plain lists of floats (closing prices) — no pandas dependency required.
 numpy is used only for standard-deviation in Bollinger Bands.
+
+These are the reference implementations.  ``technicals_engine`` computes the
+same indicators on NumPy arrays (whole histories, many tickers at once).
 """
 
 from __future__ import annotations
@@ -0,0 +1,228 @@
+"""
+Vectorized technical-indicator engine.
+
+Array counterparts of the list functions in ``technicals.py``.  Every
+indicator runs along the last axis, so a single call handles one series
+(shape ``(n,)``) or a whole watch-list (shape ``(tickers, n)``):
+
+- rolling mean / variance from cumulative sums — O(n) regardless of window;
+- EMA, RSI (Wilder) and MACD as first-order recursive filters
+  (``scipy.signal.lfilter``) instead of per-element Python loops;
+- pivots from sliding-window min / max (``scipy.ndimage``);
+- pivot clustering as a single sort-and-sweep.
+
+Outputs are unrounded float arrays with NaN where the window is not yet
+full.  The list functions round every intermediate EMA/RSI value; the engine
+carries full precision, so results agree with them to within that rounding
+(see ``tests/test_technicals_engine.py``).  Prices must be finite.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import ArrayLike
+from scipy.ndimage import maximum_filter1d, minimum_filter1d
+from scipy.signal import lfilter
+
+from app.services.analysis.technicals import SupportResistanceLevel
+
+
+def _as_array(prices: ArrayLike) -> np.ndarray:
+    return np.asarray(prices, dtype=float)
+
+
+def _smooth(values: np.ndarray, alpha: float, seed: np.ndarray) -> np.ndarray:
+    """``y[t] = alpha * x[t] + (1 - alpha) * y[t-1]`` along the last axis, ``y[-1] = seed``."""
+    if values.shape[-1] == 0:
+        return values.copy()
+    zi = ((1.0 - alpha) * np.asarray(seed))[..., np.newaxis]
+    smoothed, _ = lfilter([alpha], [1.0, alpha - 1.0], values, axis=-1, zi=zi)
+    return smoothed
+
+
+# ---------------------------------------------------------------------------
+# Rolling statistics
+# ---------------------------------------------------------------------------
+
+
+def rolling_mean_std(prices: ArrayLike, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Rolling mean and population standard deviation (ddof=0) over *window*.
+
+    Computed from cumulative sums of the series shifted by its first value
+    (keeps the sum-of-squares cancellation small).  First (window-1) entries
+    are NaN.
+    """
+    if window < 1:
+        raise ValueError("Window must be ≥ 1")
+    x = _as_array(prices)
+    mean = np.full(x.shape, np.nan)
+    std = np.full(x.shape, np.nan)
+    if x.shape[-1] < window:
+        return mean, std
+
+    shifted = x - x[..., :1]
+    pad = [(0, 0)] * (x.ndim - 1) + [(1, 0)]
+    s1 = np.pad(np.cumsum(shifted, axis=-1), pad)
+    s2 = np.pad(np.cumsum(shifted * shifted, axis=-1), pad)
+    win_mean = (s1[..., window:] - s1[..., :-window]) / window
+    win_sq = (s2[..., window:] - s2[..., :-window]) / window
+
+    mean[..., window - 1 :] = win_mean + x[..., :1]
+    std[..., window - 1 :] = np.sqrt(np.maximum(win_sq - win_mean * win_mean, 0.0))
+    return mean, std
+
+
+def bollinger_bands(
+    prices: ArrayLike,
+    period: int = 20,
+    num_std: float = 2.0,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bollinger Bands as ``(upper, middle, lower)``; first (period-1) entries NaN."""
+    middle, std = rolling_mean_std(prices, period)
+    return middle + num_std * std, middle, middle - num_std * std
+
+
+# ---------------------------------------------------------------------------
+# Recursive filters: EMA, RSI, MACD
+# ---------------------------------------------------------------------------
+
+
+def ema(prices: ArrayLike, period: int) -> np.ndarray:
+    """
+    Exponential Moving Average seeded with the SMA of the first *period* prices.
+
+    First (period-1) entries are NaN.
+    """
+    if period < 1:
+        raise ValueError("Period must be ≥ 1")
+    x = _as_array(prices)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] < period:
+        return out
+
+    seed = x[..., :period].mean(axis=-1)
+    out[..., period - 1] = seed
+    out[..., period:] = _smooth(x[..., period:], 2.0 / (period + 1), seed)
+    return out
+
+
+def rsi(prices: ArrayLike, period: int = 14) -> np.ndarray:
+    """
+    Relative Strength Index with Wilder's smoothing (alpha = 1/period).
+
+    First *period* entries are NaN; 100 where the average loss is zero.
+    """
+    x = _as_array(prices)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] < period + 1:
+        return out
+
+    deltas = np.diff(x, axis=-1)
+    gains = np.maximum(deltas, 0.0)
+    losses = np.maximum(-deltas, 0.0)
+
+    averages = []
+    for series in (gains, losses):
+        seed = series[..., :period].mean(axis=-1)
+        rest = _smooth(series[..., period:], 1.0 / period, seed)
+        averages.append(np.concatenate([seed[..., np.newaxis], rest], axis=-1))
+    avg_gain, avg_loss = averages
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    out[..., period:] = np.where(avg_loss == 0, 100.0, values)
+    return out
+
+
+def macd(
+    prices: ArrayLike,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD as ``(macd_line, signal_line, histogram)``.
+
+    The signal EMA starts where the MACD line does (index max(fast, slow)-1).
+    """
+    x = _as_array(prices)
+    line = ema(x, fast) - ema(x, slow)
+    signal_line = np.full(x.shape, np.nan)
+    start = max(fast, slow) - 1
+    if x.shape[-1] - start >= signal:
+        signal_line[..., start:] = ema(line[..., start:], signal)
+    return line, signal_line, line - signal_line
+
+
+# ---------------------------------------------------------------------------
+# Support / Resistance
+# ---------------------------------------------------------------------------
+
+
+def pivot_masks(prices: ArrayLike, window: int = 5) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Boolean ``(support, resistance)`` masks of pivot points.
+
+    A support pivot is a price no greater than the *window* prices on either
+    side (i.e. the minimum of its centred 2·window+1 neighbourhood); a
+    resistance pivot is the maximum.  A flat neighbourhood counts as support.
+    """
+    x = _as_array(prices)
+    size = 2 * window + 1
+    interior = np.zeros(x.shape, dtype=bool)
+    if x.shape[-1] >= size:
+        interior[..., window : x.shape[-1] - window] = True
+
+    support = interior & (x == minimum_filter1d(x, size, axis=-1, mode="nearest"))
+    resistance = interior & ~support & (x == maximum_filter1d(x, size, axis=-1, mode="nearest"))
+    return support, resistance
+
+
+def support_resistance(
+    prices: ArrayLike,
+    window: int = 5,
+    tolerance_pct: float = 0.5,
+) -> list[list[SupportResistanceLevel]]:
+    """
+    Support/resistance levels per series (one list per row of *prices*).
+
+    Pivots are sorted by price once and swept in order: a pivot joins the
+    most recent cluster of its kind when within *tolerance_pct* % of that
+    cluster's running mean, otherwise it opens a new one.  Levels are sorted
+    by strength (most touches first), ties in ascending price order.
+    """
+    x = np.atleast_2d(_as_array(prices))
+    support, resistance = pivot_masks(x, window)
+    tol = tolerance_pct / 100.0
+    return [
+        _cluster_pivots(row, row_support, row_resistance, tol)
+        for row, row_support, row_resistance in zip(x, support, resistance)
+    ]
+
+
+def _cluster_pivots(
+    row: np.ndarray,
+    support: np.ndarray,
+    resistance: np.ndarray,
+    tol: float,
+) -> list[SupportResistanceLevel]:
+    idx = np.flatnonzero(support | resistance)
+    if idx.size == 0:
+        return []
+
+    clusters: list[list] = []  # [price, kind, strength]
+    latest: dict[str, list] = {}
+    for i in idx[np.argsort(row[idx], kind="stable")]:
+        price = float(row[i])
+        kind = "support" if support[i] else "resistance"
+        cluster = latest.get(kind)
+        if cluster is not None and abs(price - cluster[0]) / cluster[0] <= tol:
+            cluster[0] = (cluster[0] * cluster[2] + price) / (cluster[2] + 1)
+            cluster[2] += 1
+        else:
+            latest[kind] = [round(price, 2), kind, 1]
+            clusters.append(latest[kind])
+
+    clusters.sort(key=lambda c: c[2], reverse=True)
+    return [SupportResistanceLevel(price=p, kind=k, strength=s) for p, k, s in clusters]
@@ -8,7 +8,8 @@ schedule without exposing FastAPI business routes to the browser.
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable, Iterable
+from collections.abc import Awaitable, Callable, Iterable
+from contextvars import ContextVar
 from dataclasses import dataclass
 from datetime import datetime, timezone
 import json
@@ -33,6 +34,12 @@ from app.dal.database import engine
 
 logger = logging.getLogger(__name__)
 STALE_AFTER_HOURS = 24
+# Sections in flight across the whole batch; provider calls are further bounded
+# by the market-data gateway's thread pool and rate limit.
+SECTION_CONCURRENCY = 8
+
+# Set by the batch refresher so every ticker's sections share one cap.
+_section_limit: ContextVar[asyncio.Semaphore | None] = ContextVar("analyze_section_limit", default=None)
 
 
 @dataclass(frozen=True)
@@ -76,25 +83,44 @@ async def build_ticker_analysis(ticker: str) -> dict[str, Any]:
     sections: dict[str, Any] = {}
     errors: dict[str, str] = {}
 
-    async def required_section(name: str, loader: Callable[[], Any]) -> None:
-        sections[name] = _normalize_response(await loader())
+    async def load(loader: Callable[[], Awaitable[Any]]) -> dict[str, Any]:
+        limit = _section_limit.get()
+        if limit is None:
+            return _normalize_response(await loader())
+        async with limit:
+            return _normalize_response(await loader())
 
-    async def optional_section(name: str, loader: Callable[[], Any]) -> None:
+    async def optional_section(name: str, loader: Callable[[], Awaitable[Any]]) -> dict[str, Any] | None:
         try:
-            sections[name] = _normalize_response(await loader())
+            return await load(loader)
         except HTTPException as exc:
             errors[name] = str(exc.detail)
             logger.info("Optional analysis section skipped ticker=%s section=%s error=%s", normalized, name, exc.detail)
         except Exception as exc:  # noqa: BLE001 - a section failure should not abort all tickers
             errors[name] = str(exc)
             logger.exception("Optional analysis section failed ticker=%s section=%s", normalized, name)
-
-    await required_section("fundamentals", lambda: get_fundamentals(normalized))
-    await optional_section("price_history_1y_1d", lambda: get_price_history(normalized, "1y", "1d"))
-    await optional_section("price_history_5y_1wk", lambda: get_price_history(normalized, "5y", "1wk"))
-    await optional_section("technicals", lambda: get_technicals(normalized))
-    await optional_section("options", lambda: get_option_chain(normalized))
-    await optional_section("synthesis", lambda: get_synthesis(normalized))
+        return None
+
+    optional_loaders: dict[str, Callable[[], Awaitable[Any]]] = {
+        "price_history_1y_1d": lambda: get_price_history(normalized, "1y", "1d"),
+        "price_history_5y_1wk": lambda: get_price_history(normalized, "5y", "1wk"),
+        "technicals": lambda: get_technicals(normalized),
+        "options": lambda: get_option_chain(normalized),
+        "synthesis": lambda: get_synthesis(normalized),
+    }
+    # Fetch all sections concurrently; a failing fundamentals section still
+    # fails the ticker once the optional sections have settled.
+    fundamentals, *optional = await asyncio.gather(
+        load(lambda: get_fundamentals(normalized)),
+        *(optional_section(name, loader) for name, loader in optional_loaders.items()),
+        return_exceptions=True,
+    )
+    if isinstance(fundamentals, BaseException):
+        raise fundamentals
+    sections["fundamentals"] = fundamentals
+    for name, value in zip(optional_loaders, optional):
+        if value is not None:
+            sections[name] = value
 
     return {
         "ticker": normalized,
@@ -199,16 +225,40 @@ class AnalyzeBatchRefresher:
             return refreshed
 
     def refresh_specific_tickers(self, session: Session, ticker_inputs: Iterable[TickerInput]) -> int:
-        """Refresh a supplied ticker set into analysis_tickers."""
+        """Refresh a supplied ticker set into analysis_tickers.
 
-        refreshed = 0
+        Each distinct ticker is analysed once, all tickers concurrently in one
+        event loop, and the result is written for every household holding it.
+        Returns the number of (household, ticker) rows written.
+        """
+
+        households_by_ticker: dict[str, list[TickerInput]] = {}
         for ticker_input in ticker_inputs:
-            try:
-                data = asyncio.run(build_ticker_analysis(ticker_input.ticker))
-                self._upsert_ticker_analysis(session, ticker_input, data)
-                refreshed += 1
-            except Exception:  # noqa: BLE001 - one bad ticker must not abort the batch
-                logger.exception("Ticker analysis refresh skipped ticker=%s", ticker_input.ticker)
+            households_by_ticker.setdefault(ticker_input.ticker, []).append(ticker_input)
+        if not households_by_ticker:
+            return 0
+
+        analyses = asyncio.run(_build_ticker_analyses(list(households_by_ticker)))
+        refreshed = 0
+        for ticker, holders in households_by_ticker.items():
+            data = analyses[ticker]
+            if isinstance(data, BaseException):
+                logger.error(
+                    "Ticker analysis refresh skipped ticker=%s households=%d",
+                    ticker,
+                    len(holders),
+                    exc_info=(type(data), data, data.__traceback__),
+                )
+                continue
+            for ticker_input in holders:
+                try:
+                    self._upsert_ticker_analysis(session, ticker_input, data)
+                    refreshed += 1
+                except Exception:  # noqa: BLE001 - one bad row must not abort the batch
+                    logger.exception("Ticker analysis upsert skipped ticker=%s", ticker)
+        logger.info(
+            "Ticker analysis refresh wrote %d row(s) for %d distinct ticker(s)", refreshed, len(households_by_ticker)
+        )
         return refreshed
 
     def should_refresh(self, table_name: str) -> bool:
@@ -281,6 +331,14 @@ class AnalyzeBatchRefresher:
         )
 
 
+async def _build_ticker_analyses(tickers: list[str]) -> dict[str, dict[str, Any] | BaseException]:
+    """Analyse ``tickers`` concurrently under the batch-wide section cap."""
+
+    _section_limit.set(asyncio.Semaphore(SECTION_CONCURRENCY))
+    results = await asyncio.gather(*(build_ticker_analysis(ticker) for ticker in tickers), return_exceptions=True)
+    return dict(zip(tickers, results))
+
+
 def refresh_ticker_analyses() -> int:
     """Refresh ticker analyses using the default database session."""
 
@@ -1,12 +1,15 @@
 from abc import ABC, abstractmethod
 from datetime import date, timedelta
-from typing import List, Optional, Dict
+from typing import Iterable, List, Optional, Dict
+from cachetools import LRUCache
 from sqlmodel import Session
 from app.dal.database import engine
 from app.schema.models import DailyBar
 from app.services.tax_condor_tool.core.pricer import BlackScholesPricer
+from .data_store import BacktestDataStore, synthetic_conid
 from dateutil.relativedelta import relativedelta
 import math
+import numpy as np
 
 class OptionChain:
     def __init__(self, date: date, underlying_price: float, volatility: float):
@@ -37,43 +40,63 @@ class DataProvider(ABC):
     def get_option_chain(self, symbol: str, date: date) -> OptionChain:
         pass
 
+def _vol_symbol(symbol: str) -> str:
+    # Map symbol to vol symbol
+    if symbol in ['NDX', 'QQQ']:
+        return 'VXN'
+    elif symbol in ['SPX', 'SPY']:
+        return 'VIX'
+    return 'VIX'
+
 class SyntheticDataProvider(DataProvider):
-    def __init__(self):
-        self.cache_spot = {}
-        self.cache_vol = {}
+    """Black-Scholes option chains over ``DailyBar`` closes.
+
+    Call ``preload`` at run start to serve every close from one bulk query;
+    without it (or outside the preloaded symbols/range) closes are read per
+    (symbol, date).  Generated chains are memoized per (symbol, date,
+    expiration) and shared between callers — treat them as read-only.
+    """
+
+    def __init__(self, store: Optional[BacktestDataStore] = None, chain_cache_size: int = 256):
+        self.store = store
+        self.cache_close: Dict[tuple, Optional[float]] = {}
+        self._chains: LRUCache = LRUCache(maxsize=chain_cache_size)
+
+    def preload(self, symbols: Iterable[str], start: date, end: date) -> None:
+        """Bulk-load closes for *symbols* and their volatility indices over ``[start, end]``.
+
+        A no-op when the current store already covers them (e.g. a snapshot
+        shared by the variants of a parameter sweep).
+        """
+        symbols = set(symbols)
+        symbols |= {_vol_symbol(s) for s in symbols}
+        if self.store is not None and self.store.covers_range(symbols, start, end):
+            return
+        self.store = BacktestDataStore.load(engine, symbols, start, end)
+        self.cache_close.clear()
+        self._chains.clear()
 
     def _get_daily_bar(self, symbol: str, date: date) -> Optional[DailyBar]:
         with Session(engine) as session:
             return session.get(DailyBar, (symbol, date))
 
+    def _get_close(self, symbol: str, date: date) -> Optional[float]:
+        if self.store is not None and self.store.covers(symbol, date):
+            return self.store.close(symbol, date)
+        if (symbol, date) not in self.cache_close:
+            bar = self._get_daily_bar(symbol, date)
+            self.cache_close[(symbol, date)] = float(bar.close) if bar else None
+        return self.cache_close[(symbol, date)]
+
     def get_spot_price(self, symbol: str, date: date) -> float:
-        if (symbol, date) in self.cache_spot:
-            return self.cache_spot[(symbol, date)]
-        
-        bar = self._get_daily_bar(symbol, date)
-        if bar:
-            self.cache_spot[(symbol, date)] = bar.close
-            return bar.close
-        return 0.0
+        close = self._get_close(symbol, date)
+        return close if close is not None else 0.0
 
     def get_volatility(self, symbol: str, date: date) -> float:
-        # Map symbol to vol symbol
-        if symbol in ['NDX', 'QQQ']:
-            vol_symbol = 'VXN'
-        elif symbol in ['SPX', 'SPY']:
-            vol_symbol = 'VIX'
-        else:
-            vol_symbol = 'VIX'
-        
-        if (vol_symbol, date) in self.cache_vol:
-            return self.cache_vol[(vol_symbol, date)]
-            
-        bar = self._get_daily_bar(vol_symbol, date)
-        if bar:
+        close = self._get_close(_vol_symbol(symbol), date)
+        if close is not None:
             # VXN is in percentage points, e.g. 20.0 means 20%
-            vol = bar.close / 100.0
-            self.cache_vol[(vol_symbol, date)] = vol
-            return vol
+            return close / 100.0
         return 0.20 # Default fallback
 
     def get_expirations(self, symbol: str, date: date) -> List[date]:
@@ -103,6 +126,14 @@ class SyntheticDataProvider(DataProvider):
         return sorted(list(expirations))
 
     def get_option_chain(self, symbol: str, date: date, expiration: Optional[date] = None) -> OptionChain:
+        key = (symbol, date, expiration)
+        chain = self._chains.get(key)
+        if chain is None:
+            chain = self._build_option_chain(symbol, date, expiration)
+            self._chains[key] = chain
+        return chain
+
+    def _build_option_chain(self, symbol: str, date: date, expiration: Optional[date]) -> OptionChain:
         spot = self.get_spot_price(symbol, date)
         vol = self.get_volatility(symbol, date)
         
@@ -135,31 +166,31 @@ class SyntheticDataProvider(DataProvider):
         
         strikes = range(start_strike, end_strike + step, step)
         
-        # Generate Contracts
-        for exp in sorted_exps:
-            dte = (exp - date).days
-            if dte < 1: continue
-            
-            t = dte / 365.0
-            r = 0.05 # Risk free rate assumption
-            
-            for strike in strikes:
-                # Call
-                call_price = BlackScholesPricer.price(spot, strike, t, r, vol, True)
-                d, g, th, v = BlackScholesPricer.greeks(spot, strike, t, r, vol, True)
-                call_greeks = {"delta": d, "gamma": g, "theta": th, "vega": v, "implied_vol": vol}
-                
-                # Put
-                put_price = BlackScholesPricer.price(spot, strike, t, r, vol, False)
-                d, g, th, v = BlackScholesPricer.greeks(spot, strike, t, r, vol, False)
-                put_greeks = {"delta": d, "gamma": g, "theta": th, "vega": v, "implied_vol": vol}
-                
-                # Generate synthetic conid
-                # Simple hash
-                call_id = abs(hash(f"{symbol}{exp}{strike}C")) & 0xFFFFFFFF
-                put_id = abs(hash(f"{symbol}{exp}{strike}P")) & 0xFFFFFFFF
-                
-                chain.add_contract(call_id, exp, strike, 'C', call_price, call_greeks)
-                chain.add_contract(put_id, exp, strike, 'P', put_price, put_greeks)
-                
+        # Generate Contracts: price the whole chain (expiries x strikes x
+        # call/put) in one vectorized pass.
+        r = 0.05 # Risk free rate assumption
+        live_exps = [exp for exp in sorted_exps if (exp - date).days >= 1]
+        if not live_exps:
+            return chain
+        t = np.array([(exp - date).days / 365.0 for exp in live_exps])[:, None, None]
+        k = np.array(strikes, dtype=float)[None, :, None]
+        is_call = np.array([True, False])[None, None, :]
+        prices = BlackScholesPricer.price_batch(spot, k, t, r, vol, is_call).tolist()
+        deltas, gammas, thetas, vegas = (
+            greek.tolist() for greek in BlackScholesPricer.greeks_batch(spot, k, t, r, vol, is_call)
+        )
+
+        for i, exp in enumerate(live_exps):
+            for j, strike in enumerate(strikes):
+                for side, right in enumerate(('C', 'P')):
+                    greeks = {
+                        "delta": deltas[i][j][side],
+                        "gamma": gammas[i][j][side],
+                        "theta": thetas[i][j][side],
+                        "vega": vegas[i][j][side],
+                        "implied_vol": vol,
+                    }
+                    conid = synthetic_conid(symbol, exp, strike, right)
+                    chain.add_contract(conid, exp, strike, right, prices[i][j][side], greeks)
+
         return chain
@@ -0,0 +1,70 @@
+"""
+In-memory daily-bar store for a backtest run.
+
+``BacktestDataStore.load`` reads the ``DailyBar`` closes of every symbol a
+run needs for its whole date range in one query, into dense float arrays
+indexed by day offset from ``start`` (NaN where there is no bar).  Lookups
+during the run are then array reads instead of one Session per
+(symbol, date).
+"""
+
+import hashlib
+from collections.abc import Iterable
+from datetime import date
+from typing import Optional
+
+import numpy as np
+from sqlmodel import Session, select
+
+from app.schema.models import DailyBar
+
+
+def synthetic_conid(symbol: str, expiration: date, strike: float, right: str) -> int:
+    """Deterministic 32-bit conid for a synthetic contract.
+
+    Uses a stable digest rather than ``hash()``, which is salted per
+    process, so runs reproduce across processes and machines.
+    """
+    key = f"{symbol}{expiration}{strike}{right}".encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=4).digest(), "big")
+
+
+class BacktestDataStore:
+    """Daily closes for a fixed set of symbols over ``[start, end]``."""
+
+    def __init__(self, start: date, end: date, closes: dict[str, np.ndarray]):
+        self.start = start
+        self.end = end
+        self.closes = closes
+
+    @classmethod
+    def load(cls, db_engine, symbols: Iterable[str], start: date, end: date) -> "BacktestDataStore":
+        """Bulk-load the closes of *symbols* between *start* and *end* (inclusive)."""
+        symbols = sorted(set(symbols))
+        days = max((end - start).days + 1, 0)
+        closes = {symbol: np.full(days, np.nan) for symbol in symbols}
+        if symbols and days:
+            with Session(db_engine) as session:
+                rows = session.exec(
+                    select(DailyBar.symbol, DailyBar.date, DailyBar.close).where(
+                        DailyBar.symbol.in_(symbols),
+                        DailyBar.date >= start,
+                        DailyBar.date <= end,
+                    )
+                ).all()
+            for symbol, day, close in rows:
+                closes[symbol][(day - start).days] = float(close)
+        return cls(start, end, closes)
+
+    def covers(self, symbol: str, day: date) -> bool:
+        """True when *symbol* was loaded and *day* is inside the loaded range."""
+        return symbol in self.closes and self.start <= day <= self.end
+
+    def covers_range(self, symbols: Iterable[str], start: date, end: date) -> bool:
+        """True when every one of *symbols* was loaded for all of ``[start, end]``."""
+        return self.start <= start and end <= self.end and all(symbol in self.closes for symbol in symbols)
+
+    def close(self, symbol: str, day: date) -> Optional[float]:
+        """Close of *symbol* on *day*, or None when there is no bar (requires ``covers``)."""
+        value = self.closes[symbol][(day - self.start).days]
+        return None if np.isnan(value) else float(value)
@@ -1,9 +1,11 @@
 import logging
 from datetime import date, datetime, timedelta
+from typing import List
+from sqlalchemy import insert
 from sqlmodel import Session
 
 from app.dal.database import engine as db_engine
-from app.schema.backtest_models import BacktestRun, BacktestTrade
+from app.schema.backtest_models import BacktestDailySnapshot, BacktestRun, BacktestTrade
 from .portfolio import Portfolio
 from .strategy import Strategy
 from .data_provider import SyntheticDataProvider
@@ -14,7 +16,7 @@ logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
 
 class BacktestEngine:
-    def __init__(self, strategy: Strategy, start_date: date, end_date: date, initial_capital: float = 100000.0, data_provider=None, step_days: int = 1):
+    def __init__(self, strategy: Strategy, start_date: date, end_date: date, initial_capital: float = 100000.0, data_provider=None, step_days: int = 1, persist: bool = True):
         self.strategy = strategy
         self.start_date = start_date
         self.end_date = end_date
@@ -22,6 +24,7 @@ class BacktestEngine:
         self.data_provider = data_provider or SyntheticDataProvider()
         self.daily_stats = []
         self.step_days = step_days
+        self.persist = persist # Write BacktestRun/BacktestTrade rows when the run completes
 
     async def run(self):
         with tracer.start_as_current_span("backtest_run") as span:
@@ -30,6 +33,12 @@ class BacktestEngine:
             span.set_attribute("backtest.step_days", self.step_days)
             
             logger.info(f"Starting backtest from {self.start_date} to {self.end_date} with step {self.step_days} days")
+
+            # Load every daily bar the run needs in one query up front
+            preload = getattr(self.data_provider, "preload", None)
+            if preload is not None:
+                with tracer.start_as_current_span("preload_market_data"):
+                    preload(self.strategy.symbols(), self.start_date, self.end_date)
             
             current_date = self.start_date
             while current_date <= self.end_date:
@@ -89,7 +98,8 @@ class BacktestEngine:
                     
                     current_date += timedelta(days=self.step_days)
                 
-            self.save_results()
+            if self.persist:
+                self.save_results()
             logger.info("Backtest complete")
 
     def update_market_values(self, date: datetime):
@@ -129,6 +139,11 @@ class BacktestEngine:
             self.portfolio.update_price(conid, price)
 
     def save_results(self):
+        """Persist the run, its trades and its daily snapshots in one transaction.
+
+        Trades and snapshots are written with one multi-row insert per table
+        rather than one ORM object per row.
+        """
         with Session(db_engine) as session:
             run = BacktestRun(
                 start_date=self.start_date,
@@ -140,19 +155,50 @@ class BacktestEngine:
                 total_unrealized_pnl=self.portfolio.total_unrealized_pnl
             )
             session.add(run)
-            session.commit()
-            session.refresh(run)
+            session.flush()
             
-            for trade in self.portfolio.trade_log:
-                t = BacktestTrade(
-                    run_id=run.id,
-                    date=trade['date'],
-                    action=trade['action'],
-                    conid=trade['conid'],
-                    quantity=trade['quantity'],
-                    price=trade['price'],
-                    commission=trade['commission'],
-                    notes=f"Equity: {trade['equity']}"
-                )
-                session.add(t)
+            trades = [
+                {
+                    "run_id": run.id,
+                    "date": trade['date'],
+                    "action": trade['action'],
+                    "conid": trade['conid'],
+                    "quantity": trade['quantity'],
+                    "price": trade['price'],
+                    "commission": trade['commission'],
+                    "notes": f"Equity: {trade['equity']}"
+                }
+                for trade in self.portfolio.trade_log
+            ]
+            snapshots = [{"run_id": run.id, **stats} for stats in self.daily_stats]
+            _bulk_insert(session, BacktestTrade, trades)
+            _bulk_insert(session, BacktestDailySnapshot, snapshots)
             session.commit()
+
+
+def _bulk_insert(session: Session, model, rows: List[dict]):
+    """Insert *rows* into *model*'s table in batched multi-row statements.
+
+    On psycopg2 this is ``execute_values`` on the session's connection;
+    other drivers (SQLite in tests) get a plain executemany.
+    """
+    if not rows:
+        return
+    if session.get_bind().dialect.driver != "psycopg2":
+        session.execute(insert(model), rows)
+        return
+
+    from psycopg2.extras import execute_values
+
+    table = model.__table__
+    columns = list(rows[0])
+    cursor = session.connection().connection.cursor()
+    try:
+        execute_values(
+            cursor,
+            f"insert into {table.name} ({', '.join(columns)}) values %s",
+            [tuple(row[c] for c in columns) for row in rows],
+            page_size=1000,
+        )
+    finally:
+        cursor.close()
@@ -1,45 +1,82 @@
+from dataclasses import dataclass
 from datetime import date, datetime
 from typing import Dict, List, Optional
-from pydantic import BaseModel
 
-class Position(BaseModel):
+@dataclass(slots=True)
+class Position:
     conid: int
     symbol: str
+    quantity: float
+    avg_price: float
     expiration: Optional[date] = None
     strike: Optional[float] = None
     right: Optional[str] = None
-    quantity: float
-    avg_price: float
     current_price: float = 0.0
     
     @property
     def market_value(self) -> float:
         return self.quantity * self.current_price * 100 # Assuming 100 multiplier
 
+    @property
+    def cost_basis(self) -> float:
+        return self.quantity * self.avg_price * 100
+
     @property
     def unrealized_pnl(self) -> float:
         return (self.current_price - self.avg_price) * self.quantity * 100
 
 class Portfolio:
+    """Cash, open positions and realized PnL of one backtest.
+
+    Position market value and cost basis are kept as running totals, updated
+    whenever a position's quantity or price changes, so equity and unrealized
+    PnL are O(1) however many positions are open.  Mutate positions only
+    through ``add_trade`` / ``update_price``.
+    """
+
     def __init__(self, initial_capital: float):
         self.initial_capital = initial_capital
         self.cash = initial_capital
         self.positions: Dict[int, Position] = {} # conid -> Position
         self.realized_pnl = 0.0
         self.trade_log: List[dict] = []
+        self._market_value = 0.0 # sum of position market values
+        self._cost_basis = 0.0 # sum of position cost bases
 
     @property
     def total_equity(self) -> float:
-        pos_value = sum(p.market_value for p in self.positions.values())
-        return self.cash + pos_value
+        return self.cash + self._market_value
 
     @property
     def total_unrealized_pnl(self) -> float:
-        return sum(p.unrealized_pnl for p in self.positions.values())
+        return self._market_value - self._cost_basis
 
     def update_price(self, conid: int, price: float):
-        if conid in self.positions:
-            self.positions[conid].current_price = price
+        pos = self.positions.get(conid)
+        if pos is not None:
+            self._market_value += (price - pos.current_price) * pos.quantity * 100
+            pos.current_price = price
+
+    def _open(self, pos: Position):
+        self.positions[pos.conid] = pos
+        self._market_value += pos.market_value
+        self._cost_basis += pos.cost_basis
+
+    def _resize(self, pos: Position, quantity: float, avg_price: float):
+        """Set a position's quantity/avg price, closing it at zero quantity."""
+        self._market_value -= pos.market_value
+        self._cost_basis -= pos.cost_basis
+        pos.quantity = quantity
+        pos.avg_price = avg_price
+        if quantity == 0:
+            del self.positions[pos.conid]
+            if not self.positions:
+                # Nothing open: drop accumulated rounding error
+                self._market_value = 0.0
+                self._cost_basis = 0.0
+            return
+        self._market_value += pos.market_value
+        self._cost_basis += pos.cost_basis
 
     def add_trade(self, date: datetime, conid: int, symbol: str, action: str, quantity: float, price: float, commission: float = 0.0, expiration: date = None, strike: float = None, right: str = None):
         """
@@ -65,26 +102,21 @@ class Portfolio:
                     pnl = (pos.avg_price - price) * qty_to_close * 100
                     self.realized_pnl += (pnl - commission)
                     
-                    pos.quantity += quantity # quantity is positive, pos.quantity is negative. e.g. -1 + 1 = 0
+                    new_quantity = pos.quantity + quantity # quantity is positive, pos.quantity is negative. e.g. -1 + 1 = 0
                     
-                    if pos.quantity == 0:
-                        del self.positions[conid]
-                    elif pos.quantity > 0:
-                        # We flipped from short to long? (Unlikely in this strategy but possible)
-                        # The remaining quantity is new long position
-                        # Reset avg price for the new long portion?
-                        # Simplified: Just update quantity. The avg_price for the short portion is gone.
-                        # The new long portion should have avg_price = price
-                        pos.avg_price = price
+                    # If we flipped from short to long (unlikely in this strategy but possible),
+                    # the avg_price for the short portion is gone and the new long portion
+                    # has avg_price = price
+                    self._resize(pos, new_quantity, price if new_quantity > 0 else pos.avg_price)
                 else:
                     # Adding to Long Position
-                    total_cost = (pos.quantity * pos.avg_price * 100) + cost
-                    pos.quantity += quantity
-                    if pos.quantity != 0:
-                        pos.avg_price = total_cost / (pos.quantity * 100)
+                    total_cost = pos.cost_basis + cost
+                    new_quantity = pos.quantity + quantity
+                    avg_price = total_cost / (new_quantity * 100) if new_quantity != 0 else pos.avg_price
+                    self._resize(pos, new_quantity, avg_price)
             else:
                 # New Long Position
-                self.positions[conid] = Position(
+                self._open(Position(
                     conid=conid, 
                     symbol=symbol, 
                     expiration=expiration,
@@ -93,7 +125,7 @@ class Portfolio:
                     quantity=quantity, 
                     avg_price=price, 
                     current_price=price
-                )
+                ))
                 
         elif action == "SELL":
             self.cash += (cost - commission)
@@ -108,12 +140,9 @@ class Portfolio:
                     pnl = (price - pos.avg_price) * qty_to_close * 100
                     self.realized_pnl += (pnl - commission)
                     
-                    pos.quantity -= quantity
-                    if pos.quantity == 0:
-                        del self.positions[conid]
-                    elif pos.quantity < 0:
-                        # Flipped to short
-                        pos.avg_price = price
+                    new_quantity = pos.quantity - quantity
+                    # Flipped to short: the new short portion has avg_price = price
+                    self._resize(pos, new_quantity, price if new_quantity < 0 else pos.avg_price)
                 else:
                     # Adding to Short Position (Selling more)
                     # pos.quantity is negative. quantity is positive (amount to sell).
@@ -125,12 +154,12 @@ class Portfolio:
                     new_val = quantity * price * 100
                     total_val = current_val + new_val
                     
-                    pos.quantity -= quantity
-                    pos.avg_price = total_val / (abs(pos.quantity) * 100)
+                    new_quantity = pos.quantity - quantity
+                    self._resize(pos, new_quantity, total_val / (abs(new_quantity) * 100))
 
             else:
                 # New Short Position
-                self.positions[conid] = Position(
+                self._open(Position(
                     conid=conid, 
                     symbol=symbol, 
                     expiration=expiration,
@@ -139,7 +168,7 @@ class Portfolio:
                     quantity=-quantity, 
                     avg_price=price, 
                     current_price=price
-                )
+                ))
 
         self.trade_log.append({
             "date": date,
@@ -1,9 +1,9 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from .portfolio import Portfolio
 from .adapters import BacktestMarketDataProvider
-from app.services.tax_condor_tool.logic.ic_generator import ICCandidateGenerator
+from app.services.tax_condor_tool.logic.ic_generator import SHORT_OFFSET_STEPS, WIDTH_STEPS, ICCandidateGenerator
 from app.services.tax_condor_tool.logic.leap_selector import LeapSelector
 from app.services.tax_condor_tool.logic.validator import Validator
 from app.services.tax_condor_tool.models import LeapRecommendation, OptionLeg, GreekVector
@@ -16,14 +16,38 @@ class Strategy(ABC):
         """
         pass
 
+    def symbols(self) -> List[str]:
+        """Underlyings this strategy reads; the engine preloads their data."""
+        return []
+
 class TaxCondorStrategy(Strategy):
-    def __init__(self, symbol: str, leap_symbol: str, budget: float):
+    def __init__(
+        self,
+        symbol: str,
+        leap_symbol: str,
+        budget: float,
+        leap_delta: float = 0.70,
+        leap_min_days: int = 300,
+        ic_target_dte: int = 40,
+        roll_dte: int = 21,
+        short_offset_steps: Sequence[int] = SHORT_OFFSET_STEPS,
+        width_steps: Sequence[int] = WIDTH_STEPS,
+    ):
         self.symbol = symbol # For IC
         self.leap_symbol = leap_symbol # For LEAP
         self.budget = budget
+        self.leap_delta = leap_delta # Target LEAP call delta
+        self.leap_min_days = leap_min_days # Minimum LEAP DTE at entry
+        self.ic_target_dte = ic_target_dte # IC expiration closest to this DTE
+        self.roll_dte = roll_dte # Close the IC once any leg is at or below this DTE
+        self.short_offset_steps = tuple(short_offset_steps) # IC short strikes, in strike steps from ATM
+        self.width_steps = tuple(width_steps) # IC wing widths, in strike steps
         self.leap_conid: Optional[int] = None
         self.current_ic_legs: List[int] = [] # List of conids
 
+    def symbols(self) -> List[str]:
+        return [self.symbol, self.leap_symbol]
+
     async def on_bar(self, date: datetime, portfolio: Portfolio, data_provider) -> List[dict]:
         orders = []
         
@@ -46,8 +70,8 @@ class TaxCondorStrategy(Strategy):
                     active_legs += 1
                     if pos.expiration:
                         dte = (pos.expiration - date.date()).days
-                        # Close if DTE is <= 21 (Management point) or expired
-                        if dte <= 21:
+                        # Close if DTE is <= roll_dte (Management point) or expired
+                        if dte <= self.roll_dte:
                             legs_to_close = self.current_ic_legs
                             break
             
@@ -97,7 +121,9 @@ class TaxCondorStrategy(Strategy):
         if not self.leap_conid and date.month == 1:
             selector = LeapSelector(adapter)
             # Use LEAP Symbol
-            best_leap = await selector.select_best_leap(self.leap_symbol, min_days=300, reference_date=date.date())
+            best_leap = await selector.select_best_leap(
+                self.leap_symbol, target_delta=self.leap_delta, min_days=self.leap_min_days, reference_date=date.date()
+            )
             
             if best_leap:
                 # Use conid from best_leap if available, otherwise find in chain (optimized)
@@ -151,9 +177,9 @@ class TaxCondorStrategy(Strategy):
 
         # 3. Open New IC Logic
         if not self.current_ic_legs and current_leap_leg:
-            generator = ICCandidateGenerator(adapter)
+            generator = ICCandidateGenerator(adapter, self.short_offset_steps, self.width_steps)
             # Use IC Symbol
-            candidates = await generator.generate(self.symbol, reference_date=date.date())
+            candidates = await generator.generate_grid(self.symbol, self.ic_target_dte, reference_date=date.date())
             
             if candidates:
                 validator = Validator()
@@ -162,7 +188,7 @@ class TaxCondorStrategy(Strategy):
                 # Get spot for validation
                 spot = data_provider.get_spot_price(self.symbol, date.date())
                 
-                recs = validator.rank_and_validate(leap_rec, candidates, self.budget, spot_price=spot, reference_date=date.date())
+                recs = validator.rank_grid(leap_rec, candidates, self.budget, spot_price=spot, reference_date=date.date(), top_k=1)
                 
                 if recs:
                     best_ic = recs[0].iron_condor
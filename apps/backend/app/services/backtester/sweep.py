@@ -0,0 +1,198 @@
+"""
+Parameter sweeps over ``TaxCondorStrategy``.
+
+``expand_grid`` turns a parameter grid (one list of values per strategy
+parameter) into variants; ``run_sweep`` runs them in parallel worker
+processes and hands each variant's ``PerformanceAnalyzer`` summary to a
+callback as soon as it finishes, so results can be streamed to storage.
+
+Market data is loaded once in the parent (``BacktestDataStore``) and passed
+to every worker through the pool initializer, so a sweep costs one DailyBar
+query however many variants it has.  Workers use the ``spawn`` start method
+because sweeps are launched from the worker's compute-job threads, where
+forking is unsafe; the snapshot is pickled once per worker process.
+"""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+from collections.abc import Callable, Collection, Iterable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Optional
+
+from .analyzer import PerformanceAnalyzer
+from .data_provider import SyntheticDataProvider
+from .data_store import BacktestDataStore
+from .engine import BacktestEngine
+from .strategy import TaxCondorStrategy
+
+logger = logging.getLogger(__name__)
+
+_START_METHOD = "spawn"
+DEFAULT_SWEEP_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def _steps(value: Any) -> tuple[int, ...]:
+    steps = tuple(int(step) for step in value)
+    if not steps or any(step <= 0 for step in steps):
+        raise ValueError("strike step lists must be non-empty and positive")
+    return steps
+
+
+# Sweepable ``TaxCondorStrategy`` parameters and how to coerce one value.
+SWEEP_PARAMETERS: dict[str, Callable[[Any], Any]] = {
+    "leap_delta": float,
+    "leap_min_days": int,
+    "ic_target_dte": int,
+    "roll_dte": int,
+    "short_offset_steps": _steps,
+    "width_steps": _steps,
+}
+
+
+@dataclass(frozen=True)
+class SweepConfig:
+    """Settings shared by every variant of a sweep."""
+
+    symbol: str
+    leap_symbol: str
+    start_date: date
+    end_date: date
+    initial_capital: float = 100000.0
+    step_days: int = 1
+
+
+@dataclass(frozen=True)
+class VariantResult:
+    """Outcome of one variant: ``summary`` on success, ``error`` on failure."""
+
+    index: int
+    params: dict[str, Any]
+    summary: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+def expand_grid(grid: Mapping[str, Iterable[Any]]) -> list[dict[str, Any]]:
+    """Return the cartesian product of *grid* as a list of parameter dicts.
+
+    Values are coerced per ``SWEEP_PARAMETERS``; unknown parameters and empty
+    value lists raise ``ValueError``.  Variant order follows the grid's key
+    order, last key varying fastest.
+    """
+    unknown = sorted(set(grid) - set(SWEEP_PARAMETERS))
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(unknown)}")
+    names = list(grid)
+    values = []
+    for name in names:
+        options = [SWEEP_PARAMETERS[name](value) for value in grid[name]]
+        if not options:
+            raise ValueError(f"Sweep parameter {name} has no values")
+        values.append(options)
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def load_snapshot(config: SweepConfig) -> BacktestDataStore:
+    """Load the market data every variant of *config* reads, in one query."""
+    provider = SyntheticDataProvider()
+    provider.preload([config.symbol, config.leap_symbol], config.start_date, config.end_date)
+    return provider.store
+
+
+# ---------------------------------------------------------------------------
+# Worker process
+# ---------------------------------------------------------------------------
+
+_snapshot: Optional[BacktestDataStore] = None
+
+
+def _init_worker(snapshot: BacktestDataStore) -> None:
+    global _snapshot
+    _snapshot = snapshot
+
+
+def run_variant(
+    config: SweepConfig, params: Mapping[str, Any], snapshot: Optional[BacktestDataStore] = None
+) -> dict[str, Any]:
+    """Run one variant without persisting it and return its summary."""
+    strategy = TaxCondorStrategy(config.symbol, config.leap_symbol, config.initial_capital, **params)
+    engine = BacktestEngine(
+        strategy,
+        config.start_date,
+        config.end_date,
+        config.initial_capital,
+        data_provider=SyntheticDataProvider(store=snapshot if snapshot is not None else _snapshot),
+        step_days=config.step_days,
+        persist=False,
+    )
+    asyncio.run(engine.run())
+    return {
+        "final_equity": engine.portfolio.total_equity,
+        "realized_pnl": engine.portfolio.realized_pnl,
+        "unrealized_pnl": engine.portfolio.total_unrealized_pnl,
+        "trade_count": len(engine.portfolio.trade_log),
+        "metrics": PerformanceAnalyzer.analyze(engine.daily_stats, config.initial_capital),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+
+def run_sweep(
+    config: SweepConfig,
+    variants: list[dict[str, Any]],
+    on_result: Callable[[VariantResult], None],
+    max_workers: int = DEFAULT_SWEEP_WORKERS,
+    skip: Collection[int] = (),
+    snapshot: Optional[BacktestDataStore] = None,
+) -> dict[str, int]:
+    """Run *variants* in parallel, calling *on_result* in this process as each one finishes.
+
+    Variants whose index is in *skip* (already recorded by an earlier attempt)
+    are not run.  A failing variant is reported with ``error`` set and does
+    not stop the others.  ``max_workers <= 1`` runs everything inline.
+    Returns ``{"completed": ..., "failed": ..., "skipped": ...}``.
+    """
+    pending = [(index, params) for index, params in enumerate(variants) if index not in skip]
+    counts = {"completed": 0, "failed": 0, "skipped": len(variants) - len(pending)}
+    if not pending:
+        return counts
+    if snapshot is None:
+        snapshot = load_snapshot(config)
+
+    def report(index: int, params: dict[str, Any], run: Callable[[], dict[str, Any]]) -> None:
+        try:
+            result = VariantResult(index, params, summary=run())
+        except Exception as exc:  # one bad variant must not abort the sweep
+            logger.exception("Sweep variant %s failed: %s", index, params)
+            result = VariantResult(index, params, error=f"{type(exc).__name__}: {exc}")
+        counts["failed" if result.error else "completed"] += 1
+        on_result(result)
+
+    workers = min(max_workers, len(pending))
+    if workers <= 1:
+        for index, params in pending:
+            report(index, params, lambda params=params: run_variant(config, params, snapshot))
+        return counts
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(_START_METHOD),
+        initializer=_init_worker,
+        initargs=(snapshot,),
+    ) as pool:
+        futures: dict[Future, tuple[int, dict[str, Any]]] = {
+            pool.submit(run_variant, config, params): (index, params) for index, params in pending
+        }
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, params = futures.pop(future)
+                report(index, params, future.result)
+    return counts
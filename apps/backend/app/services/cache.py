@@ -1,79 +1,439 @@
 """
-In-memory TTL cache for yfinance data.
+Two-tier TTL cache for yfinance data.
 
-Thread-safe caching with per-type TTLs and hit/miss tracking.
+- **L1** — per-process ``TTLCache`` (thread-safe, tiny, no I/O).
+- **L2** — a store shared by every API worker and the background worker
+  (``app.services.cache_store``).  By default it is the ``analyze_cache``
+  UNLOGGED Postgres table whenever the app database is Postgres, so it is
+  shared across hosts and survives restarts.  Otherwise it is a SQLite file
+  under the temp directory, which only processes on one host share and
+  which the OS may delete.  ``ANALYZE_CACHE_L2=postgres|sqlite|none``
+  overrides the choice.  L2 failures are logged and counted, then treated
+  as misses — the cache never fails a request.
+
+Each namespace has its own size and TTLs (:class:`NamespaceConfig`,
+overridable per field via ``ANALYZE_CACHE_<NAMESPACE>_<FIELD>``).  Async
+callers go through :func:`get_or_load`, which adds:
+
+- **stale-while-revalidate** — for ``stale_ttl`` seconds after expiry the old
+  value is served immediately while one background task refreshes it;
+- **negative caching** — a loader raising :class:`CacheNotFound` is served as
+  not-found for ``negative_ttl`` seconds (short: an empty yfinance response
+  may be a rate limit or network hiccup).  The miss is remembered until
+  ``unknown_ttl``; if the retry after ``negative_ttl`` is empty again the
+  ticker is treated as confirmed unknown and cached for ``unknown_ttl``;
+- **single flight** — concurrent loads of one key share one loader call.
+
+Misses are filled through ``app.services.market_data.market_data_gateway``,
+whose coalescing/timeout counters are reported alongside the cache stats.
 """
 
+import asyncio
 import logging
+import os
+import tempfile
 import threading
-from typing import Optional
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, fields, replace
+from typing import Any, Optional
 
 from cachetools import TTLCache
 
+from app.services.cache_store import CacheEntry, CacheStore, PostgresCacheStore, SQLiteCacheStore
+from app.services.market_data import market_data_gateway
+
 logger = logging.getLogger("trading_journal.cache")
 
 # Cache TTL constants (seconds)
-PRICE_TTL = 300       # 5 minutes
+PRICE_TTL = 300  # 5 minutes
 FUNDAMENTALS_TTL = 3600  # 1 hour
 TECHNICALS_TTL = 300  # 5 minutes
-OPTIONS_TTL = 300     # 5 minutes
+OPTIONS_TTL = 300  # 5 minutes
+
+NEGATIVE_TTL = 60  # a single empty response may be transient
+UNKNOWN_TTL = 3600  # a repeated empty response: the ticker really is unknown
+L2_PRUNE_EVERY = 200  # L2 writes per namespace between size prunes
+
+
+class CacheNotFound(Exception):
+    """Raised by a loader when the key does not exist upstream (cached as a negative entry)."""
+
+    def __init__(self, detail: str) -> None:
+        super().__init__(detail)
+        self.detail = detail
+
+
+@dataclass(frozen=True)
+class NamespaceConfig:
+    """Sizes and lifetimes (seconds) of one cache namespace."""
+
+    maxsize: int  # L1 entries per process
+    ttl: int  # fresh lifetime
+    stale_ttl: int  # extra time a value may be served while revalidating
+    negative_ttl: int  # lifetime of a first not-found entry
+    unknown_ttl: int  # lifetime of a not-found entry confirmed by a repeat miss
+    l2_maxsize: int  # L2 entries kept after a prune
+
+
+_DEFAULT_CONFIG: dict[str, NamespaceConfig] = {
+    "price": NamespaceConfig(
+        maxsize=1000, ttl=PRICE_TTL, stale_ttl=900, negative_ttl=NEGATIVE_TTL, unknown_ttl=UNKNOWN_TTL, l2_maxsize=20000
+    ),
+    "fundamentals": NamespaceConfig(
+        maxsize=500,
+        ttl=FUNDAMENTALS_TTL,
+        stale_ttl=6 * 3600,
+        negative_ttl=NEGATIVE_TTL,
+        unknown_ttl=UNKNOWN_TTL,
+        l2_maxsize=10000,
+    ),
+    "technicals": NamespaceConfig(
+        maxsize=1000,
+        ttl=TECHNICALS_TTL,
+        stale_ttl=900,
+        negative_ttl=NEGATIVE_TTL,
+        unknown_ttl=UNKNOWN_TTL,
+        l2_maxsize=20000,
+    ),
+    "options": NamespaceConfig(
+        maxsize=500,
+        ttl=OPTIONS_TTL,
+        stale_ttl=300,
+        negative_ttl=NEGATIVE_TTL,
+        unknown_ttl=UNKNOWN_TTL,
+        l2_maxsize=10000,
+    ),
+}
+
+
+def _env_int(name: str, default: int) -> int:
+    raw_value = os.getenv(name)
+    if raw_value is None:
+        return default
+    try:
+        return max(0, int(raw_value))
+    except ValueError:
+        logger.warning("Invalid %s=%s; using default", name, raw_value)
+        return default
+
+
+def load_config() -> dict[str, NamespaceConfig]:
+    """Return the namespace config with ``ANALYZE_CACHE_<NAMESPACE>_<FIELD>`` overrides applied."""
+    return {
+        name: replace(
+            default,
+            **{
+                f.name: _env_int(f"ANALYZE_CACHE_{name.upper()}_{f.name.upper()}", getattr(default, f.name))
+                for f in fields(default)
+            },
+        )
+        for name, default in _DEFAULT_CONFIG.items()
+    }
+
 
 # ---------------------------------------------------------------------------
 # Cache instances
 # ---------------------------------------------------------------------------
 
-_caches: dict[str, TTLCache] = {
-    "price": TTLCache(maxsize=100, ttl=PRICE_TTL),
-    "fundamentals": TTLCache(maxsize=50, ttl=FUNDAMENTALS_TTL),
-    "technicals": TTLCache(maxsize=100, ttl=TECHNICALS_TTL),
-    "options": TTLCache(maxsize=50, ttl=OPTIONS_TTL),
-}
+_config: dict[str, NamespaceConfig] = load_config()
+
+
+def _new_l1(config: NamespaceConfig) -> TTLCache:
+    # Entries carry their own deadlines; the L1 TTL only bounds how long a
+    # stale or negative entry can linger.
+    return TTLCache(
+        maxsize=max(1, config.maxsize),
+        ttl=max(config.ttl + config.stale_ttl, config.unknown_ttl, config.negative_ttl, 1),
+    )
+
+
+_caches: dict[str, TTLCache] = {name: _new_l1(config) for name, config in _config.items()}
 
 _lock = threading.Lock()
 
 # Hit/miss counters
-_stats: dict[str, dict[str, int]] = {
-    name: {"hits": 0, "misses": 0} for name in _caches
-}
+_COUNTERS = (
+    "hits",
+    "misses",
+    "stale_hits",
+    "negative_hits",
+    "l1_hits",
+    "l1_lookups",
+    "l2_hits",
+    "l2_lookups",
+    "l2_errors",
+)
+_stats: dict[str, dict[str, int]] = {name: dict.fromkeys(_COUNTERS, 0) for name in _caches}
+_l2_writes: dict[str, int] = dict.fromkeys(_caches, 0)
+
+_UNSET: Any = object()
+_l2: Optional[CacheStore] = _UNSET
+_l2_lock = threading.Lock()
+
+_inflight: dict[tuple[str, str], asyncio.Task] = {}
+
+
+def _build_l2() -> Optional[CacheStore]:
+    from app.dal.database import engine
+
+    default = "postgres" if engine.dialect.name == "postgresql" else "sqlite"
+    backend = os.getenv("ANALYZE_CACHE_L2", default).strip().lower()
+    try:
+        if backend == "postgres":
+            return PostgresCacheStore(engine)
+        if backend == "sqlite":
+            path = os.getenv("ANALYZE_CACHE_SQLITE_PATH") or os.path.join(
+                tempfile.gettempdir(), "trading_journal_analyze_cache.sqlite3"
+            )
+            return SQLiteCacheStore(path)
+        if backend not in ("none", ""):
+            logger.warning("Invalid ANALYZE_CACHE_L2=%s; L2 cache disabled", backend)
+    except Exception:
+        logger.exception("Failed to open %s L2 cache; L2 cache disabled", backend)
+    return None
+
+
+def _get_l2() -> Optional[CacheStore]:
+    """Return the shared L2 store, opening it on first use (``None`` when disabled)."""
+    global _l2
+    if _l2 is _UNSET:
+        with _l2_lock:
+            if _l2 is _UNSET:
+                _l2 = _build_l2()
+    return _l2
 
 
 # ---------------------------------------------------------------------------
-# Public API
+# Tier access (sync; L2 calls block on I/O)
 # ---------------------------------------------------------------------------
 
-def get_cached(cache_type: str, key: str) -> Optional[dict]:
-    """Retrieve a value from the specified cache. Returns None on miss."""
-    cache = _caches.get(cache_type)
-    if cache is None:
+
+def _count(cache_type: str, **increments: int) -> None:
+    with _lock:
+        counters = _stats[cache_type]
+        for name, value in increments.items():
+            counters[name] += value
+
+
+def _lookup_l1(cache_type: str, key: str) -> Optional[CacheEntry]:
+    with _lock:
+        counters = _stats[cache_type]
+        counters["l1_lookups"] += 1
+        entry = _caches[cache_type].get(key)
+        if entry is not None and entry.stale_until > time.time():
+            counters["l1_hits"] += 1
+            return entry
+    return None
+
+
+def _lookup_l2(cache_type: str, key: str) -> Optional[CacheEntry]:
+    """Read *key* from L2, promoting a hit into L1."""
+    store = _get_l2()
+    if store is None:
+        return None
+    try:
+        entry = store.get(cache_type, key)
+    except Exception as e:
+        logger.warning("L2 cache read failed [%s] %s: %s", cache_type, key, e)
+        _count(cache_type, l2_lookups=1, l2_errors=1)
+        return None
+    if entry is None:
+        _count(cache_type, l2_lookups=1)
         return None
+    with _lock:
+        _stats[cache_type]["l2_lookups"] += 1
+        _stats[cache_type]["l2_hits"] += 1
+        _caches[cache_type][key] = entry
+    return entry
+
+
+def _lookup(cache_type: str, key: str) -> Optional[CacheEntry]:
+    """L1, then L2.  Returns any unexpired entry, fresh or stale."""
+    return _lookup_l1(cache_type, key) or _lookup_l2(cache_type, key)
 
+
+def _store(cache_type: str, key: str, entry: CacheEntry) -> None:
+    """Write *entry* to both tiers."""
     with _lock:
-        value = cache.get(key)
-        if value is not None:
-            _stats[cache_type]["hits"] += 1
-            logger.debug("Cache HIT  [%s] %s", cache_type, key)
-            return value
-        _stats[cache_type]["misses"] += 1
-        logger.debug("Cache MISS [%s] %s", cache_type, key)
+        _caches[cache_type][key] = entry
+        _l2_writes[cache_type] += 1
+        prune = _l2_writes[cache_type] % L2_PRUNE_EVERY == 0
+    logger.debug("Cache SET  [%s] %s", cache_type, key)
+
+    store = _get_l2()
+    if store is None:
+        return
+    try:
+        store.set(cache_type, key, entry)
+        if prune:
+            store.prune(cache_type, _config[cache_type].l2_maxsize)
+    except Exception as e:
+        logger.warning("L2 cache write failed [%s] %s: %s", cache_type, key, e)
+        _count(cache_type, l2_errors=1)
+
+
+def _entry(cache_type: str, value: dict, negative: bool = False, confirmed: bool = False) -> CacheEntry:
+    config = _config[cache_type]
+    now = time.time()
+    if negative:
+        # An unconfirmed miss is served for negative_ttl, then kept until
+        # unknown_ttl only so a repeat miss can be recognised.
+        ttl = config.unknown_ttl if confirmed else config.negative_ttl
+        stale_until = now + max(config.unknown_ttl, ttl)
+        return CacheEntry(value=value, fresh_until=now + ttl, stale_until=stale_until, negative=True)
+    return CacheEntry(value=value, fresh_until=now + config.ttl, stale_until=now + config.ttl + config.stale_ttl)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def get_cached(cache_type: str, key: str) -> Optional[dict]:
+    """Retrieve a fresh value from the specified cache. Returns None on miss.
+
+    Blocks on L2 I/O; async callers should use :func:`get_or_load`.
+    """
+    if cache_type not in _caches:
         return None
 
+    entry = _lookup(cache_type, key)
+    if entry is not None and not entry.negative and entry.fresh_until > time.time():
+        _count(cache_type, hits=1)
+        logger.debug("Cache HIT  [%s] %s", cache_type, key)
+        return entry.value
+    _count(cache_type, misses=1)
+    logger.debug("Cache MISS [%s] %s", cache_type, key)
+    return None
+
 
 def set_cached(cache_type: str, key: str, value: dict) -> None:
-    """Store a value in the specified cache."""
-    cache = _caches.get(cache_type)
-    if cache is None:
+    """Store a value in the specified cache (both tiers)."""
+    if cache_type not in _caches:
+        return
+    _store(cache_type, key, _entry(cache_type, value))
+
+
+def set_negative(cache_type: str, key: str, detail: str, confirmed: bool = False) -> None:
+    """Remember that *key* was not found upstream.
+
+    Served as not-found for ``negative_ttl`` seconds, or ``unknown_ttl`` when
+    *confirmed* by an earlier miss.
+    """
+    if cache_type not in _caches:
         return
+    _store(cache_type, key, _entry(cache_type, {"detail": detail}, negative=True, confirmed=confirmed))
+
+
+async def get_or_load(
+    cache_type: str,
+    key: str,
+    loader: Callable[[], Awaitable[dict]],
+) -> tuple[dict, str]:
+    """
+    Return ``(value, status)`` for *key*, calling *loader* on a miss.
+
+    *status* is ``"HIT"``, ``"STALE"`` (served while a background refresh
+    runs) or ``"MISS"``.  Raises :class:`CacheNotFound` for a cached or
+    freshly discovered unknown key; any other loader error propagates and
+    is not cached.
+    """
+    if cache_type not in _caches:
+        return await loader(), "MISS"
+
+    entry = _lookup_l1(cache_type, key)
+    if entry is None and _get_l2() is not None:
+        entry = await asyncio.to_thread(_lookup_l2, cache_type, key)
+    now = time.time()
+    if entry is not None and entry.negative:
+        if entry.fresh_until > now:
+            _count(cache_type, hits=1, negative_hits=1)
+            logger.debug("Cache NEG  [%s] %s", cache_type, key)
+            raise CacheNotFound(entry.value.get("detail", "Not found"))
+        # An earlier miss past its negative_ttl: retry, and a second miss confirms it.
+        _count(cache_type, misses=1)
+        logger.debug("Cache MISS [%s] %s (retrying earlier miss)", cache_type, key)
+        return await asyncio.shield(_load_once(cache_type, key, loader, repeat_miss=True)), "MISS"
+    if entry is not None:
+        if entry.fresh_until > now:
+            _count(cache_type, hits=1)
+            logger.debug("Cache HIT  [%s] %s", cache_type, key)
+            return entry.value, "HIT"
+        _count(cache_type, hits=1, stale_hits=1)
+        logger.debug("Cache STALE [%s] %s", cache_type, key)
+        _load_once(cache_type, key, loader).add_done_callback(_log_revalidation)
+        return entry.value, "STALE"
+
+    _count(cache_type, misses=1)
+    logger.debug("Cache MISS [%s] %s", cache_type, key)
+    return await asyncio.shield(_load_once(cache_type, key, loader)), "MISS"
+
+
+def _load_once(
+    cache_type: str, key: str, loader: Callable[[], Awaitable[dict]], repeat_miss: bool = False
+) -> asyncio.Task:
+    """Start (or join) the single in-flight load of *key*."""
+    task = _inflight.get((cache_type, key))
+    if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.create_task(_load(cache_type, key, loader, repeat_miss))
+        _inflight[(cache_type, key)] = task
+        task.add_done_callback(_forget_inflight)
+    return task
+
 
+def _forget_inflight(task: asyncio.Task) -> None:
+    for flight_key, inflight in list(_inflight.items()):
+        if inflight is task:
+            del _inflight[flight_key]
+
+
+async def _load(cache_type: str, key: str, loader: Callable[[], Awaitable[dict]], repeat_miss: bool = False) -> dict:
+    try:
+        value = await loader()
+    except CacheNotFound as e:
+        await asyncio.to_thread(set_negative, cache_type, key, e.detail, repeat_miss)
+        raise
+    await asyncio.to_thread(set_cached, cache_type, key, value)
+    return value
+
+
+def _log_revalidation(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Cache revalidation failed: %s", task.exception())
+
+
+def clear_cache() -> None:
+    """Drop every entry from L1 and the shared L2 store."""
     with _lock:
-        cache[key] = value
-        logger.debug("Cache SET  [%s] %s", cache_type, key)
+        for cache in _caches.values():
+            cache.clear()
+    store = _get_l2()
+    if store is not None:
+        try:
+            store.clear()
+        except Exception as e:
+            logger.warning("L2 cache clear failed: %s", e)
 
 
 def get_cache_stats() -> dict:
-    """Return hit/miss counts and ratios per cache type."""
+    """Return hit/miss counts and ratios per cache type and tier, plus gateway counters."""
+    result = _ttl_cache_stats()
+    result["market_data"] = market_data_gateway.stats()
+    return result
+
+
+def _ratio(hits: int, total: int) -> float:
+    return round(hits / total, 4) if total > 0 else 0.0
+
+
+def _ttl_cache_stats() -> dict:
+    store = _l2 if _l2 is not _UNSET else None
+    backend = store.name if store is not None else "none"
     with _lock:
         result: dict = {}
         for name, counters in _stats.items():
+            config = _config[name]
             hits = counters["hits"]
             misses = counters["misses"]
             total = hits + misses
@@ -81,9 +441,29 @@ def get_cache_stats() -> dict:
                 "hits": hits,
                 "misses": misses,
                 "total": total,
-                "hit_ratio": round(hits / total, 4) if total > 0 else 0.0,
+                "hit_ratio": _ratio(hits, total),
+                "stale_hits": counters["stale_hits"],
+                "negative_hits": counters["negative_hits"],
                 "size": len(_caches[name]),
                 "maxsize": _caches[name].maxsize,
-                "ttl": int(_caches[name].ttl),
+                "ttl": config.ttl,
+                "stale_ttl": config.stale_ttl,
+                "negative_ttl": config.negative_ttl,
+                "unknown_ttl": config.unknown_ttl,
+                "tiers": {
+                    "l1": {
+                        "hits": counters["l1_hits"],
+                        "lookups": counters["l1_lookups"],
+                        "hit_ratio": _ratio(counters["l1_hits"], counters["l1_lookups"]),
+                    },
+                    "l2": {
+                        "backend": backend,
+                        "hits": counters["l2_hits"],
+                        "lookups": counters["l2_lookups"],
+                        "hit_ratio": _ratio(counters["l2_hits"], counters["l2_lookups"]),
+                        "errors": counters["l2_errors"],
+                        "maxsize": config.l2_maxsize,
+                    },
+                },
             }
         return result
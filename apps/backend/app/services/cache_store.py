@@ -0,0 +1,209 @@
+"""
+Second-tier (shared) stores for the analyze cache.
+
+``app.services.cache`` keeps a small in-process L1 per worker; the stores
+here are the L2 that every uvicorn worker and the background worker share,
+so a value fetched by one process is a hit for all the others.
+
+- :class:`SQLiteCacheStore` — a WAL-mode SQLite file; shared by every process
+  on the host, needs no external service (default).
+- :class:`PostgresCacheStore` — the ``analyze_cache`` UNLOGGED table
+  (supabase migration 20260605090000); shared across hosts.  Unlogged: the
+  contents are disposable, so writes skip the WAL and the table is emptied
+  after a crash.
+
+Entries carry absolute wall-clock deadlines (``time.time()``), so any
+process can judge freshness without coordinating with the writer.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional, Protocol
+
+from sqlalchemy import text
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """A cached value and its deadlines (epoch seconds).
+
+    Fresh until ``fresh_until``; may be served stale (while revalidating)
+    until ``stale_until``.  Negative entries record a not-found ``detail``.
+    """
+
+    value: dict
+    fresh_until: float
+    stale_until: float
+    negative: bool = False
+
+
+class CacheStore(Protocol):
+    """Interface of an L2 store."""
+
+    name: str
+
+    def get(self, namespace: str, key: str) -> Optional[CacheEntry]: ...
+
+    def set(self, namespace: str, key: str, entry: CacheEntry) -> None: ...
+
+    def prune(self, namespace: str, max_entries: int) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class SQLiteCacheStore:
+    """L2 store in a local SQLite file (one connection per thread)."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        self._conn()  # fail fast if the file cannot be created
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analyze_cache (
+                    namespace   TEXT    NOT NULL,
+                    key         TEXT    NOT NULL,
+                    value       TEXT    NOT NULL,
+                    negative    INTEGER NOT NULL DEFAULT 0,
+                    fresh_until REAL    NOT NULL,
+                    stale_until REAL    NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        row = (
+            self._conn()
+            .execute(
+                "SELECT value, negative, fresh_until, stale_until FROM analyze_cache "
+                "WHERE namespace = ? AND key = ? AND stale_until > ?",
+                (namespace, key, time.time()),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return CacheEntry(value=json.loads(row[0]), negative=bool(row[1]), fresh_until=row[2], stale_until=row[3])
+
+    def set(self, namespace: str, key: str, entry: CacheEntry) -> None:
+        self._conn().execute(
+            "INSERT INTO analyze_cache (namespace, key, value, negative, fresh_until, stale_until) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, negative = excluded.negative, "
+            "fresh_until = excluded.fresh_until, stale_until = excluded.stale_until",
+            (namespace, key, json.dumps(entry.value), int(entry.negative), entry.fresh_until, entry.stale_until),
+        )
+
+    def prune(self, namespace: str, max_entries: int) -> None:
+        conn = self._conn()
+        conn.execute(
+            "DELETE FROM analyze_cache WHERE namespace = ? AND stale_until <= ?",
+            (namespace, time.time()),
+        )
+        conn.execute(
+            "DELETE FROM analyze_cache WHERE namespace = ? AND key IN ("
+            "  SELECT key FROM analyze_cache WHERE namespace = ? ORDER BY fresh_until DESC LIMIT -1 OFFSET ?"
+            ")",
+            (namespace, namespace, max_entries),
+        )
+
+    def clear(self) -> None:
+        self._conn().execute("DELETE FROM analyze_cache")
+
+
+class PostgresCacheStore:
+    """L2 store in the ``analyze_cache`` UNLOGGED Postgres table."""
+
+    name = "postgres"
+
+    def __init__(self, engine: Any) -> None:
+        self.engine = engine
+
+    def get(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text(
+                    """
+                    SELECT value, negative,
+                           extract(epoch FROM fresh_until) AS fresh_until,
+                           extract(epoch FROM stale_until) AS stale_until
+                      FROM analyze_cache
+                     WHERE namespace = :namespace AND key = :key AND stale_until > now()
+                    """
+                ),
+                {"namespace": namespace, "key": key},
+            ).one_or_none()
+        if row is None:
+            return None
+        return CacheEntry(
+            value=row.value,
+            negative=row.negative,
+            fresh_until=float(row.fresh_until),
+            stale_until=float(row.stale_until),
+        )
+
+    def set(self, namespace: str, key: str, entry: CacheEntry) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO analyze_cache (namespace, key, value, negative, fresh_until, stale_until)
+                    VALUES (:namespace, :key, cast(:value AS jsonb), :negative,
+                            to_timestamp(:fresh_until), to_timestamp(:stale_until))
+                    ON CONFLICT (namespace, key) DO UPDATE
+                       SET value = excluded.value,
+                           negative = excluded.negative,
+                           fresh_until = excluded.fresh_until,
+                           stale_until = excluded.stale_until
+                    """
+                ),
+                {
+                    "namespace": namespace,
+                    "key": key,
+                    "value": json.dumps(entry.value),
+                    "negative": entry.negative,
+                    "fresh_until": entry.fresh_until,
+                    "stale_until": entry.stale_until,
+                },
+            )
+
+    def prune(self, namespace: str, max_entries: int) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(
+                text("DELETE FROM analyze_cache WHERE namespace = :namespace AND stale_until <= now()"),
+                {"namespace": namespace},
+            )
+            conn.execute(
+                text(
+                    """
+                    DELETE FROM analyze_cache
+                     WHERE namespace = :namespace
+                       AND key IN (SELECT key FROM analyze_cache
+                                    WHERE namespace = :namespace
+                                    ORDER BY fresh_until DESC
+                                   OFFSET :max_entries)
+                    """
+                ),
+                {"namespace": namespace, "max_entries": max_entries},
+            )
+
+    def clear(self) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(text("DELETE FROM analyze_cache"))
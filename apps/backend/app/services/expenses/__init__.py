@@ -1,3 +1,3 @@
-from .categorize import CategoryAssignment, CategoryResolver
+from .categorize import CategoryAssignment, CategoryResolver, MerchantMappingCache
 
-__all__ = ["CategoryAssignment", "CategoryResolver"]
+__all__ = ["CategoryAssignment", "CategoryResolver", "MerchantMappingCache"]
@@ -35,13 +35,16 @@ from __future__ import annotations
 
 import logging
 import re
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Protocol, runtime_checkable
 from uuid import UUID
 
 import yaml
+from sqlalchemy import case, or_, update
 from sqlmodel import Session, select
 
 from app.schema.expenses import ExpenseCategory, MerchantCategoryMapping
@@ -56,6 +59,9 @@ CATEGORY_RULES_PATH = Path(__file__).parent / "category_rules.yaml"
 
 _DEFAULT_RULE_WEIGHT = 0.5
 
+# Distinct merchants whose best rule match is memoized per CategoryRulesCache.
+_MATCH_CACHE_SIZE = 8192
+
 # Hebrew sector strings in EXTRACTED (visual / reversed) form → category slug.
 # Cal and Isracard include a Hebrew ענף (sector) field on domestic transactions.
 # These strings are matched as substrings (case-insensitive) against sector_raw.
@@ -103,6 +109,13 @@ _SECTOR_TO_SLUG: dict[str, CategoryTarget] = {
 }
 
 
+@lru_cache(maxsize=1024)
+def _sector_targets(sector_raw: str) -> tuple[tuple[str, CategoryTarget], ...]:
+    """Sector keys contained in ``sector_raw``, in ``_SECTOR_TO_SLUG`` priority order."""
+    sector_lower = sector_raw.lower()
+    return tuple((key, target) for key, target in _SECTOR_TO_SLUG.items() if key.lower() in sector_lower)
+
+
 # ---------------------------------------------------------------------------
 # ParsedTransaction protocol
 # ---------------------------------------------------------------------------
@@ -224,6 +237,157 @@ def _compile_rules(yaml_data: dict) -> list[_CompiledRule]:
     return compiled
 
 
+def _rule_priority(rule: _CompiledRule) -> tuple[float, int, str]:
+    """Sort key for competing matches (see ``CategoryResolver._pick_best_match``).
+
+    Primary: highest weight first (negate).
+    Secondary: subcategory rules beat parent-only rules (more specific wins).
+    Tertiary: alphabetical by combined slug for determinism.
+    """
+    subcat_priority = 0 if rule.subcategory_slug else 1
+    slug_key = f"{rule.category_slug}/{rule.subcategory_slug or ''}"
+    return (-rule.weight, subcat_priority, slug_key)
+
+
+def _required_literals(pattern: str) -> Optional[frozenset[str]]:
+    """Return literals of which every match of ``pattern`` contains at least one.
+
+    Works on the parsed regex: a branch requires the union of its
+    alternatives' literals, a sequence requires any one of its literal runs or
+    mandatory groups (the most selective is kept).  Returns None when no such
+    set can be proven (e.g. ``.*``) — the rule is then always evaluated.
+    Literals are casefolded to match ``_RuleMatcher``'s casefolded text.
+    """
+    try:
+        from re import _parser as sre_parse  # type: ignore[attr-defined]
+
+        parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    except Exception:  # pragma: no cover — unexpected parser shape; fall back to "always evaluate"
+        return None
+
+    def best(options: list[frozenset[str]]) -> Optional[frozenset[str]]:
+        # Prefer the requirement whose shortest literal is longest (fewest false candidates).
+        return max(options, key=lambda lits: (min(len(lit) for lit in lits), -len(lits)), default=None)
+
+    def sequence(items) -> Optional[frozenset[str]]:  # type: ignore[no-untyped-def]
+        options: list[frozenset[str]] = []
+        run: list[str] = []
+
+        def close_run() -> None:
+            if run:
+                options.append(frozenset(["".join(run).casefold()]))
+                run.clear()
+
+        for op, av in items:
+            name = str(op)
+            if name == "LITERAL":
+                run.append(chr(av))
+                continue
+            close_run()
+            if name == "SUBPATTERN":
+                required = sequence(av[-1])
+            elif name == "BRANCH":
+                branches = [sequence(branch) for branch in av[1]]
+                required = None if any(b is None for b in branches) else frozenset().union(*branches)
+            elif name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT") and av[0] >= 1:
+                required = sequence(av[2])
+            else:
+                required = None
+            if required:
+                options.append(required)
+        close_run()
+        return best(options)
+
+    required = sequence(parsed)
+    if not required or any(not lit for lit in required):
+        return None
+    return required
+
+
+class _AhoCorasick:
+    """Minimal Aho-Corasick automaton: all keyword hits in one pass over the text."""
+
+    def __init__(self, keywords: dict[str, set[int]]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[set[int]] = [set()]
+        for keyword, values in keywords.items():
+            node = 0
+            for ch in keyword:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                node = nxt
+            self._out[node] |= values
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> set[int]:
+        hits: set[int] = set()
+        node = 0
+        for ch in text:
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            if self._out[node]:
+                hits |= self._out[node]
+        return hits
+
+
+class _RuleMatcher:
+    """Compiled rule engine: literal prefilter + priority-ordered regex checks.
+
+    Each rule's regex only runs when the merchant contains one of the rule's
+    required literals (one Aho-Corasick pass finds them all).  Candidates are
+    checked in ``_rule_priority`` order and the first hit wins, which is the
+    same rule ``_pick_best_match`` would choose from the full match list.
+    """
+
+    def __init__(self, rules: list[_CompiledRule]) -> None:
+        order = sorted(range(len(rules)), key=lambda i: _rule_priority(rules[i]))
+        self._rules = [rules[i] for i in order]
+        keywords: dict[str, set[int]] = {}
+        self._always: set[int] = set()
+        for idx, rule in enumerate(self._rules):
+            literals = _required_literals(rule.regex.pattern)
+            if literals is None:
+                self._always.add(idx)
+                continue
+            for literal in literals:
+                keywords.setdefault(literal, set()).add(idx)
+        self._automaton = _AhoCorasick(keywords)
+        self.best = lru_cache(maxsize=_MATCH_CACHE_SIZE)(self._best)
+
+    def _best(self, merchant_normalized: str) -> tuple[Optional[_CompiledRule], Optional[_CompiledRule]]:
+        """Return (best transfer rule, best non-transfer rule) matching the merchant."""
+        candidates = self._automaton.find(merchant_normalized.casefold()) | self._always
+        best_transfer: Optional[_CompiledRule] = None
+        best_rule: Optional[_CompiledRule] = None
+        for idx in sorted(candidates):
+            rule = self._rules[idx]
+            if rule.is_transfer:
+                if best_transfer is None and rule.regex.search(merchant_normalized):
+                    best_transfer = rule
+            elif best_rule is None and rule.regex.search(merchant_normalized):
+                best_rule = rule
+            if best_transfer is not None and best_rule is not None:
+                break
+        return best_transfer, best_rule
+
+
 # ---------------------------------------------------------------------------
 # CategoryRulesCache
 # ---------------------------------------------------------------------------
@@ -240,6 +404,7 @@ class CategoryRulesCache:
         self._path = rules_path
         self._compiled: list[_CompiledRule] = []
         self._transfer_slugs: set[str] = set()
+        self._matcher = _RuleMatcher([])
         self.reload()
 
     def reload(self) -> None:
@@ -247,6 +412,7 @@ class CategoryRulesCache:
         with self._path.open(encoding="utf-8") as fh:
             yaml_data: dict = yaml.safe_load(fh)
         self._compiled = _compile_rules(yaml_data)
+        self._matcher = _RuleMatcher(self._compiled)
         # Collect all category / subcategory slugs marked is_transfer=true.
         self._transfer_slugs = {rule.category_slug for rule in self._compiled if rule.is_transfer} | {
             rule.subcategory_slug for rule in self._compiled if rule.is_transfer and rule.subcategory_slug
@@ -265,6 +431,10 @@ class CategoryRulesCache:
     def transfer_slugs(self) -> set[str]:
         return self._transfer_slugs
 
+    @property
+    def matcher(self) -> _RuleMatcher:
+        return self._matcher
+
 
 # ---------------------------------------------------------------------------
 # Module-level cache (process-scoped singleton instances)
@@ -308,6 +478,103 @@ def _invalidate_category_cache() -> None:
     _CATEGORY_SLUG_CACHE = {}
 
 
+# ---------------------------------------------------------------------------
+# MerchantMappingCache
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _MappingEntry:
+    """Detached snapshot of one merchant_category_mappings row."""
+
+    id: UUID
+    household_id: Optional[UUID]
+    source: str
+    match_count: int
+    category_id: UUID
+    subcategory_id: Optional[UUID]
+
+
+class MerchantMappingCache:
+    """Per-run merchant → mapping lookup for one household.
+
+    Loads every household-scoped and global merchant_category_mappings row
+    once, answers ``CategoryResolver`` tier-3 lookups from memory, and
+    accumulates the match_count / last_used_at audit bumps until ``flush()``
+    writes them with a single UPDATE.  Build one per statement (or per
+    recategorization run) and call ``flush()`` before committing.
+
+    Usage
+    -----
+    mappings = MerchantMappingCache(db, household_id)
+    for txn in txns:
+        resolver.resolve(txn, db, household_id, mappings=mappings)
+    mappings.flush()
+    db.commit()
+    """
+
+    def __init__(self, db: Session, household_id: UUID) -> None:
+        self._db = db
+        self._household_id = household_id
+        self._by_merchant: dict[str, list[_MappingEntry]] = {}
+        self._pending: dict[UUID, int] = {}
+        # Security: household-scoped OR global rows only — never another household's mappings.
+        rows = db.exec(
+            select(MerchantCategoryMapping).where(
+                or_(
+                    MerchantCategoryMapping.household_id == household_id,
+                    MerchantCategoryMapping.household_id.is_(None),  # type: ignore[union-attr]
+                )
+            )
+        ).all()
+        for row in rows:
+            self._by_merchant.setdefault(row.merchant_normalized, []).append(
+                _MappingEntry(
+                    id=row.id,
+                    household_id=row.household_id,
+                    source=row.source,
+                    match_count=row.match_count or 0,
+                    category_id=row.category_id,
+                    subcategory_id=row.subcategory_id,
+                )
+            )
+
+    def lookup(self, merchant_normalized: str, user_only: bool) -> Optional[_MappingEntry]:
+        """Same selection as ``CategoryResolver._query_mapping``, without the round-trips."""
+        rows = self._by_merchant.get(merchant_normalized)
+        if not rows:
+            return None
+        if user_only:
+            rows = [r for r in rows if r.source == "user"]
+        scoped = [r for r in rows if r.household_id == self._household_id]
+        candidates = scoped or [r for r in rows if r.household_id is None]
+        if not candidates:
+            return None
+
+        chosen = min(candidates, key=lambda r: -r.match_count)
+        chosen.match_count += 1
+        self._pending[chosen.id] = self._pending.get(chosen.id, 0) + 1
+        return chosen
+
+    def flush(self) -> int:
+        """Write the accumulated match_count bumps in one UPDATE; return rows touched.
+
+        Does not commit — the caller's transaction owns the write.
+        """
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        self._db.exec(
+            update(MerchantCategoryMapping)
+            .where(MerchantCategoryMapping.id.in_(list(pending)))  # type: ignore[union-attr]
+            .values(
+                match_count=MerchantCategoryMapping.match_count + case(pending, value=MerchantCategoryMapping.id),
+                last_used_at=datetime.utcnow(),
+            )
+        )
+        return len(pending)
+
+
 # ---------------------------------------------------------------------------
 # CategoryResolver
 # ---------------------------------------------------------------------------
@@ -325,6 +592,9 @@ class CategoryResolver:
     -----
     resolver = CategoryResolver()  # process scope
     assignment = resolver.resolve(txn, db_session, household_id)
+
+    Batch callers pass a ``MerchantMappingCache`` so tier-3 lookups are served
+    from memory and match_count bumps are written once per statement.
     """
 
     def __init__(self, rules_cache: Optional[CategoryRulesCache] = None) -> None:
@@ -335,6 +605,7 @@ class CategoryResolver:
         txn: ParsedTransaction,
         db: Session,
         household_id: UUID,
+        mappings: Optional[MerchantMappingCache] = None,
     ) -> CategoryAssignment:
         """Resolve category for a single parsed transaction.
 
@@ -343,6 +614,10 @@ class CategoryResolver:
         txn:          Parsed transaction (merchant_normalized, sector_raw, …).
         db:           Active SQLModel Session for tier-3 DB queries.
         household_id: UUID of the current household for scoped mapping lookup.
+        mappings:     Optional per-run ``MerchantMappingCache`` for
+                      ``household_id``.  When given, tier-3 lookups make no
+                      queries and the caller must ``flush()`` it; otherwise
+                      each mapping hit is queried and committed immediately.
 
         Returns
         -------
@@ -367,12 +642,7 @@ class CategoryResolver:
 
         # ── Tier 3-A: User-confirmed DB mappings ──────────────────────────
         # User-explicit preferences beat YAML rules (user correction wins).
-        user_mapping = self._query_mapping(
-            txn.merchant_normalized,
-            household_id,
-            db,
-            user_only=True,
-        )
+        user_mapping = self._lookup_mapping(txn.merchant_normalized, household_id, db, mappings, user_only=True)
         if user_mapping is not None:
             return self._assignment_from_mapping(user_mapping, slug_map)
 
@@ -382,12 +652,7 @@ class CategoryResolver:
             return rule_result
 
         # ── Tier 3-B: Learned / inferred DB mappings ──────────────────────
-        inferred_mapping = self._query_mapping(
-            txn.merchant_normalized,
-            household_id,
-            db,
-            user_only=False,
-        )
+        inferred_mapping = self._lookup_mapping(txn.merchant_normalized, household_id, db, mappings, user_only=False)
         if inferred_mapping is not None:
             return self._assignment_from_mapping(inferred_mapping, slug_map)
 
@@ -410,12 +675,10 @@ class CategoryResolver:
         """Return a transfer CategoryAssignment if the merchant matches any
         transfers/* rule, otherwise None.
         """
-        transfer_rules = [r for r in self._cache.compiled_rules if r.is_transfer]
-        matches: list[_CompiledRule] = [r for r in transfer_rules if r.regex.search(merchant_normalized)]
-        if not matches:
+        best, _ = self._cache.matcher.best(merchant_normalized)
+        if best is None:
             return None
 
-        best = self._pick_best_match(matches)
         cat_id = slug_map.get(best.category_slug)
         subcat_id = slug_map.get(best.subcategory_slug) if best.subcategory_slug else None
         return CategoryAssignment(
@@ -433,34 +696,33 @@ class CategoryResolver:
     ) -> Optional[CategoryAssignment]:
         """Map issuer sector_raw → category slug via substring lookup.
 
-        The sector string is compared case-insensitively; we scan every entry
-        in ``_SECTOR_TO_SLUG`` and take the first match found (dict insertion
-        order = Hebrew common-sector priority order).
+        The sector string is compared case-insensitively against every entry
+        in ``_SECTOR_TO_SLUG`` and the first match found wins (dict insertion
+        order = Hebrew common-sector priority order).  Sector strings repeat
+        across a statement, so the substring scan is memoized per string.
         """
-        sector_lower = sector_raw.lower()
-        for sector_key, target in _SECTOR_TO_SLUG.items():
-            if sector_key.lower() in sector_lower:
-                if isinstance(target, tuple):
-                    category_slug, subcategory_slug = target
-                else:
-                    category_slug, subcategory_slug = target, None
-                cat_id = slug_map.get(category_slug)
-                subcat_id = slug_map.get(subcategory_slug) if subcategory_slug is not None else None
-                if cat_id is None or (subcategory_slug is not None and subcat_id is None):
-                    # Slug not in DB yet — skip this sector hit
-                    logger.debug(
-                        "Sector key '%s' → slug '%s' not found in DB categories",
-                        sector_key,
-                        target,
-                    )
-                    continue
-                return CategoryAssignment(
-                    category_id=cat_id,
-                    subcategory_id=subcat_id,
-                    resolution_status="auto",
-                    resolution_source="sector",
-                    is_transfer=False,
+        for sector_key, target in _sector_targets(sector_raw):
+            if isinstance(target, tuple):
+                category_slug, subcategory_slug = target
+            else:
+                category_slug, subcategory_slug = target, None
+            cat_id = slug_map.get(category_slug)
+            subcat_id = slug_map.get(subcategory_slug) if subcategory_slug is not None else None
+            if cat_id is None or (subcategory_slug is not None and subcat_id is None):
+                # Slug not in DB yet — skip this sector hit
+                logger.debug(
+                    "Sector key '%s' → slug '%s' not found in DB categories",
+                    sector_key,
+                    target,
                 )
+                continue
+            return CategoryAssignment(
+                category_id=cat_id,
+                subcategory_id=subcat_id,
+                resolution_status="auto",
+                resolution_source="sector",
+                is_transfer=False,
+            )
         return None
 
     def _resolve_rules(
@@ -470,18 +732,17 @@ class CategoryResolver:
     ) -> Optional[CategoryAssignment]:
         """Match merchant_normalized against all compiled YAML rules.
 
-        Subcategory rules are checked before top-level rules (guaranteed by
-        _compile_rules ordering).  Among all matches, the one with the highest
-        weight wins; ties are broken alphabetically by
-        ``category_slug/subcategory_slug``.
+        Among all matches the one with the highest weight wins; subcategory
+        rules beat top-level rules and remaining ties are broken alphabetically
+        by ``category_slug/subcategory_slug`` (see ``_rule_priority``).  The
+        compiled matcher only runs the regexes whose literals occur in the
+        merchant and stops at the first hit in priority order.
         """
-        # Exclude transfer rules (already handled in pre-check).
-        non_transfer_rules = [r for r in self._cache.compiled_rules if not r.is_transfer]
-        matches: list[_CompiledRule] = [r for r in non_transfer_rules if r.regex.search(merchant_normalized)]
-        if not matches:
+        # Transfer rules are excluded (already handled in pre-check).
+        _, best = self._cache.matcher.best(merchant_normalized)
+        if best is None:
             return None
 
-        best = self._pick_best_match(matches)
         cat_id = slug_map.get(best.category_slug)
         subcat_id = slug_map.get(best.subcategory_slug) if best.subcategory_slug else None
         return CategoryAssignment(
@@ -500,16 +761,19 @@ class CategoryResolver:
         combined slug key ``category_slug/subcategory_slug`` (deterministic
         across Python processes and reruns).
         """
+        return min(matches, key=_rule_priority)
 
-        def sort_key(r: _CompiledRule) -> tuple[float, int, str]:
-            # Primary: highest weight first (negate).
-            # Secondary: subcategory rules beat parent-only rules (more specific wins).
-            # Tertiary: alphabetical by combined slug for determinism.
-            subcat_priority = 0 if r.subcategory_slug else 1
-            slug_key = f"{r.category_slug}/{r.subcategory_slug or ''}"
-            return (-r.weight, subcat_priority, slug_key)
-
-        return sorted(matches, key=sort_key)[0]
+    def _lookup_mapping(
+        self,
+        merchant_normalized: str,
+        household_id: UUID,
+        db: Session,
+        mappings: Optional[MerchantMappingCache],
+        user_only: bool,
+    ) -> Optional[MerchantCategoryMapping | _MappingEntry]:
+        if mappings is not None:
+            return mappings.lookup(merchant_normalized, user_only=user_only)
+        return self._query_mapping(merchant_normalized, household_id, db, user_only=user_only)
 
     def _query_mapping(
         self,
@@ -566,7 +830,7 @@ class CategoryResolver:
 
     @staticmethod
     def _assignment_from_mapping(
-        mapping: MerchantCategoryMapping,
+        mapping: MerchantCategoryMapping | _MappingEntry,
         slug_map: dict[str, UUID],  # noqa: ARG004 — unused; IDs already on mapping
     ) -> CategoryAssignment:
         """Build a CategoryAssignment from a MerchantCategoryMapping row."""
@@ -15,9 +15,11 @@ from .base import (
     UnknownIssuer,
 )
 from .dispatcher import dispatch_pdf
+from .document import ParsedDocument
 
 __all__ = [
     "dispatch_pdf",
+    "ParsedDocument",
     "ParsedStatement",
     "ParsedTransaction",
     "ParserError",
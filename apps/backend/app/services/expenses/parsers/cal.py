@@ -18,11 +18,10 @@ import logging
 import re
 from datetime import date
 from decimal import Decimal
-from typing import Optional
-
-import pdfplumber
+from typing import Optional, Union
 
 from .base import BaseParser, ParsedStatement, ParsedTransaction, ParserError
+from .document import ParsedDocument
 
 logger = logging.getLogger(__name__)
 
@@ -105,20 +104,21 @@ class CalParser(BaseParser):
     #: Issuer slug written into ParsedStatement.issuer
     ISSUER = "cal"
 
-    def parse(self, path: str) -> ParsedStatement:
-        """Parse *path* and return a :class:`ParsedStatement`.
+    def parse(self, source: Union[str, ParsedDocument]) -> ParsedStatement:
+        """Parse *source* and return a :class:`ParsedStatement`.
+
+        *source* is a filesystem path or an already-open
+        :class:`~.document.ParsedDocument` (the dispatcher passes the latter
+        so the PDF is only opened and extracted once).
 
         Raises :class:`~.base.ParserError` on any unrecoverable error.
         """
-        try:
-            pdf = pdfplumber.open(path)
-        except Exception as exc:
-            raise ParserError(f"Cannot open PDF: {path!r}") from exc
-
-        with pdf:
-            pages_text = [pg.extract_text() or "" for pg in pdf.pages]
+        if not isinstance(source, ParsedDocument):
+            with ParsedDocument.open(source) as doc:
+                return self.parse(doc)
 
-        full_text = "\n".join(pages_text)
+        pages_text = source.pages_text
+        full_text = source.full_text
         # Rabin security condition #1
         self._reject_card_numbers(full_text)
 
@@ -4,46 +4,41 @@ correct parser.
 Security conditions from Rabin CC-2 review:
 - File size limit: 5 MB (PDFTooLarge raised before opening)
 - Text size limit: 500 KB (PDFTooLarge raised after extraction)
-- Timeout: 30 s via ThreadPoolExecutor future (ParserTimeout raised on timeout)
+- Timeout: 30 s, enforced by the parse pool (ParserTimeout raised on timeout)
 - Full card-number scrub enforced inside each parser (SecurityError)
 
-Thread-safety note (CC-11 follow-up):
-  The original SIGALRM approach only works in the main thread of the main
-  interpreter. APScheduler runs jobs in a worker thread pool, causing
-  "signal only works in main thread" errors.  We now use
-  concurrent.futures.ThreadPoolExecutor with Future.result(timeout=...) which
-  is thread-safe.
-
-  Cancellation caveat: cancelling a Future that wraps synchronous pdfplumber
-  code is best-effort — on timeout we call ``executor.shutdown(wait=False)``
-  so the caller is not blocked, but the background thread continues until
-  pdfplumber yields (or the worker process exits). Zombie parse threads are
-  rare and bounded (one per timed-out PDF), so this is acceptable. If true
-  hard-kill isolation is ever required, switch to subprocess-based isolation
-  (e.g. pebble.ProcessPool).
+Single-open pipeline:
+  Each PDF is opened once into a :class:`~.document.ParsedDocument`; the same
+  page texts feed the size check, issuer fingerprinting and the issuer
+  parser, so pdfplumber extraction is no longer repeated per statement.
+
+Timeout isolation (CC-11 follow-up):
+  The original SIGALRM approach only worked in the main thread, and the
+  per-PDF ThreadPoolExecutor that replaced it could only stop *waiting* for a
+  hung pdfplumber call — the thread kept running.  Parsing now happens in the
+  long-lived worker processes of :mod:`.pool`; a worker that overruns the
+  deadline is killed and replaced, so nothing is left running.
 """
 
 from __future__ import annotations
 
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor
-from concurrent.futures import TimeoutError as FuturesTimeoutError
-
-import pdfplumber
+from typing import Optional
 
 from .base import (
     ParsedStatement,
     ParserError,
-    ParserTimeout,
     PDFTooLarge,
     UnknownIssuer,
 )
 from .cal import CalParser
 from .cal_paybox import CalPayBoxParser
+from .document import ParsedDocument
 from .fingerprint import detect_issuer
 from .isracard import IsracardParser
 from .max import MaxParser
+from .pool import ParsePool, get_parse_pool
 
 logger = logging.getLogger(__name__)
 
@@ -59,7 +54,11 @@ _PARSER_MAP = {
 }
 
 
-def dispatch_pdf(path: str, timeout_seconds: int = _TIMEOUT_SECONDS) -> ParsedStatement:
+def dispatch_pdf(
+    path: str,
+    timeout_seconds: int = _TIMEOUT_SECONDS,
+    pool: Optional[ParsePool] = None,
+) -> ParsedStatement:
     """Open *path*, detect the issuer, and parse the statement.
 
     Parameters
@@ -70,6 +69,9 @@ def dispatch_pdf(path: str, timeout_seconds: int = _TIMEOUT_SECONDS) -> ParsedSt
         Maximum wall-clock seconds allowed for parsing.  Defaults to 30 s
         (Rabin CC-12 §timeout requirement).  Raises :exc:`ParserTimeout` if
         the limit is exceeded.
+    pool:
+        Parse pool to run in; defaults to the process-wide pool from
+        :func:`~.pool.get_parse_pool`.
 
     Returns
     -------
@@ -98,38 +100,19 @@ def dispatch_pdf(path: str, timeout_seconds: int = _TIMEOUT_SECONDS) -> ParsedSt
     if size > _MAX_FILE_BYTES:
         raise PDFTooLarge(f"PDF file is {size:,} bytes; limit is {_MAX_FILE_BYTES:,} bytes")
 
-    # ── Thread-safe timeout via concurrent.futures ───────────────────────
-    # ThreadPoolExecutor.Future.result(timeout=...) works in any thread,
-    # unlike signal.SIGALRM which is restricted to the main thread.
-    #
-    # On timeout we call shutdown(wait=False) so the caller is not blocked
-    # waiting for pdfplumber to yield.  The background thread is a daemon and
-    # will be reaped when the worker process exits.  This is acceptable because
-    # zombie parse threads are rare and bounded (one per timed-out PDF).
-    # If hard-kill isolation is ever required, switch to subprocess isolation.
-    executor = ThreadPoolExecutor(max_workers=1)
-    future = executor.submit(_do_parse, path)
-    try:
-        result = future.result(timeout=timeout_seconds)
-        executor.shutdown(wait=True)
-        return result
-    except FuturesTimeoutError:
-        executor.shutdown(wait=False)  # don't block on hung pdfplumber thread
-        raise ParserTimeout(f"PDF parsing exceeded {timeout_seconds}-second time limit")
+    # ── Parse in a pooled worker process (hard-kill on timeout) ────────
+    return (pool or get_parse_pool()).run(_do_parse, path, timeout=timeout_seconds)
 
 
 def _do_parse(path: str) -> ParsedStatement:
-    """Internal parse worker (submitted to ThreadPoolExecutor by dispatch_pdf)."""
-    # Extract full text for fingerprinting
-    try:
-        pdf = pdfplumber.open(path)
-    except Exception as exc:
-        raise ParserError(f"Cannot open PDF: {path!r}") from exc
+    """Internal parse worker (run in a :class:`~.pool.ParsePool` process by dispatch_pdf)."""
+    with ParsedDocument.open(path) as doc:
+        return _parse_document(doc)
 
-    with pdf:
-        pages_text = [pg.extract_text() or "" for pg in pdf.pages]
 
-    full_text = "\n".join(pages_text)
+def _parse_document(doc: ParsedDocument) -> ParsedStatement:
+    """Size-check, fingerprint and parse an already-extracted document."""
+    full_text = doc.full_text
 
     # ── Security: text size check ────────────────────────────────────────
     text_bytes = len(full_text.encode("utf-8"))
@@ -139,11 +122,11 @@ def _do_parse(path: str) -> ParsedStatement:
     # ── Issuer detection ────────────────────────────────────────────────
     issuer = detect_issuer(full_text)
     if issuer is None:
-        raise UnknownIssuer(f"Cannot identify credit-card issuer from PDF: {path!r}")
+        raise UnknownIssuer(f"Cannot identify credit-card issuer from PDF: {doc.path!r}")
 
-    logger.debug("Detected issuer=%s for path=%r", issuer, path)
+    logger.debug("Detected issuer=%s for path=%r", issuer, doc.path)
 
     # ── Parser dispatch ──────────────────────────────────────────────────
     parser_cls = _PARSER_MAP[issuer]
     parser = parser_cls()
-    return parser.parse(path)
+    return parser.parse(doc)
@@ -0,0 +1,84 @@
+"""Single-open PDF document shared by the fingerprinter and issuer parsers.
+
+:class:`ParsedDocument` opens a statement with pdfplumber exactly once and
+extracts every page's text up front — that is all issuer detection and the
+current parsers need.  Word boxes and tables are layout-level extractions that
+cost far more than plain text, so they are computed lazily per page (and
+memoised) while the document is open.
+
+Usage::
+
+    with ParsedDocument.open(path) as doc:
+        issuer = detect_issuer(doc.full_text)
+        statement = CalParser().parse(doc)
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import pdfplumber
+
+from .base import ParserError
+
+
+class ParsedDocument:
+    """Page texts (eager) plus word boxes and tables (lazy) for one PDF."""
+
+    def __init__(self, path: str, pdf: Any, pages_text: list[str]) -> None:
+        self.path = path
+        self.pages_text = pages_text
+        self.full_text = "\n".join(pages_text)
+        self._pdf = pdf
+        self._words: dict[int, list[dict]] = {}
+        self._tables: dict[int, list[list[list[Optional[str]]]]] = {}
+
+    @classmethod
+    def open(cls, path: str) -> ParsedDocument:
+        """Open *path* and extract the text of every page.
+
+        Raises :class:`~.base.ParserError` if pdfplumber cannot open the file.
+        """
+        try:
+            pdf = pdfplumber.open(path)
+        except Exception as exc:
+            raise ParserError(f"Cannot open PDF: {path!r}") from exc
+
+        try:
+            pages_text = [pg.extract_text() or "" for pg in pdf.pages]
+        except Exception:
+            pdf.close()
+            raise
+        return cls(path, pdf, pages_text)
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages_text)
+
+    def words(self, page_index: int) -> list[dict]:
+        """Return pdfplumber word boxes (``text``, ``x0``, ``top``, …) for a page."""
+        if page_index not in self._words:
+            self._words[page_index] = self._page(page_index).extract_words()
+        return self._words[page_index]
+
+    def tables(self, page_index: int) -> list[list[list[Optional[str]]]]:
+        """Return the tables pdfplumber detects on a page (rows of cell strings)."""
+        if page_index not in self._tables:
+            self._tables[page_index] = self._page(page_index).extract_tables()
+        return self._tables[page_index]
+
+    def _page(self, page_index: int) -> Any:
+        if self._pdf is None:
+            raise ParserError(f"ParsedDocument for {self.path!r} is closed; layout data is unavailable")
+        return self._pdf.pages[page_index]
+
+    def close(self) -> None:
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+    def __enter__(self) -> ParsedDocument:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
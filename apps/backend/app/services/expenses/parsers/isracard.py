@@ -27,11 +27,10 @@ import logging
 import re
 from datetime import date
 from decimal import Decimal
-from typing import Optional
-
-import pdfplumber
+from typing import Optional, Union
 
 from .base import BaseParser, ParsedStatement, ParsedTransaction, ParserError
+from .document import ParsedDocument
 
 logger = logging.getLogger(__name__)
 
@@ -155,17 +154,14 @@ class IsracardParser(BaseParser):
 
     ISSUER = "isracard"
 
-    def parse(self, path: str) -> ParsedStatement:
-        """Parse *path* and return a :class:`ParsedStatement`."""
-        try:
-            pdf = pdfplumber.open(path)
-        except Exception as exc:
-            raise ParserError(f"Cannot open PDF: {path!r}") from exc
-
-        with pdf:
-            pages_text = [pg.extract_text() or "" for pg in pdf.pages]
+    def parse(self, source: Union[str, ParsedDocument]) -> ParsedStatement:
+        """Parse *source* (path or open :class:`~.document.ParsedDocument`) into a :class:`ParsedStatement`."""
+        if not isinstance(source, ParsedDocument):
+            with ParsedDocument.open(source) as doc:
+                return self.parse(doc)
 
-        full_text = "\n".join(pages_text)
+        pages_text = source.pages_text
+        full_text = source.full_text
         self._reject_card_numbers(full_text)
 
         warnings: list[str] = []
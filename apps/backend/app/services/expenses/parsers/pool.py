@@ -0,0 +1,196 @@
+"""Long-lived process pool for PDF parsing with hard-kill timeouts.
+
+pdfplumber/pdfminer code is synchronous and cannot be interrupted from
+another thread, so a thread-based timeout only stops *waiting* for a stuck
+parse — the thread itself keeps burning CPU until the process exits.  Each
+:class:`ParsePool` worker is a separate process that is reused across PDFs;
+when a parse overruns its deadline the worker is killed and a fresh one is
+spawned on the next request, so a pathological PDF can never leak work.
+
+Workers use the ``spawn`` start method: the inbox runs inside APScheduler and
+the compute-job thread pool, and forking a multi-threaded process is unsafe.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+from collections.abc import Callable
+from typing import Any, Optional
+
+from .base import ParserError, ParserTimeout
+
+logger = logging.getLogger(__name__)
+
+_START_METHOD = "spawn"
+DEFAULT_PARSE_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def _worker_main(conn: Any) -> None:
+    """Worker loop: run ``(fn, args)`` tasks until told to stop."""
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return
+        if task is None:
+            return
+        fn, args = task
+        try:
+            reply = ("ok", fn(*args))
+        except Exception as exc:  # noqa: BLE001 - every failure is reported back to the caller
+            reply = ("err", _portable_exception(exc))
+        try:
+            conn.send(reply)
+        except Exception as exc:  # noqa: BLE001 - result could not be pickled
+            conn.send(("err", ParserError(f"Parse result could not be returned: {exc!s}")))
+
+
+def _portable_exception(exc: Exception) -> Exception:
+    """Return *exc* if it survives a pickle round-trip, else a ParserError."""
+    try:
+        pickle.loads(pickle.dumps(exc))
+    except Exception:  # noqa: BLE001
+        return ParserError(f"{type(exc).__name__}: {exc!s}")
+    return exc
+
+
+class _Worker:
+    """One worker process and the parent end of its pipe."""
+
+    def __init__(self, ctx: Any) -> None:
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), name="cc-parse-worker", daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class ParsePool:
+    """Bounded pool of reusable parse worker processes.
+
+    :meth:`run` blocks until a worker is free, so at most ``max_workers``
+    parses run at once.  The timeout covers the parse itself, not the wait
+    for a free worker.  Safe to call from any thread.
+    """
+
+    def __init__(self, max_workers: int = 1, start_method: str = _START_METHOD) -> None:
+        self.max_workers = max(1, max_workers)
+        self._ctx = multiprocessing.get_context(start_method)
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._idle: list[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self.killed_workers = 0
+
+    def run(self, fn: Callable[..., Any], *args: Any, timeout: float) -> Any:
+        """Run ``fn(*args)`` in a worker and return its result.
+
+        *fn* and *args* must be picklable (module-level functions).  Raises
+        :exc:`ParserTimeout` — after killing the worker — if no result arrives
+        within *timeout* seconds; exceptions raised by *fn* are re-raised here.
+        """
+        with self._slots:
+            worker = self._checkout()
+            try:
+                worker.conn.send((fn, args))
+                if not worker.conn.poll(timeout):
+                    self._kill(worker)
+                    raise ParserTimeout(f"PDF parsing exceeded {timeout:g}-second time limit")
+                status, payload = worker.conn.recv()
+            except (EOFError, OSError) as exc:
+                self._kill(worker)
+                raise ParserError("PDF parse worker exited unexpectedly") from exc
+            self._checkin(worker)
+
+        if status == "err":
+            raise payload
+        return payload
+
+    def shutdown(self) -> None:
+        """Stop idle workers; busy workers are stopped when they finish."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
+
+    # ------------------------------------------------------------------
+
+    def _checkout(self) -> _Worker:
+        with self._lock:
+            if self._closed:
+                raise ParserError("PDF parse pool has been shut down")
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.process.is_alive():
+                    return worker
+                worker.conn.close()
+        return _Worker(self._ctx)
+
+    def _checkin(self, worker: _Worker) -> None:
+        with self._lock:
+            if not self._closed:
+                self._idle.append(worker)
+                return
+        worker.stop()
+
+    def _kill(self, worker: _Worker) -> None:
+        worker.kill()
+        self.killed_workers += 1
+        logger.warning("PDF parse worker pid=%s killed; a fresh worker will be spawned", worker.process.pid)
+
+
+_pool: Optional[ParsePool] = None
+_pool_lock = threading.Lock()
+
+
+def _parse_workers() -> int:
+    """Return the process-wide pool size (``CREDIT_CARD_PARSE_WORKERS``)."""
+    raw_value = os.getenv("CREDIT_CARD_PARSE_WORKERS", str(DEFAULT_PARSE_WORKERS))
+    try:
+        value = int(raw_value)
+    except ValueError:
+        logger.warning("Invalid CREDIT_CARD_PARSE_WORKERS=%s; using default", raw_value)
+        return DEFAULT_PARSE_WORKERS
+    return max(1, value)
+
+
+def get_parse_pool() -> ParsePool:
+    """Return the process-wide parse pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParsePool(max_workers=_parse_workers())
+        return _pool
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the process-wide parse pool's workers (safe to call repeatedly)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+atexit.register(shutdown_parse_pool)
@@ -2,6 +2,7 @@ from uuid import UUID
 from typing import Optional
 from sqlmodel import Session, select
 
+from app.request_context import household_cache
 from app.schema.household_models import HouseholdMember
 
 
@@ -10,7 +11,17 @@ def get_user_household_id(db: Session, user_id: UUID) -> Optional[UUID]:
     
     Returns the household_id of the first active membership found.
     If the user is a member of multiple households, returns the first one.
+    Memberships are served from the in-process household cache when fresh.
     """
+    household_id = household_cache.get(user_id)
+    if household_id is None:
+        household_id = _query_household_id(db, user_id)
+        if household_id is not None:
+            household_cache.put(user_id, household_id)
+    return household_id
+
+
+def _query_household_id(db: Session, user_id: UUID) -> Optional[UUID]:
     statement = (
         select(HouseholdMember.household_id)
         .where(HouseholdMember.user_id == user_id)
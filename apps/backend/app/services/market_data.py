@@ -0,0 +1,371 @@
+"""
+Non-blocking market-data gateway for the analyze API.
+
+yfinance is a blocking HTTP client.  Calling it straight from ``async def``
+routes stalls the event loop for every other request while Yahoo answers, so
+routes go through :class:`MarketDataGateway` instead, which:
+
+- runs provider calls on a bounded thread pool;
+- coalesces concurrent identical requests (single-flight per section +
+  ticker + parameters), so ten tabs opening the same ticker cost one fetch;
+- rate-limits each provider with a token bucket and bounds how long a request
+  waits (``MarketDataTimeout``).
+
+Providers implement :class:`MarketDataProvider`; ``YFinanceProvider`` is the
+production one and ``FakeMarketDataProvider`` is a deterministic stand-in that
+records call counts and peak concurrency for tests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import logging
+import os
+import threading
+import time
+from typing import Any, Protocol, TypeVar
+
+import pandas as pd
+
+logger = logging.getLogger("trading_journal.market_data")
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_RATE_PER_SECOND = 5.0
+DEFAULT_BURST = 10
+DEFAULT_TIMEOUT_SECONDS = 20.0
+
+
+class MarketDataError(Exception):
+    """Base error raised by the market-data gateway."""
+
+
+class MarketDataTimeout(MarketDataError):
+    """The provider did not answer within the gateway timeout."""
+
+
+# ---------------------------------------------------------------------------
+# Providers
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class OptionChainData:
+    """Calls/puts frames for one expiry (mirrors yfinance's ``Options`` tuple)."""
+
+    calls: pd.DataFrame
+    puts: pd.DataFrame
+
+
+@dataclass
+class FinancialStatements:
+    """Annual statements as yfinance returns them (rows=items, cols=dates)."""
+
+    financials: pd.DataFrame | None = None
+    cashflow: pd.DataFrame | None = None
+    balance_sheet: pd.DataFrame | None = None
+
+
+class MarketDataProvider(Protocol):
+    """Blocking market-data source wrapped by the gateway."""
+
+    name: str
+
+    def info(self, ticker: str) -> dict:
+        """Quote/profile dictionary (yfinance ``Ticker.info``)."""
+
+    def history(self, ticker: str, period: str, interval: str) -> pd.DataFrame:
+        """OHLCV frame indexed by timestamp."""
+
+    def options(self, ticker: str) -> tuple[str, ...]:
+        """Available option expirations as ``YYYY-MM-DD`` strings."""
+
+    def option_chain(self, ticker: str, expiry: str) -> OptionChainData:
+        """Calls and puts for one expiration."""
+
+    def financial_statements(self, ticker: str) -> FinancialStatements:
+        """Income statement, cash flow and balance sheet."""
+
+
+class YFinanceProvider:
+    """Production provider backed by ``yfinance.Ticker``."""
+
+    name = "yfinance"
+
+    def info(self, ticker: str) -> dict:
+        import yfinance as yf
+
+        return yf.Ticker(ticker).info or {}
+
+    def history(self, ticker: str, period: str, interval: str) -> pd.DataFrame:
+        import yfinance as yf
+
+        return yf.Ticker(ticker).history(period=period, interval=interval)
+
+    def options(self, ticker: str) -> tuple[str, ...]:
+        import yfinance as yf
+
+        return tuple(yf.Ticker(ticker).options or ())
+
+    def option_chain(self, ticker: str, expiry: str) -> OptionChainData:
+        import yfinance as yf
+
+        chain = yf.Ticker(ticker).option_chain(expiry)
+        return OptionChainData(calls=chain.calls, puts=chain.puts)
+
+    def financial_statements(self, ticker: str) -> FinancialStatements:
+        import yfinance as yf
+
+        t = yf.Ticker(ticker)
+        return FinancialStatements(financials=t.financials, cashflow=t.cashflow, balance_sheet=t.balance_sheet)
+
+
+@dataclass
+class FakeMarketDataProvider:
+    """Deterministic in-memory provider that records load for tests.
+
+    Every call sleeps ``latency`` seconds (in the gateway's worker thread) and
+    updates ``calls`` and ``max_concurrency`` so tests can assert coalescing,
+    pool bounds and that the event loop stayed free.
+    """
+
+    latency: float = 0.0
+    price: float = 100.0
+    name: str = "fake"
+    calls: dict[str, int] = field(default_factory=dict)
+    in_flight: int = 0
+    max_concurrency: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def _enter(self, method: str) -> None:
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            self.in_flight += 1
+            self.max_concurrency = max(self.max_concurrency, self.in_flight)
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.in_flight -= 1
+
+    def info(self, ticker: str) -> dict:
+        self._enter("info")
+        return {
+            "symbol": ticker,
+            "longName": f"{ticker} Corp",
+            "sector": "Technology",
+            "currency": "USD",
+            "currentPrice": self.price,
+            "regularMarketPrice": self.price,
+            "marketCap": 1_000_000_000.0,
+            "forwardEps": 5.0,
+            "trailingEps": 4.5,
+            "forwardPE": self.price / 5.0,
+            "beta": 1.1,
+            "fiftyTwoWeekHigh": self.price * 1.2,
+            "fiftyTwoWeekLow": self.price * 0.8,
+        }
+
+    def history(self, ticker: str, period: str, interval: str) -> pd.DataFrame:
+        self._enter("history")
+        index = pd.bdate_range(end="2024-06-28", periods=130)
+        closes = [self.price + (i % 10) - 5 for i in range(len(index))]
+        return pd.DataFrame(
+            {"Open": closes, "High": closes, "Low": closes, "Close": closes, "Volume": [1_000] * len(index)},
+            index=index,
+        )
+
+    def options(self, ticker: str) -> tuple[str, ...]:
+        self._enter("options")
+        return ("2024-07-19", "2024-08-16")
+
+    def option_chain(self, ticker: str, expiry: str) -> OptionChainData:
+        self._enter("option_chain")
+        strikes = [self.price * m for m in (0.9, 1.0, 1.1)]
+        frame = pd.DataFrame(
+            {
+                "strike": strikes,
+                "bid": [1.0, 2.0, 3.0],
+                "ask": [1.1, 2.1, 3.1],
+                "impliedVolatility": [0.3, 0.25, 0.28],
+                "volume": [10, 20, 30],
+                "openInterest": [100, 200, 300],
+            }
+        )
+        return OptionChainData(calls=frame, puts=frame.copy())
+
+    def financial_statements(self, ticker: str) -> FinancialStatements:
+        self._enter("financial_statements")
+        return FinancialStatements()
+
+
+# ---------------------------------------------------------------------------
+# Gateway
+# ---------------------------------------------------------------------------
+
+
+class _TokenBucket:
+    """Thread-safe token bucket; ``acquire`` blocks the calling worker thread."""
+
+    def __init__(self, rate_per_second: float, burst: int) -> None:
+        self.rate = rate_per_second
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available; return seconds waited."""
+
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class _RateLimitedProvider:
+    """Proxy that takes a token from the bucket before every provider call."""
+
+    def __init__(self, provider: MarketDataProvider, bucket: _TokenBucket) -> None:
+        self._provider = provider
+        self._bucket = bucket
+        self.name = provider.name
+
+    def __getattr__(self, attr: str) -> Any:
+        method = getattr(self._provider, attr)
+        if not callable(method):
+            return method
+
+        def limited(*args: Any, **kwargs: Any) -> Any:
+            self._bucket.acquire()
+            return method(*args, **kwargs)
+
+        return limited
+
+
+def _env_float(name: str, default: float) -> float:
+    raw_value = os.getenv(name)
+    if raw_value is None:
+        return default
+    try:
+        return float(raw_value)
+    except ValueError:
+        logger.warning("Invalid %s=%s; using default", name, raw_value)
+        return default
+
+
+class MarketDataGateway:
+    """Bounded, coalescing, rate-limited front door to a market-data provider."""
+
+    def __init__(
+        self,
+        provider: MarketDataProvider,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_per_second: float = DEFAULT_RATE_PER_SECOND,
+        burst: int = DEFAULT_BURST,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    ) -> None:
+        self.provider = provider
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self._limited = _RateLimitedProvider(provider, _TokenBucket(rate_per_second, burst))
+        self._executor: ThreadPoolExecutor | None = None
+        self._inflight: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "coalesced": 0, "timeouts": 0, "errors": 0}
+
+    @classmethod
+    def from_env(cls, provider: MarketDataProvider) -> MarketDataGateway:
+        return cls(
+            provider,
+            max_workers=int(_env_float("MARKET_DATA_MAX_WORKERS", DEFAULT_MAX_WORKERS)),
+            rate_per_second=_env_float("MARKET_DATA_RATE_PER_SECOND", DEFAULT_RATE_PER_SECOND),
+            burst=int(_env_float("MARKET_DATA_BURST", DEFAULT_BURST)),
+            timeout=_env_float("MARKET_DATA_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS),
+        )
+
+    async def fetch(
+        self,
+        section: str,
+        ticker: str,
+        loader: Callable[..., T],
+        *params: Hashable,
+    ) -> T:
+        """Run ``loader(provider, ticker, *params)`` off the event loop.
+
+        Concurrent calls with the same ``(section, ticker, params)`` share one
+        execution.  Raises :class:`MarketDataTimeout` if the result is not
+        ready within ``timeout`` seconds; the shared call keeps running for
+        any other waiter.
+        """
+
+        key = (self.provider.name, section, ticker, *params)
+        future = self._submit(key, loader, ticker, params)
+        try:
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._stats["timeouts"] += 1
+            logger.warning("market_data.timeout provider=%s section=%s ticker=%s", key[0], section, ticker)
+            raise MarketDataTimeout(f"{self.provider.name} {section} for {ticker} timed out after {self.timeout}s")
+
+    async def info(self, ticker: str) -> dict:
+        """Shortcut for the shared ``info`` section."""
+
+        return await self.fetch("info", ticker, _load_info)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "in_flight": len(self._inflight),
+                "max_workers": self.max_workers,
+                "provider": self.provider.name,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, key: Hashable, loader: Callable[..., T], ticker: str, params: tuple) -> Future:
+        with self._lock:
+            existing = self._inflight.get(key)
+            if existing is not None:
+                self._stats["coalesced"] += 1
+                return existing
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="market-data")
+            self._stats["calls"] += 1
+            future = self._executor.submit(loader, self._limited, ticker, *params)
+            self._inflight[key] = future
+        future.add_done_callback(lambda done: self._finish(key, done))
+        return future
+
+    def _finish(self, key: Hashable, future: Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if not future.cancelled() and future.exception() is not None:
+                self._stats["errors"] += 1
+
+
+def _load_info(provider: MarketDataProvider, ticker: str) -> dict:
+    return provider.info(ticker)
+
+
+market_data_gateway = MarketDataGateway.from_env(YFinanceProvider())
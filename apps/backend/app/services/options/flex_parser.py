@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from datetime import date, datetime, timezone
 from decimal import Decimal, InvalidOperation
@@ -25,6 +25,8 @@ SECTION_ROW_NAMES = {
     "OpenDividendAccruals": "OpenDividendAccrual",
     "FinancialInstrumentInformation": "SecurityInfo",
 }
+# Sections whose rows the result builder holds until the end of each file.
+_HELD_SECTIONS = ("TradeConfirms", "Trades", "ChangeInDividendAccruals", "OpenDividendAccruals")
 MONEY_ZERO = Decimal("0")
 ASSIGNMENT_TRANSACTION_TYPES = {"assignment", "exercise"}
 # CashTransaction types that route to dividend_payments instead of options_cash_events.
@@ -340,93 +342,233 @@ class _AssignmentOptionLeg:
     opt_notes: str | None = None
 
 
-def parse_flex_files(paths: Iterable[Path], account_id: str | None = None) -> FlexParseResult:
-    """Parse Flex XML files into typed rows, optionally filtering to one account."""
-
-    trades: list[FlexTradeConfirm] = []
-    cash: list[FlexCashTransaction] = []
-    positions: list[FlexOpenPosition] = []
-    stock_positions: list[FlexStockPosition] = []
-    bond_positions: list[FlexBondPosition] = []
-    dividend_payments: list[FlexDividendPayment] = []
-    dividend_accruals: list[FlexDividendAccrual] = []
-    security_infos: list[FlexSecurityInfo] = []
-    eae_rows: list[FlexTradeConfirm] = []
-    account_info: list[FlexAccountInformation] = []
-    assignment_eae_attrs: list[dict[str, str]] = []
-    option_trade_attrs: list[dict[str, str]] = []
-    stock_trade_attrs: list[dict[str, str]] = []
-    counts: dict[str, int] = {
-        "assignment_synthetic_emitted": 0,
-        "assignment_synthetic_skipped_no_market": 0,
-        "assignment_synthetic_skipped_ambiguous": 0,
-    }
+FlexRow = tuple[str, dict[str, str]]
+STATEMENT_TAG = "FlexStatement"
+
+
+@dataclass(frozen=True, slots=True)
+class FlexReport:
+    """One Flex XML file read into section rows, partitioned by ``accountId``.
+
+    ``rows`` are kept in document order; :func:`build_flex_result` restores the
+    parser's canonical section ordering, so building a result from a report is
+    identical to parsing the file directly.  ``account_rows`` holds the same
+    row tuples split per account, letting multi-account statements be consumed
+    one account at a time without re-reading the XML.
+    """
+
+    path: Path
+    statement_dates: tuple[date | None, date | None]
+    rows: tuple[FlexRow, ...]
+    account_rows: dict[str, tuple[FlexRow, ...]]
+
+    def rows_for(self, account_id: str | None) -> tuple[FlexRow, ...]:
+        """Return every row, or only the rows whose ``accountId`` matches."""
+        if not account_id:
+            return self.rows
+        return self.account_rows.get(account_id, ())
+
+    @property
+    def account_ids(self) -> frozenset[str]:
+        return frozenset(self.account_rows)
+
+
+def read_flex_report(path: Path) -> FlexReport:
+    """Stream one Flex XML file into section rows partitioned by account."""
+
+    statement_dates: tuple[date | None, date | None] | None = None
+    rows: list[FlexRow] = []
+    by_account: dict[str, list[FlexRow]] = {}
+    for section_name, attrs in _stream_flex_rows(path):
+        if section_name == STATEMENT_TAG:
+            if statement_dates is None:
+                statement_dates = _statement_dates_from_attrs(attrs)
+            continue
+        entry = (section_name, attrs)
+        rows.append(entry)
+        row_account = attrs.get("accountId")
+        if row_account:
+            by_account.setdefault(row_account, []).append(entry)
+    return FlexReport(
+        path=path,
+        statement_dates=statement_dates or (None, None),
+        rows=tuple(rows),
+        account_rows={key: tuple(value) for key, value in by_account.items()},
+    )
+
+
+def parse_flex_files(
+    paths: Iterable[Path],
+    account_id: str | None = None,
+    *,
+    streaming: bool = True,
+) -> FlexParseResult:
+    """Parse Flex XML files into typed rows, optionally filtering to one account.
+
+    By default each file is read in a single ``iterparse`` pass and rows are
+    dispatched to section handlers as they close, so peak memory tracks the
+    typed output rather than the XML tree.  ``streaming=False`` keeps the
+    original whole-document ``ElementTree.parse`` reader for comparison.
+    """
+
+    read_rows = _stream_flex_rows if streaming else _tree_flex_rows
+    builder = _FlexResultBuilder()
     for path in paths:
-        root = _parse_xml_file(path)
-        statement_dates = _statement_dates(root)
-        for section_name, row in _iter_section_rows(root):
-            attrs = dict(row.attrib)
-            if account_id and attrs.get("accountId") != account_id:
+        builder.begin_file()
+        for section_name, attrs in read_rows(path):
+            if section_name != STATEMENT_TAG and account_id and attrs.get("accountId") != account_id:
                 continue
-            counts[section_name] = counts.get(section_name, 0) + 1
-            if section_name in {"TradeConfirms", "Trades"}:
+            builder.add(section_name, attrs)
+        builder.end_file()
+    return builder.result()
+
+
+def build_flex_result(reports: Iterable[FlexReport], account_id: str | None = None) -> FlexParseResult:
+    """Normalize already-read Flex reports into typed rows for one account (or all)."""
+
+    builder = _FlexResultBuilder()
+    for report in reports:
+        builder.begin_file(report.statement_dates)
+        for section_name, attrs in report.rows_for(account_id):
+            builder.add(section_name, attrs)
+        builder.end_file()
+    return builder.result()
+
+
+class _FlexResultBuilder:
+    """Accumulate typed Flex rows as section handlers receive them.
+
+    Rows arrive one file at a time in document order.  Sections that feed a
+    shared list (trades, dividend accruals) are held per file until
+    :meth:`end_file` so TradeConfirms precede Trades and
+    ChangeInDividendAccruals precede OpenDividendAccruals across every
+    statement in the file, which is the order the whole-document reader has
+    always produced.
+    """
+
+    def __init__(self) -> None:
+        self.trades: list[FlexTradeConfirm] = []
+        self.cash: list[FlexCashTransaction] = []
+        self.positions: list[FlexOpenPosition] = []
+        self.stock_positions: list[FlexStockPosition] = []
+        self.bond_positions: list[FlexBondPosition] = []
+        self.dividend_payments: list[FlexDividendPayment] = []
+        self.dividend_accruals: list[FlexDividendAccrual] = []
+        self.security_infos: list[FlexSecurityInfo] = []
+        self.eae_rows: list[FlexTradeConfirm] = []
+        self.account_info: list[FlexAccountInformation] = []
+        self.assignment_eae_attrs: list[dict[str, str]] = []
+        self.option_trade_attrs: list[dict[str, str]] = []
+        self.stock_trade_attrs: list[dict[str, str]] = []
+        self.counts: dict[str, int] = {
+            "assignment_synthetic_emitted": 0,
+            "assignment_synthetic_skipped_no_market": 0,
+            "assignment_synthetic_skipped_ambiguous": 0,
+        }
+        self._statement_dates: tuple[date | None, date | None] | None = None
+        self._pending_rows: dict[str, list[dict[str, str]]] = {}
+        self._handlers = {
+            "TradeConfirms": self._hold_row,
+            "Trades": self._hold_row,
+            "CashTransactions": self._on_cash_transaction,
+            "OpenPositions": self._on_open_position,
+            "OptionEAE": self._on_option_eae,
+            "AccountInformation": self._on_account_information,
+            "ChangeInDividendAccruals": self._hold_row,
+            "OpenDividendAccruals": self._hold_row,
+            "FinancialInstrumentInformation": self._on_security_info,
+        }
+
+    @property
+    def _fallback_date(self) -> date | None:
+        return self._statement_dates[1] if self._statement_dates else None
+
+    def begin_file(self, statement_dates: tuple[date | None, date | None] | None = None) -> None:
+        self._statement_dates = statement_dates
+        self._pending_rows = {section_name: [] for section_name in _HELD_SECTIONS}
+
+    def add(self, section_name: str, attrs: dict[str, str]) -> None:
+        if section_name == STATEMENT_TAG:
+            # Statement dates come from the first FlexStatement in the file.
+            if self._statement_dates is None:
+                self._statement_dates = _statement_dates_from_attrs(attrs)
+            return
+        self.counts[section_name] = self.counts.get(section_name, 0) + 1
+        self._handlers[section_name](section_name, attrs)
+
+    def end_file(self) -> None:
+        for section_name in ("TradeConfirms", "Trades"):
+            for attrs in self._pending_rows[section_name]:
                 if _is_option_contract_row(attrs):
-                    option_trade_attrs.append(attrs)
-                    trades.append(parse_trade_confirm(attrs, statement_dates[1]))
+                    self.option_trade_attrs.append(attrs)
+                    self.trades.append(parse_trade_confirm(attrs, self._fallback_date))
                 elif attrs.get("assetCategory") == "STK":
-                    stock_trade_attrs.append(attrs)
-            elif section_name == "CashTransactions":
-                ibkr_type = _optional_text(attrs.get("type")) or ""
-                if ibkr_type in DIVIDEND_CASH_TYPES:
-                    dp = parse_dividend_payment(attrs)
-                    if dp is not None:
-                        dividend_payments.append(dp)
-                else:
-                    cash.append(parse_cash_transaction(attrs))
-            elif section_name == "OpenPositions":
-                if _is_option_contract_row(attrs):
-                    positions.append(parse_open_position(attrs, statement_dates[1]))
-                elif attrs.get("assetCategory") == "STK" and attrs.get("putCall", "") == "":
-                    stk = parse_stock_open_position(attrs, statement_dates[1])
-                    if stk is not None:
-                        stock_positions.append(stk)
-                elif attrs.get("assetCategory") in ("BOND", "BILL"):
-                    bond = parse_bond_open_position(attrs, statement_dates[1])
-                    if bond is not None:
-                        bond_positions.append(bond)
-            elif section_name == "OptionEAE":
-                if _is_assignment_lifecycle_row(attrs):
-                    assignment_eae_attrs.append(attrs)
-                if _is_option_contract_row(attrs):
-                    eae_rows.append(parse_option_eae(attrs, statement_dates[1]))
-            elif section_name == "AccountInformation":
-                account_info.append(parse_account_information(attrs))
-            elif section_name == "ChangeInDividendAccruals":
-                accrual = parse_dividend_accrual(attrs, source_section="change")
+                    self.stock_trade_attrs.append(attrs)
+        for section_name, source_section in (("ChangeInDividendAccruals", "change"), ("OpenDividendAccruals", "open")):
+            for attrs in self._pending_rows[section_name]:
+                accrual = parse_dividend_accrual(attrs, source_section=source_section)
                 if accrual is not None:
-                    dividend_accruals.append(accrual)
-            elif section_name == "OpenDividendAccruals":
-                accrual = parse_dividend_accrual(attrs, source_section="open")
-                if accrual is not None:
-                    dividend_accruals.append(accrual)
-            elif section_name == "FinancialInstrumentInformation":
-                sec = parse_security_info(attrs)
-                if sec is not None:
-                    security_infos.append(sec)
-    cash.extend(_assignment_synthetic_cash_events(assignment_eae_attrs, option_trade_attrs, stock_trade_attrs, counts))
-    return FlexParseResult(
-        trades=trades,
-        cash_transactions=cash,
-        open_positions=positions,
-        stock_positions=stock_positions,
-        bond_positions=bond_positions,
-        dividend_payments=dividend_payments,
-        dividend_accruals=dividend_accruals,
-        security_infos=security_infos,
-        option_eae=eae_rows,
-        account_information=account_info,
-        section_counts=counts,
-    )
+                    self.dividend_accruals.append(accrual)
+        self._pending_rows = {}
+
+    def result(self) -> FlexParseResult:
+        cash = [
+            *self.cash,
+            *_assignment_synthetic_cash_events(
+                self.assignment_eae_attrs, self.option_trade_attrs, self.stock_trade_attrs, self.counts
+            ),
+        ]
+        return FlexParseResult(
+            trades=self.trades,
+            cash_transactions=cash,
+            open_positions=self.positions,
+            stock_positions=self.stock_positions,
+            bond_positions=self.bond_positions,
+            dividend_payments=self.dividend_payments,
+            dividend_accruals=self.dividend_accruals,
+            security_infos=self.security_infos,
+            option_eae=self.eae_rows,
+            account_information=self.account_info,
+            section_counts=self.counts,
+        )
+
+    def _hold_row(self, section_name: str, attrs: dict[str, str]) -> None:
+        self._pending_rows[section_name].append(attrs)
+
+    def _on_cash_transaction(self, _section_name: str, attrs: dict[str, str]) -> None:
+        ibkr_type = _optional_text(attrs.get("type")) or ""
+        if ibkr_type in DIVIDEND_CASH_TYPES:
+            dp = parse_dividend_payment(attrs)
+            if dp is not None:
+                self.dividend_payments.append(dp)
+        else:
+            self.cash.append(parse_cash_transaction(attrs))
+
+    def _on_open_position(self, _section_name: str, attrs: dict[str, str]) -> None:
+        if _is_option_contract_row(attrs):
+            self.positions.append(parse_open_position(attrs, self._fallback_date))
+        elif attrs.get("assetCategory") == "STK" and attrs.get("putCall", "") == "":
+            stk = parse_stock_open_position(attrs, self._fallback_date)
+            if stk is not None:
+                self.stock_positions.append(stk)
+        elif attrs.get("assetCategory") in ("BOND", "BILL"):
+            bond = parse_bond_open_position(attrs, self._fallback_date)
+            if bond is not None:
+                self.bond_positions.append(bond)
+
+    def _on_option_eae(self, _section_name: str, attrs: dict[str, str]) -> None:
+        if _is_assignment_lifecycle_row(attrs):
+            self.assignment_eae_attrs.append(attrs)
+        if _is_option_contract_row(attrs):
+            self.eae_rows.append(parse_option_eae(attrs, self._fallback_date))
+
+    def _on_account_information(self, _section_name: str, attrs: dict[str, str]) -> None:
+        self.account_info.append(parse_account_information(attrs))
+
+    def _on_security_info(self, _section_name: str, attrs: dict[str, str]) -> None:
+        sec = parse_security_info(attrs)
+        if sec is not None:
+            self.security_infos.append(sec)
 
 
 def parse_trade_confirm(attrs: dict[str, str], fallback_date: date | None = None) -> FlexTradeConfirm:
@@ -1131,6 +1273,48 @@ def _parse_xml_file(path: Path) -> Element:
         raise FlexParserError(f"Could not parse Flex XML {path}: {exc}") from exc
 
 
+def _stream_flex_rows(path: Path) -> Iterator[FlexRow]:
+    """Yield ``(section, attrs)`` rows in document order in a single ``iterparse`` pass.
+
+    Each ``FlexStatement`` is yielded as ``(STATEMENT_TAG, attrs)`` when it
+    opens, ahead of the rows it contains.  Row attribute dicts are handed over
+    without copying, and every element is detached from its parent once
+    closed, so the live tree never grows beyond the current element path.
+    """
+
+    stack: list[Element] = []
+    try:
+        for event, elem in ElementTree.iterparse(path, events=("start", "end")):
+            if event == "start":
+                if elem.tag == STATEMENT_TAG and stack:
+                    yield STATEMENT_TAG, dict(elem.attrib)
+                stack.append(elem)
+                continue
+            stack.pop()
+            if not stack:
+                continue
+            parent = stack[-1]
+            if SECTION_ROW_NAMES.get(parent.tag) == elem.tag:
+                attrs = elem.attrib
+                elem.attrib = {}
+                yield parent.tag, attrs
+            elem.clear()
+            parent.remove(elem)
+    except (OSError, ParseError) as exc:
+        raise FlexParserError(f"Could not parse Flex XML {path}: {exc}") from exc
+
+
+def _tree_flex_rows(path: Path) -> Iterator[FlexRow]:
+    """Whole-document equivalent of :func:`_stream_flex_rows` (one tree walk per section)."""
+
+    root = _parse_xml_file(path)
+    statement = root.find(f".//{STATEMENT_TAG}")
+    if statement is not None:
+        yield STATEMENT_TAG, dict(statement.attrib)
+    for section_name, row in _iter_section_rows(root):
+        yield section_name, dict(row.attrib)
+
+
 def _iter_section_rows(root: Element) -> Iterable[tuple[str, Element]]:
     for section_name, row_name in SECTION_ROW_NAMES.items():
         for section in root.iter(section_name):
@@ -1139,11 +1323,8 @@ def _iter_section_rows(root: Element) -> Iterable[tuple[str, Element]]:
                     yield section_name, row
 
 
-def _statement_dates(root: Element) -> tuple[date | None, date | None]:
-    statement = root.find(".//FlexStatement")
-    if statement is None:
-        return None, None
-    return _parse_date_value(statement.attrib.get("fromDate")), _parse_date_value(statement.attrib.get("toDate"))
+def _statement_dates_from_attrs(attrs: dict[str, str]) -> tuple[date | None, date | None]:
+    return _parse_date_value(attrs.get("fromDate")), _parse_date_value(attrs.get("toDate"))
 
 
 def _is_option_contract_row(attrs: dict[str, str]) -> bool:
@@ -0,0 +1,111 @@
+"""Parse-once cache for Flex XML reports shared across accounts and callers.
+
+Household Flex statements carry every account in one file, and the sync loop
+used to re-parse each file once per configured account.  This module reads a
+file once into a :class:`~app.services.options.flex_parser.FlexReport`
+(section rows partitioned by ``accountId``) and hands the same report to every
+account, to ``flex_refresh`` polls and to the backfill scripts.
+
+Entries are keyed by resolved path + ``st_mtime_ns`` + sha256 of the bytes, so
+a file rewritten in place (same name, new content) is always re-parsed.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+import hashlib
+import logging
+from pathlib import Path
+import threading
+
+from app.services.options.flex_parser import FlexParseResult, FlexReport, build_flex_result, read_flex_report
+
+logger = logging.getLogger(__name__)
+
+# Multi-year household statements hold ~100k rows each; a handful of them is
+# plenty for one sync run while keeping a long-lived worker's footprint bounded.
+DEFAULT_MAX_REPORTS = 8
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+@dataclass(frozen=True, slots=True)
+class FlexFileKey:
+    """Identity of one Flex XML file's contents on disk."""
+
+    path: str
+    mtime_ns: int
+    sha256: str
+
+
+def flex_file_key(path: Path) -> FlexFileKey:
+    """Return the cache key for ``path`` (resolved path, mtime and content hash)."""
+
+    resolved = path.resolve()
+    digest = hashlib.sha256()
+    with resolved.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return FlexFileKey(path=str(resolved), mtime_ns=resolved.stat().st_mtime_ns, sha256=digest.hexdigest())
+
+
+class FlexReportCache:
+    """Bounded LRU of parsed Flex reports keyed by :class:`FlexFileKey`."""
+
+    def __init__(self, max_reports: int = DEFAULT_MAX_REPORTS) -> None:
+        self.max_reports = max_reports
+        self._reports: OrderedDict[FlexFileKey, FlexReport] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def report(self, path: Path) -> FlexReport:
+        """Return the parsed report for ``path``, parsing only on a cache miss."""
+
+        key = flex_file_key(path)
+        with self._lock:
+            cached = self._reports.get(key)
+            if cached is not None:
+                self._reports.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        # Parse outside the lock: a slow multi-MB file must not block readers
+        # of unrelated reports.  A concurrent miss on the same key just parses
+        # twice and the second insert wins.
+        report = read_flex_report(path)
+        with self._lock:
+            self._reports[key] = report
+            self._reports.move_to_end(key)
+            while len(self._reports) > self.max_reports:
+                evicted, _ = self._reports.popitem(last=False)
+                logger.debug("Evicted Flex report %s from parse cache", evicted.path)
+        return report
+
+    def reports(self, paths: Iterable[Path]) -> list[FlexReport]:
+        return [self.report(path) for path in paths]
+
+    def parse(self, paths: Iterable[Path], account_id: str | None = None) -> FlexParseResult:
+        """Cached equivalent of :func:`~app.services.options.flex_parser.parse_flex_files`."""
+
+        return build_flex_result(self.reports(paths), account_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reports.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._reports), "maxsize": self.max_reports}
+
+
+flex_report_cache = FlexReportCache()
+
+
+def parse_flex_files(paths: Iterable[Path], account_id: str | None = None) -> FlexParseResult:
+    """Drop-in for ``flex_parser.parse_flex_files`` backed by the process-wide cache."""
+
+    return flex_report_cache.parse(paths, account_id)
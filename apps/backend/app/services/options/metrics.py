@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
 from collections.abc import Iterable
 from datetime import date, datetime, time, timedelta, timezone
@@ -83,8 +84,19 @@ def compute_monthly_metrics(
     rolls: Iterable[OptionMetricRoll] | None = None,
     capital_history: Iterable[OptionCapitalHistory] | None = None,
     margin_snapshots: Iterable[OptionMarginSnapshot] | None = None,
+    *,
+    from_month: date | None = None,
+    opening_cash_flow: Decimal = ZERO,
+    opening_realized_pnl: Decimal = ZERO,
 ) -> list[MonthlyMetric]:
-    """Aggregate trades, rolls, capital risk, and margin snapshots by month."""
+    """Aggregate trades, rolls, capital risk, and margin snapshots by month.
+
+    ``from_month`` drops earlier months so a caller can recompute only a tail
+    of the history: cumulative totals then start from ``opening_cash_flow`` /
+    ``opening_realized_pnl`` (the prior month's stored cumulatives), while
+    capital history must still be complete because earlier entries carry
+    into later months.
+    """
 
     buckets: dict[date, dict[str, Decimal | int]] = defaultdict(
         lambda: {"cash": ZERO, "pnl": ZERO, "count": 0, "positive": 0, "negative": 0, "neutral": 0}
@@ -108,11 +120,14 @@ def compute_monthly_metrics(
     margin_rows = sorted(margin_snapshots or [], key=lambda row: row.captured_at)
     for month in _months_from_capital_and_margin(capital_rows, margin_rows):
         buckets.setdefault(month, {"cash": ZERO, "pnl": ZERO, "count": 0, "positive": 0, "negative": 0, "neutral": 0})
+    months = sorted(month for month in buckets if from_month is None or month >= from_month)
+    avg_capital_by_month = monthly_avg_capital(capital_rows, months)
+    margin_by_month = _latest_margin_by_month(margin_rows)
 
     rows: list[MonthlyMetric] = []
-    cumulative_cash = ZERO
-    cumulative_pnl = ZERO
-    for month in sorted(buckets):
+    cumulative_cash = opening_cash_flow
+    cumulative_pnl = opening_realized_pnl
+    for month in months:
         cash = Decimal(buckets[month]["cash"])
         pnl = Decimal(buckets[month]["pnl"])
         positive = int(buckets[month]["positive"])
@@ -121,8 +136,8 @@ def compute_monthly_metrics(
         roll_count = positive + negative + neutral
         cumulative_cash += cash
         cumulative_pnl += pnl
-        avg_capital = compute_time_weighted_avg_capital(capital_rows, month, _month_end(month))
-        latest_margin = latest_margin_snapshot_for_month(margin_rows, month, _month_end(month))
+        avg_capital = avg_capital_by_month[month]
+        latest_margin = margin_by_month.get(month)
         margin_used = latest_margin.margin_used if latest_margin else None
         margin_available = latest_margin.margin_available if latest_margin else None
         rows.append(
@@ -153,6 +168,69 @@ def compute_monthly_metrics(
     return rows
 
 
+def monthly_avg_capital(
+    capital_history: Iterable[OptionCapitalHistory], months: Iterable[date]
+) -> dict[date, Decimal | None]:
+    """Return the time-weighted average capital at risk for each calendar month.
+
+    Equivalent to ``compute_time_weighted_avg_capital`` per month, but sweeps
+    each group's history once: a capital level spanning whole months is added
+    to a running sum through a difference array, and only the months where it
+    starts or is superseded are integrated piecewise.
+    """
+
+    ordered_months = sorted(set(months))
+    starts = [datetime.combine(month, time.min, tzinfo=timezone.utc) for month in ordered_months]
+    ends = [
+        datetime.combine(_month_end(month) + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        for month in ordered_months
+    ]
+    partial = [ZERO] * len(ordered_months)
+    running_delta = [ZERO] * (len(ordered_months) + 1)
+    by_group: dict[str, list[OptionCapitalHistory]] = defaultdict(list)
+    for row in capital_history:
+        if row.capital_at_risk is None:
+            continue
+        by_group[row.group_id].append(row)
+
+    for entries in by_group.values():
+        ordered = sorted(entries, key=lambda row: row.effective_at)
+        for index, entry in enumerate(ordered):
+            capital = entry.capital_at_risk or ZERO
+            active_from = _aware(entry.effective_at)
+            active_until = _aware(ordered[index + 1].effective_at) if index + 1 < len(ordered) else None
+            if active_until is not None and active_until <= active_from:
+                continue
+            first = bisect_right(ends, active_from)
+            last = bisect_left(starts, active_until) if active_until is not None else len(ordered_months)
+            if first >= last:
+                continue
+            whole_from, whole_until = first, last
+            for edge in {first, last - 1}:
+                period_start = max(active_from, starts[edge])
+                period_end = min(active_until, ends[edge]) if active_until is not None else ends[edge]
+                if period_start == starts[edge] and period_end == ends[edge]:
+                    continue
+                active_days = Decimal(str((period_end - period_start).total_seconds())) / Decimal(86400)
+                partial[edge] += capital * active_days
+                if edge == first:
+                    whole_from = first + 1
+                if edge == last - 1:
+                    whole_until = last - 1
+            if whole_from < whole_until:
+                running_delta[whole_from] += capital
+                running_delta[whole_until] -= capital
+
+    averages: dict[date, Decimal | None] = {}
+    running = ZERO
+    for index, month in enumerate(ordered_months):
+        running += running_delta[index]
+        days_in_month = Decimal((ends[index] - starts[index]).days)
+        total = partial[index] + running * days_in_month
+        averages[month] = None if total == ZERO else (total / days_in_month).quantize(Decimal("0.000001"))
+    return averages
+
+
 def compute_time_weighted_avg_capital(
     capital_history: Iterable[OptionCapitalHistory], month_start: date, month_end: date
 ) -> Decimal | None:
@@ -215,6 +293,18 @@ def latest_margin_snapshot_for_month(
     )
 
 
+def _latest_margin_by_month(snapshots: list[OptionMarginSnapshot]) -> dict[date, OptionMarginSnapshot]:
+    """Map each month to its newest snapshot; *snapshots* must be sorted by ``captured_at``."""
+
+    latest: dict[date, OptionMarginSnapshot] = {}
+    for row in snapshots:
+        month = date(row.captured_at.year, row.captured_at.month, 1)
+        current = latest.get(month)
+        if current is None or row.captured_at > current.captured_at:
+            latest[month] = row
+    return latest
+
+
 def _months_from_capital_and_margin(
     capital_history: list[OptionCapitalHistory], margin_rows: list[OptionMarginSnapshot]
 ) -> set[date]:
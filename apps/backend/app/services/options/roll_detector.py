@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal
+from heapq import heapify, heappop, heappush, merge
 from typing import Literal
 
 RollClassification = Literal["positive", "negative", "neutral"]
@@ -37,31 +39,109 @@ RollDetection = tuple[str, str, Decimal, RollClassification]
 
 
 def detect_rolls(trades: list[RollCandidateTrade]) -> list[RollDetection]:
-    """Detect same-trading-day rolls as closed/opened/P&L/classification tuples."""
-
-    if not trades:
-        return []
-
-    closes = [trade for trade in trades if _is_close_trade(trade)]
-    opens = [trade for trade in trades if _is_open_trade(trade)]
-    scored: list[tuple[Decimal, str, str, RollCandidateTrade, RollCandidateTrade]] = []
-    for closed in closes:
-        for opened in opens:
-            if not _is_candidate_pair(closed, opened):
-                continue
-            score = abs(closed.strike - opened.strike) + Decimal(abs((opened.expiry - closed.expiry).days))
-            scored.append((score, closed.trade_id, opened.trade_id, closed, opened))
-
-    linked_closes: set[str] = set()
-    linked_opens: set[str] = set()
-    matches: list[RollDetection] = []
-    for _, _, _, closed, opened in sorted(scored, key=lambda item: (item[0], item[1], item[2])):
-        if closed.trade_id in linked_closes or opened.trade_id in linked_opens:
+    """Detect same-trading-day rolls as closed/opened/P&L/classification tuples.
+
+    Each close is paired with at most one open (and vice versa), best score
+    first: strike distance plus expiry distance in days, ties broken by
+    closed then opened trade id.  Trades are bucketed by (account, trade
+    date, underlying, currency, right) — pairs never cross buckets — and
+    opens are kept strike-sorted per side, so a close's candidates are found
+    by bisection instead of a scan of every open.  Trade ids are assumed
+    unique.
+    """
+
+    buckets: dict[_BucketKey, _RollBucket] = {}
+    for trade in trades:
+        is_close, is_open = _is_close_trade(trade), _is_open_trade(trade)
+        if not (is_close or is_open):
             continue
-        linked_closes.add(closed.trade_id)
-        linked_opens.add(opened.trade_id)
-        matches.append((closed.trade_id, opened.trade_id, closed.realized_pnl, classify_roll(closed.realized_pnl)))
-    return matches
+        key = (trade.account_id, trade.trade_date, trade.underlying_symbol, trade.currency, trade.right)
+        bucket = buckets.setdefault(key, _RollBucket())
+        if is_close:
+            bucket.closes.append(trade)
+        if is_open:
+            bucket.add_open(trade)
+    return [detection for _, detection in merge(*(bucket.match() for bucket in buckets.values()))]
+
+
+_BucketKey = tuple[str, date, str, str, str]
+_PairKey = tuple[Decimal, str, str]
+
+
+@dataclass(slots=True)
+class _RollBucket:
+    """Closes and opens that can pair with each other: one account, day, underlying, currency and right."""
+
+    closes: list[RollCandidateTrade] = field(default_factory=list)
+    # side -> opens sorted by (strike, trade_id), with the strikes alongside for bisection
+    opens: dict[str, list[RollCandidateTrade]] = field(default_factory=dict)
+    open_strikes: dict[str, list[Decimal]] = field(default_factory=dict)
+
+    def add_open(self, trade: RollCandidateTrade) -> None:
+        opens = self.opens.setdefault(trade.side, [])
+        strikes = self.open_strikes.setdefault(trade.side, [])
+        index = bisect_right(opens, (trade.strike, trade.trade_id), key=lambda o: (o.strike, o.trade_id))
+        opens.insert(index, trade)
+        strikes.insert(index, trade.strike)
+
+    def best_open(self, closed: RollCandidateTrade, linked: set[str]) -> tuple[_PairKey, RollCandidateTrade] | None:
+        """Lowest-key unlinked open that pairs with *closed*.
+
+        Score is at least the strike distance, so each side-sorted list is
+        scanned outward from the close's strike and a direction stops once
+        the strike distance alone exceeds the best score found.
+        """
+
+        best: tuple[_PairKey, RollCandidateTrade] | None = None
+        for side, opens in self.opens.items():
+            if side == closed.side:
+                continue
+            strikes = self.open_strikes[side]
+            start = bisect_left(strikes, closed.strike)
+            for indexes in (range(start - 1, -1, -1), range(start, len(opens))):
+                for index in indexes:
+                    opened = opens[index]
+                    distance = abs(closed.strike - opened.strike)
+                    if best is not None and distance > best[0][0]:
+                        break
+                    if opened.trade_id in linked or not _is_candidate_pair(closed, opened):
+                        continue
+                    key = (_roll_score(closed, opened), closed.trade_id, opened.trade_id)
+                    if best is None or key < best[0]:
+                        best = (key, opened)
+        return best
+
+    def match(self) -> list[tuple[_PairKey, RollDetection]]:
+        """Greedy best-score-first matching, identical to sorting every candidate pair.
+
+        A heap holds each close's best unlinked open; when a popped entry's
+        open has been taken meanwhile, the close's next best is pushed.
+        """
+
+        heap: list[tuple[_PairKey, int, RollCandidateTrade, RollCandidateTrade]] = []
+        linked_opens: set[str] = set()
+        for position, closed in enumerate(self.closes):
+            best = self.best_open(closed, linked_opens)
+            if best is not None:
+                heap.append((best[0], position, closed, best[1]))
+        heapify(heap)
+
+        linked_closes: set[str] = set()
+        matches: list[tuple[_PairKey, RollDetection]] = []
+        while heap:
+            key, position, closed, opened = heappop(heap)
+            if closed.trade_id in linked_closes:
+                continue
+            if opened.trade_id in linked_opens:
+                best = self.best_open(closed, linked_opens)
+                if best is not None:
+                    heappush(heap, (best[0], position, closed, best[1]))
+                continue
+            linked_closes.add(closed.trade_id)
+            linked_opens.add(opened.trade_id)
+            detection = (closed.trade_id, opened.trade_id, closed.realized_pnl, classify_roll(closed.realized_pnl))
+            matches.append((key, detection))
+        return matches
 
 
 def classify_roll(realized_pnl_at_close: Decimal) -> RollClassification:
@@ -74,6 +154,10 @@ def classify_roll(realized_pnl_at_close: Decimal) -> RollClassification:
     return "negative"
 
 
+def _roll_score(closed: RollCandidateTrade, opened: RollCandidateTrade) -> Decimal:
+    return abs(closed.strike - opened.strike) + Decimal(abs((opened.expiry - closed.expiry).days))
+
+
 def _is_candidate_pair(closed: RollCandidateTrade, opened: RollCandidateTrade) -> bool:
     return (
         closed.account_id == opened.account_id
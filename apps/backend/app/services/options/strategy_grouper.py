@@ -14,6 +14,7 @@ from app.services.options.roll_detector import HEURISTIC_VERSION, RollCandidateT
 StrategyKind = Literal["csp", "vertical_spread", "roll_chain", "ungrouped"]
 StrategyStatus = Literal["open", "closed", "expired", "assigned", "mixed"]
 RiskCalculationMethod = Literal["csp_net_premium", "vertical_spread_max_loss", "roll_chain_latest_leg", "ungrouped"]
+ContractKey = tuple[str, str, str, date, Decimal]
 GROUP_NAMESPACE = UUID("f6288d91-31d7-4eaf-94f5-090bda327f8e")
 ZERO = Decimal("0")
 DEFAULT_MULTIPLIER = Decimal("100")
@@ -116,15 +117,20 @@ def group_option_strategies(trades: list[StrategyTrade]) -> StrategyGroupingResu
         )
         assigned_open_ids.add(trade.trade_id)
 
-    _attach_matching_closes(builders, ordered)
+    closes_by_contract = _closes_by_contract(ordered)
+    _attach_matching_closes(builders, closes_by_contract, by_id)
+    owners = _first_builder_by_trade(builders)
     roll_events: list[StrategyRollEvent] = []
     for closed_trade_id, opened_trade_id, realized_pnl_at_close, classification in rolls:
-        builder = _find_builder_containing(builders, closed_trade_id)
-        if builder is None:
+        position = owners.get(closed_trade_id)
+        if position is None:
             continue
+        builder = builders[position]
         builder.kind = "roll_chain"
         builder.roll_open_ids.append(opened_trade_id)
         builder.trade_ids.add(opened_trade_id)
+        if owners.get(opened_trade_id, position) >= position:
+            owners[opened_trade_id] = position
         opened = by_id[opened_trade_id]
         closed = by_id[closed_trade_id]
         roll_events.append(
@@ -141,7 +147,7 @@ def group_option_strategies(trades: list[StrategyTrade]) -> StrategyGroupingResu
                 new_strike=opened.strike,
             )
         )
-    _attach_matching_closes(builders, ordered)
+    _attach_matching_closes(builders, closes_by_contract, by_id)
 
     assigned = {trade_id for builder in builders for trade_id in builder.trade_ids}
     for trade in ordered:
@@ -243,25 +249,42 @@ def _vertical_open_pairs(trades: list[StrategyTrade]) -> list[tuple[StrategyTrad
     return pairs
 
 
-def _attach_matching_closes(builders: list[_GroupBuilder], trades: list[StrategyTrade]) -> None:
-    by_id = {trade.trade_id: trade for trade in trades}
-    changed = True
-    while changed:
-        changed = False
-        for builder in builders:
-            contracts = {_contract_key(by_id[trade_id]) for trade_id in builder.trade_ids if _is_open(by_id[trade_id])}
-            for trade in trades:
-                if trade.trade_id in builder.trade_ids or not _is_close(trade):
-                    continue
-                if _contract_key(trade) in contracts:
-                    builder.trade_ids.add(trade.trade_id)
-                    changed = True
+def _closes_by_contract(trades: list[StrategyTrade]) -> dict[ContractKey, list[str]]:
+    closes: dict[ContractKey, list[str]] = defaultdict(list)
+    for trade in trades:
+        if _is_close(trade):
+            closes[_contract_key(trade)].append(trade.trade_id)
+    return closes
+
+
+def _attach_matching_closes(
+    builders: list[_GroupBuilder], closes_by_contract: dict[ContractKey, list[str]], by_id: dict[str, StrategyTrade]
+) -> None:
+    """Attach every close on a contract a builder holds an open leg in.
+
+    A close shares its contract key with the opens it matches, so attaching it
+    never adds a new contract and one pass per builder reaches the fixed point.
+    """
+
+    for builder in builders:
+        contracts = {_contract_key(by_id[trade_id]) for trade_id in builder.trade_ids if _is_open(by_id[trade_id])}
+        for contract in contracts:
+            builder.trade_ids.update(closes_by_contract.get(contract, ()))
+
+
+def _first_builder_by_trade(builders: list[_GroupBuilder]) -> dict[str, int]:
+    owners: dict[str, int] = {}
+    for position, builder in enumerate(builders):
+        for trade_id in builder.trade_ids:
+            owners.setdefault(trade_id, position)
+    return owners
 
 
 def _build_group(builder: _GroupBuilder, by_id: dict[str, StrategyTrade]) -> StrategyGroup:
     group_trades = [by_id[trade_id] for trade_id in sorted(builder.trade_ids)]
     times = [trade.trade_time or datetime.combine(trade.trade_date, datetime.min.time()) for trade in group_trades]
     close_times = [time for trade, time in zip(group_trades, times, strict=True) if _is_close(trade)]
+    closed_contracts = {_contract_key(trade) for trade in group_trades if _is_close(trade)}
     initial_trades = [by_id[trade_id] for trade_id in builder.anchor_ids]
     capital_at_risk, method = calculate_capital_at_risk(builder.base_kind, initial_trades)
     if builder.kind == "roll_chain" and method != "ungrouped":
@@ -272,11 +295,11 @@ def _build_group(builder: _GroupBuilder, by_id: dict[str, StrategyTrade]) -> Str
         account_id=group_trades[0].account_id,
         underlying_symbol=group_trades[0].underlying_symbol,
         kind=builder.kind,
-        status=_status(group_trades),
+        status=_status(group_trades, closed_contracts),
         trade_ids=tuple(sorted(builder.trade_ids)),
         opened_at=min(times),
         closed_at=max(close_times)
-        if close_times and all(_is_close(trade) or _has_close(trade, group_trades) for trade in group_trades)
+        if close_times and all(_is_close(trade) or _contract_key(trade) in closed_contracts for trade in group_trades)
         else None,
         net_cash_flow=sum((trade.net_cash_flow + trade.assignment_cash_flow for trade in group_trades), ZERO),
         realized_pnl=sum((trade.realized_pnl for trade in group_trades), ZERO),
@@ -297,29 +320,28 @@ def _build_capital_history(builder: _GroupBuilder, by_id: dict[str, StrategyTrad
         initial_method = "roll_chain_latest_leg"
     entries = [StrategyCapitalHistory(group_id, opened_at, initial_risk, initial_method)]
 
-    group_trades = [by_id[trade_id] for trade_id in builder.trade_ids]
+    timeline = _timeline([by_id[trade_id] for trade_id in builder.trade_ids])
     for opened_id in builder.roll_open_ids:
         opened = by_id[opened_id]
         effective_at = opened.trade_time or datetime.combine(opened.trade_date, datetime.min.time())
-        active = _active_open_trades(group_trades, effective_at)
+        active = _active_open_trades(timeline, effective_at)
         risk, method = calculate_capital_at_risk("roll_chain", active, roll_chain=True)
         entries.append(StrategyCapitalHistory(group_id, effective_at, risk, method))
     return entries
 
 
-def _active_open_trades(trades: list[StrategyTrade], as_of: datetime) -> list[StrategyTrade]:
-    active: dict[tuple[str, str, str, date, Decimal], StrategyTrade] = {}
-    for trade in sorted(
-        trades,
-        key=lambda item: (
-            item.trade_time or datetime.combine(item.trade_date, datetime.min.time()),
-            0 if _is_open(item) else 1,
-            item.trade_id,
-        ),
-    ):
-        trade_time = trade.trade_time or datetime.combine(trade.trade_date, datetime.min.time())
+def _timeline(trades: list[StrategyTrade]) -> list[tuple[datetime, StrategyTrade]]:
+    """Return *trades* with their effective time, opens before closes at the same instant."""
+
+    timed = [(trade.trade_time or datetime.combine(trade.trade_date, datetime.min.time()), trade) for trade in trades]
+    return sorted(timed, key=lambda item: (item[0], 0 if _is_open(item[1]) else 1, item[1].trade_id))
+
+
+def _active_open_trades(timeline: list[tuple[datetime, StrategyTrade]], as_of: datetime) -> list[StrategyTrade]:
+    active: dict[ContractKey, StrategyTrade] = {}
+    for trade_time, trade in timeline:
         if trade_time > as_of:
-            continue
+            break
         key = _contract_key(trade)
         if _is_open(trade):
             active[key] = trade
@@ -328,30 +350,22 @@ def _active_open_trades(trades: list[StrategyTrade], as_of: datetime) -> list[St
     return list(active.values())
 
 
-def _status(trades: list[StrategyTrade]) -> StrategyStatus:
+def _status(trades: list[StrategyTrade], closed_contracts: set[ContractKey]) -> StrategyStatus:
     if any(trade.event_type == "assign" for trade in trades):
         return "assigned"
     if any(trade.event_type == "expire" for trade in trades):
         return "expired"
     opens = [trade for trade in trades if _is_open(trade)]
-    if opens and all(_has_close(trade, trades) for trade in opens):
+    if opens and all(_contract_key(trade) in closed_contracts for trade in opens):
         return "closed"
     return "open"
 
 
-def _has_close(open_trade: StrategyTrade, trades: list[StrategyTrade]) -> bool:
-    return any(_is_close(trade) and _contract_key(trade) == _contract_key(open_trade) for trade in trades)
-
-
-def _find_builder_containing(builders: list[_GroupBuilder], trade_id: str) -> _GroupBuilder | None:
-    return next((builder for builder in builders if trade_id in builder.trade_ids), None)
-
-
 def _group_id(anchor_ids: tuple[str, ...]) -> str:
     return str(uuid5(GROUP_NAMESPACE, ":".join(sorted(anchor_ids))))
 
 
-def _contract_key(trade: StrategyTrade) -> tuple[str, str, str, date, Decimal]:
+def _contract_key(trade: StrategyTrade) -> ContractKey:
     return (trade.account_id, trade.underlying_symbol, trade.right, trade.expiry, trade.strike)
 
 
@@ -0,0 +1,554 @@
+"""Monte Carlo engine for plan projections.
+
+``PlanService.calculate_projection`` walks one deterministic path, re-resolving
+milestone conditions and copying every account each year.  This module runs
+the same yearly model over thousands of paths at once:
+
+1. ``compile_plan`` resolves accounts, real assets, milestones and plan items
+   once and turns them into per-year arrays (income, tax, expenses, purchases,
+   contributions, dividend schedules, pension triggers, RSU sale prices) plus a
+   ``TaxBracketTable`` for marginal tax;
+2. ``run_monte_carlo`` draws one market-return shock and one inflation shock
+   per path and year from a seeded ``numpy`` generator and steps every path
+   forward together — the only Python loops are over years and accounts.
+
+Returns are each account's growth rate plus a shared shock of
+``return_volatility``; inflation only moves expenses relative to the plan's own
+growth assumptions.  With both volatilities at zero every path reproduces the
+deterministic projection.  A path is *depleted* in the first year whose deficit
+cannot be covered by unallocated cash and account withdrawals.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Annotated, Any
+
+import numpy as np
+from pydantic import BaseModel, Field
+from sqlmodel import Session
+
+from app.services.plan_components import AccountManager, MilestoneManager, PlanInterfaces, RealAssetManager
+from app.services.tax_calculator import TaxBracketTable
+
+MAX_PATHS = 50_000
+# Milestone year used by MilestoneManager for references that are not resolved (yet).
+UNRESOLVED_YEAR = 9999
+# process_deficit caps RSU sales per year and assumes this effective rate for Broker/Taxable.
+RSU_YEARLY_LIMIT = 200_000.0
+TAXABLE_WITHDRAWAL_RATE = 0.125
+RSU_CAPITAL_GAINS_RATE = 0.25
+UNALLOCATED_CASH_GROWTH = 1.02
+
+FREQUENCY_MULTIPLIERS = {"Monthly": 12.0, "Weekly": 52.0, "Bi-Weekly": 26.0, "Daily": 365.0}
+
+
+class MonteCarloOptions(BaseModel):
+    paths: int = Field(1000, ge=1, le=MAX_PATHS)
+    seed: int | None = None
+    return_volatility: float = Field(15.0, ge=0)  # annual stdev in percent, around each account's growth rate
+    inflation_mean: float = 2.0  # percent
+    inflation_volatility: float = Field(1.0, ge=0)  # percent
+    percentiles: list[Annotated[float, Field(ge=0, le=100)]] = Field(
+        default_factory=lambda: [5.0, 25.0, 50.0, 75.0, 95.0]
+    )
+
+
+class MonteCarloResult(BaseModel):
+    paths: int
+    seed: int | None = None
+    years: list[int]
+    ages: list[int]
+    percentiles: list[float]
+    net_worth: dict[str, list[float]]  # "p50" -> value per year
+    liquid_net_worth: dict[str, list[float]]
+    probability_of_depletion: float
+    depletion_probability_by_year: list[float]  # cumulative share of depleted paths
+    median_depletion_age: int | None = None
+
+
+@dataclass
+class _DynamicItem:
+    """Income/Expense item whose start or end is the (path-dependent) FI milestone."""
+
+    is_income: bool
+    values: np.ndarray  # (years,) amount if active
+    tax_rate: float
+    one_time: bool
+    start_year: int | None  # None -> FI year
+    end_year: int | None  # None -> FI year (current year while unresolved)
+
+
+@dataclass
+class CompiledPlan:
+    years: np.ndarray
+    birth_year: int
+    current_year: int
+    start_cash: float
+    # Path-independent yearly flows
+    income: np.ndarray
+    income_tax: np.ndarray
+    expenses: np.ndarray  # scaled by the inflation surprise
+    purchases: np.ndarray  # asset purchases / down payments
+    real_assets: np.ndarray
+    liquid_real_assets: np.ndarray
+    liquid_real_debt: np.ndarray
+    dynamic_items: list[_DynamicItem]
+    # Accounts: (accounts,) settings and (years, accounts) schedules
+    values: np.ndarray
+    growth: np.ndarray
+    fees: np.ndarray
+    yields: np.ndarray
+    dividend_tax: np.ndarray
+    fixed_dividends: np.ndarray  # (years, accounts), NaN -> percent-of-value mode
+    payout: np.ndarray  # bool, dividend policy is Payout
+    payout_start: np.ndarray  # first payout year, UNRESOLVED_YEAR when never
+    payout_start_fi: np.ndarray  # bool, payout starts at the FI year
+    contributions: np.ndarray  # (years, accounts)
+    annuity_start: np.ndarray  # pension draw year, UNRESOLVED_YEAR when not drawing
+    annuity_divisor: np.ndarray
+    annuity_tax: np.ndarray
+    liquid: np.ndarray  # bool, counts toward liquid net worth
+    is_rsu: np.ndarray
+    is_taxable: np.ndarray
+    max_withdrawal_cap: np.ndarray  # inf when unset
+    max_withdrawal_rate: np.ndarray  # percent, NaN when unset
+    savings_goal: np.ndarray  # 0 when unset
+    savings_eligible: np.ndarray  # bool, process_savings may deposit here
+    inflow_order: np.ndarray
+    withdrawal_order: np.ndarray
+    rsu_sale_price: np.ndarray  # (years, accounts)
+    rsu_grant_price: np.ndarray  # blended, NaN without grants
+    tax_table: TaxBracketTable
+    fi_milestone: bool
+
+
+def _item_values(item: dict, main_currency: str) -> tuple[float, float]:
+    base_val_raw = PlanInterfaces._safe_float(item.get("value", 0))
+    base_val = AccountManager._convert(base_val_raw, item.get("currency", "ILS"), main_currency)
+    base_val *= FREQUENCY_MULTIPLIERS.get(item.get("frequency", "Yearly"), 1.0)
+    return base_val, base_val_raw
+
+
+def compile_plan(
+    plan_data: dict[str, Any],
+    finance_snapshot: Any,
+    user_settings: dict[str, Any],
+    db: Session | None = None,
+) -> CompiledPlan:
+    current_year = datetime.now().year
+    birth_year = PlanInterfaces._safe_int(user_settings.get("primaryUser", {}).get("birthYear", 1980), 1980)
+    spouse_birth_year = PlanInterfaces._safe_int(
+        user_settings.get("spouse", {}).get("birthYear", birth_year), birth_year
+    )
+    main_currency = user_settings.get("mainCurrency", "ILS")
+    years = np.arange(current_year, birth_year + 95 + 1)
+    n_years = len(years)
+    years_passed = years - current_year
+
+    accounts = AccountManager.load_accounts(plan_data, finance_snapshot, user_settings, db=db)
+    real_assets_list, start_cash = RealAssetManager.load_real_assets(plan_data, finance_snapshot, user_settings)
+    milestones = plan_data.get("milestones", [])
+    milestone_manager = MilestoneManager(milestones, birth_year, user_settings, accounts)
+    fi = next((m for m in milestones if m.get("type") == "Financial Independence"), None)
+    fi_id = fi["id"] if fi else None
+
+    def is_fi(cond: Any, ref: Any) -> bool:
+        return fi_id is not None and cond == "Milestone" and ref == fi_id
+
+    # Plan items -> yearly flows
+    items = plan_data.get("items", [])
+    income = np.zeros(n_years)
+    income_tax = np.zeros(n_years)
+    expenses = np.zeros(n_years)
+    purchases = np.zeros(n_years)
+    purchased_assets: dict[int, list[tuple[dict, float, float]]] = {}
+    dynamic_items: list[_DynamicItem] = []
+
+    for item in items:
+        cat = item.get("category")
+        if cat not in ["Income", "Expense", "Asset"]:
+            continue
+        base_val, base_val_raw = _item_values(item, main_currency)
+        one_time = item.get("frequency", "Yearly") == "OneTime"
+        dyn_start = is_fi(item.get("start_condition"), item.get("start_reference"))
+        dyn_end = is_fi(item.get("end_condition"), item.get("end_reference"))
+        start_y = milestone_manager.get_year_from_condition(item, "start_condition", "start_reference", "start_date")
+        end_y = milestone_manager.get_year_from_condition(item, "end_condition", "end_reference", "end_date")
+
+        if cat == "Asset":
+            # Purchases shape real assets, so they stay path-independent: a purchase tied to the
+            # FI milestone keeps MilestoneManager's unresolved fallback.
+            recurrence = item.get("recurrence") or {}
+            period = PlanInterfaces._safe_int(recurrence.get("period_years", 10), 10)
+            financing = item.get("details", {}).get("financing", None)
+            for i, year in enumerate(years):
+                if not (start_y <= year <= end_y) or (one_time and year != start_y):
+                    continue
+                is_purchase = year == start_y or (
+                    recurrence.get("rule") == "Replace"
+                    and period > 0
+                    and year > start_y
+                    and (year - start_y) % period == 0
+                )
+                if not is_purchase:
+                    continue
+                cost = base_val * ((1 + 0.03) ** years_passed[i])
+                if financing:
+                    down_pct = (
+                        PlanInterfaces._safe_float(financing.get("down_payment", 0)) / base_val_raw
+                        if base_val_raw
+                        else 0
+                    )
+                    purchases[i] += cost * down_pct
+                else:
+                    purchases[i] += cost
+                purchased_assets.setdefault(i, []).append((item, base_val_raw, cost))
+            continue
+
+        growth = PlanInterfaces._safe_float(item.get("growth_rate", 0))
+        values = base_val * (1 + growth / 100.0) ** years_passed
+        tax_rate = PlanInterfaces._safe_float(item.get("tax_rate", 0)) / 100.0
+        if dyn_start or dyn_end:
+            dynamic_items.append(
+                _DynamicItem(
+                    is_income=cat == "Income",
+                    values=values,
+                    tax_rate=tax_rate,
+                    one_time=one_time,
+                    start_year=None if dyn_start else start_y,
+                    end_year=None if dyn_end else end_y,
+                )
+            )
+            continue
+        active = (years >= start_y) & (years <= end_y)
+        if one_time:
+            active &= years == start_y
+        flow = np.where(active, values, 0.0)
+        if cat == "Income":
+            income += flow
+            income_tax += flow * tax_rate
+        else:
+            expenses += flow
+
+    # Real assets do not depend on market returns; walk them once.
+    real_asset_manager = RealAssetManager(real_assets_list)
+    real_assets = np.zeros(n_years)
+    liquid_real_assets = np.zeros(n_years)
+    liquid_real_debt = np.zeros(n_years)
+    for i in range(n_years):
+        if i > 0:
+            real_asset_manager.process_growth()
+        for item, base_val_raw, cost in purchased_assets.get(i, []):
+            real_asset_manager.add_asset(item, base_val_raw, cost)
+        liquid_real_assets[i], liquid_real_debt[i] = real_asset_manager.get_liquid_assets_value(items)
+        real_assets[i] = sum(ra["value"] for ra in real_asset_manager.real_assets)
+
+    # Accounts
+    n_accounts = len(accounts)
+    fixed_dividends = np.full((n_years, n_accounts), np.nan)
+    contributions = np.zeros((n_years, n_accounts))
+    rsu_sale_price = np.zeros((n_years, n_accounts))
+    payout_start = np.full(n_accounts, current_year)
+    payout_start_fi = np.zeros(n_accounts, dtype=bool)
+    annuity_start = np.full(n_accounts, UNRESOLVED_YEAR)
+    rsu_grant_price = np.full(n_accounts, np.nan)
+
+    for a, acc in enumerate(accounts):
+        acc_type = (acc.get("type") or "").strip()
+        owner_birth_year = spouse_birth_year if acc.get("owner") == "Spouse" else birth_year
+        starting_age = acc.get("starting_age", 67)
+
+        if acc_type == "Pension" and acc.get("draw_income") and acc.get("divide_rate", 200.0) > 0:
+            annuity_start[a] = owner_birth_year + starting_age
+
+        m_contrib = acc.get("monthly_contribution", 0.0)
+        if m_contrib > 0:
+            active = np.ones(n_years, dtype=bool)
+            if acc_type == "Pension":
+                active = years - owner_birth_year < starting_age
+            contributions[:, a] = np.where(active, m_contrib * 12, 0.0)
+
+        if acc.get("dividend_mode") == "Fixed" and acc.get("dividend_fixed_amount"):
+            fixed = PlanInterfaces._safe_float(acc.get("dividend_fixed_amount", 0))
+            div_growth = 1 + acc.get("dividend_growth_rate", 0.0) / 100.0
+            fixed_dividends[1:, a] = fixed * div_growth ** np.arange(n_years - 1)
+
+        start_cond = acc.get("dividend_payout_start_condition")
+        if acc.get("dividend_policy", "Accumulate") == "Payout" and start_cond and start_cond != "Immediate":
+            ref = acc.get("dividend_payout_start_reference")
+            if start_cond == "Age":
+                payout_start[a] = birth_year + PlanInterfaces._safe_int(ref, 67)
+            elif start_cond == "Date":
+                payout_start[a] = PlanInterfaces._safe_int(ref, current_year)
+            elif start_cond == "Milestone":
+                payout_start_fi[a] = is_fi("Milestone", str(ref))
+                payout_start[a] = milestone_manager.resolved_milestones.get(str(ref), UNRESOLVED_YEAR)
+
+        if acc_type == "RSU":
+            base_price = acc.get("current_price", 0.0)
+            rsu_sale_price[:, a] = base_price
+            if base_price > 0:
+                rsu_sale_price[:, a] = base_price * (1 + acc.get("growth", 0.0) / 100.0) ** years_passed
+            grants = acc.get("rsu_grants", []) or []
+            total_shares = sum(float(g.get("shares", 0)) for g in grants)
+            if total_shares > 0:
+                rsu_grant_price[a] = (
+                    sum(float(g.get("shares", 0)) * float(g.get("price", 0)) for g in grants) / total_shares
+                )
+
+    # calculate_projection reports the current dividends of every account as first-year income.
+    for acc in accounts:
+        if acc.get("dividend_mode") == "Fixed" and acc.get("dividend_fixed_amount"):
+            income[0] += acc["dividend_fixed_amount"]
+        elif acc.get("yield", 0.0) > 0:
+            income[0] += acc["value"] * (acc["yield"] / 100.0)
+
+    def column(key: str, default: float, missing: float | None = None) -> np.ndarray:
+        return np.array(
+            [missing if missing is not None and acc.get(key) is None else acc.get(key, default) for acc in accounts],
+            dtype=float,
+        )
+
+    types = [(acc.get("type") or "").strip() for acc in accounts]
+    return CompiledPlan(
+        years=years,
+        birth_year=birth_year,
+        current_year=current_year,
+        start_cash=start_cash,
+        income=income,
+        income_tax=income_tax,
+        expenses=expenses,
+        purchases=purchases,
+        real_assets=real_assets,
+        liquid_real_assets=liquid_real_assets,
+        liquid_real_debt=liquid_real_debt,
+        dynamic_items=dynamic_items,
+        values=column("value", 0.0),
+        growth=column("growth", 0.0) / 100.0,
+        fees=column("fees", 0.0) / 100.0,
+        yields=column("yield", 0.0) / 100.0,
+        dividend_tax=column("dividend_tax_rate", 0.0) / 100.0,
+        fixed_dividends=fixed_dividends,
+        payout=np.array([acc.get("dividend_policy", "Accumulate") == "Payout" for acc in accounts], dtype=bool),
+        payout_start=payout_start,
+        payout_start_fi=payout_start_fi,
+        contributions=contributions,
+        annuity_start=annuity_start,
+        annuity_divisor=column("divide_rate", 200.0),
+        annuity_tax=column("tax_rate", 0.0) / 100.0,
+        liquid=np.array(
+            [
+                "pension" not in (acc.get("type") or "").lower() and "pension" not in (acc.get("name") or "").lower()
+                for acc in accounts
+            ],
+            dtype=bool,
+        ),
+        is_rsu=np.array([t == "RSU" for t in types], dtype=bool),
+        is_taxable=np.array([t in ["Broker", "Taxable"] for t in types], dtype=bool),
+        max_withdrawal_cap=column("max_withdrawal_cap", 0.0, missing=np.inf),
+        max_withdrawal_rate=column("max_withdrawal_rate", 0.0, missing=np.nan),
+        savings_goal=np.nan_to_num(column("savings_goal", 0.0, missing=0.0)),
+        savings_eligible=np.array(
+            [not (acc.get("type") == "Pension" and acc.get("draw_income")) for acc in accounts], dtype=bool
+        ),
+        inflow_order=np.argsort([acc.get("inflow_priority", 100) for acc in accounts], kind="stable"),
+        withdrawal_order=np.argsort([acc.get("withdrawal_priority", 50) for acc in accounts], kind="stable"),
+        rsu_sale_price=rsu_sale_price,
+        rsu_grant_price=rsu_grant_price,
+        tax_table=TaxBracketTable.for_years(years),
+        fi_milestone=fi_id is not None,
+    )
+
+
+def _rsu_effective_rate(
+    plan: CompiledPlan, a: int, i: int, gross: np.ndarray, base_annual_income: np.ndarray
+) -> np.ndarray:
+    """Vectorized calculate_rsu_withdrawal_effective_tax_rate for account ``a`` in year ``i``."""
+    sale_price = plan.rsu_sale_price[i, a]
+    grant_price = plan.rsu_grant_price[a]
+    if np.isnan(grant_price) or sale_price <= 0:
+        return np.zeros_like(gross)
+    shares_sold = gross / sale_price
+    income_tax = plan.tax_table.tax_on_additional_income(base_annual_income, shares_sold * grant_price, i)
+    cap_gains_tax = np.maximum(0.0, shares_sold * (sale_price - grant_price)) * RSU_CAPITAL_GAINS_RATE
+    safe_gross = np.where(gross > 0, gross, 1.0)
+    return np.where(gross > 0, np.minimum(0.99, (income_tax + cap_gains_tax) / safe_gross), 0.0)
+
+
+def _withdraw(
+    plan: CompiledPlan, values: np.ndarray, deficit: np.ndarray, i: int, base_annual_income: np.ndarray
+) -> np.ndarray:
+    """Drain accounts in withdrawal-priority order (process_deficit); returns the unmet deficit."""
+    rsu_withdrawn = np.zeros_like(deficit)
+    for a in plan.withdrawal_order:
+        if not deficit.any():
+            break
+        current = values[:, a]
+        allowed = np.minimum(current, plan.max_withdrawal_cap[a])
+        if not np.isnan(plan.max_withdrawal_rate[a]):
+            allowed = np.minimum(allowed, current * plan.max_withdrawal_rate[a] / 100.0)
+        if plan.is_rsu[a]:
+            allowed = np.minimum(allowed, np.maximum(0.0, RSU_YEARLY_LIMIT - rsu_withdrawn))
+        net = np.where((deficit > 0) & (current > 0), np.minimum(deficit, allowed), 0.0)
+        net = np.maximum(net, 0.0)
+
+        if plan.is_rsu[a]:
+            rate = _rsu_effective_rate(plan, a, i, net, base_annual_income)
+        elif plan.is_taxable[a]:
+            rate = np.full_like(net, TAXABLE_WITHDRAWAL_RATE)
+        else:
+            rate = np.zeros_like(net)
+        gross = np.where(rate > 0, net / (1 - rate), net)
+        capped = (rate > 0) & (gross > allowed)
+        if capped.any():
+            capped_rate = _rsu_effective_rate(plan, a, i, allowed, base_annual_income) if plan.is_rsu[a] else rate
+            gross = np.where(capped, allowed, gross)
+            net = np.where(capped, allowed * (1 - capped_rate), net)
+
+        values[:, a] -= gross
+        deficit -= net
+        if plan.is_rsu[a]:
+            rsu_withdrawn += gross
+    return deficit
+
+
+def run_monte_carlo(plan: CompiledPlan, options: MonteCarloOptions) -> MonteCarloResult:
+    n_paths = options.paths
+    n_years = len(plan.years)
+    n_accounts = len(plan.values)
+    rng = np.random.default_rng(options.seed)
+
+    returns = rng.standard_normal((n_paths, n_years)) * (options.return_volatility / 100.0)
+    inflation_mean = options.inflation_mean / 100.0
+    inflation = inflation_mean + rng.standard_normal((n_paths, n_years)) * (options.inflation_volatility / 100.0)
+    # Expenses already grow at their own rates; only the surprise versus the expected inflation is applied.
+    inflation[:, 0] = inflation_mean
+    inflation_surprise = np.cumprod((1 + inflation) / (1 + inflation_mean), axis=1)
+
+    values = np.tile(plan.values, (n_paths, 1))
+    cash = np.full(n_paths, plan.start_cash)
+    annuity_gross = np.zeros(n_paths)
+    annuity_tax = np.zeros(n_paths)
+    fi_year = np.full(n_paths, UNRESOLVED_YEAR)
+    depleted_year = np.full(n_paths, -1)
+    net_worth = np.empty((n_paths, n_years))
+    liquid_net_worth = np.empty((n_paths, n_years))
+
+    for i, year in enumerate(plan.years):
+        liquid_accounts = values[:, plan.liquid].sum(axis=1)
+        if plan.fi_milestone:
+            # calculate_projection checks FI against zero annual expenses.
+            fi_year = np.where((fi_year == UNRESOLVED_YEAR) & (liquid_accounts + cash > 0.0), year, fi_year)
+
+        gross_income = np.full(n_paths, plan.income[i])
+        tax_paid = np.full(n_paths, plan.income_tax[i])
+
+        if i > 0:
+            # process_growth_and_income
+            for a in range(n_accounts):
+                # Pensions drawing income convert to an annuity and skip the rest of the year.
+                converting = (values[:, a] > 0) if year >= plan.annuity_start[a] else None
+                if converting is not None:
+                    payout = np.where(converting, values[:, a] / plan.annuity_divisor[a] * 12, 0.0)
+                    annuity_gross += payout
+                    annuity_tax += payout * plan.annuity_tax[a]
+                    values[:, a] = np.where(converting, 0.0, values[:, a])
+
+                contribution = plan.contributions[i, a]
+                if contribution:
+                    added = contribution if converting is None else np.where(converting, 0.0, contribution)
+                    values[:, a] += added
+                    cash -= added
+
+                if np.isnan(plan.fixed_dividends[i, a]):
+                    gross_dividend = values[:, a] * plan.yields[a]
+                else:
+                    gross_dividend = np.full(n_paths, plan.fixed_dividends[i, a])
+                net_dividend = gross_dividend * (1 - plan.dividend_tax[a])
+                values[:, a] *= 1 + plan.growth[a] + returns[:, i] - plan.fees[a]
+
+                accumulate = np.ones(n_paths, dtype=bool)
+                if plan.payout[a]:
+                    start = fi_year if plan.payout_start_fi[a] else plan.payout_start[a]
+                    accumulate = year < start
+                    paid = ~accumulate & (values[:, a] > 0)
+                    gross_income += np.where(paid, gross_dividend, 0.0)
+                    tax_paid += np.where(paid, gross_dividend - net_dividend, 0.0)
+                if converting is not None:
+                    accumulate = accumulate & ~converting
+                values[:, a] += np.where(accumulate, net_dividend, 0.0)
+            cash *= UNALLOCATED_CASH_GROWTH
+
+            gross_income += annuity_gross
+            tax_paid += annuity_tax
+
+        expenses = plan.expenses[i] * inflation_surprise[:, i] + plan.purchases[i]
+        for item in plan.dynamic_items:
+            start = fi_year if item.start_year is None else item.start_year
+            if item.end_year is None:
+                end = np.where(fi_year == UNRESOLVED_YEAR, plan.current_year, fi_year)
+            else:
+                end = item.end_year
+            active = (year >= start) & (year <= end)
+            if item.one_time:
+                active = active & (year == start)
+            flow = np.where(active, item.values[i], 0.0)
+            if item.is_income:
+                gross_income += flow
+                tax_paid += flow * item.tax_rate
+            else:
+                expenses += flow * inflation_surprise[:, i]
+
+        net_flow = gross_income - tax_paid - expenses
+
+        # process_savings
+        remaining = np.maximum(net_flow, 0.0)
+        for a in plan.inflow_order:
+            if not plan.savings_eligible[a]:
+                continue
+            amount = remaining
+            goal = plan.savings_goal[a]
+            if goal > 0:
+                amount = np.where(values[:, a] >= goal, 0.0, np.minimum(amount, goal - values[:, a]))
+            values[:, a] += amount
+            remaining = remaining - amount
+        cash += remaining
+
+        # process_deficit
+        deficit = np.maximum(-net_flow, 0.0)
+        from_cash = np.where(cash >= deficit, deficit, np.maximum(cash, 0.0))
+        cash -= from_cash
+        deficit -= from_cash
+        if deficit.any():
+            deficit = _withdraw(plan, values, deficit, i, gross_income)
+            short = deficit > 1e-6
+            cash -= np.where(short, deficit, 0.0)
+            depleted_year = np.where(short & (depleted_year < 0), i, depleted_year)
+
+        liquid_net_worth[:, i] = plan.liquid_real_assets[i] + values[:, plan.liquid].sum(axis=1) + cash
+        net_worth[:, i] = values.sum(axis=1) + cash + plan.real_assets[i] - plan.liquid_real_debt[i]
+
+    pcts = list(options.percentiles)
+    keys = [f"p{p:g}" for p in pcts]
+    nw_bands = np.percentile(net_worth, pcts, axis=0)
+    liquid_bands = np.percentile(liquid_net_worth, pcts, axis=0)
+    depleted = depleted_year >= 0
+    by_year = np.bincount(depleted_year[depleted], minlength=n_years).cumsum() / n_paths
+    median_depletion_age = None
+    if depleted.mean() >= 0.5:
+        median_depletion_age = int(plan.years[int(np.searchsorted(by_year, 0.5))] - plan.birth_year)
+
+    return MonteCarloResult(
+        paths=n_paths,
+        seed=options.seed,
+        years=plan.years.tolist(),
+        ages=(plan.years - plan.birth_year).tolist(),
+        percentiles=pcts,
+        net_worth={k: np.round(band, 2).tolist() for k, band in zip(keys, nw_bands)},
+        liquid_net_worth={k: np.round(band, 2).tolist() for k, band in zip(keys, liquid_bands)},
+        probability_of_depletion=float(depleted.mean()),
+        depletion_probability_by_year=np.round(by_year, 4).tolist(),
+        median_depletion_age=median_depletion_age,
+    )
@@ -4,6 +4,7 @@ from datetime import datetime
 from pydantic import BaseModel
 from app.schema.finance_models import FinanceSnapshot
 from app.services.plan_components import MilestoneManager, AccountManager, RealAssetManager
+from app.services.plan_monte_carlo import MonteCarloOptions, MonteCarloResult, compile_plan, run_monte_carlo
 
 
 class ProjectionPoint(BaseModel):
@@ -345,3 +346,15 @@ class PlanService:
             )
 
         return projection
+
+    @staticmethod
+    def simulate_monte_carlo(
+        plan_data: Dict[str, Any],
+        finance_snapshot: Optional[Union[FinanceSnapshot, Dict[str, Any]]],
+        user_settings: Dict[str, Any],
+        options: Optional[MonteCarloOptions] = None,
+        db: Optional[Session] = None,
+    ) -> MonteCarloResult:
+        # Same yearly model as calculate_projection, compiled once and run over many return/inflation paths.
+        compiled = compile_plan(plan_data, finance_snapshot, user_settings, db=db)
+        return run_monte_carlo(compiled, options or MonteCarloOptions())
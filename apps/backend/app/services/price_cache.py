@@ -1,14 +1,29 @@
-"""Price-cache refresh service for TJ-020 scheduled workers."""
+"""Price-cache refresh service for TJ-020 scheduled workers.
+
+Each hourly cycle:
+
+1. loads the referenced symbols plus their current ``price_cache`` state;
+2. keeps only symbols that are due under their staleness tier — symbols whose
+   market is closed (already refreshed after the last session close) or whose
+   price has not moved for several refreshes are refreshed less often;
+3. fetches the due symbols in batches — one yfinance multi-ticker download for
+   prices, a bounded thread pool for currency / dividend-yield metadata;
+4. writes the whole cycle with a single bulk upsert.
+"""
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import AbstractContextManager
 from dataclasses import dataclass
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime, time, timedelta
 from decimal import Decimal, InvalidOperation
+from functools import partial
+import json
 import logging
-from typing import Protocol, cast
+from typing import Any, Protocol, cast
+from zoneinfo import ZoneInfo
 
 from sqlalchemy import text
 from sqlmodel import Session
@@ -18,6 +33,19 @@ from app.dal.database import engine
 logger = logging.getLogger(__name__)
 DEFAULT_CURRENCY = "USD"
 
+# Symbols per yfinance multi-ticker download and concurrent metadata lookups.
+DOWNLOAD_BATCH_SIZE = 100
+METADATA_WORKERS = 8
+
+# Staleness tiers (see ``staleness_tier``).  The job runs hourly, so the
+# "open" max age sits just under the interval to refresh every cycle.
+OPEN_MAX_AGE = timedelta(minutes=50)
+QUIET_MAX_AGE = timedelta(hours=6)
+CLOSED_MAX_AGE = timedelta(hours=24)
+QUIET_AFTER_UNCHANGED = 3
+# Yahoo publishes the closing print a little after the bell.
+CLOSE_SETTLE = timedelta(minutes=20)
+
 
 class SessionFactory(Protocol):
     """Callable protocol for creating worker database sessions."""
@@ -45,6 +73,77 @@ class PriceQuote:
     dividend_yield: Decimal | None = None  # trailing 12m yield as percentage form (0.87 = 0.87%)
 
 
+@dataclass(frozen=True)
+class CachedPriceState:
+    """What the refresher needs to know about a symbol's current cache row."""
+
+    symbol: str
+    currency: str
+    refreshed_at: datetime
+    unchanged_refreshes: int = 0
+
+
+@dataclass(frozen=True)
+class MarketHours:
+    """Regular trading session of an exchange (holidays are ignored)."""
+
+    timezone: str
+    opens: time
+    closes: time
+    weekdays: frozenset[int] = frozenset(range(5))
+
+    def is_open(self, now: datetime) -> bool:
+        """Return whether ``now`` falls inside a regular session."""
+
+        local = now.astimezone(ZoneInfo(self.timezone))
+        return local.weekday() in self.weekdays and self.opens <= local.time() < self.closes
+
+    def last_close(self, now: datetime) -> datetime:
+        """Return the most recent session close at or before ``now`` (UTC)."""
+
+        tz = ZoneInfo(self.timezone)
+        local = now.astimezone(tz)
+        for days_back in range(8):
+            day: date = local.date() - timedelta(days=days_back)
+            close = datetime.combine(day, self.closes, tzinfo=tz)
+            if day.weekday() in self.weekdays and close <= local:
+                return close.astimezone(UTC)
+        raise ValueError(f"No trading day configured for {self.timezone}")
+
+
+# Quote currency → primary listing venue; approximate regular hours only.
+MARKET_HOURS_BY_CURRENCY: dict[str, MarketHours] = {
+    "USD": MarketHours("America/New_York", time(9, 30), time(16, 0)),
+    "CAD": MarketHours("America/Toronto", time(9, 30), time(16, 0)),
+    "GBP": MarketHours("Europe/London", time(8, 0), time(16, 30)),
+    "EUR": MarketHours("Europe/Berlin", time(9, 0), time(17, 30)),
+    "ILS": MarketHours("Asia/Jerusalem", time(9, 45), time(17, 30)),
+}
+
+
+def staleness_tier(state: CachedPriceState | None, now: datetime) -> tuple[str, bool]:
+    """Classify a symbol and return ``(tier, due)`` for this refresh cycle.
+
+    - ``new``: never cached — always due.
+    - ``closed``: its market is closed — due once after the session close,
+      then only every ``CLOSED_MAX_AGE``.
+    - ``quiet``: price unchanged for ``QUIET_AFTER_UNCHANGED`` refreshes
+      (illiquid) — due every ``QUIET_MAX_AGE``.
+    - ``open``: due every ``OPEN_MAX_AGE``.
+    """
+
+    if state is None:
+        return "new", True
+    age = now - state.refreshed_at
+    hours = MARKET_HOURS_BY_CURRENCY.get(state.currency)
+    if hours is not None and not hours.is_open(now):
+        settled_close = hours.last_close(now) + CLOSE_SETTLE
+        return "closed", age >= CLOSED_MAX_AGE or (state.refreshed_at < settled_close <= now)
+    if state.unchanged_refreshes >= QUIET_AFTER_UNCHANGED:
+        return "quiet", age >= QUIET_MAX_AGE
+    return "open", age >= OPEN_MAX_AGE
+
+
 def _default_session_factory() -> AbstractContextManager[Session]:
     """Return a SQLModel session using the configured privileged DB engine."""
 
@@ -123,12 +222,19 @@ def fetch_external_price(symbol: str) -> PriceQuote:
     ``None``.
     """
 
+    return _fetch_quote(symbol)
+
+
+def _fetch_quote(symbol: str, price: Decimal | None = None) -> PriceQuote:
+    """Build a quote from ``yf.Ticker``; ``price`` skips the price lookup when already known."""
+
     import yfinance as yf
 
     normalized_symbol = normalize_symbol(symbol)
     ticker = yf.Ticker(normalized_symbol)
     fast_info = ticker.fast_info
-    price = _to_decimal(getattr(fast_info, "last_price", None))
+    if price is None:
+        price = _to_decimal(getattr(fast_info, "last_price", None))
 
     if price is None:
         history = ticker.history(period="1d")
@@ -160,37 +266,174 @@ def fetch_external_price(symbol: str) -> PriceQuote:
     )
 
 
+def _download_last_prices(symbols: Sequence[str]) -> dict[str, Decimal]:
+    """Return the latest close per symbol from one yfinance multi-ticker download."""
+
+    import pandas as pd
+    import yfinance as yf
+
+    frame = yf.download(
+        list(symbols),
+        period="5d",
+        interval="1d",
+        group_by="ticker",
+        auto_adjust=False,
+        threads=True,
+        progress=False,
+    )
+    prices: dict[str, Decimal] = {}
+    if frame is None or frame.empty:
+        return prices
+    for symbol in symbols:
+        try:
+            closes = frame[symbol]["Close"] if isinstance(frame.columns, pd.MultiIndex) else frame["Close"]
+        except KeyError:
+            continue
+        closes = closes.dropna()
+        if not closes.empty:
+            price = _to_decimal(closes.iloc[-1])
+            if price is not None:
+                prices[symbol] = price
+    return prices
+
+
+def _fetch_in_pool(
+    symbols: Sequence[str],
+    fetch: Callable[[str], PriceQuote],
+    max_workers: int,
+) -> dict[str, PriceQuote]:
+    """Run ``fetch`` per symbol on a bounded pool; failed symbols are logged and left out."""
+
+    quotes: dict[str, PriceQuote] = {}
+    if not symbols:
+        return quotes
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(symbols))), thread_name_prefix="price-cache"
+    ) as pool:
+        futures = {symbol: pool.submit(fetch, symbol) for symbol in symbols}
+        for symbol, future in futures.items():
+            try:
+                quotes[symbol] = future.result()
+            except Exception:  # noqa: BLE001 - one bad ticker must not stop the batch
+                logger.exception("Failed to refresh price for %s", symbol)
+    return quotes
+
+
+def fetch_external_prices(
+    symbols: Sequence[str],
+    *,
+    batch_size: int = DOWNLOAD_BATCH_SIZE,
+    max_workers: int = METADATA_WORKERS,
+) -> dict[str, PriceQuote]:
+    """Fetch many symbols at once; symbols that fail are omitted from the result.
+
+    Prices come from one ``yf.download`` per ``batch_size`` symbols; currency
+    and dividend yield are looked up on a pool of ``max_workers`` threads,
+    which also falls back to a per-symbol price lookup when the download had
+    no usable close.
+    """
+
+    normalized = list(dict.fromkeys(normalize_symbol(symbol) for symbol in symbols))
+    prices: dict[str, Decimal] = {}
+    for start in range(0, len(normalized), batch_size):
+        batch = normalized[start : start + batch_size]
+        try:
+            prices.update(_download_last_prices(batch))
+        except Exception:  # noqa: BLE001 - the pool falls back to per-symbol prices
+            logger.exception("Batch price download failed for %d symbols", len(batch))
+    return _fetch_in_pool(normalized, lambda symbol: _fetch_quote(symbol, prices.get(symbol)), max_workers)
+
+
 class PriceCacheRefresher:
     """Refresh public.price_cache from all symbols referenced by holdings."""
 
     def __init__(
         self,
         session_factory: Callable[[], AbstractContextManager[Session]] | None = None,
-        price_fetcher: Callable[[str], PriceQuote] = fetch_external_price,
+        price_fetcher: Callable[[str], PriceQuote] | None = None,
+        batch_fetcher: Callable[[Sequence[str]], Mapping[str, PriceQuote]] | None = None,
+        clock: Callable[[], datetime] = lambda: datetime.now(UTC),
     ) -> None:
-        """Initialize the refresher with injectable DB and market-data adapters."""
+        """Initialize the refresher with injectable DB and market-data adapters.
+
+        ``batch_fetcher`` receives every due symbol at once and returns the
+        quotes it could fetch.  A per-symbol ``price_fetcher`` is run on a
+        bounded pool instead; with neither, ``fetch_external_prices`` is used.
+        """
 
         self.session_factory = session_factory or _default_session_factory
-        self.price_fetcher = price_fetcher
+        if batch_fetcher is None and price_fetcher is not None:
+            batch_fetcher = partial(_fetch_in_pool, fetch=price_fetcher, max_workers=METADATA_WORKERS)
+        self.batch_fetcher = batch_fetcher or fetch_external_prices
+        self.clock = clock
 
     def refresh_once(self) -> dict[str, int]:
-        """Refresh every referenced symbol, isolating external errors per symbol."""
+        """Refresh every due symbol and write the cycle in one bulk upsert."""
 
-        refreshed = 0
-        failed = 0
         with self.session_factory() as session:
             symbols = self._load_symbols(session)
-            for symbol_ref in symbols:
-                try:
-                    quote = self.price_fetcher(symbol_ref.symbol)
-                    self._upsert_quote(session, quote)
-                    session.commit()
-                    refreshed += 1
-                except Exception:  # noqa: BLE001 - one bad ticker must not stop the batch
-                    session.rollback()
-                    failed += 1
-                    logger.exception("Failed to refresh price for %s", symbol_ref.symbol)
-        return {"symbols": len(symbols), "refreshed": refreshed, "failed": failed}
+            states = self._load_cache_states(session, [ref.symbol for ref in symbols])
+            now = self.clock()
+            distinct = list(dict.fromkeys(ref.symbol for ref in symbols))
+            due: list[str] = []
+            tiers: dict[str, int] = {}
+            for symbol in distinct:
+                tier, is_due = staleness_tier(states.get(symbol), now)
+                tiers[tier] = tiers.get(tier, 0) + 1
+                if is_due:
+                    due.append(symbol)
+
+            quotes = list(self.batch_fetcher(due).values()) if due else []
+            failed = len(due) - len(quotes)
+            try:
+                self._upsert_quotes(session, quotes)
+                session.commit()
+            except Exception:  # noqa: BLE001 - report the failed cycle; the next one retries
+                session.rollback()
+                logger.exception("Failed to write %d refreshed prices", len(quotes))
+                failed, quotes = len(due), []
+
+        logger.info(
+            "Price cache refresh: symbols=%d due=%d refreshed=%d failed=%d tiers=%s",
+            len(symbols),
+            len(due),
+            len(quotes),
+            failed,
+            tiers,
+        )
+        return {
+            "symbols": len(symbols),
+            "refreshed": len(quotes),
+            "failed": failed,
+            "skipped": len(distinct) - len(due),
+        }
+
+    def _load_cache_states(self, session: Session, symbols: Iterable[str]) -> dict[str, CachedPriceState]:
+        """Return the freshest cache row per symbol, in one query."""
+
+        symbols = sorted(set(symbols))
+        if not symbols:
+            return {}
+        rows = session.execute(
+            text(
+                """
+                select distinct on (symbol) symbol, currency, refreshed_at, unchanged_refreshes
+                  from public.price_cache
+                 where symbol = any(:symbols)
+                 order by symbol, refreshed_at desc
+                """
+            ),
+            {"symbols": symbols},
+        ).mappings()
+        return {
+            str(row["symbol"]): CachedPriceState(
+                symbol=str(row["symbol"]),
+                currency=str(row["currency"]),
+                refreshed_at=row["refreshed_at"],
+                unchanged_refreshes=int(row["unchanged_refreshes"] or 0),
+            )
+            for row in rows
+        }
 
     def _load_symbols(self, session: Session) -> list[PriceSymbol]:
         """Return distinct symbols from holdings, positions, snapshots, and plans."""
@@ -245,31 +488,51 @@ class PriceCacheRefresher:
             for row in rows
         ]
 
-    def _upsert_quote(self, session: Session, quote: PriceQuote) -> None:
-        """Upsert a fetched quote into public.price_cache using quote currency."""
+    def _upsert_quotes(self, session: Session, quotes: Sequence[PriceQuote]) -> None:
+        """Upsert every fetched quote into public.price_cache in one statement.
+
+        ``unchanged_refreshes`` counts consecutive refreshes that saw the same
+        price and drives the ``quiet`` staleness tier.
+        """
 
+        if not quotes:
+            return
         session.execute(
             text(
                 """
-                insert into public.price_cache (symbol, currency, price, dividend_yield, as_of, refreshed_at)
-                values (:symbol, :currency, :price, :dividend_yield, :as_of, now())
+                insert into public.price_cache
+                    (symbol, currency, price, dividend_yield, as_of, refreshed_at, unchanged_refreshes)
+                select q.symbol, q.currency, q.price, q.dividend_yield, q.as_of, now(), 0
+                  from jsonb_to_recordset(cast(:quotes as jsonb)) as q(
+                      symbol text, currency text, price numeric, dividend_yield numeric, as_of timestamptz
+                  )
                 on conflict (symbol, currency) do update
-                   set price          = excluded.price,
-                       dividend_yield = excluded.dividend_yield,
-                       as_of          = excluded.as_of,
-                       refreshed_at   = now()
+                   set price               = excluded.price,
+                       dividend_yield      = excluded.dividend_yield,
+                       as_of               = excluded.as_of,
+                       refreshed_at        = now(),
+                       unchanged_refreshes = case
+                           when price_cache.price = excluded.price then price_cache.unchanged_refreshes + 1
+                           else 0
+                       end
                 """
             ),
-            {
-                "symbol": quote.symbol,
-                "currency": quote.currency,
-                "price": quote.price,
-                "dividend_yield": str(quote.dividend_yield) if quote.dividend_yield is not None else None,
-                "as_of": quote.as_of,
-            },
+            {"quotes": json.dumps([_quote_record(quote) for quote in quotes])},
         )
 
 
+def _quote_record(quote: PriceQuote) -> dict[str, Any]:
+    """JSON-safe bulk-upsert record; Decimals travel as strings to keep precision."""
+
+    return {
+        "symbol": quote.symbol,
+        "currency": quote.currency,
+        "price": str(quote.price),
+        "dividend_yield": str(quote.dividend_yield) if quote.dividend_yield is not None else None,
+        "as_of": quote.as_of.isoformat(),
+    }
+
+
 def refresh_price_cache() -> dict[str, int]:
     """Run one scheduled price-cache refresh using the global DB engine."""
 
@@ -304,37 +567,51 @@ def lookup_cached_price_data(
         ``None`` when the cache has no entry for this symbol.
     """
     sym = normalize_symbol(symbol)
-    curr = normalize_currency(currency)
-    row = (
-        session.execute(
-            text(
-                """
+    return lookup_cached_price_data_many([sym], currency, session).get(sym)
+
+
+def lookup_cached_price_data_many(
+    symbols: Iterable[str],
+    currency: str,
+    session: Session,
+) -> dict[str, CachedPriceData]:
+    """Look up price and dividend yield for many symbols in one query.
+
+    Args:
+        symbols: Ticker symbols (case-insensitive, normalised to upper-case).
+        currency: ISO currency code shared by all symbols (defaults to USD).
+        session: Open SQLAlchemy session (caller manages lifecycle).
+
+    Returns:
+        ``{normalised_symbol: CachedPriceData}`` for the symbols that are
+        cached; symbols without an entry are absent.
+    """
+    syms = sorted({normalize_symbol(symbol) for symbol in symbols})
+    if not syms:
+        return {}
+    rows = session.execute(
+        text(
+            """
             SELECT symbol, currency, price, dividend_yield, refreshed_at
               FROM public.price_cache
-             WHERE symbol   = :symbol
+             WHERE symbol   = ANY(:symbols)
                AND currency = :currency
             """
-            ),
-            {"symbol": sym, "currency": curr},
+        ),
+        {"symbols": syms, "currency": normalize_currency(currency)},
+    ).mappings()
+
+    result: dict[str, CachedPriceData] = {}
+    for row in rows:
+        price = _to_decimal(row["price"])
+        if price is None:
+            continue
+        dy_raw = row["dividend_yield"]
+        result[str(row["symbol"])] = CachedPriceData(
+            symbol=str(row["symbol"]),
+            currency=str(row["currency"]),
+            price=price,
+            dividend_yield=_to_decimal(dy_raw) if dy_raw is not None else None,
+            refreshed_at=row["refreshed_at"],
         )
-        .mappings()
-        .first()
-    )
-
-    if row is None:
-        return None
-
-    price = _to_decimal(row["price"])
-    if price is None:
-        return None
-
-    dy_raw = row["dividend_yield"]
-    dividend_yield = _to_decimal(dy_raw) if dy_raw is not None else None
-
-    return CachedPriceData(
-        symbol=str(row["symbol"]),
-        currency=str(row["currency"]),
-        price=price,
-        dividend_yield=dividend_yield,
-        refreshed_at=row["refreshed_at"],
-    )
+    return result
@@ -1,5 +1,8 @@
+from dataclasses import dataclass
 from typing import List, Dict, Any
 
+import numpy as np
+
 INFLATION_RATE = 1.015
 
 BASE_BRACKETS = [
@@ -43,6 +46,49 @@ def calculate_marginal_tax(monthly_taxable_income: float, current_year: int, app
     return tax
 
 
+@dataclass(frozen=True)
+class TaxBracketTable:
+    """
+    BASE_BRACKETS precompiled for a range of years so marginal tax can be evaluated
+    for many incomes at once. Row ``i`` holds the inflated brackets for ``years[i]``.
+    """
+
+    years: np.ndarray
+    lower: np.ndarray  # (years, brackets) monthly lower bound
+    width: np.ndarray  # (years, brackets) monthly bracket width (inf for the top bracket)
+    rates: np.ndarray  # (brackets,)
+    credit: np.ndarray  # (years,) monthly credit-point amount
+
+    @classmethod
+    def for_years(cls, years: np.ndarray) -> "TaxBracketTable":
+        years = np.asarray(years, dtype=np.int64)
+        inflation_factor = INFLATION_RATE ** np.maximum(0, years - 2026)
+        limits = np.array([b["limit"] for b in BASE_BRACKETS]) * inflation_factor[:, None]
+        lower = np.concatenate([np.zeros((len(years), 1)), limits[:, :-1]], axis=1)
+        return cls(
+            years=years,
+            lower=lower,
+            width=limits - lower,
+            rates=np.array([b["rate"] for b in BASE_BRACKETS]),
+            credit=2.25 * BASE_CREDIT_POINT * inflation_factor,
+        )
+
+    def monthly_tax(self, monthly_taxable_income: np.ndarray, year_index: int) -> np.ndarray:
+        """Vectorized calculate_marginal_tax (with credit points) for ``years[year_index]``."""
+        income = np.asarray(monthly_taxable_income, dtype=float)
+        in_bracket = np.clip(income[..., None] - self.lower[year_index], 0.0, self.width[year_index])
+        return np.maximum(0.0, in_bracket @ self.rates - self.credit[year_index])
+
+    def tax_on_additional_income(
+        self, base_annual_income: np.ndarray, additional_annual_income: np.ndarray, year_index: int
+    ) -> np.ndarray:
+        """Vectorized calculate_tax_on_additional_income for ``years[year_index]``."""
+        additional = np.asarray(additional_annual_income, dtype=float)
+        base_tax = self.monthly_tax(base_annual_income / 12.0, year_index)
+        total_tax = self.monthly_tax((base_annual_income + additional) / 12.0, year_index)
+        return np.where(additional > 0, (total_tax - base_tax) * 12.0, 0.0)
+
+
 def calculate_tax_on_additional_income(
     base_annual_income: float, additional_annual_income: float, current_year: int
 ) -> float:
@@ -0,0 +1,210 @@
+"""
+Columnar iron-condor candidates.
+
+``ICCandidateGrid`` holds a whole grid search as parallel NumPy arrays — one
+row per candidate, one column per leg (short call, long call, short put,
+long put) — so net greeks, credit, margin and the expiration P&L of every
+candidate come from a handful of broadcasted operations.  Pydantic
+``OptionLeg`` / ``IronCondorStructure`` objects are only built for the rows
+a caller asks for (``materialize``), typically the top-k after ranking.
+
+Numbers match ``StructureFactory.create_iron_condor`` for the same legs.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import date
+from functools import cached_property
+from typing import Optional
+
+import numpy as np
+
+from ..models import GreekVector, IronCondorStructure, OptionLeg, PnLSimulation
+from .pricer import BlackScholesPricer
+from .structures import CHART_PCTS, SCENARIO_PCTS
+
+LEG_NAMES = ("short_call", "long_call", "short_put", "long_put")
+QUANTITIES = np.array([-1, 1, -1, 1])
+ACTIONS = ("sell", "buy", "sell", "buy")
+SIMULATION_PCTS = np.array(SCENARIO_PCTS + CHART_PCTS)
+
+_GREEKS = ("delta", "gamma", "theta", "vega")
+
+
+@dataclass
+class ICCandidateGrid:
+    """Every candidate of one grid search over a single-expiration chain.
+
+    ``calls`` / ``puts`` are the chain's legs sorted by strike; ``index`` is an
+    ``(n, 4)`` int array pointing into them (columns 0-1 into ``calls``,
+    2-3 into ``puts``).  Per-leg attributes are ``(n, 4)`` float arrays.
+    """
+
+    calls: list[OptionLeg]
+    puts: list[OptionLeg]
+    index: np.ndarray
+    spot_price: Optional[float]
+    reference_date: date
+    _legs: dict[str, np.ndarray] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        per_side = {}
+        for attr in ("strike", "price", "implied_volatility", *_GREEKS):
+            per_side[attr] = (self._side_column(self.calls, attr), self._side_column(self.puts, attr))
+        self._legs = {attr: self._gather(*columns) for attr, columns in per_side.items()}
+        call_dte = np.array([(leg.expiration - self.reference_date).days for leg in self.calls], dtype=int)
+        self.days_to_expiration = call_dte[self.index[:, 0]] if len(self) else np.empty(0, dtype=int)
+
+    @staticmethod
+    def _side_column(legs: Sequence[OptionLeg], attr: str) -> np.ndarray:
+        if attr in _GREEKS:
+            return np.array([getattr(leg.greeks, attr) for leg in legs], dtype=float)
+        if attr == "implied_volatility":
+            return np.array([np.nan if leg.implied_volatility is None else leg.implied_volatility for leg in legs])
+        return np.array([getattr(leg, attr) for leg in legs], dtype=float)
+
+    def _gather(self, call_values: np.ndarray, put_values: np.ndarray) -> np.ndarray:
+        if not len(self):
+            return np.empty((0, 4), dtype=call_values.dtype)
+        return np.column_stack(
+            [
+                call_values[self.index[:, 0]],
+                call_values[self.index[:, 1]],
+                put_values[self.index[:, 2]],
+                put_values[self.index[:, 3]],
+            ]
+        )
+
+    @classmethod
+    def build(
+        cls,
+        calls: dict[float, OptionLeg],
+        puts: dict[float, OptionLeg],
+        atm_strike: float,
+        step: float,
+        short_offset_steps: Sequence[int],
+        width_steps: Sequence[int],
+        spot_price: Optional[float],
+        reference_date: date,
+    ) -> "ICCandidateGrid":
+        """Enumerate every (short call, short put, call width, put width) combination.
+
+        Short strikes sit ``short_offset_steps`` strike steps away from ATM,
+        wings ``width_steps`` further out (call and put widths vary
+        independently, allowing broken wings).  Combinations whose four
+        strikes are not all in the chain are dropped.  Row order matches the
+        nested loops short call → short put → call width → put width.
+        """
+        call_legs = [calls[k] for k in sorted(calls)]
+        put_legs = [puts[k] for k in sorted(puts)]
+        call_strikes = np.array([leg.strike for leg in call_legs], dtype=float)
+        put_strikes = np.array([leg.strike for leg in put_legs], dtype=float)
+
+        offsets = np.asarray(short_offset_steps, dtype=float)
+        widths = np.asarray(width_steps, dtype=float)
+        sco, spo, cw, pw = (a.ravel() for a in np.meshgrid(offsets, offsets, widths, widths, indexing="ij"))
+        sc = atm_strike + (sco * step)
+        sp = atm_strike - (spo * step)
+        strikes = (sc, sc + (cw * step), sp, sp - (pw * step))
+
+        index = np.empty((sc.size, 4), dtype=int)
+        found = np.ones(sc.size, dtype=bool)
+        for col, (wanted, available) in enumerate(zip(strikes, (call_strikes, call_strikes, put_strikes, put_strikes))):
+            pos = np.minimum(np.searchsorted(available, wanted), max(available.size - 1, 0))
+            found &= available.size > 0
+            if available.size:
+                found &= available[pos] == wanted
+            index[:, col] = pos
+
+        return cls(
+            calls=call_legs,
+            puts=put_legs,
+            index=index[found],
+            spot_price=spot_price,
+            reference_date=reference_date,
+        )
+
+    def __len__(self) -> int:
+        return int(self.index.shape[0])
+
+    # ------------------------------------------------------------------
+    # Structure-level metrics (one value per candidate)
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def net_greeks(self) -> dict[str, np.ndarray]:
+        """Quantity-weighted greek sums keyed by greek name."""
+        q = QUANTITIES
+        return {
+            name: g[:, 0] * q[0] + g[:, 1] * q[1] + g[:, 2] * q[2] + g[:, 3] * q[3]
+            for name, g in ((name, self._legs[name]) for name in _GREEKS)
+        }
+
+    @cached_property
+    def net_credit(self) -> np.ndarray:
+        p = self._legs["price"]
+        return (p[:, 0] + p[:, 2]) - (p[:, 1] + p[:, 3])
+
+    @cached_property
+    def margin_requirement(self) -> np.ndarray:
+        k = self._legs["strike"]
+        return np.maximum(np.abs(k[:, 1] - k[:, 0]), np.abs(k[:, 2] - k[:, 3])) * 100
+
+    @property
+    def simulation_spots(self) -> np.ndarray:
+        return self.spot_price * (1 + SIMULATION_PCTS)
+
+    @cached_property
+    def expiration_pnl(self) -> np.ndarray:
+        """``(n, len(SIMULATION_PCTS))`` P&L at expiration for every candidate.
+
+        All candidates x simulated spots x legs are priced in one batch; legs
+        without an implied volatility are left out, as in ``StructureFactory``.
+        Requires ``spot_price``.
+        """
+        k = self._legs["strike"]
+        iv = self._legs["implied_volatility"]
+        is_call = np.array([True, True, False, False])
+        values = BlackScholesPricer.price_batch(
+            self.simulation_spots[None, :, None], k[:, None, :], 0.0, 0.045, np.nan_to_num(iv)[:, None, :], is_call
+        )
+        leg_pnls = (values - self._legs["price"][:, None, :]) * QUANTITIES * 100
+        leg_pnls = np.where(np.isnan(iv)[:, None, :], 0.0, leg_pnls)
+        return leg_pnls[..., 0] + leg_pnls[..., 1] + leg_pnls[..., 2] + leg_pnls[..., 3]
+
+    # ------------------------------------------------------------------
+    # Materialization
+    # ------------------------------------------------------------------
+
+    def materialize(self, row: int) -> IronCondorStructure:
+        """Build the pydantic structure for candidate *row*."""
+        i = self.index[row]
+        sources = (self.calls[i[0]], self.calls[i[1]], self.puts[i[2]], self.puts[i[3]])
+        legs = {}
+        for name, leg, action, quantity in zip(LEG_NAMES, sources, ACTIONS, QUANTITIES.tolist()):
+            leg = leg.model_copy()
+            leg.action = action
+            leg.quantity = quantity
+            legs[name] = leg
+
+        pnl_sims: list[PnLSimulation] = []
+        chart_data: list[PnLSimulation] = []
+        if self.spot_price:
+            sims = [
+                PnLSimulation(price_change_pct=pct * 100, underlying_price=spot, estimated_pnl=pnl)
+                for pct, spot, pnl in zip(
+                    SIMULATION_PCTS.tolist(), self.simulation_spots.tolist(), self.expiration_pnl[row].tolist()
+                )
+            ]
+            pnl_sims = sims[: len(SCENARIO_PCTS)]
+            chart_data = sims[len(SCENARIO_PCTS) :]
+
+        return IronCondorStructure(
+            **legs,
+            net_credit=float(self.net_credit[row]),
+            margin_requirement=float(self.margin_requirement[row]),
+            greeks=GreekVector(**{name: float(values[row]) for name, values in self.net_greeks.items()}),
+            days_to_expiration=int(self.days_to_expiration[row]),
+            pnl_simulations=pnl_sims,
+            chart_data=chart_data,
+        )
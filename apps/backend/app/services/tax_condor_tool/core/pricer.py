@@ -1,35 +1,96 @@
 import math
-from scipy.stats import norm
+
+import numpy as np
+from numpy.typing import ArrayLike
+from scipy.special import ndtr
+
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
 
 class BlackScholesPricer:
+    """Black-Scholes prices and greeks.
+
+    ``price_batch`` / ``greeks_batch`` take array-likes that broadcast against
+    each other (a whole chain of strikes, a grid of spots x legs, ...) and
+    evaluate them in one vectorized pass.  ``price`` / ``greeks`` are the
+    scalar entry points and simply unwrap a 0-d batch.
+    """
+
     @staticmethod
     def price(S: float, K: float, T: float, r: float, sigma: float, is_call: bool) -> float:
-        if T <= 0:
-            return max(0.0, S - K) if is_call else max(0.0, K - S)
+        return float(BlackScholesPricer.price_batch(S, K, T, r, sigma, is_call))
+
+    @staticmethod
+    def greeks(S: float, K: float, T: float, r: float, sigma: float, is_call: bool):
+        delta, gamma, theta, vega = BlackScholesPricer.greeks_batch(S, K, T, r, sigma, is_call)
+        return float(delta), float(gamma), float(theta), float(vega)
+
+    @staticmethod
+    def price_batch(
+        S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike, sigma: ArrayLike, is_call: ArrayLike
+    ) -> np.ndarray:
+        """Price every broadcast combination of the inputs.
+
+        Expired entries (``T <= 0``) price at intrinsic value.
+        """
 
-        d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * math.sqrt(T))
-        d2 = d1 - sigma * math.sqrt(T)
+        S, K, T, r, sigma, is_call = _broadcast(S, K, T, r, sigma, is_call)
+        live = T > 0
+        intrinsic = np.where(is_call, np.maximum(S - K, 0.0), np.maximum(K - S, 0.0))
+        if not live.any():
+            return intrinsic
 
-        if is_call:
-            return float(S * norm.cdf(d1) - K * math.exp(-r * T) * norm.cdf(d2))
-        else:
-            return float(K * math.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1))
+        d1, d2, T_live = _d1_d2(S, K, T, r, sigma, live)
+        discounted_strike = K * np.exp(-r * T_live)
+        call = S * ndtr(d1) - discounted_strike * ndtr(d2)
+        put = discounted_strike * ndtr(-d2) - S * ndtr(-d1)
+        return np.where(live, np.where(is_call, call, put), intrinsic)
 
     @staticmethod
-    def greeks(S: float, K: float, T: float, r: float, sigma: float, is_call: bool):
-        if T <= 0:
-            return 0.0, 0.0, 0.0, 0.0
+    def greeks_batch(
+        S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike, sigma: ArrayLike, is_call: ArrayLike
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``(delta, gamma, theta, vega)`` arrays; zeros where ``T <= 0``.
+
+        Theta is per calendar day and vega per 1% vol change, as in ``greeks``.
+        """
+
+        S, K, T, r, sigma, is_call = _broadcast(S, K, T, r, sigma, is_call)
+        live = T > 0
+        zeros = np.zeros_like(S)
+        if not live.any():
+            return zeros, zeros.copy(), zeros.copy(), zeros.copy()
 
-        d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * math.sqrt(T))
-        d2 = d1 - sigma * math.sqrt(T)
+        d1, d2, T_live = _d1_d2(S, K, T, r, sigma, live)
+        sqrt_t = np.sqrt(T_live)
+        pdf_d1 = np.exp(-0.5 * d1 * d1) * _INV_SQRT_2PI
+        cdf_d1 = ndtr(d1)
 
-        delta = float(norm.cdf(d1) if is_call else norm.cdf(d1) - 1)
-        gamma = float(norm.pdf(d1) / (S * sigma * math.sqrt(T)))
-        theta = float(-(S * norm.pdf(d1) * sigma) / (2 * math.sqrt(T)) - r * K * math.exp(-r * T) * norm.cdf(d2 if is_call else -d2))
-        vega = float(S * norm.pdf(d1) * math.sqrt(T))
+        delta = np.where(is_call, cdf_d1, cdf_d1 - 1)
+        gamma = pdf_d1 / (S * sigma * sqrt_t)
+        theta = -(S * pdf_d1 * sigma) / (2 * sqrt_t) - r * K * np.exp(-r * T_live) * ndtr(np.where(is_call, d2, -d2))
+        vega = S * pdf_d1 * sqrt_t
 
         # Normalize Theta/Vega to standard conventions (per day, per 1% vol change)
         theta = theta / 365.0
         vega = vega / 100.0
 
-        return delta, gamma, theta, vega
+        return tuple(np.where(live, greek, zeros) for greek in (delta, gamma, theta, vega))
+
+
+def _broadcast(
+    S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike, sigma: ArrayLike, is_call: ArrayLike
+) -> list[np.ndarray]:
+    floats = [np.asarray(value, dtype=float) for value in (S, K, T, r, sigma)]
+    return np.broadcast_arrays(*floats, np.asarray(is_call, dtype=bool))
+
+
+def _d1_d2(
+    S: np.ndarray, K: np.ndarray, T: np.ndarray, r: np.ndarray, sigma: np.ndarray, live: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Expired entries get a dummy T of 1 so the formulas stay finite; callers
+    # mask them back to intrinsic / zero.
+    T_live = np.where(live, T, 1.0)
+    vol_sqrt_t = sigma * np.sqrt(T_live)
+    d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T_live) / vol_sqrt_t
+    return d1, d1 - vol_sqrt_t, T_live
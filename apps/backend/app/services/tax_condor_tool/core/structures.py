@@ -1,7 +1,17 @@
 from datetime import date
+import numpy as np
 from ..models import OptionLeg, IronCondorStructure, GreekVector, PnLSimulation
 from ..core.pricer import BlackScholesPricer
 
+# Expiration P&L is simulated at these underlying moves (fractions of spot):
+# 1. Standard Scenarios (-5%, -2%, 0%, +2%, +5%)
+SCENARIO_PCTS = [-0.05, -0.02, 0.0, 0.02, 0.05]
+# 2. Chart Data (Granular range from -10% to +10%, 50 steps)
+_CHART_START, _CHART_END, _CHART_STEPS = -0.10, 0.10, 50
+CHART_PCTS = [
+    _CHART_START + (i * ((_CHART_END - _CHART_START) / _CHART_STEPS)) for i in range(_CHART_STEPS + 1)
+]
+
 class StructureFactory:
     @staticmethod
     def create_iron_condor(
@@ -67,57 +77,37 @@ class StructureFactory:
         if spot_price:
             r = 0.045 # Risk free rate
             T_sim = 0.0 # At expiration
-            
-            # 1. Standard Scenarios (-5%, -2%, 0%, +2%, +5%)
-            for pct_change in [-0.05, -0.02, 0.0, 0.02, 0.05]:
-                new_spot = spot_price * (1 + pct_change)
-                total_pnl = 0.0
-                
-                for leg in [short_call, long_call, short_put, long_put]:
-                    if leg.implied_volatility is None:
-                        continue
-                        
-                    is_call = leg.option_type == "call"
-                    # Calculate theoretical price at T_sim (Expiration)
-                    new_price = BlackScholesPricer.price(new_spot, leg.strike, T_sim, r, leg.implied_volatility, is_call)
-                    
-                    # PnL = (New Price - Old Price) * Quantity * 100
-                    # Note: leg.price is the CURRENT price (cost basis)
-                    leg_pnl = (new_price - leg.price) * leg.quantity * 100
-                    total_pnl += leg_pnl
-                
-                pnl_sims.append(PnLSimulation(
-                    price_change_pct=pct_change*100, 
-                    underlying_price=new_spot,
-                    estimated_pnl=total_pnl
-                ))
-                
-            # 2. Chart Data (Granular range from -10% to +10%)
-            # Generate 50 points
-            start_pct = -0.10
-            end_pct = 0.10
-            steps = 50
-            step_size = (end_pct - start_pct) / steps
-            
-            for i in range(steps + 1):
-                pct_change = start_pct + (i * step_size)
-                new_spot = spot_price * (1 + pct_change)
-                total_pnl = 0.0
-                
-                for leg in [short_call, long_call, short_put, long_put]:
-                    if leg.implied_volatility is None:
-                        continue
-                        
-                    is_call = leg.option_type == "call"
-                    new_price = BlackScholesPricer.price(new_spot, leg.strike, T_sim, r, leg.implied_volatility, is_call)
-                    leg_pnl = (new_price - leg.price) * leg.quantity * 100
-                    total_pnl += leg_pnl
-                    
-                chart_data.append(PnLSimulation(
-                    price_change_pct=pct_change*100,
-                    underlying_price=new_spot,
-                    estimated_pnl=total_pnl
-                ))
+
+            scenario_pcts = SCENARIO_PCTS
+            chart_pcts = CHART_PCTS
+
+            # Reprice every leg at every scenario/chart spot in one batch:
+            # rows are spots, columns are legs.
+            pcts = scenario_pcts + chart_pcts
+            spots = [spot_price * (1 + pct_change) for pct_change in pcts]
+            total_pnls = [0.0] * len(spots)
+            legs = [leg for leg in (short_call, long_call, short_put, long_put) if leg.implied_volatility is not None]
+            if legs:
+                # Theoretical price at T_sim (Expiration)
+                new_prices = BlackScholesPricer.price_batch(
+                    np.array(spots)[:, None],
+                    [leg.strike for leg in legs],
+                    T_sim,
+                    r,
+                    [leg.implied_volatility for leg in legs],
+                    [leg.option_type == "call" for leg in legs],
+                )
+                # PnL = (New Price - Old Price) * Quantity * 100
+                # Note: leg.price is the CURRENT price (cost basis)
+                leg_pnls = (new_prices - [leg.price for leg in legs]) * [leg.quantity for leg in legs] * 100
+                total_pnls = leg_pnls.sum(axis=1).tolist()
+
+            sims = [
+                PnLSimulation(price_change_pct=pct_change * 100, underlying_price=new_spot, estimated_pnl=total_pnl)
+                for pct_change, new_spot, total_pnl in zip(pcts, spots, total_pnls)
+            ]
+            pnl_sims = sims[: len(scenario_pcts)]
+            chart_data = sims[len(scenario_pcts) :]
 
         return IronCondorStructure(
             short_call=short_call,
@@ -1,7 +1,9 @@
 from typing import List
 import logging
 from datetime import date
+import numpy as np
 from ..models import TaxCondorRecommendation, LeapRecommendation, IronCondorStructure, PnLSimulation
+from ..core.ic_grid import ICCandidateGrid, SIMULATION_PCTS
 from ..core.pricer import BlackScholesPricer
 
 logger = logging.getLogger(__name__)
@@ -67,65 +69,22 @@ class Validator:
             portfolio_chart_data = []
             
             if spot_price:
-                days_elapsed = ic.days_to_expiration
-                leap_dte_at_sim = (leap.leg.expiration - reference_date).days - days_elapsed
-                T_leap_sim = max(0, leap_dte_at_sim / 365.0)
-                r = 0.045
-                
-                # 1. Standard Scenarios
-                if ic.pnl_simulations:
-                    for sim in ic.pnl_simulations:
-                        pct_change = sim.price_change_pct / 100.0
-                        new_spot = spot_price * (1 + pct_change)
-                        
-                        # Price LEAP at new spot and new time
-                        is_call = leap.leg.option_type == "call"
-                        vol = leap.leg.implied_volatility or 0.20
-                        
-                        new_leap_price = BlackScholesPricer.price(
-                            new_spot, 
-                            leap.leg.strike, 
-                            T_leap_sim, 
-                            r, 
-                            vol, 
-                            is_call
-                        )
-                        
-                        leap_pnl = (new_leap_price - leap.leg.price) * leap.leg.quantity * 100
-                        
-                        combined_pnl = sim.estimated_pnl + leap_pnl
-                        portfolio_sims.append(PnLSimulation(
-                            price_change_pct=sim.price_change_pct,
-                            underlying_price=new_spot,
-                            estimated_pnl=combined_pnl
-                        ))
-                
-                # 2. Chart Data
-                if ic.chart_data:
-                    for sim in ic.chart_data:
-                        pct_change = sim.price_change_pct / 100.0
-                        new_spot = spot_price * (1 + pct_change)
-                        
-                        is_call = leap.leg.option_type == "call"
-                        vol = leap.leg.implied_volatility or 0.20
-                        
-                        new_leap_price = BlackScholesPricer.price(
-                            new_spot, 
-                            leap.leg.strike, 
-                            T_leap_sim, 
-                            r, 
-                            vol, 
-                            is_call
-                        )
-                        
-                        leap_pnl = (new_leap_price - leap.leg.price) * leap.leg.quantity * 100
-                        combined_pnl = sim.estimated_pnl + leap_pnl
-                        
-                        portfolio_chart_data.append(PnLSimulation(
-                            price_change_pct=sim.price_change_pct,
-                            underlying_price=new_spot,
-                            estimated_pnl=combined_pnl
-                        ))
+                ic_sims = (ic.pnl_simulations or []) + (ic.chart_data or [])
+                new_spots = [spot_price * (1 + sim.price_change_pct / 100.0) for sim in ic_sims]
+                leap_pnls = _leap_pnl(leap, new_spots, ic.days_to_expiration, reference_date).tolist()
+
+                combined = []
+                for sim, new_spot, leap_pnl in zip(ic_sims, new_spots, leap_pnls):
+                    combined.append(PnLSimulation(
+                        price_change_pct=sim.price_change_pct,
+                        underlying_price=new_spot,
+                        estimated_pnl=sim.estimated_pnl + leap_pnl
+                    ))
+
+                # 1. Standard Scenarios, 2. Chart Data
+                scenario_count = len(ic.pnl_simulations or [])
+                portfolio_sims = combined[:scenario_count]
+                portfolio_chart_data = combined[scenario_count:]
 
             rec = TaxCondorRecommendation(
                 leap=leap,
@@ -146,3 +105,89 @@ class Validator:
         valid_recs.sort(key=lambda x: x.score, reverse=True)
         
         return valid_recs
+
+    def rank_grid(
+        self,
+        leap: LeapRecommendation,
+        grid: ICCandidateGrid,
+        budget: float,
+        spot_price: float = None,
+        reference_date: date = None,
+        top_k: int = 10,
+    ) -> List[TaxCondorRecommendation]:
+        """
+        Array-space ``rank_and_validate`` for a columnar candidate grid.
+
+        Filters and scores every candidate at once, then materializes only
+        the ``top_k`` best; the result equals
+        ``rank_and_validate(leap, <all candidates>, ...)[:top_k]``.
+        """
+        if reference_date is None:
+            reference_date = date.today()
+        if grid is None or not len(grid):
+            return []
+
+        leap_theta = leap.leg.greeks.theta
+        logger.info(f"Validating {len(grid)} ICs against LEAP theta: {leap_theta}")
+
+        # Same rules as rank_and_validate: non-negative theta coverage,
+        # max loss within budget, score = coverage + credit - delta penalty.
+        theta_coverage = grid.net_greeks["theta"] / abs(leap_theta) if leap_theta != 0 else np.zeros(len(grid))
+        max_loss = (grid.margin_requirement / 100) - grid.net_credit
+        portfolio_delta = leap.leg.greeks.delta + grid.net_greeks["delta"]
+        score = (theta_coverage * 10) + grid.net_credit - np.abs(portfolio_delta) * 50
+
+        rows = np.flatnonzero(~(theta_coverage < 0.0) & ~(max_loss > budget))
+        rows = rows[np.argsort(-score[rows], kind="stable")][:top_k]
+
+        portfolio_pnls = None
+        if spot_price and grid.spot_price:
+            new_spots = spot_price * (1 + (SIMULATION_PCTS * 100) / 100.0)
+            days_elapsed = grid.days_to_expiration[rows][:, None]
+            portfolio_pnls = grid.expiration_pnl[rows] + _leap_pnl(leap, new_spots, days_elapsed, reference_date)
+
+        recs = []
+        for i, row in enumerate(rows):
+            ic = grid.materialize(row)
+            portfolio_sims = []
+            portfolio_chart_data = []
+            if portfolio_pnls is not None:
+                combined = [
+                    PnLSimulation(price_change_pct=sim.price_change_pct, underlying_price=new_spot, estimated_pnl=pnl)
+                    for sim, new_spot, pnl in zip(
+                        ic.pnl_simulations + ic.chart_data, new_spots.tolist(), portfolio_pnls[i].tolist()
+                    )
+                ]
+                scenario_count = len(ic.pnl_simulations)
+                portfolio_sims = combined[:scenario_count]
+                portfolio_chart_data = combined[scenario_count:]
+
+            recs.append(TaxCondorRecommendation(
+                leap=leap,
+                iron_condor=ic,
+                score=float(score[row]),
+                analysis={
+                    "theta_coverage": float(theta_coverage[row]),
+                    "max_loss": float(max_loss[row]),
+                    "net_credit": ic.net_credit,
+                    "portfolio_delta": float(portfolio_delta[row])
+                },
+                portfolio_pnl_simulations=portfolio_sims,
+                portfolio_chart_data=portfolio_chart_data
+            ))
+
+        return recs
+
+
+def _leap_pnl(leap: LeapRecommendation, new_spots, days_elapsed, reference_date: date) -> np.ndarray:
+    """P&L of the LEAP at each new spot after ``days_elapsed`` days (inputs broadcast)."""
+    leap_dte_at_sim = (leap.leg.expiration - reference_date).days - np.asarray(days_elapsed)
+    T_leap_sim = np.maximum(0, leap_dte_at_sim / 365.0)
+    r = 0.045
+
+    # Price the LEAP at every scenario and chart spot (new spot, new time)
+    # in one batch.
+    is_call = leap.leg.option_type == "call"
+    vol = leap.leg.implied_volatility or 0.20
+    new_leap_prices = BlackScholesPricer.price_batch(new_spots, leap.leg.strike, T_leap_sim, r, vol, is_call)
+    return (new_leap_prices - leap.leg.price) * leap.leg.quantity * 100
@@ -35,12 +35,12 @@ class TaxCondorService:
         
         # 3. Generate ICs
         logger.info("Generating Iron Condor candidates...")
-        ics = await self.ic_generator.generate(symbol)
-        logger.info(f"Generated {len(ics)} IC candidates.")
+        grid = await self.ic_generator.generate_grid(symbol)
+        logger.info(f"Generated {len(grid) if grid else 0} IC candidates.")
         
-        # 4. Validate & Rank
+        # 4. Validate & Rank (only the top 10 are materialized)
         logger.info("Validating and ranking...")
-        recommendations = self.validator.rank_and_validate(leap_rec, ics, budget, spot_price=spot)
+        recommendations = self.validator.rank_grid(leap_rec, grid, budget, spot_price=spot, top_k=10)
         logger.info(f"Final recommendations count: {len(recommendations)}")
         
         # Enrich with underlying data
@@ -48,4 +48,4 @@ class TaxCondorService:
             rec.underlying_price = spot
             rec.underlying_iv = vol
 
-        return recommendations[:10]
+        return recommendations
@@ -0,0 +1,159 @@
+"""Compute-job handler for parameter-sweep backtests."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import text
+
+from app.services.backtest_service import BacktestService
+from app.services.backtester.sweep import DEFAULT_SWEEP_WORKERS, SweepConfig, VariantResult, expand_grid, run_sweep
+from app.worker.backtest_handler import (
+    BacktestJobRequest,
+    JobPayload,
+    JobResult,
+    SessionFactory,
+    _default_session_factory,
+    _normalize_for_json,
+    _parse_payload,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_SWEEP_VARIANTS = 256
+
+
+@dataclass(frozen=True)
+class BacktestSweepJobRequest:
+    """Validated payload for a queued sweep job."""
+
+    base: BacktestJobRequest
+    variants: list[dict[str, Any]]
+
+    @property
+    def sweep_config(self) -> SweepConfig:
+        start_date = date(self.base.year, 1, 1)
+        end_date = min(date(self.base.year, 12, 31), date.today())
+        return SweepConfig(
+            symbol=self.base.underlying,
+            leap_symbol=self.base.leap_underlying,
+            start_date=start_date,
+            end_date=end_date,
+            initial_capital=float(self.base.initial_capital),
+            step_days=self.base.step_days,
+        )
+
+
+def run_backtest_sweep_job(payload: JobPayload, session_factory: SessionFactory | None = None) -> JobResult:
+    """Run every variant of a sweep, writing one result row per variant as it finishes.
+
+    Variants an earlier attempt of this compute job already finished (a
+    retried or reclaimed job) are skipped, so a retry only reruns the rest.
+    """
+
+    try:
+        request = _parse_sweep_payload(payload)
+        factory = session_factory or _default_session_factory
+        _ensure_data(request.base)
+        counts = run_sweep(
+            request.sweep_config,
+            request.variants,
+            on_result=lambda result: _insert_variant_result(request.base, result, factory),
+            max_workers=_sweep_workers(),
+            skip=_recorded_variants(request.base.compute_job_id, factory),
+        )
+        return {"variants": len(request.variants), **counts}
+    except Exception:
+        logger.exception("Backtest sweep compute job failed")
+        raise
+
+
+def _parse_sweep_payload(payload: JobPayload) -> BacktestSweepJobRequest:
+    """Validate the shared backtest settings plus the parameter grid."""
+
+    base = _parse_payload(payload)
+    grid = base.config.get("grid")
+    if not isinstance(grid, dict) or not grid:
+        raise ValueError("Backtest sweep config must include a non-empty grid object.")
+    if not all(isinstance(values, list) for values in grid.values()):
+        raise ValueError("Backtest sweep grid values must be lists.")
+    try:
+        variants = expand_grid(grid)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Backtest sweep grid is invalid: {exc}") from exc
+    if len(variants) > MAX_SWEEP_VARIANTS:
+        raise ValueError(f"Backtest sweep grid has {len(variants)} variants; the limit is {MAX_SWEEP_VARIANTS}.")
+    return BacktestSweepJobRequest(base, variants)
+
+
+def _ensure_data(request: BacktestJobRequest) -> None:
+    """Sync missing daily bars for the sweep's underlyings before fanning out."""
+
+    service = BacktestService()
+    asyncio.run(service.ensure_data_for_year(request.year, request.underlying))
+    if request.leap_underlying != request.underlying:
+        asyncio.run(service.ensure_data_for_year(request.year, request.leap_underlying))
+
+
+def _sweep_workers() -> int:
+    """Return the sweep process count (``BACKTEST_SWEEP_WORKERS``)."""
+
+    raw_value = os.getenv("BACKTEST_SWEEP_WORKERS", str(DEFAULT_SWEEP_WORKERS))
+    try:
+        value = int(raw_value)
+    except ValueError:
+        logger.warning("Invalid BACKTEST_SWEEP_WORKERS=%s; using default", raw_value)
+        return DEFAULT_SWEEP_WORKERS
+    return max(1, value)
+
+
+def _recorded_variants(compute_job_id: UUID, factory: SessionFactory) -> set[int]:
+    """Return the variant indexes an earlier attempt of this job completed."""
+
+    with factory() as session:
+        rows = session.execute(
+            text(
+                "select variant_index from public.backtest_sweep_results "
+                "where compute_job_id = :compute_job_id and status = 'done'"
+            ),
+            {"compute_job_id": str(compute_job_id)},
+        ).all()
+    return {int(row[0]) for row in rows}
+
+
+def _insert_variant_result(request: BacktestJobRequest, result: VariantResult, factory: SessionFactory) -> None:
+    """Upsert one variant's summary row."""
+
+    with factory() as session:
+        session.execute(
+            text("""
+                insert into public.backtest_sweep_results
+                  (household_id, compute_job_id, variant_index, params, status, summary, error)
+                values
+                  (:household_id, :compute_job_id, :variant_index, cast(:params as jsonb), :status,
+                   cast(:summary as jsonb), :error)
+                on conflict (compute_job_id, variant_index) do update
+                  set params = excluded.params,
+                      status = excluded.status,
+                      summary = excluded.summary,
+                      error = excluded.error,
+                      finished_at = now()
+                """),
+            {
+                "household_id": str(request.household_id),
+                "compute_job_id": str(request.compute_job_id),
+                "variant_index": result.index,
+                "params": json.dumps(_normalize_for_json(result.params)),
+                "status": "failed" if result.error else "done",
+                "summary": None if result.summary is None else json.dumps(_normalize_for_json(result.summary)),
+                "error": result.error,
+            },
+        )
+        session.commit()
@@ -2,16 +2,23 @@
 
 Scans ``reports/credit-card/inbox/`` every 60 seconds, ingests new PDFs:
 
-1. SHA-256 dedup (``file_hash`` check against ``expense_inbox`` table).
-2. Insert ``expense_inbox`` row (status=processing).
-3. ``dispatch_pdf()`` → ``ParsedStatement``
-   (includes 30 s thread-safe timeout + 5 MB file cap + 500 KB text cap).
+1. SHA-256 every inbox file; dedup the whole batch against
+   ``expense_inbox`` in one query.
+2. Insert ``expense_inbox`` rows (status=processing) in one commit.
+3. ``dispatch_pdf()`` → ``ParsedStatement``, in parallel across the parse
+   pool (includes 30 s hard-kill timeout + 5 MB file cap + 500 KB text cap).
 4. Build ``CreditCardStatement`` + ``CreditCardTransaction`` rows.
 5. ``CategoryResolver.resolve()`` for each transaction.
-6. INSERT into ``credit_card_statements`` + ``credit_card_transactions``.
+6. INSERT into ``credit_card_statements`` + ``credit_card_transactions``
+   (transactions as one batched INSERT per statement; the
+   ``credit_card_transactions`` trigger adds them to
+   ``expense_monthly_rollups``).
 7. UPDATE ``expense_inbox`` row (status=completed, processed_at=now()).
 8. Move inbox file → ``/processed/`` (or ``/errors/`` on failure).
 
+Steps 4-8 run on the scanning thread as parse results arrive, so there is
+a single DB writer no matter how many statements parse concurrently.
+
 Failure handling:
     Typed exceptions from the dispatcher (``ParserError`` subclasses) are
     caught; ``expense_inbox.status`` is set to ``'errored'``,
@@ -30,12 +37,13 @@ Retry policy (v1):
       permanently and skipped on subsequent scans.
 
 Concurrency:
-    A module-level ``threading.Lock`` prevents two APScheduler ticks from
-    running ``scan_inbox_once`` concurrently within the same process.
-
-    TODO(future): If the worker ever scales to multiple instances this
-    in-process lock will race.  Replace with a distributed advisory lock
-    (Postgres ``pg_try_advisory_lock`` or Redis SETNX) before scaling out.
+    Each scan holds a lease for its whole pass (``_scan_lease``): a
+    module-level ``threading.Lock`` stops two APScheduler ticks in the same
+    process, and on PostgreSQL a session-level ``pg_try_advisory_lock``,
+    taken on a direct (non-pooler) connection, stops scans in other worker
+    processes or instances.  A tick that cannot
+    take the lease is skipped, so a long scan is never re-entered and no
+    file is ever processed twice.
 
 Watchdog note:
     60 s polling is simpler and consistent with the existing worker patterns.
@@ -54,6 +62,8 @@ Environment variables:
     CREDIT_CARD_INBOX_ENABLED
         Set to ``"false"`` / ``"0"`` to disable job registration at startup.
         Default: enabled.
+    CREDIT_CARD_PARSE_WORKERS
+        Number of parse worker processes.  Default: ``min(4, cpu_count)``.
     CREDIT_CARD_DEFAULT_HOUSEHOLD_ID
         UUID string of the household to use when processing PDFs.
         If unset the worker queries the DB and picks the single household
@@ -69,24 +79,29 @@ import logging
 import os
 import shutil
 import threading
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import AbstractContextManager, contextmanager
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 from uuid import UUID, uuid4
 
+from sqlalchemy import Engine, insert, text
 from sqlmodel import Session, select
 
-from app.dal.database import engine
+from app.dal.database import direct_engine, engine
 from app.schema.expenses import (
     CreditCardStatement,
     CreditCardTransaction,
     ExpenseInbox,
 )
 from app.schema.household_models import Household
-from app.services.expenses.categorize import CategoryResolver
+from app.services.expenses.categorize import CategoryResolver, MerchantMappingCache
+from app.services.expenses.parsers import ParsedStatement, ParserError
 from app.services.expenses.parsers.dispatcher import dispatch_pdf
+from app.services.expenses.parsers.pool import get_parse_pool
 
 logger = logging.getLogger(__name__)
 
@@ -103,8 +118,8 @@ ERRORS_DIR: Path = INBOX_DIR.parent / "errors"
 _MAX_RETRY: int = 3
 _BACKPRESSURE_WARN_THRESHOLD: int = 50
 
-# In-process lock: prevents two APScheduler ticks from running scan_inbox_once
-# concurrently within the same worker process.
+# In-process half of the scan lease: prevents two APScheduler ticks from
+# running scan_inbox_once concurrently within the same worker process.
 _scan_lock = threading.Lock()
 
 # ---------------------------------------------------------------------------
@@ -303,6 +318,351 @@ def _reset_orphaned_processing_rows(db: Session) -> int:
     return len(orphaned)
 
 
+# ---------------------------------------------------------------------------
+# Scan lease
+# ---------------------------------------------------------------------------
+
+# Stable advisory-lock key for the inbox scan (ASCII "ccinbox").
+_SCAN_LEASE_KEY: int = 0x6363696E626F78
+
+
+@contextmanager
+def _scan_lease(session_factory: SessionFactory) -> Iterator[bool]:
+    """Hold the inbox scan lease for the duration of the ``with`` block.
+
+    Yields ``True`` when this caller owns the lease and ``False`` when another
+    scan already holds it.  ``_scan_lock`` covers overlapping APScheduler
+    ticks in this process; on PostgreSQL a session-level advisory lock, held
+    on a dedicated connection, also covers other worker processes and
+    instances.  If the holder dies its connection closes and the server drops
+    the lock, so a crashed scan never wedges the inbox.
+
+    The web engine goes through the transaction-mode pooler, which may hand
+    the server session to another client between transactions, so the lock
+    is taken through ``direct_engine`` instead.
+    """
+    if not _scan_lock.acquire(blocking=False):
+        yield False
+        return
+    try:
+        with session_factory() as db:
+            bind = db.get_bind().engine
+        if bind.dialect.name != "postgresql":
+            yield True
+            return
+        with _lease_engine(bind).connect() as conn:
+            if not conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": _SCAN_LEASE_KEY}).scalar():
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _SCAN_LEASE_KEY})
+    finally:
+        _scan_lock.release()
+
+
+def _lease_engine(bind: Engine) -> Engine:
+    """Return the engine whose connections keep a session-level lock: never the pooler."""
+    return direct_engine if bind is engine else bind
+
+
+# ---------------------------------------------------------------------------
+# Pipeline stages: hash + dedup → parallel parse → single writer
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class _InboxFile:
+    """One inbox PDF with its basename-only name and content hash."""
+
+    path: Path
+    safe_name: str
+    file_hash: str
+    file_size: int
+
+    @classmethod
+    def read(cls, pdf_path: Path) -> _InboxFile:
+        # Security: basename-only name for all filesystem operations.
+        return cls(pdf_path, _sanitize_filename(pdf_path.name), _sha256_file(pdf_path), pdf_path.stat().st_size)
+
+
+def _read_inbox_file(db: Session, pdf_path: Path) -> Optional[_InboxFile]:
+    """Hash *pdf_path*, or record the failure and return ``None`` if it cannot be read.
+
+    A file that vanishes or turns unreadable mid-scan must not abort the pass
+    for every other file.  It has no inbox row yet, so only the errors/ move
+    and sidecar are recorded.
+    """
+    try:
+        return _InboxFile.read(pdf_path)
+    except OSError as exc:
+        _record_failure(db, _InboxFile(pdf_path, _sanitize_filename(pdf_path.name), "", 0), None, exc)
+        return None
+
+
+def _move_duplicate(inbox_file: _InboxFile) -> None:
+    """Move a duplicate of an already-completed PDF to processed/ silently.
+
+    The unique constraint on ``file_hash`` prevents inserting a second DB row,
+    so no DB write is needed: the original row is the authoritative record.
+    """
+    PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
+    dest = PROCESSED_DIR / inbox_file.safe_name
+    try:
+        shutil.move(str(inbox_file.path), str(dest))
+        os.chmod(dest, 0o600)
+    except OSError as exc:
+        logger.warning(
+            "expenses_inbox: could not move duplicate %r to processed/: %s",
+            inbox_file.safe_name,
+            exc,
+        )
+    logger.debug(
+        "expenses_inbox: duplicate %r (hash=%s…) — skipped",
+        inbox_file.safe_name,
+        inbox_file.file_hash[:8],
+    )
+
+
+def _claim_files(
+    db: Session,
+    files: list[_InboxFile],
+    household_id: UUID,
+    counts: dict[str, int],
+) -> tuple[list[tuple[_InboxFile, UUID]], list[_InboxFile]]:
+    """Dedup *files* against ``expense_inbox`` in one query and claim the rest.
+
+    Duplicates of completed PDFs are moved to processed/ and files that hit
+    the retry limit to errors/ (both tallied into *counts*).  Every remaining
+    file gets a ``processing`` inbox row, all committed together (Phase 1:
+    durable before any parsing begins).
+
+    Returns ``(claimed, deferred)``: ``(file, inbox_id)`` pairs to parse, and
+    later copies of a hash already claimed in this batch — those are settled
+    once the first copy's outcome is known.
+    """
+    hashes = {f.file_hash for f in files}
+    existing = {
+        row.file_hash: row
+        for row in (db.exec(select(ExpenseInbox).where(ExpenseInbox.file_hash.in_(hashes))).all() if hashes else [])
+    }
+
+    claimed: list[tuple[_InboxFile, UUID]] = []
+    deferred: list[_InboxFile] = []
+    seen: set[str] = set()
+    for inbox_file in files:
+        if inbox_file.file_hash in seen:
+            deferred.append(inbox_file)
+            continue
+        seen.add(inbox_file.file_hash)
+
+        row = existing.get(inbox_file.file_hash)
+        if row is not None and row.status == "completed":
+            _move_duplicate(inbox_file)
+            counts["deduped"] += 1
+            continue
+
+        if row is not None and row.status == "errored" and (row.retry_count or 0) >= _MAX_RETRY:
+            # Max retries reached — move to /errors/ and leave it there.
+            _move_to_errors(inbox_file.path, inbox_file.safe_name, "Max retry limit reached")
+            logger.debug(
+                "expenses_inbox: %r hit max retries (%d) — moved to errors/ permanently",
+                inbox_file.safe_name,
+                _MAX_RETRY,
+            )
+            counts["errored"] += 1
+            continue
+
+        if row is not None:
+            # Retry path: reuse existing row; retry_count incremented on failure.
+            row.status = "processing"
+            row.error_message = None
+        else:
+            row = ExpenseInbox(
+                id=uuid4(),
+                file_path=inbox_file.safe_name,
+                file_hash=inbox_file.file_hash,
+                file_size_bytes=inbox_file.file_size,
+                status="processing",
+                retry_count=0,
+                household_id=household_id,
+                submitted_at=datetime.utcnow(),
+            )
+        db.add(row)
+        claimed.append((inbox_file, row.id))
+
+    db.commit()  # Phase 1 commit — inbox rows now durable
+    return claimed, deferred
+
+
+def _parse_claimed(
+    claimed: list[tuple[_InboxFile, UUID]],
+) -> Iterator[tuple[_InboxFile, UUID, Optional[ParsedStatement], Optional[Exception]]]:
+    """Parse claimed PDFs across the parse pool, yielding results as they finish.
+
+    One feeder thread per pool worker keeps every worker process busy; the
+    caller consumes results on its own thread, so all DB writes stay on a
+    single writer.
+    """
+    pool = get_parse_pool()
+    with ThreadPoolExecutor(max_workers=pool.max_workers, thread_name_prefix="cc-inbox-parse") as executor:
+        # dispatch_pdf() enforces a 30 s hard-kill timeout + size caps (Rabin CC-5 §1.1).
+        futures = {
+            executor.submit(dispatch_pdf, str(inbox_file.path), pool=pool): (inbox_file, inbox_id)
+            for inbox_file, inbox_id in claimed
+        }
+        for future in as_completed(futures):
+            inbox_file, inbox_id = futures[future]
+            try:
+                parsed = future.result()
+            except Exception as exc:
+                yield inbox_file, inbox_id, None, exc
+            else:
+                yield inbox_file, inbox_id, parsed, None
+
+
+def _persist_statement(
+    db: Session,
+    inbox_file: _InboxFile,
+    inbox_id: UUID,
+    parsed: ParsedStatement,
+    household_id: UUID,
+    resolver: CategoryResolver,
+) -> None:
+    """Categorise and write one parsed statement, then commit (Phase 2).
+
+    Transactions go in as a single executemany INSERT; the statement, its
+    transactions, the mapping-count bumps and the inbox status flip commit
+    atomically, so partial statements never persist.
+    """
+    stmt = CreditCardStatement(
+        id=uuid4(),
+        inbox_id=inbox_id,
+        file_hash=inbox_file.file_hash,
+        source_file_path=inbox_file.safe_name,
+        issuer=parsed.issuer,
+        # TODO(future): FK to household_members when that table exists.
+        cardholder_name=parsed.cardholder_name,
+        card_last4=parsed.card_last4,
+        period_from=datetime.combine(parsed.period_from, datetime.min.time()),
+        period_to=datetime.combine(parsed.period_to, datetime.min.time()),
+        total_amount_ils=parsed.total_amount_ils,
+        txn_count=len(parsed.transactions),
+        parse_warnings=parsed.parse_warnings or None,
+        household_id=household_id,
+        ingested_at=datetime.utcnow(),
+    )
+    db.add(stmt)
+    db.flush()  # Materialise stmt.id without committing yet.
+
+    # Tier-3 mappings are loaded once per statement; their match_count
+    # bumps are flushed with the rest of the Phase 2 transaction.
+    mappings = MerchantMappingCache(db, household_id)
+    txn_rows = []
+    for txn in parsed.transactions:
+        assignment = resolver.resolve(txn, db, household_id, mappings=mappings)
+        txn_rows.append(
+            {
+                "id": uuid4(),
+                "statement_id": stmt.id,
+                "txn_date": datetime.combine(txn.txn_date, datetime.min.time()),
+                "posting_date": (datetime.combine(txn.posting_date, datetime.min.time()) if txn.posting_date else None),
+                "merchant_raw": txn.merchant_raw,
+                "merchant_normalized": txn.merchant_normalized,
+                "amount_ils": txn.amount_ils,
+                "amount_original": txn.amount_original,
+                "original_currency": txn.original_currency,
+                "fx_rate": txn.fx_rate,
+                "installment_num": txn.installment_num,
+                "installment_total": txn.installment_total,
+                "sector_raw": txn.sector_raw,
+                "category_id": assignment.category_id,
+                "subcategory_id": assignment.subcategory_id,
+                "resolution_status": assignment.resolution_status,
+                "resolution_source": assignment.resolution_source,
+                "household_id": household_id,
+            }
+        )
+    if txn_rows:
+        # render_nulls keeps every row on the same column set, so the batch
+        # stays one executemany instead of splitting on which fields are None.
+        db.execute(insert(CreditCardTransaction).execution_options(render_nulls=True), txn_rows)
+
+    mappings.flush()
+
+    # Mark inbox row completed and commit everything atomically.
+    inbox_row = db.exec(select(ExpenseInbox).where(ExpenseInbox.id == inbox_id)).one()
+    inbox_row.status = "completed"
+    inbox_row.processed_at = datetime.utcnow()
+    db.add(inbox_row)
+    db.commit()  # Phase 2 atomic commit
+
+    # Move to /processed/ — Rabin §2.2: file permissions 0600.
+    PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
+    dest = PROCESSED_DIR / inbox_file.safe_name
+    shutil.move(str(inbox_file.path), str(dest))
+    try:
+        os.chmod(dest, 0o600)
+    except OSError:
+        pass
+
+    logger.debug(
+        "expenses_inbox: completed %r — issuer=%s txns=%d",
+        inbox_file.safe_name,
+        parsed.issuer,
+        len(parsed.transactions),
+    )
+
+
+def _record_failure(db: Session, inbox_file: _InboxFile, inbox_id: Optional[UUID], exc: Exception) -> None:
+    """Mark the inbox row errored, bump retry_count and move the file to errors/.
+
+    *inbox_id* is ``None`` for a file that failed before it was claimed.
+    """
+    db.rollback()
+
+    # Re-query inbox row (phase-1 commit survived the rollback).
+    inbox_row = None
+    if inbox_id is not None:
+        inbox_row = db.exec(select(ExpenseInbox).where(ExpenseInbox.id == inbox_id)).first()
+    if inbox_row is not None:
+        inbox_row.status = "errored"
+        inbox_row.error_message = str(exc)[:1024]
+        inbox_row.retry_count = (inbox_row.retry_count or 0) + 1
+        db.add(inbox_row)
+        db.commit()
+
+    _move_to_errors(inbox_file.path, inbox_file.safe_name, str(exc))
+
+    logger.debug(
+        "expenses_inbox: errored %r retry=%d exc=%s",
+        inbox_file.safe_name,
+        inbox_row.retry_count if inbox_row else 1,
+        type(exc).__name__,
+    )
+
+
+def _write_result(
+    db: Session,
+    inbox_file: _InboxFile,
+    inbox_id: UUID,
+    parsed: Optional[ParsedStatement],
+    error: Optional[Exception],
+    household_id: UUID,
+    resolver: CategoryResolver,
+) -> str:
+    """Persist one parse outcome and return ``'completed'`` or ``'errored'``."""
+    if parsed is not None:
+        try:
+            _persist_statement(db, inbox_file, inbox_id, parsed, household_id, resolver)
+            return "completed"
+        except Exception as exc:
+            error = exc
+    _record_failure(db, inbox_file, inbox_id, error or ParserError("No parse result"))
+    return "errored"
+
+
 # ---------------------------------------------------------------------------
 # Per-PDF processing
 # ---------------------------------------------------------------------------
@@ -316,14 +676,17 @@ def process_one_pdf(
 ) -> str:
     """Process one PDF end-to-end and return the terminal status string.
 
+    Runs the same stages as :func:`scan_inbox_once` for a single file,
+    without the lease or parallel parsing.
+
     Parameters
     ----------
     pdf_path:     Absolute path to the PDF file in the inbox directory.
     db:           Active SQLModel session.  All DB writes per PDF are
                   committed atomically (partial statements never persist).
     household_id: UUID of the target household.
-    resolver:     ``CategoryResolver`` instance.  Pass a shared instance from
-                  the scan loop to avoid reloading 100+ regexes per PDF.
+    resolver:     ``CategoryResolver`` instance.  Pass a shared instance
+                  to avoid reloading 100+ regexes per PDF.
 
     Returns
     -------
@@ -332,184 +695,27 @@ def process_one_pdf(
     Security (Rabin CC-5):
     - ``_sanitize_filename()`` strips any directory components before any
       filesystem operation (path-traversal defence).
-    - ``dispatch_pdf()`` enforces 30 s thread-safe timeout, 5 MB file cap,
+    - ``dispatch_pdf()`` enforces a 30 s hard-kill timeout, 5 MB file cap,
       and 500 KB extracted-text cap.
     - Processed/error files are set to ``0600``.
     """
     if resolver is None:
         resolver = CategoryResolver()
 
-    # Security: basename-only name for all filesystem operations.
-    safe_name = _sanitize_filename(pdf_path.name)
-    file_hash = _sha256_file(pdf_path)
-    file_size = pdf_path.stat().st_size
-
-    # ── Dedup: already-completed row with same hash? ─────────────────────
-    already_done = db.exec(
-        select(ExpenseInbox).where(
-            ExpenseInbox.file_hash == file_hash,
-            ExpenseInbox.status == "completed",
-        )
-    ).first()
-
-    if already_done is not None:
-        # Duplicate of an already-completed PDF — the unique constraint on
-        # file_hash prevents inserting a second DB row, so just move the file
-        # to processed/ silently.  No DB write needed: the original row is the
-        # authoritative record.
-        PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
-        dest = PROCESSED_DIR / safe_name
-        try:
-            shutil.move(str(pdf_path), str(dest))
-            os.chmod(dest, 0o600)
-        except OSError as exc:
-            logger.warning(
-                "expenses_inbox: could not move duplicate %r to processed/: %s",
-                safe_name,
-                exc,
-            )
-        logger.debug(
-            "expenses_inbox: duplicate %r (hash=%s…) — skipped",
-            safe_name,
-            file_hash[:8],
-        )
-        return "duplicate"
-
-    # ── Check existing errored row (retry logic) ─────────────────────────
-    errored_row = db.exec(
-        select(ExpenseInbox).where(
-            ExpenseInbox.file_hash == file_hash,
-            ExpenseInbox.status == "errored",
-        )
-    ).first()
-
-    if errored_row is not None and (errored_row.retry_count or 0) >= _MAX_RETRY:
-        # Max retries reached — move to /errors/ and leave it there.
-        _move_to_errors(pdf_path, safe_name, "Max retry limit reached")
-        logger.debug(
-            "expenses_inbox: %r hit max retries (%d) — moved to errors/ permanently",
-            safe_name,
-            _MAX_RETRY,
-        )
+    inbox_file = _read_inbox_file(db, pdf_path)
+    if inbox_file is None:
         return "errored"
+    counts = _empty_counts()
+    claimed, _ = _claim_files(db, [inbox_file], household_id, counts)
+    if not claimed:
+        return "duplicate" if counts["deduped"] else "errored"
 
-    # ── Phase 1: commit inbox row (durable before any parsing begins) ─────
-    if errored_row is not None:
-        # Retry path: reuse existing row; retry_count incremented on failure.
-        inbox_id: UUID = errored_row.id
-        errored_row.status = "processing"
-        errored_row.error_message = None
-        db.add(errored_row)
-    else:
-        new_row = ExpenseInbox(
-            id=uuid4(),
-            file_path=safe_name,
-            file_hash=file_hash,
-            file_size_bytes=file_size,
-            status="processing",
-            retry_count=0,
-            household_id=household_id,
-            submitted_at=datetime.utcnow(),
-        )
-        db.add(new_row)
-        inbox_id = new_row.id
-
-    db.commit()  # Phase 1 commit — inbox row now durable
-
-    # ── Phase 2: parse → categorise → persist (single atomic transaction) ─
+    ((inbox_file, inbox_id),) = claimed
     try:
-        # dispatch_pdf() enforces 30 s thread-safe timeout + size caps (Rabin CC-5 §1.1).
-        parsed = dispatch_pdf(str(pdf_path))
-
-        stmt = CreditCardStatement(
-            id=uuid4(),
-            inbox_id=inbox_id,
-            file_hash=file_hash,
-            source_file_path=safe_name,
-            issuer=parsed.issuer,
-            # TODO(future): FK to household_members when that table exists.
-            cardholder_name=parsed.cardholder_name,
-            card_last4=parsed.card_last4,
-            period_from=datetime.combine(parsed.period_from, datetime.min.time()),
-            period_to=datetime.combine(parsed.period_to, datetime.min.time()),
-            total_amount_ils=parsed.total_amount_ils,
-            txn_count=len(parsed.transactions),
-            parse_warnings=parsed.parse_warnings or None,
-            household_id=household_id,
-            ingested_at=datetime.utcnow(),
-        )
-        db.add(stmt)
-        db.flush()  # Materialise stmt.id without committing yet.
-
-        for txn in parsed.transactions:
-            assignment = resolver.resolve(txn, db, household_id)
-            cc_txn = CreditCardTransaction(
-                id=uuid4(),
-                statement_id=stmt.id,
-                txn_date=datetime.combine(txn.txn_date, datetime.min.time()),
-                posting_date=(datetime.combine(txn.posting_date, datetime.min.time()) if txn.posting_date else None),
-                merchant_raw=txn.merchant_raw,
-                merchant_normalized=txn.merchant_normalized,
-                amount_ils=txn.amount_ils,
-                amount_original=txn.amount_original,
-                original_currency=txn.original_currency,
-                fx_rate=txn.fx_rate,
-                installment_num=txn.installment_num,
-                installment_total=txn.installment_total,
-                sector_raw=txn.sector_raw,
-                category_id=assignment.category_id,
-                subcategory_id=assignment.subcategory_id,
-                resolution_status=assignment.resolution_status,
-                resolution_source=assignment.resolution_source,
-                household_id=household_id,
-            )
-            db.add(cc_txn)
-
-        # Mark inbox row completed and commit everything atomically.
-        inbox_row = db.exec(select(ExpenseInbox).where(ExpenseInbox.id == inbox_id)).one()
-        inbox_row.status = "completed"
-        inbox_row.processed_at = datetime.utcnow()
-        db.add(inbox_row)
-        db.commit()  # Phase 2 atomic commit
-
-        # Move to /processed/ — Rabin §2.2: file permissions 0600.
-        PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
-        dest = PROCESSED_DIR / safe_name
-        shutil.move(str(pdf_path), str(dest))
-        try:
-            os.chmod(dest, 0o600)
-        except OSError:
-            pass
-
-        logger.debug(
-            "expenses_inbox: completed %r — issuer=%s txns=%d",
-            safe_name,
-            parsed.issuer,
-            len(parsed.transactions),
-        )
-        return "completed"
-
+        parsed, error = dispatch_pdf(str(inbox_file.path)), None
     except Exception as exc:
-        db.rollback()
-
-        # Re-query inbox row (phase-1 commit survived the rollback).
-        inbox_row = db.exec(select(ExpenseInbox).where(ExpenseInbox.id == inbox_id)).first()
-        if inbox_row is not None:
-            inbox_row.status = "errored"
-            inbox_row.error_message = str(exc)[:1024]
-            inbox_row.retry_count = (inbox_row.retry_count or 0) + 1
-            db.add(inbox_row)
-            db.commit()
-
-        _move_to_errors(pdf_path, safe_name, str(exc))
-
-        logger.debug(
-            "expenses_inbox: errored %r retry=%d exc=%s",
-            safe_name,
-            inbox_row.retry_count if inbox_row else 1,
-            type(exc).__name__,
-        )
-        return "errored"
+        parsed, error = None, exc
+    return _write_result(db, inbox_file, inbox_id, parsed, error, household_id, resolver)
 
 
 # ---------------------------------------------------------------------------
@@ -517,6 +723,10 @@ def process_one_pdf(
 # ---------------------------------------------------------------------------
 
 
+def _empty_counts() -> dict[str, int]:
+    return {"scanned": 0, "completed": 0, "deduped": 0, "errored": 0}
+
+
 def scan_inbox_once(
     session_factory: SessionFactory | None = None,
     household_id: UUID | None = None,
@@ -527,6 +737,12 @@ def scan_inbox_once(
     The scheduler calls this as a zero-argument callable; the optional
     parameters exist for dependency injection in tests.
 
+    Pipeline: hash every inbox file and dedup them in one query, claim the
+    new ones in one commit, parse them in parallel on the parse pool, and
+    persist each result from this thread (the single writer) as it arrives.
+    The whole pass runs under the scan lease, so overlapping ticks or
+    worker instances never double-process a file.
+
     Returns a dict with scan counts::
 
         {'scanned': N, 'completed': M, 'deduped': K, 'errored': L}
@@ -536,21 +752,15 @@ def scan_inbox_once(
     (Rabin CC-5 §3.1 PII condition).  Transaction-level details are at
     DEBUG only.
     """
-    if not _scan_lock.acquire(blocking=False):
-        logger.debug("expenses_inbox: previous scan still running; skipping this tick")
-        return {"scanned": 0, "completed": 0, "deduped": 0, "errored": 0}
-
-    counts: dict[str, int] = {
-        "scanned": 0,
-        "completed": 0,
-        "deduped": 0,
-        "errored": 0,
-    }
+    counts = _empty_counts()
+    sf: SessionFactory = session_factory or _default_session
 
-    try:
-        _ensure_dirs()
+    with _scan_lease(sf) as leased:
+        if not leased:
+            logger.debug("expenses_inbox: another scan holds the inbox lease; skipping this tick")
+            return counts
 
-        sf: SessionFactory = session_factory or _default_session
+        _ensure_dirs()
 
         # Resolve household_id once per cycle.
         with sf() as db:
@@ -578,20 +788,31 @@ def scan_inbox_once(
 
         # Shared resolver — avoids reloading 100+ regexes per PDF.
         resolver = CategoryResolver()
+        completed_hashes: set[str] = set()
 
-        for pdf_path in pdf_files:
-            with sf() as db:
-                status = process_one_pdf(pdf_path, db, hh_id, resolver)
-
-            if status == "completed":
-                counts["completed"] += 1
-            elif status == "duplicate":
+        with sf() as db:
+            files = []
+            for pdf_path in pdf_files:
+                inbox_file = _read_inbox_file(db, pdf_path)
+                if inbox_file is None:
+                    counts["errored"] += 1
+                else:
+                    files.append(inbox_file)
+            claimed, deferred = _claim_files(db, files, hh_id, counts)
+
+            for inbox_file, inbox_id, parsed, error in _parse_claimed(claimed):
+                status = _write_result(db, inbox_file, inbox_id, parsed, error, hh_id, resolver)
+                counts[status] += 1
+                if status == "completed":
+                    completed_hashes.add(inbox_file.file_hash)
+
+        # Same bytes dropped twice in one batch: once the first copy has
+        # completed the rest are plain duplicates; otherwise they stay in the
+        # inbox and are retried against the errored row on the next scan.
+        for inbox_file in deferred:
+            if inbox_file.file_hash in completed_hashes:
+                _move_duplicate(inbox_file)
                 counts["deduped"] += 1
-            elif status == "errored":
-                counts["errored"] += 1
-
-    finally:
-        _scan_lock.release()
 
     logger.info(
         "expenses_inbox_scan: scanned=%d completed=%d deduped=%d errored=%d",
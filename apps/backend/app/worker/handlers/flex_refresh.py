@@ -21,6 +21,7 @@ from sqlmodel import Session
 
 from app.core.config import settings
 from app.dal.database import engine
+from app.services.options.flex_report_cache import flex_report_cache
 from app.worker.handlers.options_sync import run_flex_options_sync
 
 logger = logging.getLogger(__name__)
@@ -129,6 +130,10 @@ def run_flex_refresh_poll() -> None:
                 )
                 session.commit()
 
+        if pending:
+            # Accounts sharing a household statement reuse one parsed report.
+            logger.info("flex_refresh_poll: flex report cache %s", flex_report_cache.stats())
+
 
 # ---------------------------------------------------------------------------
 # Internal helpers
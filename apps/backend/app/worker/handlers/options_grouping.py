@@ -6,6 +6,7 @@ from collections.abc import Callable
 from contextlib import AbstractContextManager
 from datetime import date
 from decimal import Decimal
+import hashlib
 import json
 from typing import Any
 
@@ -13,7 +14,14 @@ from sqlalchemy import text
 from sqlmodel import Session
 
 from app.dal.database import engine
-from app.services.options.strategy_grouper import StrategyGroupingResult, StrategyTrade, group_option_strategies
+from app.services.options.strategy_grouper import (
+    StrategyCapitalHistory,
+    StrategyGroup,
+    StrategyGroupingResult,
+    StrategyRollEvent,
+    StrategyTrade,
+    group_option_strategies,
+)
 from app.worker.handlers.options_sync import OptionsAccount, _load_accounts
 
 JobPayload = dict[str, object]
@@ -61,12 +69,13 @@ def compute_options_strategy_groups(
     for account in accounts:
         trades = _load_strategy_trades(session, account.household_id, account.account_id, from_date, to_date)
         result = group_option_strategies(trades)
-        _persist_grouping(session, result)
+        changed = _persist_grouping(session, result)
         output["accounts"].append(
             {
                 "household_id": account.household_id,
                 "account_id": account.account_id,
                 "groups": len(result.groups),
+                "groups_changed": changed,
                 "roll_events": len(result.roll_events),
                 "trades": len(result.trade_group_ids),
             }
@@ -180,53 +189,147 @@ def _load_strategy_trades(
     ]
 
 
-def _persist_grouping(session: Session, result: StrategyGroupingResult) -> None:
-    for group in result.groups:
-        session.execute(
-            text(
-                """
-                insert into public.options_strategy_groups (
-                  id, household_id, account_id, underlying_symbol, kind, status, opened_at, closed_at,
-                  net_cash_flow, realized_pnl, capital_at_risk_open, risk_calculation_method, metadata
-                ) values (
-                  :id, :household_id, :account_id, :underlying_symbol, :kind, :status, :opened_at, :closed_at,
-                  :net_cash_flow, :realized_pnl, :capital_at_risk_open, :risk_calculation_method, cast(:metadata as jsonb)
-                )
-                on conflict (id) do update set
-                  underlying_symbol = excluded.underlying_symbol,
-                  kind = excluded.kind,
-                  status = excluded.status,
-                  opened_at = excluded.opened_at,
-                  closed_at = excluded.closed_at,
-                  net_cash_flow = excluded.net_cash_flow,
-                  realized_pnl = excluded.realized_pnl,
-                  capital_at_risk_open = excluded.capital_at_risk_open,
-                  risk_calculation_method = excluded.risk_calculation_method,
-                  metadata = excluded.metadata,
-                  updated_at = now()
-                """
-            ),
-            {
-                "id": group.group_id,
-                "household_id": group.household_id,
-                "account_id": group.account_id,
-                "underlying_symbol": group.underlying_symbol,
-                "kind": group.kind,
-                "status": group.status,
-                "opened_at": group.opened_at,
-                "closed_at": group.closed_at,
-                "net_cash_flow": group.net_cash_flow,
-                "realized_pnl": group.realized_pnl,
-                "capital_at_risk_open": group.capital_at_risk_open,
-                "risk_calculation_method": group.risk_calculation_method,
-                "metadata": _json(group.metadata),
-            },
-        )
-        session.execute(
-            text("delete from public.options_strategy_capital_history where group_id = :group_id"),
-            {"group_id": group.group_id},
-        )
+def _persist_grouping(session: Session, result: StrategyGroupingResult) -> int:
+    """Write the groups whose output differs from the stored snapshot; return how many.
+
+    Each group row stores a fingerprint of everything written for it (the row,
+    its capital history, roll events and trade links) in ``metadata``, so a
+    rerun over an unchanged history issues no writes for settled groups.
+    """
+
+    if not result.groups:
+        return 0
+    stored = _stored_fingerprints(session, result.groups[0].household_id, result.groups[0].account_id)
+    history_by_group: dict[str, list[StrategyCapitalHistory]] = {}
     for history in result.capital_history:
+        history_by_group.setdefault(history.group_id, []).append(history)
+    rolls_by_group: dict[str, list[StrategyRollEvent]] = {}
+    for roll in result.roll_events:
+        rolls_by_group.setdefault(roll.group_id, []).append(roll)
+    trades_by_group: dict[str, list[str]] = {}
+    for trade_id, group_id in result.trade_group_ids.items():
+        trades_by_group.setdefault(group_id, []).append(trade_id)
+
+    changed = 0
+    for group in result.groups:
+        history = history_by_group.get(group.group_id, [])
+        rolls = rolls_by_group.get(group.group_id, [])
+        trade_ids = trades_by_group.get(group.group_id, [])
+        fingerprint = _group_fingerprint(group, history, rolls, trade_ids)
+        if stored.get(group.group_id) == fingerprint:
+            continue
+        changed += 1
+        _write_group(session, group, fingerprint, history, rolls, trade_ids)
+    return changed
+
+
+def _stored_fingerprints(session: Session, household_id: str, account_id: str) -> dict[str, str | None]:
+    rows = session.execute(
+        text(
+            """
+            select id::text as id, metadata->>'fingerprint' as fingerprint
+              from public.options_strategy_groups
+             where household_id = :household_id and account_id = :account_id
+            """
+        ),
+        {"household_id": household_id, "account_id": account_id},
+    ).mappings()
+    return {str(row["id"]): row["fingerprint"] for row in rows}
+
+
+def _group_fingerprint(
+    group: StrategyGroup,
+    history: list[StrategyCapitalHistory],
+    rolls: list[StrategyRollEvent],
+    trade_ids: list[str],
+) -> str:
+    payload = {
+        "group": [
+            group.underlying_symbol,
+            group.kind,
+            group.status,
+            group.opened_at,
+            group.closed_at,
+            group.net_cash_flow,
+            group.realized_pnl,
+            group.capital_at_risk_open,
+            group.risk_calculation_method,
+            group.metadata,
+        ],
+        "history": [[entry.effective_at, entry.capital_at_risk, entry.risk_calculation_method] for entry in history],
+        "rolls": [
+            [
+                roll.closed_trade_id,
+                roll.opened_trade_id,
+                roll.classification,
+                roll.closed_leg_realized_pnl,
+                roll.incremental_cash_flow,
+                roll.old_expiry,
+                roll.new_expiry,
+                roll.old_strike,
+                roll.new_strike,
+                roll.heuristic_version,
+            ]
+            for roll in rolls
+        ],
+        "trade_ids": sorted(trade_ids),
+    }
+    return hashlib.sha256(_json(payload).encode()).hexdigest()
+
+
+def _write_group(
+    session: Session,
+    group: StrategyGroup,
+    fingerprint: str,
+    history: list[StrategyCapitalHistory],
+    rolls: list[StrategyRollEvent],
+    trade_ids: list[str],
+) -> None:
+    session.execute(
+        text(
+            """
+            insert into public.options_strategy_groups (
+              id, household_id, account_id, underlying_symbol, kind, status, opened_at, closed_at,
+              net_cash_flow, realized_pnl, capital_at_risk_open, risk_calculation_method, metadata
+            ) values (
+              :id, :household_id, :account_id, :underlying_symbol, :kind, :status, :opened_at, :closed_at,
+              :net_cash_flow, :realized_pnl, :capital_at_risk_open, :risk_calculation_method, cast(:metadata as jsonb)
+            )
+            on conflict (id) do update set
+              underlying_symbol = excluded.underlying_symbol,
+              kind = excluded.kind,
+              status = excluded.status,
+              opened_at = excluded.opened_at,
+              closed_at = excluded.closed_at,
+              net_cash_flow = excluded.net_cash_flow,
+              realized_pnl = excluded.realized_pnl,
+              capital_at_risk_open = excluded.capital_at_risk_open,
+              risk_calculation_method = excluded.risk_calculation_method,
+              metadata = excluded.metadata,
+              updated_at = now()
+            """
+        ),
+        {
+            "id": group.group_id,
+            "household_id": group.household_id,
+            "account_id": group.account_id,
+            "underlying_symbol": group.underlying_symbol,
+            "kind": group.kind,
+            "status": group.status,
+            "opened_at": group.opened_at,
+            "closed_at": group.closed_at,
+            "net_cash_flow": group.net_cash_flow,
+            "realized_pnl": group.realized_pnl,
+            "capital_at_risk_open": group.capital_at_risk_open,
+            "risk_calculation_method": group.risk_calculation_method,
+            "metadata": _json({**group.metadata, "fingerprint": fingerprint}),
+        },
+    )
+    session.execute(
+        text("delete from public.options_strategy_capital_history where group_id = :group_id"),
+        {"group_id": group.group_id},
+    )
+    for entry in history:
         session.execute(
             text(
                 """
@@ -242,20 +345,20 @@ def _persist_grouping(session: Session, result: StrategyGroupingResult) -> None:
                 """
             ),
             {
-                "group_id": history.group_id,
-                "effective_at": history.effective_at,
-                "capital_at_risk": history.capital_at_risk,
-                "risk_calculation_method": history.risk_calculation_method,
+                "group_id": entry.group_id,
+                "effective_at": entry.effective_at,
+                "capital_at_risk": entry.capital_at_risk,
+                "risk_calculation_method": entry.risk_calculation_method,
             },
         )
-    for trade_id, group_id in result.trade_group_ids.items():
+    for trade_id in trade_ids:
         session.execute(
             text(
                 "update public.options_trades set strategy_group_id = :group_id, updated_at = now() where id = :trade_id"
             ),
-            {"group_id": group_id, "trade_id": trade_id},
+            {"group_id": group.group_id, "trade_id": trade_id},
         )
-    for roll in result.roll_events:
+    for roll in rolls:
         session.execute(
             text(
                 """
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from contextlib import AbstractContextManager
-from datetime import date
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import Any
 
@@ -20,6 +20,10 @@ from app.services.options.metrics import (
     compute_monthly_metrics,
 )
 
+# Rows written by a transaction that was still open when the previous
+# metrics run started carry an ``updated_at`` just before its watermark.
+CHANGE_LOOKBACK = timedelta(hours=1)
+
 JobPayload = dict[str, object]
 JobResult = dict[str, object]
 SessionFactory = Callable[[], AbstractContextManager[Session]]
@@ -58,21 +62,65 @@ def compute_options_monthly_metrics(
     from_date: date | None = None,
     to_date: date | None = None,
 ) -> JobResult:
-    """Aggregate normalized trade facts and replace affected monthly rows."""
+    """Aggregate normalized trade facts and replace affected monthly rows.
+
+    Without an explicit date range an account that already has dashboard rows
+    is recomputed incrementally: only months at or after the earliest fact
+    changed since the last run are rebuilt, continuing the cumulative totals
+    stored on the month before.  An account with no changes is left alone.
+    """
 
     accounts = _metric_accounts(session, household_id=household_id, account_id=account_id)
     output: dict[str, Any] = {"accounts": [], "row_count": 0}
     for account in accounts:
-        rows = _load_trade_facts(session, account["household_id"], account["account_id"], from_date, to_date)
-        rolls = _load_roll_facts(session, account["household_id"], account["account_id"], from_date, to_date)
+        from_month: date | None = None
+        opening_cash_flow = opening_realized_pnl = Decimal(0)
+        if from_date is None and to_date is None:
+            last_computed_at = _last_computed_at(session, account["household_id"], account["account_id"])
+            if last_computed_at is not None:
+                since = last_computed_at - CHANGE_LOOKBACK
+                changed_on = _earliest_change(session, account["household_id"], account["account_id"], since)
+                if changed_on is None:
+                    output["accounts"].append(
+                        {"household_id": account["household_id"], "account_id": account["account_id"], "months": 0}
+                    )
+                    continue
+                _prune_logged_changes(session, account["household_id"], account["account_id"], since)
+                from_month = date(changed_on.year, changed_on.month, 1)
+                opening_cash_flow, opening_realized_pnl = _opening_totals(
+                    session, account["household_id"], account["account_id"], from_month
+                )
+        load_from = from_month or from_date
+        rows = _load_trade_facts(session, account["household_id"], account["account_id"], load_from, to_date)
+        rolls = _load_roll_facts(session, account["household_id"], account["account_id"], load_from, to_date)
         capital_history = _load_capital_history(
             session, account["household_id"], account["account_id"], from_date, to_date
         )
         margin_snapshots = _load_margin_snapshots(
-            session, account["household_id"], account["account_id"], from_date, to_date
+            session, account["household_id"], account["account_id"], load_from, to_date
+        )
+        metrics = compute_monthly_metrics(
+            rows,
+            rolls,
+            capital_history,
+            margin_snapshots,
+            from_month=from_month,
+            opening_cash_flow=opening_cash_flow,
+            opening_realized_pnl=opening_realized_pnl,
         )
-        metrics = compute_monthly_metrics(rows, rolls, capital_history, margin_snapshots)
-        if metrics:
+        if from_month is not None:
+            session.execute(
+                text(
+                    """
+                    delete from public.options_dashboard_monthly
+                     where household_id = :household_id
+                       and account_id = :account_id
+                       and period_start >= :start
+                    """
+                ),
+                {"household_id": account["household_id"], "account_id": account["account_id"], "start": from_month},
+            )
+        elif metrics:
             start = metrics[0].period_start
             end = metrics[-1].period_start
             session.execute(
@@ -91,42 +139,43 @@ def compute_options_monthly_metrics(
                     "end": end,
                 },
             )
-            for metric in metrics:
-                session.execute(
-                    text(
-                        """
-                        insert into public.options_dashboard_monthly (
-                          household_id, account_id, period_start, period_end,
-                          cash_flow_total, realized_pnl_total,
-                          cash_flow_cumulative, realized_pnl_cumulative,
-                          variance_gap, variance_gap_cumulative, trade_count,
-                          roll_count, roll_positive_count, roll_negative_count,
-                          roll_neutral_count, roll_efficiency_pct, avg_capital_at_risk,
-                          return_on_capital_at_risk_pct, latest_margin_used,
-                          latest_margin_available, margin_utilization_pct, last_computed_at
-                        ) values (
-                          :household_id, :account_id, :period_start, :period_end,
-                          :cash_flow_total, :realized_pnl_total,
-                          :cash_flow_cumulative, :realized_pnl_cumulative,
-                          :variance_gap, :variance_gap_cumulative, :trade_count,
-                          :roll_count, :roll_positive_count, :roll_negative_count,
-                          :roll_neutral_count, :roll_efficiency_pct, :avg_capital_at_risk,
-                          :return_on_capital_at_risk_pct, :latest_margin_used,
-                          :latest_margin_available, :margin_utilization_pct, now()
-                        )
-                        """
-                    ),
-                    {
-                        "household_id": account["household_id"],
-                        "account_id": account["account_id"],
-                        **metric.model_dump(),
-                    },
-                )
+        for metric in metrics:
+            session.execute(
+                text(
+                    """
+                    insert into public.options_dashboard_monthly (
+                      household_id, account_id, period_start, period_end,
+                      cash_flow_total, realized_pnl_total,
+                      cash_flow_cumulative, realized_pnl_cumulative,
+                      variance_gap, variance_gap_cumulative, trade_count,
+                      roll_count, roll_positive_count, roll_negative_count,
+                      roll_neutral_count, roll_efficiency_pct, avg_capital_at_risk,
+                      return_on_capital_at_risk_pct, latest_margin_used,
+                      latest_margin_available, margin_utilization_pct, last_computed_at
+                    ) values (
+                      :household_id, :account_id, :period_start, :period_end,
+                      :cash_flow_total, :realized_pnl_total,
+                      :cash_flow_cumulative, :realized_pnl_cumulative,
+                      :variance_gap, :variance_gap_cumulative, :trade_count,
+                      :roll_count, :roll_positive_count, :roll_negative_count,
+                      :roll_neutral_count, :roll_efficiency_pct, :avg_capital_at_risk,
+                      :return_on_capital_at_risk_pct, :latest_margin_used,
+                      :latest_margin_available, :margin_utilization_pct, now()
+                    )
+                    """
+                ),
+                {
+                    "household_id": account["household_id"],
+                    "account_id": account["account_id"],
+                    **metric.model_dump(),
+                },
+            )
         output["accounts"].append(
             {
                 "household_id": account["household_id"],
                 "account_id": account["account_id"],
                 "months": len(metrics),
+                "recomputed_from": from_month.isoformat() if from_month else None,
                 "cash_flow_total": str(sum((m.cash_flow_total for m in metrics), Decimal("0"))),
                 "realized_pnl_total": str(sum((m.realized_pnl_total for m in metrics), Decimal("0"))),
                 "variance_gap_cumulative": str(metrics[-1].variance_gap_cumulative if metrics else Decimal("0")),
@@ -181,6 +230,126 @@ def _metric_accounts(session: Session, *, household_id: str | None, account_id:
     return [{"household_id": str(row["household_id"]), "account_id": str(row["account_id"])} for row in rows]
 
 
+def _last_computed_at(session: Session, household_id: str, account_id: str) -> datetime | None:
+    rows = list(
+        session.execute(
+            text(
+                """
+                select max(last_computed_at) as last_computed_at
+                  from public.options_dashboard_monthly
+                 where household_id = :household_id and account_id = :account_id
+                """
+            ),
+            {"household_id": household_id, "account_id": account_id},
+        ).mappings()
+    )
+    return rows[0]["last_computed_at"] if rows else None
+
+
+def _earliest_change(session: Session, household_id: str, account_id: str, since: datetime) -> date | None:
+    """Return the earliest fact date touched by any metric input changed at or after *since*.
+
+    Rows written since then are found by ``updated_at``; deleted rows and the
+    old dates of re-dated rows come from ``options_metric_changes``.
+    """
+
+    changes = [
+        _earliest_written(session, household_id, account_id, since),
+        _earliest_logged(session, household_id, account_id, since),
+    ]
+    return min((changed_on for changed_on in changes if changed_on is not None), default=None)
+
+
+def _earliest_written(session: Session, household_id: str, account_id: str, since: datetime) -> date | None:
+    rows = list(
+        session.execute(
+            text(
+                """
+                select min(changed_on) as changed_on
+                  from (
+                    select min(trade_date) as changed_on
+                      from public.options_trades
+                     where household_id = :household_id and account_id = :account_id and updated_at >= :since
+                    union all
+                    select min(event_date)
+                      from public.options_cash_events
+                     where household_id = :household_id and account_id = :account_id and updated_at >= :since
+                       and event_category in ('option_related', 'assignment_synthetic')
+                    union all
+                    select min(t.trade_date)
+                      from public.options_roll_events r
+                      join public.options_trades t on t.id = r.closed_trade_id
+                     where r.household_id = :household_id and r.account_id = :account_id and r.updated_at >= :since
+                    union all
+                    select min(h.effective_at::date)
+                      from public.options_strategy_capital_history h
+                      join public.options_strategy_groups g on g.id = h.group_id
+                     where g.household_id = :household_id and g.account_id = :account_id and h.updated_at >= :since
+                    union all
+                    select min(captured_at::date)
+                      from public.options_margin_snapshots
+                     where household_id = :household_id and account_id = :account_id and updated_at >= :since
+                  ) changes
+                """
+            ),
+            {"household_id": household_id, "account_id": account_id, "since": since},
+        ).mappings()
+    )
+    return rows[0]["changed_on"] if rows else None
+
+
+def _earliest_logged(session: Session, household_id: str, account_id: str, since: datetime) -> date | None:
+    rows = list(
+        session.execute(
+            text(
+                """
+                select min(changed_on) as changed_on
+                  from public.options_metric_changes
+                 where household_id = :household_id and account_id = :account_id and changed_at >= :since
+                """
+            ),
+            {"household_id": household_id, "account_id": account_id, "since": since},
+        ).mappings()
+    )
+    return rows[0]["changed_on"] if rows else None
+
+
+def _prune_logged_changes(session: Session, household_id: str, account_id: str, since: datetime) -> None:
+    """Drop change-log entries the previous run already covered."""
+
+    session.execute(
+        text(
+            """
+            delete from public.options_metric_changes
+             where household_id = :household_id and account_id = :account_id and changed_at < :since
+            """
+        ),
+        {"household_id": household_id, "account_id": account_id, "since": since},
+    )
+
+
+def _opening_totals(session: Session, household_id: str, account_id: str, month: date) -> tuple[Decimal, Decimal]:
+    """Return the stored cumulative cash flow and realized P&L carried into *month*."""
+
+    rows = list(
+        session.execute(
+            text(
+                """
+                select cash_flow_cumulative, realized_pnl_cumulative
+                  from public.options_dashboard_monthly
+                 where household_id = :household_id and account_id = :account_id and period_start < :month
+                 order by period_start desc
+                 limit 1
+                """
+            ),
+            {"household_id": household_id, "account_id": account_id, "month": month},
+        ).mappings()
+    )
+    if not rows:
+        return Decimal(0), Decimal(0)
+    return Decimal(str(rows[0]["cash_flow_cumulative"])), Decimal(str(rows[0]["realized_pnl_cumulative"]))
+
+
 def _load_trade_facts(
     session: Session,
     household_id: str,
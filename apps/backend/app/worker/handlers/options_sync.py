@@ -29,8 +29,9 @@ from app.services.options.flex_parser import (
     FlexStockPosition,
     FlexTradeConfirm,
     OptionLegKey,
-    parse_flex_files,
+    build_flex_result,
 )
+from app.services.options.flex_report_cache import flex_report_cache
 from app.worker.handlers.options_metrics import compute_options_monthly_metrics
 
 logger = logging.getLogger(__name__)
@@ -39,6 +40,8 @@ JobResult = dict[str, object]
 SessionFactory = Callable[[], AbstractContextManager[Session]]
 PROJECT_ROOT = Path(__file__).resolve().parents[4]
 SYNTHETIC_DIR = PROJECT_ROOT / "tmp" / "flex"
+# Rows per multi-row VALUES statement on the bulk ingestion path.
+BULK_PAGE_SIZE = 1000
 
 
 @dataclass(frozen=True)
@@ -198,8 +201,11 @@ def run_flex_options_sync(
     total_bond_positions = 0
     total_dividends = 0
     summaries: list[dict[str, Any]] = []
+    # Each file is parsed once and partitioned by accountId; every account in
+    # the loop (and later flex_refresh polls) reuses the cached report.
+    reports = flex_report_cache.reports(paths)
     for account in accounts:
-        parsed = parse_flex_files(paths, account.account_id)
+        parsed = build_flex_result(reports, account.account_id)
         if account.account_id is None:
             account_ids = _parsed_account_ids(parsed)
         else:
@@ -976,30 +982,13 @@ def _ingest_account(
     to_date: date | None,
 ) -> dict[str, int]:
     parsed = _filter_result_by_dates(parsed, from_date, to_date)
-    leg_ids: dict[OptionLegKey, str] = {}
     trades_to_insert = parsed.trades
-    for trade in trades_to_insert:
-        leg_ids[trade.leg] = _upsert_leg(session, household_id, trade.leg)
-        _upsert_trade(session, household_id, trade, leg_ids[trade.leg])
-    for cash in parsed.cash_transactions:
-        _upsert_cash_event(session, household_id, cash)
+    if _supports_bulk_ingest(session):
+        leg_ids = _bulk_ingest_option_rows(session, household_id, account_id, parsed)
+    else:
+        leg_ids = _row_ingest_option_rows(session, household_id, account_id, parsed)
     for dividend in parsed.dividend_payments:
         _upsert_dividend_payment(session, account_id, dividend)
-    snapshot_dates = {position.as_of_date for position in parsed.open_positions}
-    for snapshot_date in snapshot_dates:
-        session.execute(
-            text(
-                """
-                delete from public.options_positions
-                 where household_id = :household_id and account_id = :account_id and as_of_date = :as_of_date
-                """
-            ),
-            {"household_id": household_id, "account_id": account_id, "as_of_date": snapshot_date},
-        )
-    for position in parsed.open_positions:
-        leg_id = leg_ids.get(position.leg) or _upsert_leg(session, household_id, position.leg)
-        leg_ids[position.leg] = leg_id
-        _insert_position(session, household_id, position, leg_id)
     for account_info in parsed.account_information:
         _upsert_flex_margin_snapshot(session, household_id, account_info)
     # Accruals: pass all accruals together so windows are calculated once.
@@ -1022,6 +1011,35 @@ def _ingest_account(
     }
 
 
+def _row_ingest_option_rows(
+    session: Session, household_id: str, account_id: str, parsed: FlexParseResult
+) -> dict[OptionLegKey, str]:
+    """Write legs, trades, cash events and position snapshots one statement per row."""
+
+    leg_ids: dict[OptionLegKey, str] = {}
+    for trade in parsed.trades:
+        leg_ids[trade.leg] = _upsert_leg(session, household_id, trade.leg)
+        _upsert_trade(session, household_id, trade, leg_ids[trade.leg])
+    for cash in parsed.cash_transactions:
+        _upsert_cash_event(session, household_id, cash)
+    snapshot_dates = {position.as_of_date for position in parsed.open_positions}
+    for snapshot_date in snapshot_dates:
+        session.execute(
+            text(
+                """
+                delete from public.options_positions
+                 where household_id = :household_id and account_id = :account_id and as_of_date = :as_of_date
+                """
+            ),
+            {"household_id": household_id, "account_id": account_id, "as_of_date": snapshot_date},
+        )
+    for position in parsed.open_positions:
+        leg_id = leg_ids.get(position.leg) or _upsert_leg(session, household_id, position.leg)
+        leg_ids[position.leg] = leg_id
+        _insert_position(session, household_id, position, leg_id)
+    return leg_ids
+
+
 def _filter_result_by_dates(parsed: FlexParseResult, from_date: date | None, to_date: date | None) -> FlexParseResult:
     """Keep parsed Flex rows whose business date falls inside the requested window."""
 
@@ -1218,6 +1236,293 @@ def _insert_position(session: Session, household_id: str, position: FlexOpenPosi
     )
 
 
+def _supports_bulk_ingest(session: Session) -> bool:
+    """Return whether ``session`` can take the set-based ingestion path.
+
+    Bulk ingestion stages rows through psycopg2's ``execute_values`` on the
+    session's own connection, so it needs a real SQLModel session bound to a
+    psycopg2 engine.  ``OPTIONS_SYNC_BULK_INGEST=false`` forces the per-row
+    path (useful when bisecting a bad statement).
+    """
+
+    if os.getenv("OPTIONS_SYNC_BULK_INGEST", "true").strip().lower() in {"0", "false", "no", "off"}:
+        return False
+    if not isinstance(session, Session):
+        return False
+    return session.get_bind().dialect.driver == "psycopg2"
+
+
+def _leg_natural_key(leg: OptionLegKey) -> tuple[Any, ...]:
+    """Mirror of the ``options_legs_natural_key`` constraint columns (minus household)."""
+
+    return (leg.account_id, leg.underlying_symbol, leg.expiry, leg.strike, leg.right, leg.multiplier, leg.currency)
+
+
+def _bulk_ingest_option_rows(
+    session: Session, household_id: str, account_id: str, parsed: FlexParseResult
+) -> dict[OptionLegKey, str]:
+    """Write one account's legs, trades, cash events and positions in a handful of statements.
+
+    Same end state as :func:`_row_ingest_option_rows`; duplicates inside one
+    parse collapse the way sequential upserts would (last row wins).
+    """
+
+    from psycopg2.extras import execute_values
+
+    legs = list(dict.fromkeys([*(trade.leg for trade in parsed.trades), *(pos.leg for pos in parsed.open_positions)]))
+    leg_ids = _bulk_upsert_legs(session, household_id, legs)
+    trades = {trade.source_trade_id: trade for trade in parsed.trades}.values()
+    cash_events = {cash.source_transaction_id: cash for cash in parsed.cash_transactions}.values()
+    cursor = session.connection().connection.cursor()
+    try:
+        if trades:
+            execute_values(
+                cursor,
+                """
+                insert into public.options_trades (
+                  household_id, account_id, leg_id, source, source_trade_id, source_transaction_id, source_exec_id,
+                  event_type, side, trade_time, trade_date, quantity, price, gross_amount, commission, fees,
+                  net_cash_flow, realized_pnl, currency, raw_payload
+                ) values %s
+                on conflict on constraint options_trades_source_trade_key do update set
+                  leg_id = excluded.leg_id,
+                  source_transaction_id = excluded.source_transaction_id,
+                  source_exec_id = excluded.source_exec_id,
+                  event_type = excluded.event_type,
+                  side = excluded.side,
+                  trade_time = excluded.trade_time,
+                  trade_date = excluded.trade_date,
+                  quantity = excluded.quantity,
+                  price = excluded.price,
+                  gross_amount = excluded.gross_amount,
+                  commission = excluded.commission,
+                  fees = excluded.fees,
+                  net_cash_flow = excluded.net_cash_flow,
+                  realized_pnl = excluded.realized_pnl,
+                  currency = excluded.currency,
+                  raw_payload = excluded.raw_payload,
+                  updated_at = now()
+                """,
+                [
+                    {
+                        "household_id": household_id,
+                        "leg_id": leg_ids[trade.leg],
+                        **trade.model_dump(exclude={"leg"}),
+                        "raw_payload": _json(trade.raw_payload),
+                    }
+                    for trade in trades
+                ],
+                template="""(
+                  %(household_id)s, %(account_id)s, %(leg_id)s, 'ibkr_flex', %(source_trade_id)s,
+                  %(source_transaction_id)s, %(source_exec_id)s, %(event_type)s, %(side)s, %(trade_time)s,
+                  %(trade_date)s, %(quantity)s, %(price)s, %(gross_amount)s, %(commission)s, %(fees)s,
+                  %(net_cash_flow)s, %(realized_pnl)s, %(currency)s, cast(%(raw_payload)s as jsonb)
+                )""",
+                page_size=BULK_PAGE_SIZE,
+            )
+        if cash_events:
+            execute_values(
+                cursor,
+                """
+                insert into public.options_cash_events (
+                  household_id, account_id, source, source_transaction_id, event_date, event_time,
+                  event_category, description, amount, currency, raw_payload
+                ) values %s
+                on conflict on constraint options_cash_events_source_transaction_key do update set
+                  event_date = excluded.event_date,
+                  event_time = excluded.event_time,
+                  event_category = excluded.event_category,
+                  description = excluded.description,
+                  amount = excluded.amount,
+                  currency = excluded.currency,
+                  raw_payload = excluded.raw_payload,
+                  updated_at = now()
+                """,
+                [
+                    {"household_id": household_id, **cash.model_dump(), "raw_payload": _json(cash.raw_payload)}
+                    for cash in cash_events
+                ],
+                template="""(
+                  %(household_id)s, %(account_id)s, 'ibkr_flex', %(source_transaction_id)s, %(event_date)s,
+                  %(event_time)s, %(event_category)s, %(description)s, %(amount)s, %(currency)s,
+                  cast(%(raw_payload)s as jsonb)
+                )""",
+                page_size=BULK_PAGE_SIZE,
+            )
+        if parsed.open_positions:
+            cursor.execute(
+                """
+                delete from public.options_positions
+                 where household_id = %(household_id)s and account_id = %(account_id)s
+                   and as_of_date = any(%(as_of_dates)s)
+                """,
+                {
+                    "household_id": household_id,
+                    "account_id": account_id,
+                    "as_of_dates": sorted({position.as_of_date for position in parsed.open_positions}),
+                },
+            )
+            execute_values(
+                cursor,
+                """
+                insert into public.options_positions (
+                  household_id, account_id, as_of_date, leg_id, opened_at, quantity_open,
+                  average_open_price, open_cash_flow, ib_margin_requirement, last_broker_sync_at, raw_payload
+                ) values %s
+                """,
+                [
+                    {
+                        "household_id": household_id,
+                        "leg_id": leg_ids[position.leg],
+                        **position.model_dump(exclude={"leg"}),
+                        "raw_payload": _json(position.raw_payload),
+                    }
+                    for position in parsed.open_positions
+                ],
+                template="""(
+                  %(household_id)s, %(account_id)s, %(as_of_date)s, %(leg_id)s, %(opened_at)s, %(quantity_open)s,
+                  %(average_open_price)s, %(open_cash_flow)s, %(ib_margin_requirement)s,
+                  %(last_broker_sync_at)s, cast(%(raw_payload)s as jsonb)
+                )""",
+                page_size=BULK_PAGE_SIZE,
+            )
+    finally:
+        cursor.close()
+    return leg_ids
+
+
+def _bulk_upsert_legs(session: Session, household_id: str, legs: list[OptionLegKey]) -> dict[OptionLegKey, str]:
+    """Stage legs in a temp table and merge them into ``options_legs`` with one statement.
+
+    The conid guard from :func:`_source_conid_for_insert` runs as a single
+    lateral join: a staged conid is dropped when another natural leg already
+    owns it, either in the table or earlier in the same batch.
+    """
+
+    if not legs:
+        return {}
+    from psycopg2.extras import execute_values
+
+    # Collapse legs sharing a natural key the way repeated single-row upserts
+    # would: the latest option_symbol wins, the first known conid sticks.
+    staged: dict[tuple[Any, ...], dict[str, Any]] = {}
+    for leg in legs:
+        natural_key = _leg_natural_key(leg)
+        row = staged.get(natural_key)
+        if row is None:
+            staged[natural_key] = {
+                "ord": len(staged),
+                "account_id": leg.account_id,
+                "source_conid": leg.source_conid,
+                "underlying_symbol": leg.underlying_symbol,
+                "option_symbol": leg.option_symbol,
+                "expiry": leg.expiry,
+                "strike": leg.strike,
+                "right": leg.right,
+                "multiplier": leg.multiplier,
+                "currency": leg.currency,
+            }
+        else:
+            row["option_symbol"] = leg.option_symbol
+            row["source_conid"] = row["source_conid"] if row["source_conid"] is not None else leg.source_conid
+
+    session.execute(
+        text(
+            """
+            create temp table if not exists options_legs_stage (
+              ord integer not null,
+              account_id text not null,
+              source_conid bigint,
+              underlying_symbol text not null,
+              option_symbol text,
+              expiry date not null,
+              strike numeric(18,6) not null,
+              "right" text not null,
+              multiplier numeric(18,6) not null,
+              currency text not null
+            ) on commit drop
+            """
+        )
+    )
+    session.execute(text("truncate options_legs_stage"))
+    cursor = session.connection().connection.cursor()
+    try:
+        execute_values(
+            cursor,
+            """
+            insert into options_legs_stage (
+              ord, account_id, source_conid, underlying_symbol, option_symbol, expiry, strike, "right", multiplier, currency
+            ) values %s
+            """,
+            list(staged.values()),
+            template="""(
+              %(ord)s, %(account_id)s, %(source_conid)s, %(underlying_symbol)s, %(option_symbol)s, %(expiry)s,
+              %(strike)s, %(right)s, %(multiplier)s, %(currency)s
+            )""",
+            page_size=BULK_PAGE_SIZE,
+        )
+    finally:
+        cursor.close()
+    rows = session.execute(
+        text(
+            """
+            with staged as (
+              select s.*,
+                     row_number() over (partition by s.account_id, s.source_conid order by s.ord) as conid_rank
+                from options_legs_stage s
+            )
+            insert into public.options_legs (
+              household_id, account_id, source_conid, underlying_symbol, option_symbol,
+              expiry, strike, "right", multiplier, currency, metadata
+            )
+            select cast(:household_id as uuid), s.account_id,
+                   case when s.conid_rank = 1 and taken.id is null then s.source_conid end,
+                   s.underlying_symbol, s.option_symbol, s.expiry, s.strike, cast(s."right" as public.option_right),
+                   s.multiplier, s.currency, '{}'::jsonb
+              from staged s
+              left join lateral (
+                select l.id
+                  from public.options_legs l
+                 where l.household_id = cast(:household_id as uuid)
+                   and l.account_id = s.account_id
+                   and l.source_conid = s.source_conid
+                   and not (
+                     l.underlying_symbol = s.underlying_symbol
+                     and l.expiry = s.expiry
+                     and l.strike = s.strike
+                     and l."right"::text = s."right"
+                     and l.multiplier = s.multiplier
+                     and l.currency = s.currency
+                   )
+                 limit 1
+              ) taken on true
+             order by s.ord
+            on conflict on constraint options_legs_natural_key do update set
+              option_symbol = excluded.option_symbol,
+              source_conid = coalesce(public.options_legs.source_conid, excluded.source_conid),
+              metadata = excluded.metadata,
+              updated_at = now()
+            returning id::text as id, account_id, underlying_symbol, expiry, strike, "right"::text as "right",
+                      multiplier, currency
+            """
+        ),
+        {"household_id": household_id},
+    ).mappings()
+    ids_by_natural_key = {
+        (
+            row["account_id"],
+            row["underlying_symbol"],
+            row["expiry"],
+            row["strike"],
+            row["right"],
+            row["multiplier"],
+            row["currency"],
+        ): str(row["id"])
+        for row in rows
+    }
+    return {leg: ids_by_natural_key[_leg_natural_key(leg)] for leg in legs}
+
+
 def _upsert_flex_margin_snapshot(session: Session, household_id: str, account_info: Any) -> None:
     raw = account_info.raw_payload
     margin_used = _first_decimal(raw, ("MaintMarginReq", "maintenanceMargin", "maintMarginReq"))
@@ -1,13 +1,22 @@
 """Compute handler: raw.broker_trade_events → compute intermediates → cooked.daily_performance.
 
 Pipeline (raw → compute → cooked):
-  1. Read raw.broker_trade_events for the household (optionally scoped by date range).
-  2. Open a compute.pnl_runs row to track this invocation.
-  3. Derive per-day P&L aggregates → write to compute.daily_pnl_intermediates.
-  4. Run reconciliation: verify raw trade counts match computed intermediates.
-  5. On reconciliation pass, upsert rows into cooked.daily_performance.
-  6. Mark pnl_run succeeded; update public.household_refresh_state.
-  7. On any failure, mark pnl_run failed; update household_refresh_state.last_failed_at.
+  1. Open a compute.pnl_runs row to track this invocation.
+  2. Work out which days to recompute (incremental mode, the default):
+       a. compare each account's raw event count / latest ``_loaded_at`` with its
+          watermark in compute.pnl_watermarks; unchanged accounts are skipped;
+       b. for changed accounts, hash the raw events per (account, day) in SQL and
+          compare with compute.pnl_day_hashes — new, edited or vanished events
+          change the hash and mark that day dirty.
+     In ``full`` mode every day in the window is recomputed.
+  3. Read raw.broker_trade_events for the dirty days only.
+  4. Derive per-day P&L aggregates → write to compute.daily_pnl_intermediates.
+  5. Run reconciliation: verify raw trade counts match computed intermediates.
+  6. On reconciliation pass, upsert rows into cooked.daily_performance (one
+     set-based statement) and drop cooked rows for days that no longer have events;
+     store the new day hashes and watermarks in the same transaction.
+  7. Mark pnl_run succeeded; update public.household_refresh_state.
+  8. On any failure, mark pnl_run failed; update household_refresh_state.last_failed_at.
      Cooked rows are never written on failure.
 
 Job type key:  ``pnl_daily``
@@ -17,6 +26,11 @@ Optional payload keys:
   - ``from_date``  (str ISO-8601 date) — earliest trade date to include (default: all).
   - ``to_date``    (str ISO-8601 date) — latest trade date to include (default: today).
   - ``currency``   (str, default 'USD') — cooked row currency label.
+  - ``mode``       (str, 'incremental' | 'full', default 'incremental') — ``full``
+    recomputes every day in the window and resets the stored hashes/watermarks.
+
+Watermarks are only read and advanced for unbounded runs; a run with
+``from_date``/``to_date`` always hash-checks every account inside its window.
 """
 
 from __future__ import annotations
@@ -24,9 +38,9 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from contextlib import AbstractContextManager
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Any
 
@@ -44,6 +58,13 @@ SessionFactory = Callable[[], AbstractContextManager[Session]]
 # Precision for P&L aggregates stored in compute/cooked layers.
 _PNL_SCALE = Decimal("0.000001")  # matches numeric(18,6) in schema
 
+MODE_INCREMENTAL = "incremental"
+MODE_FULL = "full"
+_MODES = (MODE_INCREMENTAL, MODE_FULL)
+
+# (account_id, trade_date) — the grain at which raw changes are detected.
+DayKey = tuple[str, date]
+
 
 # ---------------------------------------------------------------------------
 # Public entrypoint (registered in registry.JOB_HANDLERS)
@@ -62,16 +83,21 @@ def handle_pnl_daily(
         session_factory: Override the DB session factory (useful in tests).
 
     Returns:
-        Result dict with run_id, days_written, reconciliation_status.
+        Result dict with run_id, mode, days_written, days_deleted, raw_events
+        and the reconciliation result.
 
     Raises:
-        ValueError: If household_id is missing or malformed.
+        ValueError: If household_id is missing or malformed, or mode is unknown.
     """
 
     household_id = _require_str(payload, "household_id")
     from_date = _optional_date(payload.get("from_date"))
     to_date = _optional_date(payload.get("to_date"))
     currency = str(payload.get("currency") or "USD")
+    mode = str(payload.get("mode") or MODE_INCREMENTAL)
+    if mode not in _MODES:
+        raise ValueError(f"Invalid mode '{mode}'; expected one of {', '.join(_MODES)}")
+    windowed = from_date is not None or to_date is not None
 
     sf = session_factory or _default_session_factory
 
@@ -80,35 +106,88 @@ def handle_pnl_daily(
         session.commit()
 
         try:
-            # Step 1: fetch raw events
-            raw_rows = _fetch_raw_events(session, household_id, from_date, to_date)
+            # Step 1: decide which days need recomputing
+            watermarks = _fetch_account_watermarks(session, household_id, from_date, to_date)
+            if mode == MODE_FULL:
+                dirty_accounts = set(watermarks)
+            else:
+                stored_watermarks = {} if windowed else _load_stored_watermarks(session, household_id)
+                dirty_accounts = {
+                    account_id for account_id, mark in watermarks.items() if stored_watermarks.get(account_id) != mark
+                }
+                dirty_accounts.update(set(stored_watermarks) - set(watermarks))
+
+            fingerprints = _fetch_day_fingerprints(session, household_id, dirty_accounts, from_date, to_date)
+            stored_hashes = _load_stored_day_hashes(session, household_id, dirty_accounts, from_date, to_date)
+            changed_keys = {
+                key
+                for key, fp in fingerprints.items()
+                if mode == MODE_FULL or stored_hashes.get(key) != fp["content_hash"]
+            }
+            vanished_keys = set(stored_hashes) - set(fingerprints)
+            dirty_days = sorted({day for _, day in changed_keys | vanished_keys})
+
+            # Step 2: fetch raw events for the dirty days
+            if mode == MODE_FULL:
+                raw_rows = _fetch_raw_events(session, household_id, from_date, to_date)
+            else:
+                raw_rows = _fetch_raw_events(session, household_id, from_date, to_date, days=dirty_days)
             logger.info(
-                "pnl_daily run=%s household=%s raw_events=%d",
+                "pnl_daily run=%s household=%s mode=%s dirty_accounts=%d dirty_days=%d raw_events=%d",
                 run_id,
                 household_id,
+                mode,
+                len(dirty_accounts),
+                len(dirty_days),
                 len(raw_rows),
             )
 
-            # Step 2: aggregate to daily intermediates
+            # Step 3: aggregate to daily intermediates
             intermediates = _aggregate_daily(raw_rows)
 
-            # Step 3: write intermediates
+            # Step 4: write intermediates
             _write_intermediates(session, run_id, household_id, intermediates)
             session.commit()
 
-            # Step 4: reconcile
+            # Step 5: reconcile
             recon = _reconcile(raw_rows, intermediates)
             if not recon["ok"]:
                 raise ValueError(f"Reconciliation failed: {recon['detail']}")
 
             logger.info("pnl_daily reconciliation passed run=%s", run_id)
 
-            # Step 5: publish to cooked (only after reconciliation passes)
+            # Step 6: publish to cooked (only after reconciliation passes) and
+            # record what was published in the same transaction.
             days_written = _publish_cooked(session, run_id, household_id, intermediates, currency)
+            emptied_days = [day for day in dirty_days if day not in intermediates]
+            days_deleted = _delete_cooked_days(session, household_id, emptied_days, currency)
+            _store_day_hashes(
+                session,
+                run_id,
+                household_id,
+                {key: fingerprints[key] for key in changed_keys},
+                vanished_keys,
+                reset=mode == MODE_FULL and not windowed,
+            )
+            if not windowed:
+                _store_watermarks(
+                    session,
+                    run_id,
+                    household_id,
+                    {account_id: watermarks[account_id] for account_id in dirty_accounts if account_id in watermarks},
+                    removed=dirty_accounts - set(watermarks),
+                    reset=mode == MODE_FULL,
+                )
             session.commit()
 
-            # Step 6: mark run succeeded and update refresh state
-            input_hash = _input_hash(household_id, from_date, to_date, len(raw_rows))
+            # Step 7: mark run succeeded and update refresh state
+            input_hash = _input_hash(
+                household_id,
+                from_date,
+                to_date,
+                sum(int(mark[0]) for mark in watermarks.values()),
+                watermarks=(f"{account_id}:{count}:{loaded}" for account_id, (count, loaded) in watermarks.items()),
+            )
             _finish_pnl_run(session, run_id, "succeeded")
             _update_refresh_state(
                 session,
@@ -121,13 +200,17 @@ def handle_pnl_daily(
             session.commit()
 
             logger.info(
-                "pnl_daily succeeded run=%s days_written=%d",
+                "pnl_daily succeeded run=%s mode=%s days_written=%d days_deleted=%d",
                 run_id,
+                mode,
                 days_written,
+                days_deleted,
             )
             return {
                 "run_id": run_id,
+                "mode": mode,
                 "days_written": days_written,
+                "days_deleted": days_deleted,
                 "raw_events": len(raw_rows),
                 "reconciliation": recon,
             }
@@ -180,14 +263,152 @@ def _open_pnl_run(session: Session, household_id: str, params: JobPayload) -> st
     return str(row)
 
 
+def _fetch_account_watermarks(
+    session: Session,
+    household_id: str,
+    from_date: date | None,
+    to_date: date | None,
+) -> dict[str, tuple[int, datetime | None]]:
+    """Return ``{account_id: (event_count, latest _loaded_at)}`` for the household's raw events."""
+
+    rows = session.execute(
+        text(
+            """
+            select
+                coalesce(source_account_id, '') as account_id,
+                count(*)                        as event_count,
+                max(_loaded_at)                 as loaded_through
+            from raw.broker_trade_events
+            where household_id = :household_id
+              and (:from_date is null or event_timestamp::date >= cast(:from_date as date))
+              and (:to_date   is null or event_timestamp::date <= cast(:to_date as date))
+            group by 1
+            """
+        ),
+        {
+            "household_id": household_id,
+            "from_date": str(from_date) if from_date else None,
+            "to_date": str(to_date) if to_date else None,
+        },
+    ).mappings()
+    return {str(r["account_id"]): (int(r["event_count"]), r["loaded_through"]) for r in rows}
+
+
+def _load_stored_watermarks(session: Session, household_id: str) -> dict[str, tuple[int, datetime | None]]:
+    """Return the watermarks recorded by the last successful run."""
+
+    rows = session.execute(
+        text(
+            """
+            select account_id, event_count, loaded_through
+            from compute.pnl_watermarks
+            where household_id = :household_id
+            """
+        ),
+        {"household_id": household_id},
+    ).mappings()
+    return {str(r["account_id"]): (int(r["event_count"]), r["loaded_through"]) for r in rows}
+
+
+def _fetch_day_fingerprints(
+    session: Session,
+    household_id: str,
+    account_ids: set[str],
+    from_date: date | None,
+    to_date: date | None,
+) -> dict[DayKey, dict[str, Any]]:
+    """Hash the raw events of each (account, day) for the given accounts.
+
+    The hash covers every column the aggregation reads, so an edited, added
+    or removed event changes the hash of its day.
+    """
+
+    if not account_ids:
+        return {}
+    rows = session.execute(
+        text(
+            """
+            select
+                coalesce(source_account_id, '') as account_id,
+                event_timestamp::date           as trade_date,
+                count(*)                        as event_count,
+                md5(string_agg(
+                    concat_ws('|', id, event_timestamp, symbol, asset_category,
+                              side, quantity, price, currency),
+                    ',' order by id
+                ))                              as content_hash
+            from raw.broker_trade_events
+            where household_id = :household_id
+              and coalesce(source_account_id, '') = any(:account_ids)
+              and (:from_date is null or event_timestamp::date >= cast(:from_date as date))
+              and (:to_date   is null or event_timestamp::date <= cast(:to_date as date))
+            group by 1, 2
+            """
+        ),
+        {
+            "household_id": household_id,
+            "account_ids": sorted(account_ids),
+            "from_date": str(from_date) if from_date else None,
+            "to_date": str(to_date) if to_date else None,
+        },
+    ).mappings()
+    return {
+        (str(r["account_id"]), _as_date(r["trade_date"])): {
+            "content_hash": str(r["content_hash"]),
+            "event_count": int(r["event_count"]),
+        }
+        for r in rows
+        if r["trade_date"] is not None
+    }
+
+
+def _load_stored_day_hashes(
+    session: Session,
+    household_id: str,
+    account_ids: set[str],
+    from_date: date | None,
+    to_date: date | None,
+) -> dict[DayKey, str]:
+    """Return the stored content hash per (account, day) for the given accounts."""
+
+    if not account_ids:
+        return {}
+    rows = session.execute(
+        text(
+            """
+            select account_id, date, content_hash
+            from compute.pnl_day_hashes
+            where household_id = :household_id
+              and account_id = any(:account_ids)
+              and (:from_date is null or date >= cast(:from_date as date))
+              and (:to_date   is null or date <= cast(:to_date as date))
+            """
+        ),
+        {
+            "household_id": household_id,
+            "account_ids": sorted(account_ids),
+            "from_date": str(from_date) if from_date else None,
+            "to_date": str(to_date) if to_date else None,
+        },
+    ).mappings()
+    return {(str(r["account_id"]), _as_date(r["date"])): str(r["content_hash"]) for r in rows}
+
+
 def _fetch_raw_events(
     session: Session,
     household_id: str,
     from_date: date | None,
     to_date: date | None,
+    days: list[date] | None = None,
 ) -> list[dict[str, Any]]:
-    """Return raw.broker_trade_events rows for the household in the date window."""
+    """Return raw.broker_trade_events rows for the household in the date window.
 
+    ``days`` restricts the result to those trade dates (incremental runs);
+    ``None`` means every day in the window.
+    """
+
+    if days is not None and not days:
+        return []
     rows = session.execute(
         text(
             """
@@ -202,8 +423,9 @@ def _fetch_raw_events(
                 currency
             from raw.broker_trade_events
             where household_id = :household_id
-              and (:from_date is null or event_timestamp::date >= :from_date::date)
-              and (:to_date   is null or event_timestamp::date <= :to_date::date)
+              and (:from_date is null or event_timestamp::date >= cast(:from_date as date))
+              and (:to_date   is null or event_timestamp::date <= cast(:to_date as date))
+              and (cast(:days as date[]) is null or event_timestamp::date = any(cast(:days as date[])))
             order by event_timestamp
             """
         ),
@@ -211,6 +433,7 @@ def _fetch_raw_events(
             "household_id": household_id,
             "from_date": str(from_date) if from_date else None,
             "to_date": str(to_date) if to_date else None,
+            "days": [str(d) for d in days] if days is not None else None,
         },
     ).mappings()
     return [dict(r) for r in rows]
@@ -230,9 +453,7 @@ def _aggregate_daily(raw_rows: list[dict[str, Any]]) -> dict[date, dict[str, Any
     by_day: dict[date, dict[str, Any]] = {}
 
     for row in raw_rows:
-        d = row["trade_date"]
-        if isinstance(d, str):
-            d = date.fromisoformat(d)
+        d = _as_date(row["trade_date"])
 
         qty = Decimal(str(row["quantity"] or 0))
         price = Decimal(str(row["price"] or 0))
@@ -275,34 +496,34 @@ def _write_intermediates(
     household_id: str,
     intermediates: dict[date, dict[str, Any]],
 ) -> None:
-    """Insert rows into compute.daily_pnl_intermediates for this run."""
+    """Insert rows into compute.daily_pnl_intermediates for this run in one statement."""
 
-    for bucket in intermediates.values():
-        session.execute(
-            text(
-                """
-                insert into compute.daily_pnl_intermediates
-                    (run_id, household_id, date, realized_pnl, unrealized_pnl,
-                     fees, taxes, trade_count, winning_trades, losing_trades)
-                values
-                    (:run_id, :household_id, :date, :realized_pnl, :unrealized_pnl,
-                     :fees, :taxes, :trade_count, :winning_trades, :losing_trades)
-                on conflict (run_id, household_id, date, account_id, symbol) do nothing
-                """
+    if not intermediates:
+        return
+    session.execute(
+        text(
+            """
+            insert into compute.daily_pnl_intermediates
+                (run_id, household_id, date, realized_pnl, unrealized_pnl,
+                 fees, taxes, trade_count, winning_trades, losing_trades)
+            select
+                cast(:run_id as uuid), cast(:household_id as uuid), r.date, r.realized_pnl, r.unrealized_pnl,
+                r.fees, r.taxes, r.trade_count, r.winning_trades, r.losing_trades
+            from jsonb_to_recordset(cast(:rows as jsonb)) as r(
+                date date, realized_pnl numeric, unrealized_pnl numeric, fees numeric, taxes numeric,
+                trade_count integer, winning_trades integer, losing_trades integer
+            )
+            on conflict (run_id, household_id, date, account_id, symbol) do nothing
+            """
+        ),
+        {
+            "run_id": run_id,
+            "household_id": household_id,
+            "rows": json.dumps(
+                [{"date": str(bucket["trade_date"]), **_bucket_payload(bucket)} for bucket in intermediates.values()]
             ),
-            {
-                "run_id": run_id,
-                "household_id": household_id,
-                "date": bucket["trade_date"],
-                "realized_pnl": str(bucket["realized_pnl"]),
-                "unrealized_pnl": str(bucket["unrealized_pnl"]),
-                "fees": str(bucket["fees"]),
-                "taxes": str(bucket["taxes"]),
-                "trade_count": bucket["trade_count"],
-                "winning_trades": bucket["winning_trades"],
-                "losing_trades": bucket["losing_trades"],
-            },
-        )
+        },
+    )
 
 
 def _reconcile(
@@ -345,46 +566,191 @@ def _publish_cooked(
     intermediates: dict[date, dict[str, Any]],
     currency: str,
 ) -> int:
-    """Upsert cooked.daily_performance rows from the intermediates.
+    """Upsert cooked.daily_performance rows from the intermediates in one statement.
 
     Returns the number of rows upserted.
     """
 
-    count = 0
-    for bucket in intermediates.values():
-        payload = {
-            "realized_pnl": str(bucket["realized_pnl"]),
-            "unrealized_pnl": str(bucket["unrealized_pnl"]),
-            "fees": str(bucket["fees"]),
-            "taxes": str(bucket["taxes"]),
-            "trade_count": bucket["trade_count"],
-            "winning_trades": bucket["winning_trades"],
-            "losing_trades": bucket["losing_trades"],
-        }
+    if not intermediates:
+        return 0
+    session.execute(
+        text(
+            """
+            insert into cooked.daily_performance
+                (household_id, date, currency, performance_payload, source_run_id, _computed_at)
+            select
+                cast(:household_id as uuid), r.date, :currency, r.payload, cast(:run_id as uuid), now()
+            from jsonb_to_recordset(cast(:rows as jsonb)) as r(date date, payload jsonb)
+            on conflict (household_id, date, currency) do update
+                set performance_payload = excluded.performance_payload,
+                    source_run_id       = excluded.source_run_id,
+                    _computed_at        = excluded._computed_at
+            """
+        ),
+        {
+            "household_id": household_id,
+            "currency": currency,
+            "rows": json.dumps(
+                [
+                    {"date": str(bucket["trade_date"]), "payload": _bucket_payload(bucket)}
+                    for bucket in intermediates.values()
+                ]
+            ),
+            "run_id": run_id,
+        },
+    )
+    return len(intermediates)
+
+
+def _delete_cooked_days(session: Session, household_id: str, days: list[date], currency: str) -> int:
+    """Remove cooked.daily_performance rows for days that no longer have raw events."""
+
+    if not days:
+        return 0
+    session.execute(
+        text(
+            """
+            delete from cooked.daily_performance
+            where household_id = :household_id
+              and currency = :currency
+              and date = any(cast(:days as date[]))
+            """
+        ),
+        {"household_id": household_id, "currency": currency, "days": [str(d) for d in days]},
+    )
+    return len(days)
+
+
+def _store_day_hashes(
+    session: Session,
+    run_id: str,
+    household_id: str,
+    fingerprints: dict[DayKey, dict[str, Any]],
+    vanished: set[DayKey],
+    *,
+    reset: bool = False,
+) -> None:
+    """Record the published content hash per (account, day).
+
+    ``reset`` drops every stored hash for the household first (unbounded full rebuild).
+    """
+
+    if reset:
+        session.execute(
+            text("delete from compute.pnl_day_hashes where household_id = :household_id"),
+            {"household_id": household_id},
+        )
+    elif vanished:
         session.execute(
             text(
                 """
-                insert into cooked.daily_performance
-                    (household_id, date, currency, performance_payload, source_run_id, _computed_at)
-                values
-                    (:household_id, :date, :currency,
-                     cast(:payload as jsonb), :run_id::uuid, now())
-                on conflict (household_id, date, currency) do update
-                    set performance_payload = excluded.performance_payload,
-                        source_run_id       = excluded.source_run_id,
-                        _computed_at        = excluded._computed_at
+                delete from compute.pnl_day_hashes h
+                using jsonb_to_recordset(cast(:keys as jsonb)) as k(account_id text, date date)
+                where h.household_id = :household_id
+                  and h.account_id = k.account_id
+                  and h.date = k.date
                 """
             ),
             {
                 "household_id": household_id,
-                "date": bucket["trade_date"],
-                "currency": currency,
-                "payload": json.dumps(payload),
-                "run_id": run_id,
+                "keys": json.dumps([{"account_id": account_id, "date": str(day)} for account_id, day in vanished]),
             },
         )
-        count += 1
-    return count
+    if not fingerprints:
+        return
+    session.execute(
+        text(
+            """
+            insert into compute.pnl_day_hashes
+                (household_id, account_id, date, content_hash, event_count, source_run_id, updated_at)
+            select
+                cast(:household_id as uuid), r.account_id, r.date, r.content_hash, r.event_count,
+                cast(:run_id as uuid), now()
+            from jsonb_to_recordset(cast(:rows as jsonb)) as r(
+                account_id text, date date, content_hash text, event_count integer
+            )
+            on conflict (household_id, account_id, date) do update
+                set content_hash  = excluded.content_hash,
+                    event_count   = excluded.event_count,
+                    source_run_id = excluded.source_run_id,
+                    updated_at    = excluded.updated_at
+            """
+        ),
+        {
+            "household_id": household_id,
+            "run_id": run_id,
+            "rows": json.dumps(
+                [
+                    {"account_id": account_id, "date": str(day), **fingerprint}
+                    for (account_id, day), fingerprint in fingerprints.items()
+                ]
+            ),
+        },
+    )
+
+
+def _store_watermarks(
+    session: Session,
+    run_id: str,
+    household_id: str,
+    watermarks: dict[str, tuple[int, datetime | None]],
+    removed: Iterable[str] = (),
+    *,
+    reset: bool = False,
+) -> None:
+    """Advance compute.pnl_watermarks for the accounts processed by this run.
+
+    ``removed`` accounts no longer have any events; ``reset`` drops every
+    stored watermark for the household first (full rebuild).
+    """
+
+    removed = sorted(removed)
+    if reset or removed:
+        session.execute(
+            text(
+                """
+                delete from compute.pnl_watermarks
+                where household_id = :household_id
+                  and (:reset or account_id = any(:account_ids))
+                """
+            ),
+            {"household_id": household_id, "reset": reset, "account_ids": removed},
+        )
+    if not watermarks:
+        return
+    session.execute(
+        text(
+            """
+            insert into compute.pnl_watermarks
+                (household_id, account_id, event_count, loaded_through, source_run_id, updated_at)
+            select
+                cast(:household_id as uuid), r.account_id, r.event_count, r.loaded_through,
+                cast(:run_id as uuid), now()
+            from jsonb_to_recordset(cast(:rows as jsonb)) as r(
+                account_id text, event_count bigint, loaded_through timestamptz
+            )
+            on conflict (household_id, account_id) do update
+                set event_count    = excluded.event_count,
+                    loaded_through = excluded.loaded_through,
+                    source_run_id  = excluded.source_run_id,
+                    updated_at     = excluded.updated_at
+            """
+        ),
+        {
+            "household_id": household_id,
+            "run_id": run_id,
+            "rows": json.dumps(
+                [
+                    {
+                        "account_id": account_id,
+                        "event_count": event_count,
+                        "loaded_through": loaded_through.isoformat() if loaded_through else None,
+                    }
+                    for account_id, (event_count, loaded_through) in watermarks.items()
+                ]
+            ),
+        },
+    )
 
 
 def _finish_pnl_run(session: Session, run_id: str, status: str, error: str | None = None) -> None:
@@ -397,7 +763,7 @@ def _finish_pnl_run(session: Session, run_id: str, status: str, error: str | Non
                set status      = :status,
                    finished_at = now(),
                    error       = :error
-             where run_id = :run_id::uuid
+             where run_id = cast(:run_id as uuid)
             """
         ),
         {"run_id": run_id, "status": status, "error": error},
@@ -423,7 +789,7 @@ def _update_refresh_state(
                 insert into public.household_refresh_state
                     (household_id, job_type, last_run_id, last_succeeded_at, last_input_hash)
                 values
-                    (:household_id, :job_type, :run_id::uuid, now(), :input_hash)
+                    (:household_id, :job_type, cast(:run_id as uuid), now(), :input_hash)
                 on conflict (household_id, job_type) do update
                     set last_run_id       = excluded.last_run_id,
                         last_succeeded_at = excluded.last_succeeded_at,
@@ -446,7 +812,7 @@ def _update_refresh_state(
                 insert into public.household_refresh_state
                     (household_id, job_type, last_run_id, last_failed_at, last_error)
                 values
-                    (:household_id, :job_type, :run_id::uuid, now(), :error)
+                    (:household_id, :job_type, cast(:run_id as uuid), now(), :error)
                 on conflict (household_id, job_type) do update
                     set last_failed_at = excluded.last_failed_at,
                         last_error     = excluded.last_error
@@ -488,13 +854,44 @@ def _optional_date(value: object) -> date | None:
         raise ValueError(f"Invalid date value '{value}': {exc}") from exc
 
 
+def _as_date(value: object) -> date:
+    """Coerce a DB date (or ISO string from a fake/driver) to ``date``."""
+
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+def _bucket_payload(bucket: dict[str, Any]) -> dict[str, Any]:
+    """JSON-safe P&L columns of one daily bucket."""
+
+    return {
+        "realized_pnl": str(bucket["realized_pnl"]),
+        "unrealized_pnl": str(bucket["unrealized_pnl"]),
+        "fees": str(bucket["fees"]),
+        "taxes": str(bucket["taxes"]),
+        "trade_count": bucket["trade_count"],
+        "winning_trades": bucket["winning_trades"],
+        "losing_trades": bucket["losing_trades"],
+    }
+
+
 def _input_hash(
     household_id: str,
     from_date: date | None,
     to_date: date | None,
     raw_count: int,
+    watermarks: Iterable[str] = (),
 ) -> str:
-    """Produce a short hash summarising the inputs for idempotency tracking."""
+    """Produce a short hash summarising the inputs for idempotency tracking.
+
+    ``watermarks`` are per-account ``account:count:loaded_through`` strings, so a
+    re-imported (edited) event changes the hash even when the count does not.
+    """
 
-    key = f"{household_id}:{from_date}:{to_date}:{raw_count}"
-    return hashlib.sha256(key.encode()).hexdigest()[:16]
+    digest = hashlib.sha256(f"{household_id}:{from_date}:{to_date}:{raw_count}".encode())
+    for watermark in sorted(watermarks):
+        digest.update(watermark.encode())
+    return digest.hexdigest()[:16]
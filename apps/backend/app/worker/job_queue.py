@@ -1,25 +1,73 @@
-"""Supabase-backed compute job queue poller."""
+"""Supabase-backed compute job queue poller and worker pool.
+
+Jobs are claimed with ``FOR UPDATE SKIP LOCKED`` and each one runs in its own
+session with its own commit, so a failing or slow job never holds back the
+rest of its batch.  :class:`JobWorkerPool` runs claimed jobs on a thread pool
+with per-``job_type`` concurrency limits and wakes immediately on
+``NOTIFY compute_jobs`` (sent by an insert trigger on ``public.compute_jobs``);
+the poll interval remains the fallback when notifications are unavailable.
+
+A claimed job holds a lease (``lease_expires_at``) that a
+:class:`LeaseHeartbeat` renews while the job runs.  Only ``running`` jobs
+whose lease has lapsed (their worker died) are reclaimed, so a job that runs
+for an hour is never handed to a second worker.
+"""
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections import Counter
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import AbstractContextManager
 from dataclasses import dataclass
+import json
 import logging
+import threading
+import time
 from typing import Any, Protocol, cast
 from uuid import UUID
 
+from opentelemetry import metrics
 from sqlalchemy import text
 from sqlmodel import Session
 
 from app.dal.database import engine
+from app.dal.notifications import LISTEN_RECONNECT_SECONDS, NotificationListener
 from app.worker.registry import JOB_HANDLERS, JobHandler, JobPayload, JobResult
 from app.worker.retry import backoff_interval_sql
 
 logger = logging.getLogger(__name__)
 MAX_ATTEMPTS = 5
 DEFAULT_BATCH_SIZE = 10
+DEFAULT_CONCURRENCY = 4
+NOTIFY_CHANNEL = "compute_jobs"
+# Long-running or rate-limited job types that should not fan out by default.
+DEFAULT_JOB_TYPE_LIMITS: dict[str, int] = {"backtest": 1, "backtest_sweep": 1, "flex_options_sync": 1}
+# Seconds a claimed job stays leased without a heartbeat; renewed every quarter.
+JOB_LEASE_SECONDS = 120
+# Rows claimed before leases existed have no lease_expires_at; they fall back
+# to this age since started_at.
 _STALE_RUNNING_MINUTES = 10
+# The claim query scans this many pending rows per free slot so a backlog of a
+# saturated job type cannot hide eligible jobs of other types.
+_CLAIM_SCAN_FACTOR = 5
+
+meter = metrics.get_meter(__name__)
+queue_latency_histogram = meter.create_histogram(
+    "worker.compute_jobs.queue_latency.s",
+    unit="s",
+    description="Time from a compute job becoming eligible to being claimed by a worker.",
+)
+job_duration_histogram = meter.create_histogram(
+    "worker.compute_jobs.duration.s",
+    unit="s",
+    description="Compute job handler wall time.",
+)
+jobs_finished_counter = meter.create_counter(
+    "worker.compute_jobs.finished",
+    unit="1",
+    description="Compute jobs finished, by job_type and outcome (throughput).",
+)
 
 
 class SessionFactory(Protocol):
@@ -38,6 +86,7 @@ class ComputeJob:
     job_type: str
     payload: JobPayload
     attempts: int
+    queue_seconds: float | None = None
 
 
 def _default_session_factory() -> AbstractContextManager[Session]:
@@ -54,30 +103,108 @@ class JobQueuePoller:
         handlers: dict[str, JobHandler] | None = None,
         session_factory: Callable[[], AbstractContextManager[Session]] | None = None,
         batch_size: int = DEFAULT_BATCH_SIZE,
+        lease_seconds: float = JOB_LEASE_SECONDS,
     ) -> None:
         """Initialize a poller for the configured handler registry."""
 
         self.handlers = handlers if handlers is not None else JOB_HANDLERS
         self.session_factory = session_factory or _default_session_factory
         self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self._held: set[UUID] = set()
+        self._held_lock = threading.Lock()
+
+    @property
+    def held_job_ids(self) -> list[UUID]:
+        """Jobs this poller has claimed and not finalized yet."""
+
+        with self._held_lock:
+            return list(self._held)
 
     def poll_once(self) -> int:
-        """Claim and process one batch of pending jobs.
+        """Claim one batch of pending jobs and run them sequentially.
+
+        The whole batch stays leased while it runs, including jobs still
+        waiting behind a slow one.
 
         Returns:
             Number of jobs claimed for processing.
         """
 
+        jobs = self.claim_jobs()
+        if jobs:
+            heartbeat = LeaseHeartbeat(self)
+            heartbeat.start()
+            try:
+                for job in jobs:
+                    self.run_job(job)
+            finally:
+                heartbeat.stop()
+        return len(jobs)
+
+    def claim_jobs(self, limit: int | None = None, type_slots: Mapping[str, int] | None = None) -> list[ComputeJob]:
+        """Reclaim stale jobs, then claim and commit up to ``limit`` pending jobs.
+
+        Args:
+            limit: Maximum jobs to claim; defaults to ``batch_size``.
+            type_slots: Free slots per ``job_type``.  Types missing from the
+                mapping are only bounded by ``limit``; a value of 0 skips the
+                type entirely.
+        """
+
         with self.session_factory() as session:
             self._reclaim_stale_running_jobs(session)
-            jobs = self._claim_pending_jobs(session)
-            for job in jobs:
-                self._process_job(session, job)
+            jobs = self._claim_pending_jobs(session, limit=limit, type_slots=type_slots)
             session.commit()
-            return len(jobs)
+        with self._held_lock:
+            self._held.update(job.id for job in jobs)
+        for job in jobs:
+            if job.queue_seconds is not None:
+                queue_latency_histogram.record(job.queue_seconds, {"job_type": job.job_type})
+        return jobs
+
+    def run_job(self, job: ComputeJob) -> None:
+        """Run one claimed job in its own session and commit its outcome."""
+
+        started = time.perf_counter()
+        try:
+            with self.session_factory() as session:
+                outcome = self._process_job(session, job)
+                session.commit()
+        finally:
+            with self._held_lock:
+                self._held.discard(job.id)
+        job_duration_histogram.record(time.perf_counter() - started, {"job_type": job.job_type})
+        jobs_finished_counter.add(1, {"job_type": job.job_type, "outcome": outcome})
+
+    def renew_leases(self) -> int:
+        """Push the lease of every held job forward; return how many were renewed."""
+
+        job_ids = self.held_job_ids
+        if not job_ids:
+            return 0
+        with self.session_factory() as session:
+            rows = session.execute(
+                text(
+                    """
+                    update public.compute_jobs
+                       set lease_expires_at = now() + make_interval(secs => :lease_seconds)
+                     where id = any(cast(:job_ids as uuid[]))
+                       and status = 'running'
+                    returning id
+                    """
+                ),
+                {"job_ids": [str(job_id) for job_id in job_ids], "lease_seconds": self.lease_seconds},
+            ).fetchall()
+            session.commit()
+        return len(rows)
 
     def _reclaim_stale_running_jobs(self, session: Session) -> None:
-        """Reset jobs stuck in 'running' state back to 'pending' for retry."""
+        """Reset 'running' jobs whose lease lapsed back to 'pending' for retry.
+
+        Jobs this poller still holds are never reclaimed, even if a missed
+        heartbeat let their lease lapse.
+        """
 
         rows = session.execute(
             text(
@@ -85,43 +212,78 @@ class JobQueuePoller:
                 update public.compute_jobs
                    set status = 'pending',
                        next_retry_at = now(),
-                       started_at = null
+                       started_at = null,
+                       lease_expires_at = null
                  where status = 'running'
-                   and started_at < now() - interval '"""
+                   and coalesce(lease_expires_at, started_at + interval '"""
                 + str(_STALE_RUNNING_MINUTES)
-                + """ minutes'
+                + """ minutes') < now()
+                   and not (id = any(cast(:held_ids as uuid[])))
                 returning id
                 """
-            )
+            ),
+            {"held_ids": [str(job_id) for job_id in self.held_job_ids]},
         ).fetchall()
         if rows:
             logger.warning("Reclaimed %d stale running job(s)", len(rows))
 
-    def _claim_pending_jobs(self, session: Session) -> list[ComputeJob]:
+    def _claim_pending_jobs(
+        self,
+        session: Session,
+        *,
+        limit: int | None = None,
+        type_slots: Mapping[str, int] | None = None,
+    ) -> list[ComputeJob]:
         """Mark pending jobs running and return their payloads."""
 
+        limit = self.batch_size if limit is None else limit
+        if limit <= 0:
+            return []
         rows = session.execute(
             text(
                 """
+                with candidates as (
+                  select id, job_type, created_at
+                    from public.compute_jobs
+                   where status = 'pending'
+                     and attempts < :max_attempts
+                     and (next_retry_at is null or next_retry_at <= now())
+                     and coalesce((cast(:type_slots as jsonb) ->> job_type)::int, 1) > 0
+                   order by created_at
+                   limit :scan_limit
+                   for update skip locked
+                ), ranked as (
+                  select id, created_at,
+                         row_number() over (partition by job_type order by created_at) as type_rank,
+                         coalesce((cast(:type_slots as jsonb) ->> job_type)::int, :batch_size) as type_slots
+                    from candidates
+                ), eligible as (
+                  select id as job_id
+                    from ranked
+                   where type_rank <= type_slots
+                   order by created_at
+                   limit :batch_size
+                )
                 update public.compute_jobs
                    set status = 'running',
                        started_at = now(),
+                       lease_expires_at = now() + make_interval(secs => :lease_seconds),
                        finished_at = null,
                        error = null
-                 where id in (
-                   select id
-                     from public.compute_jobs
-                    where status = 'pending'
-                      and attempts < :max_attempts
-                      and (next_retry_at is null or next_retry_at <= now())
-                    order by created_at
-                    limit :batch_size
-                    for update skip locked
-                 )
-                returning id, household_id, job_type, payload, attempts
+                  from eligible
+                 where public.compute_jobs.id = eligible.job_id
+                returning id, household_id, job_type, payload, attempts,
+                          extract(epoch from now() - greatest(created_at, coalesce(next_retry_at, created_at)))
+                            as queue_seconds
                 """
             ),
-            {"max_attempts": MAX_ATTEMPTS, "batch_size": self.batch_size},
+            {
+                "max_attempts": MAX_ATTEMPTS,
+                "batch_size": limit,
+                "scan_limit": limit * _CLAIM_SCAN_FACTOR,
+                "type_slots": json.dumps(dict(type_slots or {})),
+                "lease_seconds": self.lease_seconds,
+            },
         ).mappings()
 
         return [
@@ -131,31 +293,35 @@ class JobQueuePoller:
                 job_type=cast(str, row["job_type"]),
                 payload=cast(JobPayload, row["payload"] or {}),
                 attempts=cast(int, row["attempts"]),
+                queue_seconds=float(row["queue_seconds"]) if row.get("queue_seconds") is not None else None,
             )
             for row in rows
         ]
 
-    def _process_job(self, session: Session, job: ComputeJob) -> None:
-        """Dispatch one claimed job and persist its terminal or retry state."""
+    def _process_job(self, session: Session, job: ComputeJob) -> str:
+        """Dispatch one claimed job and persist its terminal or retry state.
+
+        Returns:
+            ``"done"``, ``"retry"`` or ``"failed"`` for metrics.
+        """
 
         handler = self.handlers.get(job.job_type)
         if handler is None:
-            self._record_failure(
+            return self._record_failure(
                 session,
                 job,
                 ValueError(f"No handler registered for job_type '{job.job_type}'"),
                 permanent=True,
             )
-            return
 
         try:
             result = handler(_with_job_metadata(job))
         except Exception as exc:  # noqa: BLE001 - queue must capture handler failures
             logger.exception("Compute job %s failed", job.id)
-            self._record_failure(session, job, exc)
-            return
+            return self._record_failure(session, job, exc)
 
         self._record_success(session, job.id, result)
+        return "done"
 
     def _record_success(self, session: Session, job_id: UUID, result: JobResult) -> None:
         """Mark a job done with its JSON result."""
@@ -167,6 +333,7 @@ class JobQueuePoller:
                    set status = 'done',
                        result = cast(:result as jsonb),
                        error = null,
+                       lease_expires_at = null,
                        finished_at = now()
                  where id = :job_id
                 """
@@ -180,7 +347,7 @@ class JobQueuePoller:
         job: ComputeJob,
         exc: Exception,
         permanent: bool = False,
-    ) -> None:
+    ) -> str:
         """Record a failed attempt and requeue until the retry cap is reached."""
 
         next_attempts = min(job.attempts + 1, MAX_ATTEMPTS)
@@ -198,6 +365,7 @@ class JobQueuePoller:
                        error = :error,
                        attempts = :attempts,
                        next_retry_at = {retry_expr},
+                       lease_expires_at = null,
                        finished_at = case when :status = 'failed' then now() else null end
                  where id = :job_id
                 """
@@ -209,6 +377,7 @@ class JobQueuePoller:
                 "attempts": next_attempts,
             },
         )
+        return "failed" if next_status == "failed" else "retry"
 
 
 def _with_job_metadata(job: ComputeJob) -> JobPayload:
@@ -224,12 +393,177 @@ def _with_job_metadata(job: ComputeJob) -> JobPayload:
 def _json_safe(value: dict[str, Any]) -> str:
     """Serialize a handler result to JSON for jsonb binding."""
 
-    import json
-
     return json.dumps(value, default=str)
 
 
+class LeaseHeartbeat:
+    """Daemon thread renewing a poller's job leases every ``interval`` seconds.
+
+    Renewal failures are logged and retried on the next beat; the lease lasts
+    several intervals, so a brief DB outage does not release running jobs.
+    """
+
+    def __init__(self, poller: JobQueuePoller, interval: float | None = None) -> None:
+        self.poller = poller
+        self.interval = poller.lease_seconds / 4 if interval is None else interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="compute-jobs-lease", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poller.renew_leases()
+            except Exception:  # noqa: BLE001 - the next beat retries before the lease lapses
+                logger.warning("Compute job lease renewal failed", exc_info=True)
+
+
 def poll_compute_jobs() -> int:
     """Run one compute-job polling pass using the global registry."""
 
     return JobQueuePoller().poll_once()
+
+
+class JobNotificationListener(NotificationListener):
+    """Background ``LISTEN compute_jobs`` that sets a wake event on every notify.
+
+    The wake event is also set after every (re)connect, since a job may have
+    been enqueued while the listener was down; the pool's poll interval covers
+    any longer gap.
+    """
+
+    def __init__(
+        self,
+        wake: threading.Event,
+        connect: Callable[[], Any] | None = None,
+        channel: str = NOTIFY_CHANNEL,
+        reconnect_seconds: float = LISTEN_RECONNECT_SECONDS,
+    ) -> None:
+        super().__init__(
+            channel,
+            on_notify=lambda _job_type: wake.set(),
+            connect=connect,
+            on_connect=wake.set,
+            reconnect_seconds=reconnect_seconds,
+        )
+        self.wake = wake
+
+
+class JobWorkerPool:
+    """Run compute jobs concurrently with per-job-type limits.
+
+    A dispatcher thread claims as many jobs as there are free slots, hands each
+    to a thread pool (one session and commit per job), and sleeps until a job
+    finishes, a ``NOTIFY`` arrives, or ``poll_interval`` elapses.  A
+    :class:`LeaseHeartbeat` keeps in-flight jobs leased for as long as they run.
+    """
+
+    def __init__(
+        self,
+        poller: JobQueuePoller | None = None,
+        max_workers: int = DEFAULT_CONCURRENCY,
+        type_limits: Mapping[str, int] | None = None,
+        poll_interval: float = 5.0,
+        listen: bool = True,
+    ) -> None:
+        self.poller = poller or JobQueuePoller()
+        self.max_workers = max(1, max_workers)
+        self.type_limits = dict(DEFAULT_JOB_TYPE_LIMITS if type_limits is None else type_limits)
+        self.poll_interval = poll_interval
+        self.wake = threading.Event()
+        self.listener = JobNotificationListener(self.wake) if listen else None
+        self.heartbeat: LeaseHeartbeat | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._dispatcher: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._in_flight: Counter[str] = Counter()
+        self.started_jobs = 0
+        self.finished_jobs = 0
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="compute-job")
+        if self.listener is not None:
+            self.listener.start()
+        self.heartbeat = LeaseHeartbeat(self.poller)
+        self.heartbeat.start()
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="compute-jobs-dispatch", daemon=True)
+        self._dispatcher.start()
+        logger.info("Compute job pool started: %d worker(s), limits %s", self.max_workers, self.type_limits)
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop claiming new jobs; optionally wait for in-flight jobs to finish."""
+
+        self._stop.set()
+        self.wake.set()
+        if self.listener is not None:
+            self.listener.stop(timeout=2.0)
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+        if self.heartbeat is not None:
+            self.heartbeat.stop(timeout=2.0)
+
+    def dispatch_once(self) -> int:
+        """Claim jobs for every free slot and submit them; return the count."""
+
+        with self._lock:
+            capacity = self.max_workers - sum(self._in_flight.values())
+            type_slots = {
+                job_type: max(0, limit - self._in_flight[job_type]) for job_type, limit in self.type_limits.items()
+            }
+        if capacity <= 0:
+            return 0
+        jobs = self.poller.claim_jobs(limit=capacity, type_slots=type_slots)
+        for job in jobs:
+            with self._lock:
+                self._in_flight[job.job_type] += 1
+                self.started_jobs += 1
+            self._submit(job)
+        return len(jobs)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "in_flight": dict(+self._in_flight),
+                "started": self.started_jobs,
+                "finished": self.finished_jobs,
+            }
+
+    def _submit(self, job: ComputeJob) -> None:
+        if self._executor is None:
+            self._run(job)
+        else:
+            self._executor.submit(self._run, job)
+
+    def _run(self, job: ComputeJob) -> None:
+        try:
+            self.poller.run_job(job)
+        except Exception:  # noqa: BLE001 - stale-run reclaim retries jobs whose outcome was not stored
+            logger.exception("Compute job %s could not be finalized", job.id)
+        finally:
+            with self._lock:
+                self._in_flight[job.job_type] -= 1
+                self.finished_jobs += 1
+            # A slot just freed up: let the dispatcher claim the next job now.
+            self.wake.set()
+
+    def _dispatch_loop(self) -> None:
+        while not self._stop.is_set():
+            self.wake.clear()
+            try:
+                self.dispatch_once()
+            except Exception:  # noqa: BLE001 - transient DB errors must not kill the dispatcher
+                logger.warning("Compute job claim failed; retrying after poll interval", exc_info=True)
+            self.wake.wait(self.poll_interval)
@@ -47,7 +47,7 @@ from sqlalchemy import text
 from sqlmodel import Session
 
 from app.dal.database import direct_engine
-from app.services.price_cache import CachedPriceData, lookup_cached_price_data, normalize_symbol
+from app.services.price_cache import CachedPriceData, lookup_cached_price_data_many, normalize_symbol
 from app.worker.registry import JOB_SCHEDULES, JobSchedule
 
 logger = logging.getLogger(__name__)
@@ -277,12 +277,7 @@ def _build_price_lookup(session: Session, symbols: list[str]) -> dict[str, Cache
 
     All RSU tickers are USD-denominated (MSFT, WIX are both NYSE/NASDAQ).
     """
-    result: dict[str, CachedPriceData] = {}
-    for sym in symbols:
-        cached = lookup_cached_price_data(sym, "USD", session)
-        if cached is not None:
-            result[sym] = cached
-    return result
+    return lookup_cached_price_data_many(symbols, "USD", session)
 
 
 # ---------------------------------------------------------------------------
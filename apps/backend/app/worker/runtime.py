@@ -8,13 +8,13 @@ import pathlib
 import signal
 import time
 
+from app.services.expenses.parsers.pool import shutdown_parse_pool
 from app.worker import analyze_schedules
 from app.worker import ndx_daily_sync  # noqa: F401 - imports schedule registration side effect
 from app.worker import price_cache as _price_cache  # noqa: F401 - registers scheduled jobs
 from app.worker import yahoo_refresh as _yahoo_refresh  # noqa: F401 - registers yahoo price refresh job
-from app.worker.job_queue import poll_compute_jobs
+from app.worker.job_queue import DEFAULT_CONCURRENCY, DEFAULT_JOB_TYPE_LIMITS, JobWorkerPool
 from app.worker.registry import JOB_SCHEDULES
-from app.worker.retry import with_db_retry
 from app.worker.scheduler import get_scheduler, register_cron, register_interval
 
 logger = logging.getLogger(__name__)
@@ -32,11 +32,6 @@ def _touch_heartbeat() -> None:
         logger.warning("Failed to update heartbeat file %s", _HEARTBEAT_FILE)
 
 
-def _safe_poll_compute_jobs() -> int:
-    """Poll compute jobs with DB-reconnect retry."""
-    return with_db_retry(poll_compute_jobs)()
-
-
 def _poll_interval_seconds() -> int:
     """Return the queue polling interval in seconds."""
 
@@ -49,6 +44,37 @@ def _poll_interval_seconds() -> int:
     return max(1, value)
 
 
+def _worker_concurrency() -> int:
+    """Return the number of compute jobs that may run at once."""
+
+    raw_value = os.getenv("WORKER_CONCURRENCY", str(DEFAULT_CONCURRENCY))
+    try:
+        value = int(raw_value)
+    except ValueError:
+        logger.warning("Invalid WORKER_CONCURRENCY=%s; using default", raw_value)
+        return DEFAULT_CONCURRENCY
+    return max(1, value)
+
+
+def _job_type_limits() -> dict[str, int]:
+    """Return per-job-type concurrency caps.
+
+    ``WORKER_JOB_TYPE_LIMITS`` is a comma-separated ``job_type=N`` list that
+    overrides the defaults, e.g. ``backtest=2,pnl_daily=4``.
+    """
+
+    limits = dict(DEFAULT_JOB_TYPE_LIMITS)
+    for item in os.getenv("WORKER_JOB_TYPE_LIMITS", "").split(","):
+        if not item.strip():
+            continue
+        job_type, _, raw_limit = item.partition("=")
+        try:
+            limits[job_type.strip()] = max(0, int(raw_limit))
+        except ValueError:
+            logger.warning("Invalid WORKER_JOB_TYPE_LIMITS entry %r; ignoring", item)
+    return limits
+
+
 def start_worker() -> None:
     """Start the scheduler, register all jobs, and block until interrupted."""
 
@@ -67,15 +93,17 @@ def start_worker() -> None:
         else:
             raise ValueError(f"Unsupported schedule kind: {schedule.kind}")
 
-    register_interval(
-        "compute_jobs_poller",
-        _poll_interval_seconds(),
-        _safe_poll_compute_jobs,
+    job_pool = JobWorkerPool(
+        max_workers=_worker_concurrency(),
+        type_limits=_job_type_limits(),
+        poll_interval=_poll_interval_seconds(),
+        listen=os.getenv("WORKER_LISTEN_NOTIFY", "true").lower() != "false",
     )
 
     analyze_schedules.run_startup_analyze_refreshes()
 
     scheduler.start()
+    job_pool.start()
     logger.info("Worker scheduler started with %d job(s)", len(scheduler.get_jobs()))
 
     should_stop = False
@@ -96,7 +124,9 @@ def start_worker() -> None:
                 last_heartbeat = now
             time.sleep(1)
     finally:
+        job_pool.stop(wait=True)
         scheduler.shutdown(wait=False)
+        shutdown_parse_pool()
         logger.info("Worker scheduler stopped")
 
 
@@ -8,62 +8,75 @@ import uvicorn
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from app.middleware.security_headers import SecurityHeadersMiddleware
-from app.dal.database import check_database_connection, create_db_and_tables, validate_database_url
+from app.dal.database import (
+    check_database_connection,
+    create_db_and_tables,
+    direct_engine,
+    validate_database_url,
+)
 from app.utils.decimal_encoder import decimal_default
 from app.dependencies import get_current_user
+from app.request_context import household_membership_listener
+from app.middleware.lazy_routers import LazyRouterMiddleware, LazyRouterRegistry
 from app.api import (
     auth as auth_router_module,
     trades,
-    day,
     summary,
-    ndx,
     ladder,
     holdings,
     bonds,
-    dividends,
     dividend_accounts,
     options,
-    tax_condor,
-    backtest,
     finances,
     plans,
-    trading,
-    pension,
-    analyze,
     insurance,
     positions,
     metrics as telemetry_metrics,
     expenses,
 )
-from opentelemetry import trace, metrics
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-from opentelemetry.sdk.metrics import MeterProvider
-from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
-from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.instrumentation.logging import LoggingInstrumentor
-from opentelemetry.sdk.resources import Resource
 
-# Setup OTel
-resource = Resource.create(attributes={"service.name": os.getenv("OTEL_SERVICE_NAME", "trading-journal-backend")})
+_telemetry_configured = False
 
-trace.set_tracer_provider(TracerProvider(resource=resource))
-tracer_provider = trace.get_tracer_provider()
-otlp_exporter = OTLPSpanExporter(
-    endpoint=os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4317"), insecure=True
-)
-span_processor = BatchSpanProcessor(otlp_exporter)
-tracer_provider.add_span_processor(span_processor)
 
-metric_reader = PeriodicExportingMetricReader(
-    OTLPMetricExporter(endpoint=os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4317"), insecure=True)
-)
-meter_provider = MeterProvider(resource=resource, metric_readers=[metric_reader])
-metrics.set_meter_provider(meter_provider)
+def _configure_telemetry() -> None:
+    """Install the OTLP trace/metric exporters (once per process).
 
-LoggingInstrumentor().instrument(set_logging_format=True)
+    Runs at startup rather than import time: the gRPC exporters are slow to
+    import, and instrumentation created earlier resolves the providers lazily.
+    """
+    global _telemetry_configured
+    if _telemetry_configured:
+        return
+
+    from opentelemetry import metrics, trace
+    from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
+    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+    from opentelemetry.instrumentation.logging import LoggingInstrumentor
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    resource = Resource.create(attributes={"service.name": os.getenv("OTEL_SERVICE_NAME", "trading-journal-backend")})
+
+    trace.set_tracer_provider(TracerProvider(resource=resource))
+    tracer_provider = trace.get_tracer_provider()
+    otlp_exporter = OTLPSpanExporter(
+        endpoint=os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4317"), insecure=True
+    )
+    span_processor = BatchSpanProcessor(otlp_exporter)
+    tracer_provider.add_span_processor(span_processor)
+
+    metric_reader = PeriodicExportingMetricReader(
+        OTLPMetricExporter(endpoint=os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4317"), insecure=True)
+    )
+    meter_provider = MeterProvider(resource=resource, metric_readers=[metric_reader])
+    metrics.set_meter_provider(meter_provider)
+
+    LoggingInstrumentor().instrument(set_logging_format=True)
+    _telemetry_configured = True
 
 
 class DecimalSafeJSONResponse(JSONResponse):
@@ -82,11 +95,23 @@ class DecimalSafeJSONResponse(JSONResponse):
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    _configure_telemetry()
     validate_database_url()
     print("Creating tables..")
     create_db_and_tables()
     await _warmup_jwks_cache()
-    yield
+    # Heavy routers import in the background; requests that arrive first load theirs on demand.
+    lazy_routers.start_warmup()
+    # Cached household memberships are dropped as soon as Supabase changes them.
+    membership_listener = None
+    if direct_engine.dialect.name == "postgresql":
+        membership_listener = household_membership_listener()
+        membership_listener.start()
+    try:
+        yield
+    finally:
+        if membership_listener is not None:
+            membership_listener.stop(timeout=2.0)
 
 
 async def _warmup_jwks_cache() -> None:
@@ -136,6 +161,20 @@ app = FastAPI(
 # Instrument FastAPI
 FastAPIInstrumentor.instrument_app(app)
 
+# Routers whose modules import heavy dependencies (copilot, scipy, yfinance,
+# ib_async) are included on first use; see app.middleware.lazy_routers.
+lazy_routers = LazyRouterRegistry(app)
+_build_openapi = app.openapi
+
+
+def _openapi_with_lazy_routers() -> dict:
+    """Build the OpenAPI schema with every lazy router included."""
+    lazy_routers.load_all()
+    return _build_openapi()
+
+
+app.openapi = _openapi_with_lazy_routers
+
 
 def _cors_settings() -> tuple[list[str], str | None]:
     """Build CORS exact-origin and wildcard-regex settings from env."""
@@ -173,6 +212,12 @@ app.add_middleware(
 )
 
 app.add_middleware(SecurityHeadersMiddleware)
+# Outermost, so it runs before authentication: an unauthenticated request to a
+# lazy prefix (e.g. /api/analyze/, /api/backtest/) can trigger that module's
+# import.  Each module is imported at most once per process and the startup
+# warmup imports them all anyway, so this only moves the cost earlier; the
+# route itself still rejects the request via auth_dep.
+app.add_middleware(LazyRouterMiddleware, registry=lazy_routers)
 
 # Public paths that skip JWT authentication
 PUBLIC_PATHS = {
@@ -231,25 +276,46 @@ auth_dep = [Depends(get_current_user)]
 
 # Include routers
 app.include_router(trades.router, prefix="/api", tags=["trades"], dependencies=auth_dep)
-app.include_router(day.router, prefix="/api", tags=["day"], dependencies=auth_dep)
 app.include_router(summary.router, prefix="/api", tags=["summary"], dependencies=auth_dep)
-app.include_router(ndx.router, prefix="/api", tags=["ndx"], dependencies=auth_dep)
 app.include_router(ladder.router, prefix="/api", tags=["ladder"], dependencies=auth_dep)
 app.include_router(holdings.router, prefix="/api", tags=["holdings"], dependencies=auth_dep)
 app.include_router(bonds.router, prefix="/api", tags=["bonds"], dependencies=auth_dep)
-app.include_router(dividends.router, prefix="/api", tags=["dividends"], dependencies=auth_dep)
 app.include_router(dividend_accounts.router, dependencies=auth_dep)
 app.include_router(options.router, prefix="/api", tags=["options"], dependencies=auth_dep)
-app.include_router(tax_condor.router, prefix="/api/tax-condor", tags=["tax-condor"], dependencies=auth_dep)
-app.include_router(backtest.router, prefix="/api/backtest", tags=["backtest"], dependencies=auth_dep)
 app.include_router(finances.router, dependencies=auth_dep)
 app.include_router(plans.router, dependencies=auth_dep)
-app.include_router(trading.router, dependencies=auth_dep)
-app.include_router(pension.router, dependencies=auth_dep)
-app.include_router(analyze.router, dependencies=auth_dep)
 app.include_router(insurance.router, dependencies=auth_dep)
 app.include_router(positions.router, prefix="/api", tags=["positions"], dependencies=auth_dep)
 app.include_router(expenses.router, dependencies=auth_dep)
+
+# Lazily included routers, keyed by the path prefixes that trigger their import
+lazy_routers.add("app.api.day", path_prefixes=["/api/day/"], prefix="/api", tags=["day"], dependencies=auth_dep)
+lazy_routers.add("app.api.ndx", path_prefixes=["/api/ndx/"], prefix="/api", tags=["ndx"], dependencies=auth_dep)
+# Only the lazy module's own paths: /api/dividends/accounts belongs to the eager dividend_accounts router.
+lazy_routers.add(
+    "app.api.dividends",
+    path_prefixes=["/api/dividends/dashboard", "/api/dividends/position", "/api/dividends/projection"],
+    prefix="/api",
+    tags=["dividends"],
+    dependencies=auth_dep,
+)
+lazy_routers.add(
+    "app.api.tax_condor",
+    path_prefixes=["/api/tax-condor/"],
+    prefix="/api/tax-condor",
+    tags=["tax-condor"],
+    dependencies=auth_dep,
+)
+lazy_routers.add(
+    "app.api.backtest",
+    path_prefixes=["/api/backtest/"],
+    prefix="/api/backtest",
+    tags=["backtest"],
+    dependencies=auth_dep,
+)
+lazy_routers.add("app.api.trading", path_prefixes=["/api/trading/"], dependencies=auth_dep)
+lazy_routers.add("app.api.pension", path_prefixes=["/api/pension/"], dependencies=auth_dep)
+lazy_routers.add("app.api.analyze", path_prefixes=["/api/analyze/"], dependencies=auth_dep)
 # Metrics router handles optional auth internally (telemetry must work with sendBeacon)
 app.include_router(telemetry_metrics.router)
 
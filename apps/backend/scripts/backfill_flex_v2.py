@@ -46,8 +46,8 @@ from app.services.options.flex_parser import (  # noqa: E402
     DIVIDEND_CASH_TYPES,
     FlexSecurityInfo,
     parse_dividend_payment,
-    parse_flex_files,
 )
+from app.services.options.flex_report_cache import parse_flex_files  # noqa: E402
 from app.worker.handlers.options_sync import (  # noqa: E402
     _load_accounts,
     _sync_dividend_accruals,
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Benchmark the streaming Flex parser against the whole-document reader.
+
+Generates a large multi-account household statement with
+``scripts/flex_synthetic.write_large_report`` and parses it with both
+``parse_flex_files(streaming=True)`` (single ``iterparse`` pass) and
+``parse_flex_files(streaming=False)`` (``ElementTree.parse`` + one tree walk
+per section).  Reports wall time and tracemalloc peak for each mode and
+checks that both produce identical results.  The "reader peak" column
+measures the XML reading stage alone (rows dispatched and dropped), which is
+what streaming bounds; the full-parse peak also includes the typed rows the
+caller keeps.
+
+Usage:
+    uv run python scripts/bench_flex_parser.py [--accounts 4] [--trades-per-account 20000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+_BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(_BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT))
+
+from app.services.options.flex_parser import _stream_flex_rows, _tree_flex_rows, parse_flex_files  # noqa: E402
+from scripts.flex_synthetic import write_large_report  # noqa: E402
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=4)
+    parser.add_argument("--trades-per-account", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per mode (best is reported)")
+    parser.add_argument("--xml", type=Path, default=None, help="benchmark an existing Flex XML instead")
+    return parser.parse_args(argv)
+
+
+def _best_seconds(path: Path, *, streaming: bool, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse_flex_files([path], streaming=streaming)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _peak_mib(path: Path, *, streaming: bool) -> float:
+    tracemalloc.start()
+    try:
+        parse_flex_files([path], streaming=streaming)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def _reader_peak_mib(path: Path, *, streaming: bool) -> float:
+    read_rows = _stream_flex_rows if streaming else _tree_flex_rows
+    tracemalloc.start()
+    try:
+        for _ in read_rows(path):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.xml or write_large_report(
+            Path(tmp) / "large_household.xml",
+            accounts=args.accounts,
+            trades_per_account=args.trades_per_account,
+        )
+        size_mib = path.stat().st_size / (1024 * 1024)
+        streamed = parse_flex_files([path], streaming=True)
+        if streamed != parse_flex_files([path], streaming=False):
+            print("ERROR: streaming and tree parsers disagree", file=sys.stderr)
+            return 1
+        rows = sum(value for key, value in streamed.section_counts.items() if not key.startswith("assignment_"))
+        print(f"{path.name}: {size_mib:.1f} MiB, {rows} section rows")
+        print(f"{'mode':<10} {'best s':>8} {'peak MiB':>10} {'reader peak MiB':>16}")
+        for label, streaming in (("tree", False), ("streaming", True)):
+            seconds = _best_seconds(path, streaming=streaming, repeat=args.repeat)
+            peak = _peak_mib(path, streaming=streaming)
+            reader_peak = _reader_peak_mib(path, streaming=streaming)
+            print(f"{label:<10} {seconds:>8.2f} {peak:>10.1f} {reader_peak:>16.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
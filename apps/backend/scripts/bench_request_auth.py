@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Benchmark per-request auth overhead with and without the request caches.
+
+Simulates a dashboard fanning out to many API calls with one bearer token:
+each "request" runs ``get_current_user`` (RS256 verification against a warm
+JWKS cache) followed by ``get_user_household_id`` against an in-memory SQLite
+household table.  The uncached mode clears the verified-token and household
+caches before every request, which is what every request paid before they
+existed; the cached mode leaves them warm.
+
+Usage:
+    uv run python scripts/bench_request_auth.py [--requests 2000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+_BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(_BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT))
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+from jose import jwk, jwt  # noqa: E402
+from sqlalchemy import Column, String, Table, event  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import Session, SQLModel, create_engine  # noqa: E402
+
+from app import supabase_auth  # noqa: E402
+from app.dependencies import get_current_user  # noqa: E402
+from app.request_context import clear_request_caches  # noqa: E402
+from app.schema.household_models import Household, HouseholdMember  # noqa: E402
+from app.services.household_service import get_user_household_id  # noqa: E402
+
+_SUPABASE_URL = "https://bench.supabase.co"
+_KID = "bench-key"
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="authenticated requests per timed run")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per mode (best is reported)")
+    return parser.parse_args(argv)
+
+
+def _signed_token(user_id: str) -> tuple[str, dict]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    public_jwk = {**jwk.construct(public_pem, "RS256").to_dict(), "kid": _KID}
+    now = int(time.time())
+    payload = {
+        "sub": user_id,
+        "role": "authenticated",
+        "aud": "authenticated",
+        "iss": f"{_SUPABASE_URL}/auth/v1",
+        "iat": now,
+        "exp": now + 3600,
+    }
+    token = jwt.encode(payload, private_pem, algorithm="RS256", headers={"kid": _KID})
+    return token, public_jwk
+
+
+def _household_session(user_id) -> Session:  # type: ignore[no-untyped-def]
+    Table("users", SQLModel.metadata, Column("id", String, primary_key=True), schema="auth", extend_existing=True)
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    event.listen(engine, "connect", lambda conn, _: conn.execute("ATTACH DATABASE ':memory:' AS auth"))
+    SQLModel.metadata.create_all(engine, tables=[Household.__table__, HouseholdMember.__table__])
+    session = Session(engine)
+    household_id = uuid4()
+    session.add(Household(id=household_id, name="Bench", created_by=user_id))
+    session.add(HouseholdMember(household_id=household_id, user_id=user_id, role="owner", invited_by=user_id))
+    session.commit()
+    return session
+
+
+async def _run(requests: int, session: Session, request: MagicMock, settings, *, cached: bool) -> float:  # type: ignore[no-untyped-def]
+    clear_request_caches()
+    start = time.perf_counter()
+    for _ in range(requests):
+        if not cached:
+            clear_request_caches()
+        claims = await get_current_user(request, settings)
+        if get_user_household_id(session, claims.sub) is None:
+            raise RuntimeError("household lookup failed")
+    return time.perf_counter() - start
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    user_id = uuid4()
+    token, public_jwk = _signed_token(str(user_id))
+    settings = supabase_auth.SupabaseAuthSettings(supabase_url=_SUPABASE_URL)
+    jwks = supabase_auth.init_jwks_cache(settings)
+    jwks._keys = {_KID: public_jwk}  # warm cache: the benchmark must not touch the network
+    jwks._last_fetch = time.monotonic()
+    session = _household_session(user_id)
+    request = MagicMock()
+    request.headers = {"Authorization": f"Bearer {token}"}
+
+    print(f"{args.requests} requests with one token, best of {args.repeat}")
+    print(f"{'mode':<10} {'total s':>8} {'us/request':>11}")
+    for label, cached in (("uncached", False), ("cached", True)):
+        seconds = min(
+            asyncio.run(_run(args.requests, session, request, settings, cached=cached)) for _ in range(args.repeat)
+        )
+        print(f"{label:<10} {seconds:>8.3f} {seconds / args.requests * 1e6:>11.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
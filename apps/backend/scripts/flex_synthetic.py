@@ -646,6 +646,124 @@ def write_account_info(path: Path) -> None:
     write_xml(path, root)
 
 
+def write_large_report(
+    path: Path,
+    *,
+    accounts: int = 4,
+    trades_per_account: int = 5000,
+    from_year: int = 2021,
+) -> Path:
+    """Write one multi-account household statement for parser benchmarks.
+
+    Every account gets its own FlexStatement with ``trades_per_account``
+    open/close option trades spread over the years from ``from_year``, one
+    CashTransaction per close, one OpenPosition per 20 trades and one
+    OptionEAE expiration per 50 trades — roughly the section mix of a
+    multi-year household Activity Flex export.
+    """
+
+    root = Element("FlexQueryResponse", {"queryName": "synthetic_large"})
+    flex_statements = SubElement(root, "FlexStatements", {"count": str(accounts)})
+    underlyings = ("SPY", "QQQ", "IWM", "AAPL", "MSFT", "NVDA", "AMD", "TSLA")
+    for account_index in range(accounts):
+        account_id = f"U{9000001 + account_index}"
+        flex_statement = SubElement(
+            flex_statements,
+            "FlexStatement",
+            {"accountId": account_id, "fromDate": f"{from_year}-01-01", "toDate": "2025-12-31", "period": "Custom"},
+        )
+        trades = SubElement(flex_statement, "TradeConfirms")
+        cash = SubElement(flex_statement, "CashTransactions")
+        positions = SubElement(flex_statement, "OpenPositions")
+        eae = SubElement(flex_statement, "OptionEAE")
+        for n in range(trades_per_account):
+            underlying = underlyings[n % len(underlyings)]
+            year = from_year + (n * 5) // trades_per_account
+            month = 1 + n % 12
+            day = 1 + n % 28
+            strike = 100 + (n % 40) * 5
+            expiry = f"{year + 1}{month:02d}{day:02d}"
+            symbol = f"{underlying:<6}{expiry[2:]}P{strike * 1000:08d}"
+            opening = n % 2 == 0
+            suffix = f"{account_index}-{n:06d}"
+            row = option_trade(
+                trade_id=f"T-LARGE-{suffix}",
+                transaction_id=f"X-LARGE-{suffix}",
+                scenario="synthetic_large",
+                date_time=f"{year}-{month:02d}-{day:02d};{10 + n % 6:02d}{n % 60:02d}00",
+                symbol=symbol,
+                underlying_symbol=underlying,
+                put_call="P",
+                strike=str(strike),
+                expiry=expiry,
+                quantity="-1" if opening else "1",
+                trade_price="2.50" if opening else "1.00",
+                proceeds="250" if opening else "-100",
+                commission="-1.05",
+                net_cash="248.95" if opening else "-101.05",
+                fifo_pnl_realized="0" if opening else "148.95",
+                buy_sell="SELL" if opening else "BUY",
+                open_close_indicator="O" if opening else "C",
+            )
+            row["accountId"] = account_id
+            SubElement(trades, "TradeConfirm", row)
+            if not opening:
+                cash_row = cash_event(
+                    trade_id=f"C-LARGE-{suffix}",
+                    transaction_id=f"CX-LARGE-{suffix}",
+                    scenario="synthetic_large",
+                    date_time=f"{year}-{month:02d}-{day:02d};170000",
+                    event_type="Other Fees",
+                    description="Synthetic exchange fee",
+                    amount="-0.35",
+                )
+                cash_row["accountId"] = account_id
+                SubElement(cash, "CashTransaction", cash_row)
+            if n % 20 == 0:
+                position = base_attrs(f"P-LARGE-{suffix}", f"PX-LARGE-{suffix}")
+                position.update(
+                    {
+                        "accountId": account_id,
+                        "assetCategory": "OPT",
+                        "symbol": symbol,
+                        "underlyingSymbol": underlying,
+                        "putCall": "P",
+                        "strike": decimal_text(str(strike)),
+                        "expiry": expiry,
+                        "multiplier": decimal_text("100"),
+                        "position": decimal_text("-1"),
+                        "costBasisMoney": decimal_text("-250"),
+                        "costBasisPrice": decimal_text("2.50"),
+                        "markPrice": decimal_text("1.10"),
+                        "fifoPnlUnrealized": decimal_text("140"),
+                        "reportDate": "20251231",
+                    }
+                )
+                SubElement(positions, "OpenPosition", position)
+            if n % 50 == 0:
+                expiration = eae_event(
+                    trade_id=f"E-LARGE-{suffix}",
+                    transaction_id=f"EX-LARGE-{suffix}",
+                    scenario="synthetic_large",
+                    date_time=f"{year + 1}-{month:02d}-{day:02d};160000",
+                    symbol=symbol,
+                    underlying_symbol=underlying,
+                    put_call="P",
+                    strike=str(strike),
+                    expiry=expiry,
+                    quantity="1",
+                    event_type="Expiration",
+                    fifo_pnl_realized="250",
+                    proceeds="0",
+                    notes="Synthetic expiration",
+                )
+                expiration.update({"accountId": account_id, "assetCategory": "OPT"})
+                SubElement(eae, "OptionEAE", expiration)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_xml(path, root)
+    return path
+
+
 def write_synthetic_files(output_dir: Path = DEFAULT_OUTPUT_DIR) -> list[Path]:
     """Write all synthetic Flex fixtures and return their paths."""
     output_dir.mkdir(parents=True, exist_ok=True)
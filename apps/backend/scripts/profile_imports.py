@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Report per-module import time for the API process.
+
+Imports a module (``main`` by default) in a fresh interpreter under
+``python -X importtime`` and prints the slowest modules by cumulative time
+(self time excludes submodules), followed by self time summed per top-level
+package.  Use it to find what a cold start or worker restart pays for before
+the server can answer health checks; heavy routers registered with
+``app.middleware.lazy_routers`` should not appear.
+
+Usage:
+    uv run python scripts/profile_imports.py [--module main] [--top 30]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+_BACKEND_ROOT = Path(__file__).resolve().parents[1]
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+@dataclass(frozen=True)
+class ModuleImport:
+    name: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main", help="module to import (run from the backend root)")
+    parser.add_argument("--top", type=int, default=30, help="modules to list")
+    return parser.parse_args(argv)
+
+
+def profile_imports(module: str) -> list[ModuleImport]:
+    """Import *module* in a fresh interpreter and return its ``-X importtime`` records."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=_BACKEND_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    records = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append(ModuleImport(name, int(self_us) / 1000, int(cumulative_us) / 1000, len(indent) // 2))
+    return records
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    records = profile_imports(args.module)
+    total_ms = sum(record.cumulative_ms for record in records if record.depth == 0)
+
+    print(f"import {args.module}: {total_ms:.0f} ms across {len(records)} modules")
+    print(f"{'module':<60} {'self ms':>9} {'cum ms':>9}")
+    for record in sorted(records, key=lambda r: r.cumulative_ms, reverse=True)[: args.top]:
+        print(f"{record.name:<60} {record.self_ms:>9.1f} {record.cumulative_ms:>9.1f}")
+
+    by_package: dict[str, float] = defaultdict(float)
+    for record in records:
+        by_package[record.name.split(".")[0]] += record.self_ms
+    print()
+    print(f"{'package':<60} {'self ms':>9}")
+    for package, self_ms in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+        print(f"{package:<60} {self_ms:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
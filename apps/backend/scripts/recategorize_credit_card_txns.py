@@ -6,10 +6,15 @@ Usage (from apps/backend/):
 
 Idempotent: only touches rows where resolution_status = 'unresolved' OR category_id IS NULL.
 Safe to re-run.
+
+Categorization is CPU-bound: merchant mappings are loaded once (``MerchantMappingCache``),
+repeated merchants hit the resolver's rule-match memo, and results are written back in
+``UPDATE_BATCH_SIZE`` set-based UPDATEs plus one match_count UPDATE — all in one transaction.
 """
 
 from __future__ import annotations
 
+import json
 import os
 import sys
 from dataclasses import dataclass
@@ -25,7 +30,9 @@ if _BACKEND not in sys.path:
 from sqlalchemy import create_engine, text
 from sqlmodel import Session
 
-from app.services.expenses.categorize import CategoryResolver  # noqa: E402
+from app.services.expenses.categorize import CategoryResolver, MerchantMappingCache  # noqa: E402
+
+UPDATE_BATCH_SIZE = 5000
 
 
 @dataclass
@@ -61,12 +68,19 @@ def main() -> int:
     )
     update_sql = text(
         """
-        UPDATE credit_card_transactions
-           SET category_id = :category_id,
-               subcategory_id = :subcategory_id,
-               resolution_status = :resolution_status,
-               resolution_source = :resolution_source
-         WHERE id = :tid
+        UPDATE credit_card_transactions AS t
+           SET category_id = r.category_id,
+               subcategory_id = r.subcategory_id,
+               resolution_status = r.resolution_status,
+               resolution_source = r.resolution_source
+          FROM jsonb_to_recordset(cast(:rows AS jsonb)) AS r(
+                   tid uuid,
+                   category_id uuid,
+                   subcategory_id uuid,
+                   resolution_status text,
+                   resolution_source text
+               )
+         WHERE t.id = r.tid
         """
     )
 
@@ -76,22 +90,23 @@ def main() -> int:
         rows = session.execute(select_sql, {"hid": str(household_id)}).all()
         print(f"Loaded {len(rows)} candidate transactions to recategorize.")
 
+        mappings = MerchantMappingCache(session, household_id)
+        updates: list[dict] = []
         for row in rows:
             txn = _Txn(
                 merchant_raw=row.merchant_raw or "",
                 merchant_normalized=row.merchant_normalized or row.merchant_raw or "",
                 sector_raw=row.sector_raw,
             )
-            assignment = resolver.resolve(txn, session, household_id)
-            session.execute(
-                update_sql,
+            assignment = resolver.resolve(txn, session, household_id, mappings=mappings)
+            updates.append(
                 {
-                    "tid": row.id,
+                    "tid": str(row.id),
                     "category_id": str(assignment.category_id) if assignment.category_id else None,
                     "subcategory_id": str(assignment.subcategory_id) if assignment.subcategory_id else None,
                     "resolution_status": assignment.resolution_status,
                     "resolution_source": assignment.resolution_source,
-                },
+                }
             )
             if assignment.category_id:
                 counts["matched"] += 1
@@ -102,6 +117,9 @@ def main() -> int:
             else:
                 counts["still_unresolved"] += 1
 
+        for start in range(0, len(updates), UPDATE_BATCH_SIZE):
+            session.execute(update_sql, {"rows": json.dumps(updates[start : start + UPDATE_BATCH_SIZE])})
+        mappings.flush()
         session.commit()
 
     total = counts["matched"] + counts["still_unresolved"]
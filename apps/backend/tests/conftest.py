@@ -4,6 +4,7 @@ This module provides reusable fixtures for database sessions, FastAPI client,
 and common test data factories.
 """
 
+import os
 import sys
 import pathlib
 from typing import Generator
@@ -21,6 +22,7 @@ sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
 
 from app.dal.database import get_session
 from app.dependencies import get_current_user
+from app.request_context import clear_request_caches
 from app.supabase_auth import SupabaseClaims
 from app.schema import (  # noqa: F401
     backtest_models,
@@ -71,6 +73,14 @@ def _attach_auth_schema(dbapi_connection, _connection_record) -> None:
         cursor.close()
 
 
+@pytest.fixture(autouse=True)
+def _clear_request_caches() -> Generator[None, None, None]:
+    """Keep cached token claims and household memberships from leaking between tests."""
+    clear_request_caches()
+    yield
+    clear_request_caches()
+
+
 @pytest.fixture(name="engine")
 def engine_fixture():
     """Create an in-memory SQLite engine for testing.
@@ -92,6 +102,22 @@ def engine_fixture():
     return engine
 
 
+@pytest.fixture(name="postgres_direct_engine")
+def postgres_direct_engine_fixture(monkeypatch: pytest.MonkeyPatch) -> Generator[Engine, None, None]:
+    """Point ``app.dal.database.direct_engine`` at a real Postgres for integration tests.
+
+    Skipped unless ``RUN_INTEGRATION_TESTS`` is set and
+    ``INTEGRATION_DATABASE_URL`` names a Postgres database.
+    """
+    url = os.getenv("INTEGRATION_DATABASE_URL", "")
+    if not os.getenv("RUN_INTEGRATION_TESTS") or not url.startswith("postgresql"):
+        pytest.skip("Set RUN_INTEGRATION_TESTS=1 and INTEGRATION_DATABASE_URL=postgresql://... to run")
+    engine = create_engine(url)
+    monkeypatch.setattr("app.dal.database.direct_engine", engine)
+    yield engine
+    engine.dispose()
+
+
 @pytest.fixture(name="session")
 def session_fixture(engine) -> Generator[Session, None, None]:
     """Create a database session for testing.
@@ -9,14 +9,22 @@ from __future__ import annotations
 from typing import Tuple
 
 import pytest
+from sqlalchemy.engine import Engine
 from sqlmodel import Session
 
 from .helpers import (  # relative import — works because __init__.py exists
+    install_rollup_triggers,
     seed_expense_categories,
 )
 from app.services.expenses.categorize import _invalidate_category_cache
 
 
+@pytest.fixture(autouse=True)
+def _rollup_triggers(engine: Engine) -> None:
+    """Keep ``expense_monthly_rollups`` in step with transaction writes, as in Postgres."""
+    install_rollup_triggers(engine)
+
+
 @pytest.fixture()
 def seeded_session(session: Session) -> Tuple[Session, dict]:
     """Return (session, slug_map) with ExpenseCategory rows pre-seeded.
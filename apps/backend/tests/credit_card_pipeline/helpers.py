@@ -8,10 +8,12 @@ building synthetic parsed transactions.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Optional
 from uuid import UUID, uuid4
 
 import pytest
+from sqlalchemy.engine import Engine
 from sqlmodel import Session
 
 from app.schema.expenses import ExpenseCategory
@@ -152,3 +154,86 @@ def seeded_session(session: Session) -> tuple[Session, dict[str, UUID]]:
     _invalidate_category_cache()
     slug_map = seed_expense_categories(session)
     return session, slug_map
+
+
+# ---------------------------------------------------------------------------
+# Minimal PDF writer (no reportlab dependency)
+# ---------------------------------------------------------------------------
+
+
+def write_text_pdf(path: Path, lines: list[str]) -> Path:
+    """Write a one-page Helvetica PDF containing *lines* (ASCII only)."""
+    ops = ["BT /F1 11 Tf 14 TL 50 780 Td"] + [f"({line}) '" for line in lines] + ["ET"]
+    stream = "\n".join(ops).encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (num, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+    return path
+
+
+# ---------------------------------------------------------------------------
+# expense_monthly_rollups trigger (SQLite mirror of Supabase 20260609090000)
+# ---------------------------------------------------------------------------
+
+_ROLLUP_CELL = "household_id = {row}.household_id AND month = substr({row}.txn_date, 1, 7) || '-01' AND category_id = {row}.category_id"
+
+_ROLLUP_REMOVE = f"""
+    UPDATE expense_monthly_rollups
+       SET amount_ils = amount_ils - old.amount_ils, txn_count = txn_count - 1
+     WHERE {_ROLLUP_CELL.format(row="old")};
+    DELETE FROM expense_monthly_rollups WHERE {_ROLLUP_CELL.format(row="old")} AND txn_count <= 0;
+"""
+
+_ROLLUP_ADD = """
+    INSERT INTO expense_monthly_rollups (household_id, month, category_id, amount_ils, txn_count)
+    VALUES (new.household_id, substr(new.txn_date, 1, 7) || '-01', new.category_id, new.amount_ils, 1)
+    ON CONFLICT (household_id, month, category_id) DO UPDATE
+       SET amount_ils = amount_ils + excluded.amount_ils, txn_count = txn_count + excluded.txn_count;
+"""
+
+ROLLUP_TRIGGERS_SQLITE = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_cct_rollup_insert AFTER INSERT ON credit_card_transactions
+    WHEN new.category_id IS NOT NULL BEGIN {_ROLLUP_ADD} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_cct_rollup_delete AFTER DELETE ON credit_card_transactions
+    WHEN old.category_id IS NOT NULL BEGIN {_ROLLUP_REMOVE} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_cct_rollup_update_remove
+    AFTER UPDATE OF household_id, category_id, amount_ils, txn_date ON credit_card_transactions
+    WHEN old.category_id IS NOT NULL BEGIN {_ROLLUP_REMOVE} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_cct_rollup_update_add
+    AFTER UPDATE OF household_id, category_id, amount_ils, txn_date ON credit_card_transactions
+    WHEN new.category_id IS NOT NULL BEGIN {_ROLLUP_ADD} END
+    """,
+]
+
+
+def install_rollup_triggers(engine: Engine) -> None:
+    """Create the monthly-rollup trigger on a SQLite test engine.
+
+    Production maintains ``expense_monthly_rollups`` with a plpgsql trigger;
+    these SQLite triggers apply the same remove-old / add-new cell moves so
+    the summary endpoint can be tested against the in-memory database.
+    """
+    with engine.begin() as conn:
+        for ddl in ROLLUP_TRIGGERS_SQLITE:
+            conn.exec_driver_sql(ddl)
@@ -0,0 +1,125 @@
+"""Compiled rule matcher and per-run mapping cache for CategoryResolver (CC-4)."""
+
+from __future__ import annotations
+
+import random
+import re
+from datetime import datetime
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from app.schema.expenses import MerchantCategoryMapping
+from app.services.expenses.categorize import (
+    CategoryResolver,
+    CategoryRulesCache,
+    MerchantMappingCache,
+    _required_literals,
+)
+
+from .helpers import _SyntheticTxn
+
+HH_ID = UUID("00000000-0000-0000-0000-000000000101")
+OTHER_HH_ID = UUID("00000000-0000-0000-0000-000000000202")
+
+
+def _brute_force(rules, merchant: str):  # type: ignore[no-untyped-def]
+    """The pre-compiled-engine behaviour: run every regex, pick the best match."""
+    transfers = [r for r in rules if r.is_transfer and r.regex.search(merchant)]
+    others = [r for r in rules if not r.is_transfer and r.regex.search(merchant)]
+    pick = CategoryResolver._pick_best_match
+    return (pick(transfers) if transfers else None, pick(others) if others else None)
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        ("super.?pharm", {"super"}),
+        ("egg?ed", {"eg"}),
+        ("(cafe|coffee|rest\\b)", {"cafe", "coffee", "rest"}),
+        ("\\bbit\\b(?!.*טיב\\s*םעט)", {"bit"}),
+        ("NETFLIX", {"netflix"}),
+        ("yes\\b|partner.*internet", {"yes", "internet"}),
+        (".*", None),
+        ("a|[0-9]+", None),
+    ],
+)
+def test_required_literals(pattern: str, expected: set[str] | None) -> None:
+    literals = _required_literals(pattern)
+    assert (None if literals is None else set(literals)) == expected
+
+
+def test_compiled_matcher_matches_brute_force_on_yaml_rules() -> None:
+    cache = CategoryRulesCache()
+    rules = cache.compiled_rules
+    fragments = sorted(
+        {part for r in rules for part in re.split(r"[|()\\?*+.\[\]{}!^$]", r.regex.pattern) if part.strip()}
+    )
+    rng = random.Random(7)
+    merchants = fragments + [f.upper() for f in fragments] + ["HOT MOBILE", "PAYBOX", "---", "1234567", ""]
+    merchants += [" ".join(rng.choice(fragments) for _ in range(rng.randint(1, 3))) for _ in range(3000)]
+
+    for merchant in merchants:
+        assert cache.matcher.best(merchant) == _brute_force(rules, merchant), merchant
+
+
+def _add_mapping(session: Session, merchant: str, category_id: UUID, household_id: UUID | None, **kw) -> UUID:  # type: ignore[no-untyped-def]
+    mapping = MerchantCategoryMapping(
+        id=uuid4(),
+        merchant_normalized=merchant,
+        category_id=category_id,
+        household_id=household_id,
+        created_by=str(household_id),
+        created_at=datetime(2026, 1, 1),
+        **{"source": "inferred", "match_count": 0, **kw},
+    )
+    session.add(mapping)
+    session.commit()
+    return mapping.id
+
+
+def _count_statements(session: Session) -> list[str]:
+    statements: list[str] = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+def test_mapping_cache_serves_lookups_and_flushes_one_update(seeded_session: tuple) -> None:
+    session, slug_map = seeded_session
+    user_id = _add_mapping(session, "SUPER-PHARM", slug_map["health"], HH_ID, source="user", match_count=1)
+    inferred_id = _add_mapping(session, "OBSCURE MERCHANT", slug_map["shopping"], None, match_count=4)
+    _add_mapping(session, "OBSCURE MERCHANT", slug_map["travel"], OTHER_HH_ID, match_count=99)
+
+    resolver = CategoryResolver()
+    mappings = MerchantMappingCache(session, HH_ID)
+    statements = _count_statements(session)
+    results = [
+        resolver.resolve(_SyntheticTxn(merchant_normalized=m), session, HH_ID, mappings=mappings)
+        for m in ["SUPER-PHARM", "OBSCURE MERCHANT", "SUPER-PHARM", "NETFLIX", "OBSCURE MERCHANT", "SUPER-PHARM"]
+    ]
+
+    assert [r.category_id for r in results] == [
+        slug_map["health"],
+        slug_map["shopping"],  # global row; the other household's mapping is never visible
+        slug_map["health"],
+        slug_map["utilities"],
+        slug_map["shopping"],
+        slug_map["health"],
+    ]
+    assert not [s for s in statements if "merchant_category_mappings" in s], "lookups are served from the cache"
+
+    assert mappings.flush() == 2
+    assert len([s for s in statements if s.lstrip().upper().startswith("UPDATE")]) == 1
+    assert mappings.flush() == 0
+    session.commit()
+
+    rows = {row.id: row for row in session.exec(select(MerchantCategoryMapping)).all()}
+    assert rows[user_id].match_count == 4
+    assert rows[inferred_id].match_count == 6
+    assert rows[user_id].last_used_at is not None
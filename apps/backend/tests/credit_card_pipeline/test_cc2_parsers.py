@@ -300,15 +300,18 @@ def test_dispatch_pdf_timeout_works_from_worker_thread(
     main thread') when called from a non-main thread and parsing hangs.
 
     We monkeypatch pdfplumber.open to return a fake PDF whose page extraction
-    blocks on a threading.Event (so it can be released cleanly after the test).
-    We call dispatch_pdf with timeout_seconds=1 from a background thread.
-    The call must raise ParserTimeout cleanly, without the classic SIGALRM
-    'signal only works in main thread' error.
+    blocks on a threading.Event.  Parsing runs in a ParsePool worker process,
+    so the pool is started with ``fork`` for this test to carry the patch into
+    the worker.  We call dispatch_pdf with timeout_seconds=1 from a background
+    thread.  The call must raise ParserTimeout cleanly, without the classic
+    SIGALRM 'signal only works in main thread' error, and the hung worker
+    process must be killed rather than left running.
     """
     import threading
 
     from app.services.expenses.parsers.base import ParserTimeout
     from app.services.expenses.parsers.dispatcher import dispatch_pdf
+    from app.services.expenses.parsers.pool import ParsePool
 
     # Create a minimal real file so the os.path.getsize check passes.
     dummy_pdf = tmp_path / "dummy.pdf"  # type: ignore[operator]
@@ -335,11 +338,12 @@ def test_dispatch_pdf_timeout_works_from_worker_thread(
 
     monkeypatch.setattr("pdfplumber.open", lambda _path: _HangingPDF())
 
+    pool = ParsePool(max_workers=1, start_method="fork")
     result: list[object] = []
 
     def _worker() -> None:
         try:
-            dispatch_pdf(str(dummy_pdf), timeout_seconds=1)
+            dispatch_pdf(str(dummy_pdf), timeout_seconds=1, pool=pool)
             result.append("no_error")
         except ParserTimeout as exc:
             result.append(exc)
@@ -349,8 +353,10 @@ def test_dispatch_pdf_timeout_works_from_worker_thread(
     t = threading.Thread(target=_worker, daemon=True)
     t.start()
     t.join(timeout=10)
-    _unblock.set()  # release any still-running background parse thread
+    _unblock.set()
+    pool.shutdown()
 
     assert result, "Worker thread did not complete within 10 s"
     exc = result[0]
     assert isinstance(exc, ParserTimeout), f"Expected ParserTimeout from worker thread, got {type(exc).__name__}: {exc}"
+    assert pool.killed_workers == 1
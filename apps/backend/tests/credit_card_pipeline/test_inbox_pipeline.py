@@ -0,0 +1,158 @@
+"""Batched inbox pipeline: one dedup query, parallel parse, single writer (CC-5 follow-up)."""
+
+from __future__ import annotations
+
+import shutil
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from uuid import UUID
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import select
+
+from app.schema.expenses import CreditCardStatement, CreditCardTransaction, ExpenseInbox
+from app.services.expenses.categorize import CategoryResolver
+from app.services.expenses.parsers import ParsedStatement, ParsedTransaction
+from app.services.expenses.parsers.pool import ParsePool
+from app.worker import expenses_inbox
+
+from .helpers import write_text_pdf
+
+HH_ID = UUID("00000000-0000-0000-0000-000000000101")
+
+
+@pytest.fixture()
+def inbox(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    monkeypatch.setattr(expenses_inbox, "INBOX_DIR", tmp_path / "inbox")
+    monkeypatch.setattr(expenses_inbox, "PROCESSED_DIR", tmp_path / "processed")
+    monkeypatch.setattr(expenses_inbox, "ERRORS_DIR", tmp_path / "errors")
+    (tmp_path / "inbox").mkdir()
+    return tmp_path / "inbox"
+
+
+@pytest.fixture()
+def parse_pool(monkeypatch: pytest.MonkeyPatch):
+    pool = ParsePool(max_workers=2)
+    monkeypatch.setattr(expenses_inbox, "get_parse_pool", lambda: pool)
+    yield pool
+    pool.shutdown()
+
+
+def _statements(session) -> list[str]:  # type: ignore[no-untyped-def]
+    seen: list[str] = []
+    event.listen(session.get_bind(), "before_cursor_execute", lambda conn, cur, stmt, *a: seen.append(stmt))
+    return seen
+
+
+def test_scan_dedups_in_one_query_and_parses_batch(seeded_session: tuple, inbox: Path, parse_pool: ParsePool) -> None:
+    session, _slug_map = seeded_session
+    for i in range(4):
+        write_text_pdf(inbox / f"statement_{i}.pdf", [f"Statement {i} www.max.co.il"])
+    shutil.copy(inbox / "statement_0.pdf", inbox / "statement_0_copy.pdf")
+    (inbox / "broken.pdf").write_bytes(b"%PDF-1.4\n%%EOF\n")
+
+    @contextmanager
+    def sf():
+        yield session
+
+    statements = _statements(session)
+    result = expenses_inbox.scan_inbox_once(session_factory=sf, household_id=HH_ID)
+
+    assert result == {"scanned": 6, "completed": 4, "deduped": 1, "errored": 1}
+    dedup_queries = [s for s in statements if "FROM expense_inbox" in s and "file_hash IN" in s]
+    assert len(dedup_queries) == 1
+
+    rows = session.exec(select(ExpenseInbox)).all()
+    assert sorted(r.status for r in rows) == ["completed"] * 4 + ["errored"]
+    assert len(session.exec(select(CreditCardStatement)).all()) == 4
+    assert list(inbox.iterdir()) == []
+
+
+def test_scan_is_skipped_while_lease_is_held(seeded_session: tuple, inbox: Path) -> None:
+    session, _slug_map = seeded_session
+    write_text_pdf(inbox / "statement.pdf", ["www.max.co.il"])
+
+    @contextmanager
+    def sf():
+        yield session
+
+    with expenses_inbox._scan_lease(sf) as leased:
+        assert leased
+        result = expenses_inbox.scan_inbox_once(session_factory=sf, household_id=HH_ID)
+
+    assert result == {"scanned": 0, "completed": 0, "deduped": 0, "errored": 0}
+    assert (inbox / "statement.pdf").exists()
+    assert session.exec(select(ExpenseInbox)).all() == []
+
+
+def test_file_vanishing_mid_scan_does_not_abort_the_pass(
+    seeded_session: tuple, inbox: Path, parse_pool: ParsePool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    session, _slug_map = seeded_session
+    write_text_pdf(inbox / "kept.pdf", ["www.max.co.il"])
+    gone = write_text_pdf(inbox / "gone.pdf", ["www.max.co.il"])
+    real_sha256 = expenses_inbox._sha256_file
+
+    def vanishing_sha256(path: Path) -> str:
+        if path == gone:
+            path.unlink()
+        return real_sha256(path)
+
+    monkeypatch.setattr(expenses_inbox, "_sha256_file", vanishing_sha256)
+
+    @contextmanager
+    def sf():
+        yield session
+
+    result = expenses_inbox.scan_inbox_once(session_factory=sf, household_id=HH_ID)
+
+    assert result == {"scanned": 2, "completed": 1, "deduped": 0, "errored": 1}
+    assert session.exec(select(ExpenseInbox)).one().status == "completed"
+    assert (expenses_inbox.ERRORS_DIR / "gone.pdf.error.txt").exists()
+
+
+def test_scan_lease_locks_through_the_direct_engine() -> None:
+    from app.dal.database import direct_engine, engine
+
+    assert expenses_inbox._lease_engine(engine) is direct_engine
+    assert expenses_inbox._lease_engine(direct_engine) is direct_engine
+
+
+def test_writer_inserts_statement_transactions_in_one_batch(seeded_session: tuple, inbox: Path) -> None:
+    session, slug_map = seeded_session
+    pdf = write_text_pdf(inbox / "statement.pdf", ["www.max.co.il"])
+    counts = {"scanned": 0, "completed": 0, "deduped": 0, "errored": 0}
+    ((inbox_file, inbox_id),), _ = expenses_inbox._claim_files(
+        session, [expenses_inbox._InboxFile.read(pdf)], HH_ID, counts
+    )
+    parsed = ParsedStatement(
+        issuer="max",
+        cardholder_name="",
+        card_last4="1494",
+        period_from=date(2026, 4, 1),
+        period_to=date(2026, 5, 1),
+        total_amount_ils=Decimal("150.00"),
+        transactions=[
+            ParsedTransaction(
+                txn_date=date(2026, 4, day),
+                merchant_raw=merchant,
+                merchant_normalized=merchant,
+                amount_ils=Decimal("50.00"),
+            )
+            for day, merchant in [(3, "NETFLIX"), (9, "HOT MOBILE"), (20, "UNKNOWN SHOP")]
+        ],
+    )
+
+    statements = _statements(session)
+    expenses_inbox._persist_statement(session, inbox_file, inbox_id, parsed, HH_ID, CategoryResolver())
+
+    txn_inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT INTO CREDIT_CARD_TRANSACTIONS")]
+    assert len(txn_inserts) == 1
+    txns = session.exec(select(CreditCardTransaction)).all()
+    assert {t.merchant_normalized: t.category_id for t in txns}["NETFLIX"] == slug_map["utilities"]
+    assert len(txns) == 3
+    assert session.exec(select(ExpenseInbox)).one().status == "completed"
+    assert not pdf.exists()
@@ -0,0 +1,183 @@
+"""Materialized monthly rollups and single-query drill-down (CC-6 follow-up)."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, event, update
+from sqlmodel import Session, select
+
+from app.api import expenses as expenses_api
+from app.schema.expenses import CreditCardTransaction, ExpenseMonthlyRollup
+from app.services.expenses.categorize import CategoryResolver
+from app.services.expenses.parsers import ParsedStatement, ParsedTransaction
+from app.worker import expenses_inbox
+
+from .helpers import write_text_pdf
+
+USER_ID = UUID("00000000-0000-0000-0000-000000000001")
+HH_ID = UUID("00000000-0000-0000-0000-000000000101")
+
+
+def _cells(session: Session) -> dict[tuple[date, UUID], tuple[Decimal, int]]:
+    return {
+        (r.month, r.category_id): (Decimal(str(r.amount_ils)), r.txn_count)
+        for r in session.exec(select(ExpenseMonthlyRollup)).all()
+    }
+
+
+def _txn(session: Session, txn_date: datetime, amount: str, category_id: UUID | None, merchant: str = "SHOP") -> UUID:
+    txn = CreditCardTransaction(
+        id=uuid4(),
+        statement_id=uuid4(),
+        txn_date=txn_date,
+        merchant_raw=merchant,
+        merchant_normalized=merchant,
+        amount_ils=Decimal(amount),
+        resolution_status="auto" if category_id else "unresolved",
+        household_id=HH_ID,
+        category_id=category_id,
+    )
+    session.add(txn)
+    session.commit()
+    return txn.id
+
+
+def test_trigger_follows_direct_updates_and_deletes(seeded_session: tuple) -> None:
+    session, slug_map = seeded_session
+    groceries, restaurants = slug_map["groceries"], slug_map["restaurants"]
+    jan = date(2026, 1, 1)
+
+    first = _txn(session, datetime(2026, 1, 3), "100.00", groceries)
+    _txn(session, datetime(2026, 1, 28), "50.50", groceries)
+    _txn(session, datetime(2026, 2, 1), "999.00", None)  # uncategorized: not rolled up
+    assert _cells(session) == {(jan, groceries): (Decimal("150.50"), 2)}
+
+    # A bare category_id UPDATE, as the frontend resolve route issues.
+    session.execute(
+        update(CreditCardTransaction).where(CreditCardTransaction.id == first).values(category_id=restaurants)
+    )
+    assert _cells(session) == {
+        (jan, groceries): (Decimal("50.50"), 1),
+        (jan, restaurants): (Decimal("100.00"), 1),
+    }
+
+    session.execute(
+        update(CreditCardTransaction)
+        .where(CreditCardTransaction.id == first)
+        .values(amount_ils=Decimal("120.00"), txn_date=datetime(2026, 2, 14))
+    )
+    assert _cells(session) == {
+        (jan, groceries): (Decimal("50.50"), 1),
+        (date(2026, 2, 1), restaurants): (Decimal("120.00"), 1),
+    }
+
+    session.execute(delete(CreditCardTransaction).where(CreditCardTransaction.category_id == groceries))
+    session.commit()
+    assert _cells(session) == {(date(2026, 2, 1), restaurants): (Decimal("120.00"), 1)}
+
+
+def test_ingest_adds_statement_totals_to_rollup(seeded_session: tuple, tmp_path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    session, slug_map = seeded_session
+    monkeypatch.setattr(expenses_inbox, "PROCESSED_DIR", tmp_path / "processed")
+    pdf = write_text_pdf(tmp_path / "statement.pdf", ["www.max.co.il"])
+    counts = {"scanned": 0, "completed": 0, "deduped": 0, "errored": 0}
+    ((inbox_file, inbox_id),), _ = expenses_inbox._claim_files(
+        session, [expenses_inbox._InboxFile.read(pdf)], HH_ID, counts
+    )
+    parsed = ParsedStatement(
+        issuer="max",
+        cardholder_name="",
+        card_last4="1494",
+        period_from=date(2026, 3, 20),
+        period_to=date(2026, 4, 20),
+        total_amount_ils=Decimal("110.00"),
+        transactions=[
+            ParsedTransaction(
+                txn_date=txn_date,
+                merchant_raw=merchant,
+                merchant_normalized=merchant,
+                amount_ils=Decimal(amount),
+            )
+            for txn_date, merchant, amount in [
+                (date(2026, 3, 28), "NETFLIX", "40.00"),
+                (date(2026, 4, 2), "NETFLIX", "40.00"),
+                (date(2026, 4, 5), "UNKNOWN SHOP", "30.00"),
+            ]
+        ],
+    )
+
+    expenses_inbox._persist_statement(session, inbox_file, inbox_id, parsed, HH_ID, CategoryResolver())
+
+    utilities = slug_map["utilities"]
+    assert _cells(session) == {
+        (date(2026, 3, 1), utilities): (Decimal("40.00"), 1),
+        (date(2026, 4, 1), utilities): (Decimal("40.00"), 1),
+    }
+
+
+def test_resolve_moves_rollup_and_summary_reads_it(seeded_session: tuple) -> None:
+    session, slug_map = seeded_session
+    groceries, restaurants = slug_map["groceries"], slug_map["restaurants"]
+    target = _txn(session, datetime(2026, 5, 2), "80.00", None, merchant="CAFE")
+    _txn(session, datetime(2026, 5, 9), "20.00", None, merchant="CAFE")
+    _txn(session, datetime(2026, 5, 11), "200.00", groceries)
+
+    expenses_api.resolve_transaction(
+        body=expenses_api.ResolveRequest(transaction_id=target, category_id=restaurants, apply_to_all_matching=True),
+        user_id=USER_ID,
+        db=session,
+    )
+
+    summary = expenses_api.get_monthly_summary(
+        from_="2026-05", to="2026-05", exclude_transfers=True, user_id=USER_ID, db=session
+    )
+    assert [(s.month, s.category_slug, s.amount_ils, s.txn_count) for s in summary] == [
+        ("2026-05", "groceries", 200.0, 1),
+        ("2026-05", "restaurants", 100.0, 2),
+    ]
+    assert (
+        expenses_api.get_monthly_summary(from_="2026-06", to=None, exclude_transfers=True, user_id=USER_ID, db=session)
+        == []
+    )
+
+
+def test_by_category_returns_page_count_and_sum_in_one_query(seeded_session: tuple) -> None:
+    session, slug_map = seeded_session
+    groceries = slug_map["groceries"]
+    for day in range(1, 6):
+        _txn(session, datetime(2026, 1, day), f"{day}0.00", groceries)
+    _txn(session, datetime(2026, 2, 1), "500.00", groceries)
+
+    seen: list[str] = []
+    event.listen(session.get_bind(), "before_cursor_execute", lambda conn, cur, stmt, *a: seen.append(stmt))
+    resp = expenses_api.get_by_category(
+        category_slug="groceries",
+        from_="2026-01-02",
+        to="2026-01-31",
+        subcategory_slug=None,
+        page=1,
+        page_size=2,
+        user_id=USER_ID,
+        db=session,
+    )
+
+    assert (resp.total, resp.subtotal_ils) == (4, 140.0)
+    assert [item.amount_ils for item in resp.items] == [50.0, 40.0]
+    txn_queries = [s for s in seen if "FROM credit_card_transactions" in s]
+    assert len(txn_queries) == 1
+    assert "substr" not in txn_queries[0].lower()
+
+    past_end = expenses_api.get_by_category(
+        category_slug="groceries",
+        from_="2026-01-02",
+        to="2026-01-31",
+        subcategory_slug=None,
+        page=9,
+        page_size=2,
+        user_id=USER_ID,
+        db=session,
+    )
+    assert (past_end.items, past_end.total, past_end.subtotal_ils) == ([], 4, 140.0)
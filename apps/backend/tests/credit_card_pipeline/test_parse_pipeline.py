@@ -0,0 +1,88 @@
+"""Single-open PDF pipeline and the process-based parse pool (CC-2 follow-up)."""
+
+from __future__ import annotations
+
+import operator
+import time
+from pathlib import Path
+
+import pdfplumber
+import pytest
+
+from app.services.expenses.parsers import ParsedDocument, ParserError, ParserTimeout, dispatch_pdf
+from app.services.expenses.parsers import dispatcher as dispatcher_mod
+from app.services.expenses.parsers import document as document_mod
+from app.services.expenses.parsers.pool import ParsePool
+
+from .helpers import write_text_pdf
+
+
+@pytest.fixture()
+def max_pdf(tmp_path: Path) -> Path:
+    return write_text_pdf(tmp_path / "statement.pdf", ["Statement www.max.co.il", "Thank you for using Max"])
+
+
+@pytest.fixture()
+def pool():
+    parse_pool = ParsePool(max_workers=1)
+    yield parse_pool
+    parse_pool.shutdown()
+
+
+def test_parsed_document_extracts_text_once_and_layout_lazily(max_pdf: Path) -> None:
+    with ParsedDocument.open(str(max_pdf)) as doc:
+        assert doc.page_count == 1
+        assert "www.max.co.il" in doc.full_text
+        words = doc.words(0)
+        assert doc.words(0) is words
+        assert [w["text"] for w in words][:2] == ["Statement", "www.max.co.il"]
+
+    assert doc.words(0) is words  # memoised layout survives close
+    with pytest.raises(ParserError):
+        doc.tables(0)
+
+
+def test_pdf_is_opened_once_for_fingerprint_and_parse(max_pdf: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    opened: list[str] = []
+    real_open = pdfplumber.open
+
+    def counting_open(path, *args, **kwargs):  # type: ignore[no-untyped-def]
+        opened.append(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(document_mod.pdfplumber, "open", counting_open)
+
+    stmt = dispatcher_mod._do_parse(str(max_pdf))
+
+    assert stmt.issuer == "max"
+    assert stmt.transactions == []
+    assert opened == [str(max_pdf)]
+
+
+def test_dispatch_pdf_runs_in_pool_worker(max_pdf: Path, pool: ParsePool) -> None:
+    stmt = dispatch_pdf(str(max_pdf), pool=pool)
+
+    assert stmt.issuer == "max"
+    assert "Could not extract Max card_last4" in stmt.parse_warnings
+
+
+def test_pool_reraises_worker_exceptions_and_reuses_worker(pool: ParsePool) -> None:
+    assert pool.run(operator.add, 2, 3, timeout=30) == 5
+    with pytest.raises(ValueError):
+        pool.run(int, "not a number", timeout=30)
+    assert pool.run(operator.mul, 4, 5, timeout=30) == 20
+    assert pool.killed_workers == 0
+
+
+def test_pool_kills_worker_on_timeout_and_recovers(pool: ParsePool) -> None:
+    pool.run(operator.add, 0, 0, timeout=30)  # warm a worker so spawn cost is excluded
+    worker = pool._idle[0]
+
+    start = time.perf_counter()
+    with pytest.raises(ParserTimeout):
+        pool.run(time.sleep, 30, timeout=0.5)
+    assert time.perf_counter() - start < 5
+
+    assert not worker.process.is_alive()
+    assert pool.killed_workers == 1
+    assert pool.run(operator.add, 1, 1, timeout=30) == 2
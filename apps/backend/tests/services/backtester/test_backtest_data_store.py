@@ -0,0 +1,91 @@
+"""Preloaded market data for the synthetic backtest provider."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.schema.models import DailyBar
+from app.services.backtester import data_provider
+from app.services.backtester.data_provider import SyntheticDataProvider
+from app.services.backtester.data_store import BacktestDataStore, synthetic_conid
+
+START = date(2024, 3, 4)  # Monday
+
+
+@pytest.fixture
+def bars(engine, monkeypatch: pytest.MonkeyPatch):  # type: ignore[no-untyped-def]
+    """Two weeks of NDX closes (no bar on 2024-03-06) and VXN levels."""
+    with Session(engine) as session:
+        for i in range(14):
+            day = START + timedelta(days=i)
+            if day == date(2024, 3, 6):
+                continue
+            session.add(DailyBar(symbol="NDX", date=day, open=0, high=0, low=0, close=Decimal(18000 + i), volume=1))
+            session.add(DailyBar(symbol="VXN", date=day, open=0, high=0, low=0, close=Decimal("21.5"), volume=1))
+        session.commit()
+    monkeypatch.setattr(data_provider, "engine", engine)
+    return engine
+
+
+def _count_queries(engine) -> list[str]:  # type: ignore[no-untyped-def]
+    seen: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cur, stmt, *a: seen.append(stmt))
+    return seen
+
+
+def test_preload_serves_every_lookup_from_one_query(bars) -> None:  # type: ignore[no-untyped-def]
+    provider = SyntheticDataProvider()
+    seen = _count_queries(bars)
+
+    provider.preload(["NDX"], START, START + timedelta(days=13))
+    spots = [provider.get_spot_price("NDX", START + timedelta(days=i)) for i in range(14)]
+    vols = {provider.get_volatility("NDX", START + timedelta(days=i)) for i in range(14) if i != 2}
+
+    assert len(seen) == 1
+    assert spots[:4] == [18000.0, 18001.0, 0.0, 18003.0]
+    assert all(isinstance(spot, float) for spot in spots)
+    assert vols == {0.215}
+    assert provider.get_volatility("NDX", date(2024, 3, 6)) == 0.20
+
+    reference = SyntheticDataProvider()
+    assert [reference.get_spot_price("NDX", START + timedelta(days=i)) for i in range(14)] == spots
+
+
+def test_lookups_outside_the_preload_fall_back_to_the_database(bars) -> None:  # type: ignore[no-untyped-def]
+    provider = SyntheticDataProvider()
+    provider.preload(["NDX"], START, START + timedelta(days=6))
+    seen = _count_queries(bars)
+
+    assert provider.get_spot_price("NDX", START + timedelta(days=10)) == 18010.0
+    assert provider.get_spot_price("NDX", START + timedelta(days=10)) == 18010.0
+    assert provider.get_spot_price("SPY", START) == 0.0
+    assert len(seen) == 2
+
+
+def test_chains_are_memoized_with_stable_conids(bars) -> None:  # type: ignore[no-untyped-def]
+    provider = SyntheticDataProvider()
+    provider.preload(["NDX"], START, START + timedelta(days=13))
+    expiry = date(2024, 4, 19)
+
+    chain = provider.get_option_chain("NDX", START, expiration=expiry)
+
+    assert provider.get_option_chain("NDX", START, expiration=expiry) is chain
+    assert provider.get_option_chain("NDX", START) is not chain
+    contract = next(c for c in chain.contracts.values() if c["strike"] == 18000 and c["right"] == "C")
+    assert contract["conid"] == synthetic_conid("NDX", expiry, 18000, "C")
+    # Not salted per process (unlike hash()): the value is fixed.
+    assert synthetic_conid("NDX", date(2024, 3, 15), 18000, "C") == 1805187896
+
+
+def test_store_covers_only_loaded_symbols_and_range(bars) -> None:  # type: ignore[no-untyped-def]
+    store = BacktestDataStore.load(bars, ["NDX", "QQQ"], START, START + timedelta(days=2))
+
+    assert store.covers("QQQ", START) and store.close("QQQ", START) is None
+    assert not store.covers("NDX", START + timedelta(days=3))
+    assert not store.covers("SPY", START)
+    assert store.close("NDX", START + timedelta(days=1)) == 18001.0
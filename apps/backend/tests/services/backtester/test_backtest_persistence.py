@@ -0,0 +1,94 @@
+"""Incremental portfolio state and bulk result persistence."""
+
+from __future__ import annotations
+
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from app.schema.backtest_models import BacktestDailySnapshot, BacktestRun, BacktestTrade
+from app.services.backtester import engine as engine_module
+from app.services.backtester.engine import BacktestEngine
+from app.services.backtester.portfolio import Portfolio
+from app.services.backtester.strategy import Strategy
+
+
+class _Idle(Strategy):
+    async def on_bar(self, date, portfolio, data_provider):  # type: ignore[no-untyped-def]
+        return []
+
+
+def _recomputed(portfolio: Portfolio) -> tuple[float, float]:
+    positions = portfolio.positions.values()
+    return (
+        portfolio.cash + sum(p.market_value for p in positions),
+        sum(p.unrealized_pnl for p in positions),
+    )
+
+
+def test_running_totals_match_a_full_recompute() -> None:
+    rng = random.Random(7)
+    portfolio = Portfolio(100_000.0)
+    day = datetime(2024, 1, 2)
+
+    for _ in range(2000):
+        conid = rng.randrange(6)
+        action_taken = rng.random() >= 0.4
+        if not action_taken:
+            portfolio.update_price(conid, rng.uniform(0, 50))
+        else:
+            action = rng.choice(["BUY", "SELL"])
+            portfolio.add_trade(day, conid, "NDX", action, rng.choice([1, 2, 3]), rng.uniform(1, 50), 1.0)
+        equity, unrealized = _recomputed(portfolio)
+        assert portfolio.total_equity == pytest.approx(equity, abs=1e-6)
+        assert portfolio.total_unrealized_pnl == pytest.approx(unrealized, abs=1e-6)
+        if action_taken:
+            assert portfolio.trade_log[-1]["equity"] == pytest.approx(equity, abs=1e-6)
+
+    for conid, pos in list(portfolio.positions.items()):
+        portfolio.add_trade(day, conid, "NDX", "SELL" if pos.quantity > 0 else "BUY", abs(pos.quantity), 10.0)
+    assert portfolio.positions == {}
+    assert (portfolio.total_equity, portfolio.total_unrealized_pnl) == (portfolio.cash, 0.0)
+
+
+def test_round_trip_realizes_pnl_and_flips_reset_the_average() -> None:
+    portfolio = Portfolio(10_000.0)
+    day = datetime(2024, 1, 2)
+
+    portfolio.add_trade(day, 1, "NDX", "SELL", 2, 5.0, commission=1.0)
+    portfolio.update_price(1, 3.0)
+    assert portfolio.total_unrealized_pnl == pytest.approx(400.0)
+    assert portfolio.total_equity == pytest.approx(10_000.0 + 999.0 - 600.0)
+
+    portfolio.add_trade(day, 1, "NDX", "BUY", 3, 3.0, commission=1.0)
+    pos = portfolio.positions[1]
+    assert (pos.quantity, pos.avg_price) == (1, 3.0)
+    assert portfolio.realized_pnl == pytest.approx(399.0)
+    assert portfolio.trade_log[-1]["equity"] == pytest.approx(portfolio.cash + 300.0)
+
+
+def test_save_results_bulk_writes_trades_and_daily_snapshots(engine, monkeypatch: pytest.MonkeyPatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr(engine_module, "db_engine", engine)
+    run = BacktestEngine(_Idle(), date(2024, 1, 1), date(2024, 1, 31))
+    day = datetime(2024, 1, 2)
+    for i in range(50):
+        run.portfolio.add_trade(day, i, "NDX", "BUY", 1, 2.0)
+    run.daily_stats = [
+        {"date": day + timedelta(days=i), "equity": 100.0 + i, "realized_pnl": 0.0, "unrealized_pnl": 1.5, "cash": 50.0}
+        for i in range(30)
+    ]
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cur, stmt, *a: statements.append(stmt.split()[2]))
+
+    run.save_results()
+
+    assert statements == ["backtestrun", "backtesttrade", "backtestdailysnapshot"]
+    with Session(engine) as session:
+        saved = session.exec(select(BacktestRun)).one()
+        assert len(session.exec(select(BacktestTrade).where(BacktestTrade.run_id == saved.id)).all()) == 50
+        curve = session.exec(select(BacktestDailySnapshot).order_by(BacktestDailySnapshot.date)).all()
+    assert [float(s.equity) for s in curve] == [100.0 + i for i in range(30)]
+    assert {s.run_id for s in curve} == {saved.id}
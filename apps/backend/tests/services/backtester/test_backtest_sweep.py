@@ -0,0 +1,82 @@
+"""Parameter sweeps over TaxCondorStrategy."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.schema.models import DailyBar
+from app.services.backtester import data_provider
+from app.services.backtester.sweep import SweepConfig, VariantResult, expand_grid, load_snapshot, run_sweep, run_variant
+
+START = date(2024, 1, 2)
+CONFIG = SweepConfig(
+    symbol="NDX", leap_symbol="NDX", start_date=START, end_date=START + timedelta(days=27), step_days=7
+)
+
+
+@pytest.fixture
+def bars(engine, monkeypatch: pytest.MonkeyPatch):  # type: ignore[no-untyped-def]
+    """Four weeks of NDX closes drifting up and a flat VXN."""
+    with Session(engine) as session:
+        for i in range(28):
+            day = START + timedelta(days=i)
+            session.add(
+                DailyBar(symbol="NDX", date=day, open=0, high=0, low=0, close=Decimal(17000 + 20 * i), volume=1)
+            )
+            session.add(DailyBar(symbol="VXN", date=day, open=0, high=0, low=0, close=Decimal(20), volume=1))
+        session.commit()
+    monkeypatch.setattr(data_provider, "engine", engine)
+    return engine
+
+
+def test_expand_grid_coerces_and_orders_variants() -> None:
+    variants = expand_grid({"roll_dte": ["14", 21], "width_steps": [[1, 2], [4]]})
+
+    assert variants == [
+        {"roll_dte": 14, "width_steps": (1, 2)},
+        {"roll_dte": 14, "width_steps": (4,)},
+        {"roll_dte": 21, "width_steps": (1, 2)},
+        {"roll_dte": 21, "width_steps": (4,)},
+    ]
+    with pytest.raises(ValueError, match="Unknown sweep parameters: delta"):
+        expand_grid({"delta": [0.5]})
+    with pytest.raises(ValueError, match="has no values"):
+        expand_grid({"roll_dte": []})
+    with pytest.raises(ValueError, match="non-empty and positive"):
+        expand_grid({"width_steps": [[0]]})
+
+
+def test_sweep_runs_variants_in_parallel_from_one_snapshot(bars) -> None:  # type: ignore[no-untyped-def]
+    seen: list[str] = []
+    event.listen(bars, "before_cursor_execute", lambda conn, cur, stmt, *a: seen.append(stmt))
+    variants = expand_grid({"leap_delta": [0.5, 0.8], "ic_target_dte": [30]})
+    results: list[VariantResult] = []
+
+    counts = run_sweep(CONFIG, variants, results.append, max_workers=2)
+
+    assert counts == {"completed": 2, "failed": 0, "skipped": 0}
+    assert len(seen) == 1  # the snapshot load; workers only read the shared snapshot
+    assert sorted(r.index for r in results) == [0, 1]
+    snapshot = load_snapshot(CONFIG)
+    for result in results:
+        assert result.error is None
+        assert result.summary == run_variant(CONFIG, result.params, snapshot)
+        assert result.summary["trade_count"] > 0
+        assert set(result.summary["metrics"]) >= {"sharpe_ratio", "max_drawdown", "total_return"}
+
+
+def test_failed_variants_are_reported_and_skips_honoured(bars) -> None:  # type: ignore[no-untyped-def]
+    variants = [{"roll_dte": 21}, {"roll_dte": 21, "not_a_parameter": 1}, {"roll_dte": 7}]
+    results: list[VariantResult] = []
+
+    counts = run_sweep(CONFIG, variants, results.append, max_workers=1, skip={2})
+
+    assert counts == {"completed": 1, "failed": 1, "skipped": 1}
+    assert [r.index for r in results] == [0, 1]
+    assert results[0].summary is not None
+    assert results[1].summary is None and "not_a_parameter" in results[1].error
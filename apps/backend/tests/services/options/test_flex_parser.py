@@ -13,7 +13,7 @@ from app.services.options.flex_parser import (
     parse_trade_confirm,
     _event_type_from_trade_attrs,
 )
-from scripts.flex_synthetic import write_synthetic_files
+from scripts.flex_synthetic import write_large_report, write_synthetic_files
 
 
 def test_parse_synthetic_flex_rows_into_typed_models() -> None:
@@ -472,6 +472,37 @@ _ASSIGNMENT_STUB = textwrap.dedent("""\
     </FlexQueryResponse>
 """)
 
+_MULTI_ACCOUNT_ACCRUALS = textwrap.dedent("""\
+    <FlexQueryResponse queryName="Accruals" type="AF">
+      <FlexStatements count="2">
+        <FlexStatement accountId="U9000002" fromDate="20260101" toDate="20260131">
+          <OpenDividendAccruals>
+            <OpenDividendAccrual accountId="U9000002" conid="1001" symbol="KO" currency="USD"
+                exDate="20260114" payDate="20260201" quantity="100" grossRate="0.51" grossAmount="51"
+                netAmount="51"/>
+          </OpenDividendAccruals>
+          <ChangeInDividendAccruals>
+            <ChangeInDividendAccrual accountId="U9000002" conid="1001" symbol="KO" currency="USD"
+                date="20260114" exDate="20260114" payDate="20260201" quantity="100" grossRate="0.51"
+                grossAmount="51" netAmount="51" code="Po"/>
+          </ChangeInDividendAccruals>
+        </FlexStatement>
+        <FlexStatement accountId="U9000003" fromDate="20260101" toDate="20260131">
+          <ChangeInDividendAccruals>
+            <ChangeInDividendAccrual accountId="U9000003" conid="1002" symbol="PEP" currency="USD"
+                date="20260105" exDate="20260105" payDate="20260131" quantity="50" grossRate="1.42"
+                grossAmount="71" netAmount="71" code="Po"/>
+          </ChangeInDividendAccruals>
+          <OpenDividendAccruals>
+            <OpenDividendAccrual accountId="U9000003" conid="1002" symbol="PEP" currency="USD"
+                exDate="20260105" payDate="20260131" quantity="50" grossRate="1.42" grossAmount="71"
+                netAmount="71"/>
+          </OpenDividendAccruals>
+        </FlexStatement>
+      </FlexStatements>
+    </FlexQueryResponse>
+""")
+
 
 def test_phase0_opt_fields_extracted_from_assignment_stub(tmp_path: Path) -> None:
     """Phase 0 validator: all options-income-critical fields parse correctly.
@@ -770,3 +801,58 @@ def test_pairing_heuristic_fallback_when_no_order_id_or_notes() -> None:
     assert len(synthetics) == 1
     assert synthetics[0].raw_payload["pair_method"] == "heuristic"
     assert synthetics[0].amount == Decimal("-1000")
+
+
+def test_streaming_parser_matches_tree_parser(tmp_path: Path) -> None:
+    """The iterparse reader yields the same typed result as the whole-document reader."""
+
+    paths = [
+        *write_synthetic_files(tmp_path / "synthetic"),
+        write_large_report(tmp_path / "large.xml", accounts=3, trades_per_account=200),
+    ]
+    (tmp_path / "assignment.xml").write_text(_ASSIGNMENT_STUB)
+    paths.append(tmp_path / "assignment.xml")
+    (tmp_path / "accruals.xml").write_text(_MULTI_ACCOUNT_ACCRUALS)
+    paths.append(tmp_path / "accruals.xml")
+
+    for account_id in (None, "U9000002", "U9000003", "U9999999"):
+        streamed = parse_flex_files(paths, account_id)
+        assert streamed == parse_flex_files(paths, account_id, streaming=False)
+    parsed = parse_flex_files(paths)
+    assert parsed.section_counts["TradeConfirms"] > 600
+    assert [(a.account_id, a.source_section) for a in parsed.dividend_accruals][-4:] == [
+        ("U9000002", "change"),
+        ("U9000003", "change"),
+        ("U9000002", "open"),
+        ("U9000003", "open"),
+    ]
+
+
+def test_streaming_parser_keeps_trade_confirms_before_trades(tmp_path: Path) -> None:
+    """Trades sections preceding TradeConfirms in the document keep canonical order."""
+
+    path = tmp_path / "mixed.xml"
+    path.write_text(
+        """
+        <FlexQueryResponse><FlexStatements>
+          <FlexStatement accountId="U1" fromDate="20250101" toDate="20250131">
+                <Trades>
+                  <Trade accountId="U1" assetCategory="OPT" tradeID="T-LATE" conid="1" currency="USD"
+                         dateTime="20250102;100000" expiry="20250117" multiplier="100" putCall="P" strike="10"
+                         underlyingSymbol="ABC" symbol="ABC 250117P10" quantity="-1" tradePrice="1"
+                         proceeds="100" netCash="100" buySell="SELL" openCloseIndicator="O"/>
+                </Trades>
+                <TradeConfirms>
+                  <TradeConfirm accountId="U1" assetCategory="OPT" tradeID="T-EARLY" conid="2" currency="USD"
+                         dateTime="20250103;100000" expiry="20250117" multiplier="100" putCall="P" strike="11"
+                         underlyingSymbol="ABC" symbol="ABC 250117P11" quantity="-1" tradePrice="1"
+                         proceeds="100" netCash="100" buySell="SELL" openCloseIndicator="O"/>
+                </TradeConfirms>
+          </FlexStatement>
+        </FlexStatements></FlexQueryResponse>
+        """.strip()
+    )
+
+    streamed = parse_flex_files([path])
+    assert [trade.source_trade_id for trade in streamed.trades] == ["T-EARLY", "T-LATE"]
+    assert streamed == parse_flex_files([path], streaming=False)
@@ -0,0 +1,80 @@
+"""Tests for the parse-once Flex report cache."""
+
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+from unittest.mock import patch
+
+from app.services.options import flex_report_cache as cache_module
+from app.services.options.flex_parser import parse_flex_files
+from app.services.options.flex_report_cache import FlexReportCache, flex_file_key
+from scripts.flex_synthetic import write_synthetic_files
+
+SECOND_ACCOUNT = "U7654321"
+
+
+def _household_statement(tmp_path: Path) -> Path:
+    """Write a two-account Flex file by cloning the synthetic trades statement."""
+
+    source = write_synthetic_files(tmp_path / "synthetic")[0].read_text()
+    statement = re.search(r"<FlexStatement .*?</FlexStatement>", source, re.DOTALL)
+    assert statement is not None
+    cloned = statement.group(0).replace("U1234567", SECOND_ACCOUNT).replace('tradeID="T-', 'tradeID="T2-')
+    household = source.replace(statement.group(0), statement.group(0) + "\n" + cloned)
+    path = tmp_path / "household.xml"
+    path.write_text(household)
+    return path
+
+
+def test_each_file_parsed_once_across_accounts(tmp_path: Path) -> None:
+    """N accounts sharing one statement cost one XML parse, not N."""
+
+    path = _household_statement(tmp_path)
+    cache = FlexReportCache()
+    with patch.object(cache_module, "read_flex_report", wraps=cache_module.read_flex_report) as reader:
+        first = cache.parse([path], "U1234567")
+        second = cache.parse([path], SECOND_ACCOUNT)
+        everything = cache.parse([path])
+    assert reader.call_count == 1
+    assert cache.stats()["hits"] == 2
+    assert {row.account_id for row in first.trades} == {"U1234567"}
+    assert {row.account_id for row in second.trades} == {SECOND_ACCOUNT}
+    assert len(everything.trades) == len(first.trades) + len(second.trades)
+
+
+def test_cached_results_match_direct_parse(tmp_path: Path) -> None:
+    """Partitioned reports rebuild exactly what parse_flex_files returns per account."""
+
+    path = _household_statement(tmp_path)
+    paths = [path, *write_synthetic_files(tmp_path / "synthetic")]
+    cache = FlexReportCache()
+    for account_id in (None, "U1234567", SECOND_ACCOUNT, "U0000000"):
+        assert cache.parse(paths, account_id) == parse_flex_files(paths, account_id)
+
+
+def test_rewritten_file_is_reparsed(tmp_path: Path) -> None:
+    """A file rewritten in place gets a new key and is parsed again."""
+
+    path = _household_statement(tmp_path)
+    cache = FlexReportCache()
+    before = cache.parse([path], SECOND_ACCOUNT)
+    original_key = flex_file_key(path)
+
+    path.write_text(path.read_text().replace(SECOND_ACCOUNT, "U5555555"))
+    os.utime(path, ns=(original_key.mtime_ns, original_key.mtime_ns))
+    after = cache.parse([path], SECOND_ACCOUNT)
+
+    assert flex_file_key(path).sha256 != original_key.sha256
+    assert before.trades and not after.trades
+    assert cache.stats()["misses"] == 2
+
+
+def test_cache_is_bounded(tmp_path: Path) -> None:
+    """Least recently used reports are evicted beyond max_reports."""
+
+    paths = write_synthetic_files(tmp_path / "synthetic")
+    cache = FlexReportCache(max_reports=2)
+    cache.reports(paths)
+    assert cache.stats()["size"] == 2
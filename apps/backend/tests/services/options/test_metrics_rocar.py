@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
-from datetime import date, datetime, timezone
+import random
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 
-from app.services.options.metrics import OptionCapitalHistory, OptionMetricTrade, compute_monthly_metrics
+from app.services.options.metrics import (
+    OptionCapitalHistory,
+    OptionMetricTrade,
+    compute_monthly_metrics,
+    compute_time_weighted_avg_capital,
+)
 
 
 def test_time_weighted_rocar_for_jony_spread_example() -> None:
@@ -23,3 +29,59 @@ def test_time_weighted_rocar_for_jony_spread_example() -> None:
     )
     assert metrics[0].avg_capital_at_risk == Decimal("5161.290323")
     assert metrics[0].return_on_capital_at_risk_pct == Decimal("19.3750")
+
+
+def _capital_history(groups: int, years: int, seed: int) -> list[OptionCapitalHistory]:
+    rng = random.Random(seed)
+    start = datetime(2016, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for group in range(groups):
+        effective_at = start + timedelta(seconds=rng.randrange(years * 365 * 86400))
+        for _ in range(rng.randrange(1, 5)):
+            capital = None if rng.random() < 0.1 else Decimal(rng.randrange(0, 900_000)) / 100
+            rows.append(OptionCapitalHistory(group_id=f"g{group}", effective_at=effective_at, capital_at_risk=capital))
+            effective_at += timedelta(seconds=rng.choice([0, 3600, 86400 * rng.randrange(1, 90)]))
+    rng.shuffle(rows)
+    return rows
+
+
+def test_monthly_sweep_matches_per_month_time_weighting() -> None:
+    """The one-pass capital sweep agrees with the per-month calculation for every month."""
+
+    history = _capital_history(groups=300, years=10, seed=3)
+    trades = [
+        OptionMetricTrade(trade_date=date(2016 + year, month, 1), net_cash_flow=Decimal(1), realized_pnl=Decimal(1))
+        for year in range(10)
+        for month in range(1, 13)
+    ]
+
+    metrics = compute_monthly_metrics(trades, capital_history=history)
+
+    assert len(metrics) >= 120
+    for row in metrics:
+        assert row.avg_capital_at_risk == compute_time_weighted_avg_capital(history, row.period_start, row.period_end)
+
+
+def test_tail_recompute_continues_stored_cumulatives() -> None:
+    """Recomputing from a month with the prior cumulatives reproduces the full run's tail."""
+
+    history = _capital_history(groups=40, years=2, seed=5)
+    trades = [
+        OptionMetricTrade(
+            trade_date=date(2016, 1, 1) + timedelta(days=9 * i), net_cash_flow=Decimal(i), realized_pnl=Decimal(-i)
+        )
+        for i in range(80)
+    ]
+    full = compute_monthly_metrics(trades, capital_history=history)
+    resume = date(2017, 3, 1)
+    prior = [row for row in full if row.period_start < resume][-1]
+
+    tail = compute_monthly_metrics(
+        [trade for trade in trades if trade.trade_date >= resume],
+        capital_history=history,
+        from_month=resume,
+        opening_cash_flow=prior.cash_flow_cumulative,
+        opening_realized_pnl=prior.realized_pnl_cumulative,
+    )
+
+    assert tail == [row for row in full if row.period_start >= resume]
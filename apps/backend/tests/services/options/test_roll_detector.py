@@ -2,10 +2,20 @@
 
 from __future__ import annotations
 
-from datetime import date
+import random
+from collections import defaultdict
+from datetime import date, timedelta
 from decimal import Decimal
 
-from app.services.options.roll_detector import RollCandidateTrade, detect_rolls
+from app.services.options.roll_detector import (
+    RollCandidateTrade,
+    RollDetection,
+    _is_candidate_pair,
+    _is_close_trade,
+    _is_open_trade,
+    classify_roll,
+    detect_rolls,
+)
 
 
 def trade(
@@ -108,3 +118,77 @@ def test_empty_input_returns_empty_list() -> None:
     """No trades means no roll candidates."""
 
     assert detect_rolls([]) == []
+
+
+def all_pairs_rolls(trades: list[RollCandidateTrade]) -> list[RollDetection]:
+    """The original all-pairs scan, only skipping other account/days (never candidates) so 50k trades finish."""
+
+    opens_by_day = defaultdict(list)
+    for opened in (t for t in trades if _is_open_trade(t)):
+        opens_by_day[(opened.account_id, opened.trade_date)].append(opened)
+    scored = []
+    for closed in (t for t in trades if _is_close_trade(t)):
+        for opened in opens_by_day[(closed.account_id, closed.trade_date)]:
+            if not _is_candidate_pair(closed, opened):
+                continue
+            score = abs(closed.strike - opened.strike) + Decimal(abs((opened.expiry - closed.expiry).days))
+            scored.append((score, closed.trade_id, opened.trade_id, closed, opened))
+
+    linked_closes: set[str] = set()
+    linked_opens: set[str] = set()
+    matches: list[RollDetection] = []
+    for _, _, _, closed, opened in sorted(scored, key=lambda item: (item[0], item[1], item[2])):
+        if closed.trade_id in linked_closes or opened.trade_id in linked_opens:
+            continue
+        linked_closes.add(closed.trade_id)
+        linked_opens.add(opened.trade_id)
+        matches.append((closed.trade_id, opened.trade_id, closed.realized_pnl, classify_roll(closed.realized_pnl)))
+    return matches
+
+
+def synthetic_history(count: int, *, days: int, seed: int) -> list[RollCandidateTrade]:
+    """Random fills over a few accounts/underlyings, dense enough for contested same-day matches."""
+
+    rng = random.Random(seed)
+    start = date(2023, 1, 2)
+    trades = []
+    for i in range(count):
+        trade_date = start + timedelta(days=rng.randrange(days))
+        roll = rng.random()
+        trades.append(
+            RollCandidateTrade(
+                trade_id=f"t{i:06d}",
+                account_id=rng.choice(["U1", "U2", "U3"]),
+                trade_date=trade_date,
+                underlying_symbol=rng.choice(["SPY", "QQQ", "NDX"]),
+                right=rng.choice(["put", "call"]),
+                side=rng.choice(["buy", "sell"]),
+                open_close_indicator="C" if roll < 0.45 else "O" if roll < 0.9 else None,
+                event_type=rng.choice(["open", "close", "expire", "assign", "trade"]),
+                strike=Decimal(rng.randrange(80, 120)) * Decimal("2.5"),
+                expiry=trade_date + timedelta(days=7 * rng.randrange(1, 9)),
+                quantity=Decimal(rng.choice([1, 2, 5, 9, 10, -10])),
+                realized_pnl=Decimal(rng.randrange(-5000, 5000)) / 100,
+                currency=rng.choice(["USD", "USD", "USD", "EUR"]),
+            )
+        )
+    return trades
+
+
+def test_indexed_matcher_equals_all_pairs_on_50k_history() -> None:
+    """Bucketed bisection returns exactly the all-pairs result, order included."""
+
+    trades = synthetic_history(50_000, days=500, seed=11)
+
+    expected = all_pairs_rolls(trades)
+
+    assert len(expected) > 5_000
+    assert detect_rolls(trades) == expected
+
+
+def test_indexed_matcher_equals_all_pairs_in_one_dense_day() -> None:
+    """Thousands of contested candidates in a single bucket still match identically."""
+
+    trades = synthetic_history(3_000, days=1, seed=5)
+
+    assert detect_rolls(trades) == all_pairs_rolls(trades)
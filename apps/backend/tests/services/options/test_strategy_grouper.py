@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 
 from app.services.options.strategy_grouper import StrategyTrade, group_option_strategies
@@ -116,3 +116,45 @@ def test_assignment_synthetic_cash_flow_rolls_into_group_net_cash_flow() -> None
     )
 
     assert result.groups[0].net_cash_flow == Decimal("-2700")
+
+
+def test_closes_attach_to_every_group_holding_the_contract() -> None:
+    """A close joins each group with an open leg on its contract, and settles their status."""
+
+    result = group_option_strategies(
+        [
+            trade("csp-a", cash="300"),
+            trade("csp-b", minute=1, cash="310"),
+            trade("close", day=date(2025, 2, 3), side="buy", indicator="C", quantity="2", cash="-200", pnl="410"),
+            trade("other", strike="500", cash="90"),
+        ]
+    )
+
+    by_anchor = {group.metadata["anchor_trade_ids"][0]: group for group in result.groups}
+    assert set(by_anchor["csp-a"].trade_ids) == {"csp-a", "close"}
+    assert set(by_anchor["csp-b"].trade_ids) == {"csp-b", "close"}
+    assert [by_anchor[key].status for key in ("csp-a", "csp-b", "other")] == ["closed", "closed", "open"]
+    assert by_anchor["csp-a"].closed_at == datetime(2025, 2, 3, 10, 0, tzinfo=timezone.utc)
+    assert by_anchor["other"].closed_at is None
+
+
+def test_long_history_groups_each_cycle_once() -> None:
+    """Thousands of open/close cycles group independently with stable ids."""
+
+    trades = []
+    for week in range(400):
+        day = date(2020, 1, 6) + timedelta(days=7 * week)
+        expiry = day + timedelta(days=4)
+        strike = str(300 + week % 50)
+        trades += [
+            trade(f"open-{week}", day=day, strike=strike, expiry=expiry, cash="120"),
+            trade(f"close-{week}", day=expiry, side="buy", indicator="C", strike=strike, expiry=expiry, pnl="80"),
+        ]
+
+    result = group_option_strategies(trades)
+
+    assert len(result.groups) == 400
+    assert {group.kind for group in result.groups} == {"csp"}
+    assert {group.status for group in result.groups} == {"closed"}
+    assert result.trade_group_ids["close-399"] == result.trade_group_ids["open-399"]
+    assert result.groups == group_option_strategies(list(reversed(trades))).groups
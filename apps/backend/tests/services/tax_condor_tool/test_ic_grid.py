@@ -0,0 +1,151 @@
+"""Equivalence tests: columnar iron-condor grid vs. the per-candidate pydantic path."""
+
+from __future__ import annotations
+
+from datetime import date
+from itertools import pairwise
+
+import pytest
+
+from app.services.tax_condor_tool.core.structures import StructureFactory
+from app.services.tax_condor_tool.data.mock_provider import MockDataProvider
+from app.services.tax_condor_tool.logic.ic_generator import SHORT_OFFSET_STEPS, WIDTH_STEPS, ICCandidateGenerator
+from app.services.tax_condor_tool.logic.leap_selector import LeapSelector
+from app.services.tax_condor_tool.logic.validator import Validator
+from app.services.tax_condor_tool.models import LeapRecommendation
+
+
+class _PatchyIVProvider(MockDataProvider):
+    """Mock chain where every third strike has no implied volatility."""
+
+    async def get_option_chain(self, symbol, expiration, limit=100):  # type: ignore[no-untyped-def]
+        chain = await super().get_option_chain(symbol, expiration, limit)
+        for leg in chain:
+            if int(leg.strike) % 3 == 0:
+                leg.implied_volatility = None
+        return chain
+
+
+async def _reference_candidates(provider, symbol: str, reference_date: date) -> list:  # type: ignore[no-untyped-def]
+    """The original nested-loop generator: one StructureFactory call per candidate."""
+    spot = await provider.get_spot_price(symbol)
+    expirations = await provider.get_expirations(symbol)
+    target_exp = min(expirations, key=lambda d: abs((d - reference_date).days - 40))
+    chain = await provider.get_option_chain(symbol, target_exp, limit=200)
+    calls = {opt.strike: opt for opt in chain if opt.option_type == "call"}
+    puts = {opt.strike: opt for opt in chain if opt.option_type == "put"}
+    strikes = sorted(calls)
+    step = min(d for d in (b - a for a, b in pairwise(strikes)) if d >= 1.0)
+    atm = round(spot / step) * step
+
+    candidates = []
+    for sco in SHORT_OFFSET_STEPS:
+        for spo in SHORT_OFFSET_STEPS:
+            sc, sp = atm + (sco * step), atm - (spo * step)
+            if sc not in calls or sp not in puts:
+                continue
+            for cw in WIDTH_STEPS:
+                lc = sc + (cw * step)
+                if lc not in calls:
+                    continue
+                for pw in WIDTH_STEPS:
+                    lp = sp - (pw * step)
+                    if lp not in puts:
+                        continue
+                    legs = []
+                    for leg, action, quantity in (
+                        (calls[sc], "sell", -1),
+                        (calls[lc], "buy", 1),
+                        (puts[sp], "sell", -1),
+                        (puts[lp], "buy", 1),
+                    ):
+                        leg = leg.model_copy()
+                        leg.action, leg.quantity = action, quantity
+                        legs.append(leg)
+                    candidates.append(
+                        StructureFactory.create_iron_condor(*legs, spot_price=spot, reference_date=reference_date)
+                    )
+    return candidates
+
+
+def _strikes(ic) -> tuple[float, ...]:  # type: ignore[no-untyped-def]
+    return (ic.short_call.strike, ic.long_call.strike, ic.short_put.strike, ic.long_put.strike)
+
+
+@pytest.mark.parametrize(
+    ("provider", "symbol"),
+    [(MockDataProvider(), "SPY"), (MockDataProvider(), "NDX"), (_PatchyIVProvider(), "QQQ")],
+)
+async def test_grid_materializes_the_same_candidates(provider, symbol) -> None:  # type: ignore[no-untyped-def]
+    today = date.today()
+    expected = await _reference_candidates(provider, symbol, today)
+
+    actual = await ICCandidateGenerator(provider).generate(symbol, reference_date=today)
+
+    assert expected
+    assert [_strikes(ic) for ic in actual] == [_strikes(ic) for ic in expected]
+    for got, want in zip(actual, expected):
+        assert got.short_call == want.short_call and got.long_put == want.long_put
+        assert (got.net_credit, got.margin_requirement, got.days_to_expiration) == pytest.approx(
+            (want.net_credit, want.margin_requirement, want.days_to_expiration), abs=1e-9
+        )
+        assert got.greeks.model_dump() == pytest.approx(want.greeks.model_dump(), abs=1e-12)
+        for got_sim, want_sim in zip(
+            got.pnl_simulations + got.chart_data, want.pnl_simulations + want.chart_data, strict=True
+        ):
+            assert got_sim.price_change_pct == want_sim.price_change_pct
+            assert got_sim.underlying_price == want_sim.underlying_price
+            assert got_sim.estimated_pnl == pytest.approx(want_sim.estimated_pnl, abs=1e-9)
+
+
+@pytest.mark.parametrize(("symbol", "budget"), [("SPY", 2000.0), ("NDX", 20_000.0), ("QQQ", 500.0)])
+async def test_rank_grid_matches_rank_and_validate_top_k(symbol: str, budget: float) -> None:
+    provider = MockDataProvider()
+    today = date.today()
+    leap = LeapRecommendation(leg=await LeapSelector(provider).select_best_leap(symbol), reason="test")
+    spot = await provider.get_spot_price(symbol)
+    validator = Validator()
+
+    expected = validator.rank_and_validate(
+        leap, await _reference_candidates(provider, symbol, today), budget, spot_price=spot, reference_date=today
+    )[:5]
+    grid = await ICCandidateGenerator(provider).generate_grid(symbol, reference_date=today)
+    actual = validator.rank_grid(leap, grid, budget, spot_price=spot, reference_date=today, top_k=5)
+
+    assert expected
+    assert [_strikes(r.iron_condor) for r in actual] == [_strikes(r.iron_condor) for r in expected]
+    for got, want in zip(actual, expected):
+        assert got.score == pytest.approx(want.score, abs=1e-9)
+        assert got.analysis == pytest.approx(want.analysis, abs=1e-9)
+        got_sims = got.portfolio_pnl_simulations + got.portfolio_chart_data
+        want_sims = want.portfolio_pnl_simulations + want.portfolio_chart_data
+        assert [s.underlying_price for s in got_sims] == [s.underlying_price for s in want_sims]
+        assert [s.estimated_pnl for s in got_sims] == pytest.approx([s.estimated_pnl for s in want_sims], abs=1e-8)
+
+
+async def test_wider_grid_and_empty_chain() -> None:
+    provider = MockDataProvider()
+    today = date.today()
+    wide = ICCandidateGenerator(provider, short_offset_steps=range(1, 19), width_steps=range(1, 7))
+
+    grid = await wide.generate_grid("SPY", reference_date=today)
+    recs = Validator().rank_grid(
+        LeapRecommendation(leg=await LeapSelector(provider).select_best_leap("SPY"), reason="test"),
+        grid,
+        budget=5000.0,
+        spot_price=500.0,
+        reference_date=today,
+        top_k=3,
+    )
+
+    assert len(grid) > 10 * len(await ICCandidateGenerator(provider).generate_grid("SPY", reference_date=today))
+    assert len(recs) == 3
+    assert recs[0].score >= recs[1].score >= recs[2].score
+
+    class _NoExpirations(MockDataProvider):
+        async def get_expirations(self, symbol):  # type: ignore[no-untyped-def]
+            return []
+
+    assert await ICCandidateGenerator(_NoExpirations()).generate_grid("SPY") is None
+    assert await ICCandidateGenerator(_NoExpirations()).generate("SPY") == []
+    assert Validator().rank_grid(recs[0].leap, None, 1000.0) == []
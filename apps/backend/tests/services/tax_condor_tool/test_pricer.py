@@ -0,0 +1,169 @@
+"""Parity tests for the vectorized Black-Scholes pricer."""
+
+from __future__ import annotations
+
+import math
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from app.services.backtester.data_provider import SyntheticDataProvider
+from app.services.tax_condor_tool.core.pricer import BlackScholesPricer
+from app.services.tax_condor_tool.core.structures import StructureFactory
+from app.services.tax_condor_tool.logic.validator import Validator
+from app.services.tax_condor_tool.models import GreekVector, LeapRecommendation, OptionLeg
+
+SPOTS = [95.0, 450.0, 17500.0]
+MONEYNESS = [0.6, 0.9, 0.99, 1.0, 1.01, 1.1, 1.5]
+EXPIRIES = [-0.5, 0.0, 1 / 365, 30 / 365, 1.0, 2.5]
+RATES = [0.0, 0.045]
+VOLS = [0.05, 0.2, 0.85]
+
+
+def _reference_price(S: float, K: float, T: float, r: float, sigma: float, is_call: bool) -> float:
+    """Original one-option-at-a-time implementation."""
+
+    if T <= 0:
+        return max(0.0, S - K) if is_call else max(0.0, K - S)
+    d1 = (math.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * math.sqrt(T))
+    d2 = d1 - sigma * math.sqrt(T)
+    if is_call:
+        return float(S * norm.cdf(d1) - K * math.exp(-r * T) * norm.cdf(d2))
+    return float(K * math.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1))
+
+
+def _reference_greeks(S: float, K: float, T: float, r: float, sigma: float, is_call: bool) -> tuple[float, ...]:
+    if T <= 0:
+        return 0.0, 0.0, 0.0, 0.0
+    d1 = (math.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * math.sqrt(T))
+    d2 = d1 - sigma * math.sqrt(T)
+    delta = float(norm.cdf(d1) if is_call else norm.cdf(d1) - 1)
+    gamma = float(norm.pdf(d1) / (S * sigma * math.sqrt(T)))
+    theta = float(
+        -(S * norm.pdf(d1) * sigma) / (2 * math.sqrt(T)) - r * K * math.exp(-r * T) * norm.cdf(d2 if is_call else -d2)
+    )
+    vega = float(S * norm.pdf(d1) * math.sqrt(T))
+    return delta, gamma, theta / 365.0, vega / 100.0
+
+
+def _grid() -> list[tuple[float, float, float, float, float, bool]]:
+    return [
+        (S, S * m, T, r, sigma, is_call)
+        for S in SPOTS
+        for m in MONEYNESS
+        for T in EXPIRIES
+        for r in RATES
+        for sigma in VOLS
+        for is_call in (True, False)
+    ]
+
+
+def test_batch_matches_reference_scalar_pricing() -> None:
+    cases = _grid()
+    columns = [np.array(column) for column in zip(*cases)]
+
+    prices = BlackScholesPricer.price_batch(*columns)
+    greeks = np.stack(BlackScholesPricer.greeks_batch(*columns), axis=1)
+
+    expected_prices = np.array([_reference_price(*case) for case in cases])
+    expected_greeks = np.array([_reference_greeks(*case) for case in cases])
+    np.testing.assert_allclose(prices, expected_prices, rtol=1e-10, atol=1e-10)
+    np.testing.assert_allclose(greeks, expected_greeks, rtol=1e-10, atol=1e-10)
+
+
+@pytest.mark.parametrize("case", _grid()[::37])
+def test_scalar_wrappers_match_reference(case: tuple[float, float, float, float, float, bool]) -> None:
+    price = BlackScholesPricer.price(*case)
+    greeks = BlackScholesPricer.greeks(*case)
+
+    assert isinstance(price, float)
+    assert all(isinstance(greek, float) for greek in greeks)
+    assert price == pytest.approx(_reference_price(*case), rel=1e-10, abs=1e-10)
+    assert greeks == pytest.approx(_reference_greeks(*case), rel=1e-10, abs=1e-10)
+
+
+def test_batch_broadcasts_strikes_against_expiries() -> None:
+    strikes = np.array([90.0, 100.0, 110.0])
+    expiries = np.array([0.0, 0.25, 1.0])[:, None]
+
+    prices = BlackScholesPricer.price_batch(100.0, strikes, expiries, 0.05, 0.2, True)
+    deltas, *_ = BlackScholesPricer.greeks_batch(100.0, strikes, expiries, 0.05, 0.2, True)
+
+    assert prices.shape == deltas.shape == (3, 3)
+    np.testing.assert_array_equal(prices[0], [10.0, 0.0, 0.0])
+    np.testing.assert_array_equal(deltas[0], [0.0, 0.0, 0.0])
+    for i, T in enumerate(expiries[:, 0]):
+        for j, K in enumerate(strikes):
+            assert prices[i, j] == pytest.approx(_reference_price(100.0, K, T, 0.05, 0.2, True), rel=1e-12)
+
+
+def test_synthetic_chain_matches_scalar_pricing(monkeypatch: pytest.MonkeyPatch) -> None:
+    provider = SyntheticDataProvider()
+    monkeypatch.setattr(provider, "get_spot_price", lambda symbol, day: 450.0)
+    monkeypatch.setattr(provider, "get_volatility", lambda symbol, day: 0.22)
+    as_of = date(2024, 3, 4)
+
+    chain = provider.get_option_chain("SPY", as_of)
+
+    assert chain.contracts
+    for contract in chain.contracts.values():
+        T = (contract["expiration"] - as_of).days / 365.0
+        is_call = contract["right"] == "C"
+        args = (450.0, contract["strike"], T, 0.05, 0.22, is_call)
+        greeks = contract["greeks"]
+        assert contract["price"] == pytest.approx(_reference_price(*args), rel=1e-10, abs=1e-10)
+        assert (greeks["delta"], greeks["gamma"], greeks["theta"], greeks["vega"]) == pytest.approx(
+            _reference_greeks(*args), rel=1e-10, abs=1e-10
+        )
+
+
+def _leg(strike: float, option_type: str, quantity: int, price: float, expiration: date) -> OptionLeg:
+    return OptionLeg(
+        symbol="SPY",
+        strike=strike,
+        expiration=expiration,
+        option_type=option_type,
+        action="sell" if quantity < 0 else "buy",
+        quantity=quantity,
+        greeks=GreekVector(delta=0.1, gamma=0.01, theta=0.05, vega=0.1),
+        price=price,
+        implied_volatility=0.2,
+    )
+
+
+def test_condor_and_portfolio_simulations_match_scalar_pricing() -> None:
+    today = date(2024, 3, 4)
+    expiry = today + timedelta(days=30)
+    ic = StructureFactory.create_iron_condor(
+        _leg(470, "call", -1, 3.1, expiry),
+        _leg(480, "call", 1, 1.4, expiry),
+        _leg(430, "put", -1, 3.4, expiry),
+        _leg(420, "put", 1, 1.6, expiry),
+        spot_price=450.0,
+        reference_date=today,
+    )
+    leap_leg = _leg(400, "call", 1, 80.0, today + timedelta(days=400))
+    leap = LeapRecommendation(leg=leap_leg, reason="test")
+
+    recs = Validator().rank_and_validate(leap, [ic], budget=10_000, spot_price=450.0, reference_date=today)
+
+    assert len(ic.pnl_simulations) == 5 and len(ic.chart_data) == 51
+    legs = [ic.short_call, ic.long_call, ic.short_put, ic.long_put]
+    for sim in ic.pnl_simulations + ic.chart_data:
+        expected = sum(
+            (_reference_price(sim.underlying_price, leg.strike, 0.0, 0.045, 0.2, leg.option_type == "call") - leg.price)
+            * leg.quantity
+            * 100
+            for leg in legs
+        )
+        assert sim.estimated_pnl == pytest.approx(expected, abs=1e-9)
+
+    T_leap = (400 - 30) / 365.0
+    rec = recs[0]
+    portfolio = rec.portfolio_pnl_simulations + rec.portfolio_chart_data
+    for sim, ic_sim in zip(portfolio, ic.pnl_simulations + ic.chart_data, strict=True):
+        leap_price = _reference_price(sim.underlying_price, 400, T_leap, 0.045, 0.2, True)
+        expected = ic_sim.estimated_pnl + (leap_price - 80.0) * 100
+        assert sim.estimated_pnl == pytest.approx(expected, rel=1e-10)
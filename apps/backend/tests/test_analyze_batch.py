@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from contextlib import AbstractContextManager
 from types import TracebackType
 from typing import Any
@@ -117,3 +118,66 @@ def test_refresh_ticker_analyses_skips_failed_ticker(monkeypatch: pytest.MonkeyP
     assert refreshed == 1
     assert session.committed is True
     assert sum("insert into public.analysis_tickers" in call["sql"] for call in session.executions) == 1
+
+
+def test_refresh_fetches_shared_ticker_once_for_all_households(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Households holding the same ticker share one analysis build."""
+
+    session = FakeSession()
+    built: list[str] = []
+
+    async def fake_build_ticker_analysis(ticker: str) -> dict[str, Any]:
+        built.append(ticker)
+        return {"ticker": ticker, "sections": {}}
+
+    monkeypatch.setattr(analyze_batch, "build_ticker_analysis", fake_build_ticker_analysis)
+
+    households = [UUID(f"00000000-0000-0000-0000-00000000010{i}") for i in range(5)]
+    inputs = [TickerInput(ticker="SPY", household_id=household_id) for household_id in households]
+    inputs.append(TickerInput(ticker="QQQ", household_id=households[0]))
+
+    refreshed = AnalyzeBatchRefresher(session_factory=lambda: session).refresh_specific_tickers(  # type: ignore[arg-type]
+        session, inputs
+    )
+
+    assert refreshed == 6
+    assert sorted(built) == ["QQQ", "SPY"]
+    upserts = [call["params"] for call in session.executions if "insert into public.analysis_tickers" in call["sql"]]
+    assert sorted(str(params["household_id"]) for params in upserts if params["ticker"] == "SPY") == sorted(
+        str(household_id) for household_id in households
+    )
+
+
+async def test_build_ticker_analysis_fetches_sections_concurrently(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Sections are awaited together and keep a stable key order."""
+
+    in_flight = 0
+    peak = 0
+
+    def section(name: str):  # type: ignore[no-untyped-def]
+        async def load(*_args: Any, **_kwargs: Any) -> dict[str, str]:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if name == "options":
+                raise RuntimeError("no chain")
+            return {"section": name}
+
+        return load
+
+    for name in ("fundamentals", "price_history", "technicals", "option_chain", "synthesis"):
+        monkeypatch.setattr(analyze_batch, f"get_{name}", section("options" if name == "option_chain" else name))
+
+    data = await analyze_batch.build_ticker_analysis("nvda")
+
+    assert peak == 6
+    assert list(data["sections"]) == [
+        "fundamentals",
+        "price_history_1y_1d",
+        "price_history_5y_1wk",
+        "technicals",
+        "synthesis",
+    ]
+    assert data["errors"] == {"options": "no chain"}
@@ -0,0 +1,217 @@
+"""Tests for the two-tier analyze cache (L1 per process, shared L2 store)."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from fastapi import HTTPException
+import pytest
+from sqlalchemy import create_engine
+
+from app.api import analyze
+from app.services import cache
+from app.services.cache_store import CacheEntry, PostgresCacheStore, SQLiteCacheStore
+from app.services.market_data import FakeMarketDataProvider, MarketDataGateway
+
+
+class _UnknownTickerProvider(FakeMarketDataProvider):
+    def info(self, ticker: str) -> dict:
+        self._enter("info")
+        return {}
+
+
+class _BrokenStore:
+    name = "broken"
+
+    def get(self, namespace, key):  # type: ignore[no-untyped-def]
+        raise OSError("disk gone")
+
+    def set(self, namespace, key, entry):  # type: ignore[no-untyped-def]
+        raise OSError("disk gone")
+
+    def prune(self, namespace, max_entries):  # type: ignore[no-untyped-def]
+        raise OSError("disk gone")
+
+    def clear(self) -> None:
+        raise OSError("disk gone")
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch: pytest.MonkeyPatch) -> SQLiteCacheStore:  # type: ignore[no-untyped-def]
+    """A fresh SQLite L2, empty L1 and zeroed counters."""
+    l2 = SQLiteCacheStore(str(tmp_path / "analyze_cache.sqlite3"))
+    monkeypatch.setattr(cache, "_l2", l2)
+    monkeypatch.setattr(cache, "_stats", {name: dict.fromkeys(cache._COUNTERS, 0) for name in cache._caches})
+    cache.clear_cache()
+    return l2
+
+
+def _gateway(monkeypatch: pytest.MonkeyPatch, provider: FakeMarketDataProvider) -> MarketDataGateway:
+    gateway = MarketDataGateway(provider, max_workers=2, rate_per_second=0, timeout=5.0)
+    monkeypatch.setattr(analyze, "market_data_gateway", gateway)
+    return gateway
+
+
+async def test_l2_serves_other_processes_after_l1_is_lost(store, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    provider = FakeMarketDataProvider()
+    gateway = _gateway(monkeypatch, provider)
+
+    first = await analyze.get_price_history("SPY", period="1y", interval="1d")
+    cache._caches["price"].clear()  # a fresh worker process: empty L1, same L2
+    second = await analyze.get_price_history("SPY", period="1y", interval="1d")
+    third = await analyze.get_price_history("SPY", period="1y", interval="1d")
+
+    assert [r.headers["X-Cache"] for r in (first, second, third)] == ["MISS", "HIT", "HIT"]
+    assert second.body == first.body
+    assert provider.calls == {"history": 1}
+    stats = cache.get_cache_stats()["price"]
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (2, 1, 0.6667)
+    assert stats["tiers"]["l1"] == {"hits": 1, "lookups": 3, "hit_ratio": 0.3333}
+    assert stats["tiers"]["l2"]["backend"] == "sqlite"
+    assert (stats["tiers"]["l2"]["hits"], stats["tiers"]["l2"]["lookups"]) == (1, 2)
+    gateway.shutdown()
+
+
+async def test_stale_value_is_served_while_one_refresh_runs(store) -> None:  # type: ignore[no-untyped-def]
+    now = time.time()
+    cache._store("technicals", "QQQ", CacheEntry(value={"v": "old"}, fresh_until=now - 1, stale_until=now + 60))
+    calls = 0
+
+    async def loader() -> dict:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"v": "new"}
+
+    results = await asyncio.gather(*(cache.get_or_load("technicals", "QQQ", loader) for _ in range(5)))
+    assert results == [({"v": "old"}, "STALE")] * 5
+    await asyncio.gather(*cache._inflight.values())
+
+    assert calls == 1
+    assert await cache.get_or_load("technicals", "QQQ", loader) == ({"v": "new"}, "HIT")
+    assert store.get("technicals", "QQQ").value == {"v": "new"}
+    assert cache.get_cache_stats()["technicals"]["stale_hits"] == 5
+
+
+async def test_unknown_ticker_is_negatively_cached(store, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    provider = _UnknownTickerProvider()
+    gateway = _gateway(monkeypatch, provider)
+
+    for _ in range(3):
+        with pytest.raises(HTTPException) as excinfo:
+            await analyze.get_fundamentals("nosuch")
+        assert (excinfo.value.status_code, excinfo.value.detail) == (404, "Ticker 'NOSUCH' not found")
+
+    assert provider.calls == {"info": 1}
+    assert store.get("fundamentals", "NOSUCH").negative
+    assert cache.get_cache_stats()["fundamentals"]["negative_hits"] == 2
+    gateway.shutdown()
+
+
+def _expire_first_miss(namespace: str, key: str) -> None:
+    """Age a negative entry past negative_ttl while it is still remembered."""
+    entry = cache._lookup(namespace, key)
+    cache._store(namespace, key, CacheEntry(entry.value, time.time() - 1, entry.stale_until, negative=True))
+
+
+async def test_single_empty_response_is_only_negatively_cached_briefly(store) -> None:  # type: ignore[no-untyped-def]
+    responses = [None, {"v": 1}]
+
+    async def loader() -> dict:
+        value = responses.pop(0)
+        if value is None:
+            raise cache.CacheNotFound("No price data for 'SPY'")
+        return value
+
+    with pytest.raises(cache.CacheNotFound):
+        await cache.get_or_load("price", "SPY", loader)
+    first_miss = store.get("price", "SPY")
+    assert first_miss.fresh_until - time.time() <= cache.NEGATIVE_TTL
+
+    _expire_first_miss("price", "SPY")
+
+    assert await cache.get_or_load("price", "SPY", loader) == ({"v": 1}, "MISS")
+
+
+async def test_repeated_miss_confirms_an_unknown_ticker(store) -> None:  # type: ignore[no-untyped-def]
+    calls = 0
+
+    async def loader() -> dict:
+        nonlocal calls
+        calls += 1
+        raise cache.CacheNotFound("Ticker 'NOSUCH' not found")
+
+    with pytest.raises(cache.CacheNotFound):
+        await cache.get_or_load("fundamentals", "NOSUCH", loader)
+    _expire_first_miss("fundamentals", "NOSUCH")
+    with pytest.raises(cache.CacheNotFound):
+        await cache.get_or_load("fundamentals", "NOSUCH", loader)
+    with pytest.raises(cache.CacheNotFound):
+        await cache.get_or_load("fundamentals", "NOSUCH", loader)
+
+    assert calls == 2
+    assert store.get("fundamentals", "NOSUCH").fresh_until - time.time() > cache.UNKNOWN_TTL - 60
+
+
+async def test_loader_errors_are_not_cached(store) -> None:  # type: ignore[no-untyped-def]
+    async def failing() -> dict:
+        raise HTTPException(status_code=502, detail="upstream down")
+
+    with pytest.raises(HTTPException):
+        await cache.get_or_load("options", "SPY:default", failing)
+
+    assert store.get("options", "SPY:default") is None
+    assert cache.get_cached("options", "SPY:default") is None
+
+
+async def test_l2_failures_degrade_to_misses(store, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr(cache, "_l2", _BrokenStore())
+
+    async def loader() -> dict:
+        return {"ok": True}
+
+    assert await cache.get_or_load("price", "X", loader) == ({"ok": True}, "MISS")
+    assert await cache.get_or_load("price", "X", loader) == ({"ok": True}, "HIT")
+    assert cache.get_cache_stats()["price"]["tiers"]["l2"]["errors"] == 2
+
+
+def test_sqlite_store_is_shared_and_pruned(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    path = str(tmp_path / "shared.sqlite3")
+    writer, reader = SQLiteCacheStore(path), SQLiteCacheStore(path)
+    now = time.time()
+
+    for i in range(5):
+        writer.set("price", f"T{i}", CacheEntry(value={"i": i}, fresh_until=now + i, stale_until=now + 60))
+    writer.set("price", "OLD", CacheEntry(value={}, fresh_until=now - 20, stale_until=now - 10))
+    assert reader.get("price", "T3") == CacheEntry(value={"i": 3}, fresh_until=now + 3, stale_until=now + 60)
+    assert reader.get("price", "OLD") is None
+
+    reader.prune("price", 2)
+    assert [writer.get("price", f"T{i}") is not None for i in range(5)] == [False, False, False, True, True]
+
+
+def test_l2_defaults_to_postgres_when_the_app_database_is_postgres(tmp_path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.delenv("ANALYZE_CACHE_L2", raising=False)
+    monkeypatch.setenv("ANALYZE_CACHE_SQLITE_PATH", str(tmp_path / "l2.sqlite3"))
+
+    monkeypatch.setattr("app.dal.database.engine", create_engine("postgresql://user:pw@db.invalid/app"))
+    assert isinstance(cache._build_l2(), PostgresCacheStore)
+
+    monkeypatch.setattr("app.dal.database.engine", create_engine("sqlite://"))
+    assert isinstance(cache._build_l2(), SQLiteCacheStore)
+
+    monkeypatch.setenv("ANALYZE_CACHE_L2", "none")
+    assert cache._build_l2() is None
+
+
+def test_namespace_config_reads_env_overrides(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ANALYZE_CACHE_PRICE_TTL", "60")
+    monkeypatch.setenv("ANALYZE_CACHE_PRICE_STALE_TTL", "0")
+    monkeypatch.setenv("ANALYZE_CACHE_OPTIONS_MAXSIZE", "lots")
+
+    config = cache.load_config()
+
+    assert (config["price"].ttl, config["price"].stale_ttl) == (60, 0)
+    assert config["options"].maxsize == cache._DEFAULT_CONFIG["options"].maxsize
+    assert config["fundamentals"].ttl == cache.FUNDAMENTALS_TTL
@@ -0,0 +1,110 @@
+"""Unit tests for the queued backtest sweep worker handler."""
+
+from __future__ import annotations
+
+from datetime import date
+from types import TracebackType
+from typing import Any
+
+import pytest
+
+from app.services.backtester.sweep import SweepConfig, VariantResult
+from app.worker import backtest_sweep_handler
+from app.worker.registry import JOB_HANDLERS
+
+PAYLOAD_IDS = {
+    "household_id": "10000000-0000-0000-0000-000000000001",
+    "compute_job_id": "00000000-0000-0000-0000-000000000001",
+}
+
+
+class FakeResult:
+    """Rows returned for the already-recorded variants query."""
+
+    def __init__(self, rows: list[tuple[int]]) -> None:
+        self.rows = rows
+
+    def all(self) -> list[tuple[int]]:
+        return self.rows
+
+
+class FakeSession:
+    """Capture SQL parameters for backtest_sweep_results assertions."""
+
+    def __init__(self, recorded: list[tuple[int]]) -> None:
+        self.recorded = recorded
+        self.executions: list[dict[str, Any]] = []
+        self.commits = 0
+
+    def __enter__(self) -> "FakeSession":
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+    ) -> bool:
+        return False
+
+    def execute(self, statement: object, params: dict[str, Any]) -> FakeResult:
+        self.executions.append({"sql": str(statement), "params": params})
+        return FakeResult(self.recorded)
+
+    def commit(self) -> None:
+        self.commits += 1
+
+
+def test_sweep_job_streams_one_row_per_variant(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Each finished variant is upserted as it completes; recorded variants are skipped."""
+
+    session = FakeSession(recorded=[(1,)])
+    calls: dict[str, Any] = {}
+
+    def fake_run_sweep(config: SweepConfig, variants: list[dict[str, Any]], on_result: Any, **kwargs: Any) -> Any:
+        calls.update(config=config, variants=variants, **kwargs)
+        on_result(VariantResult(0, variants[0], summary={"final_equity": 101250.5, "metrics": {"sharpe_ratio": 1.2}}))
+        on_result(VariantResult(2, variants[2], error="ValueError: boom"))
+        return {"completed": 1, "failed": 1, "skipped": 1}
+
+    monkeypatch.setattr(backtest_sweep_handler, "_ensure_data", lambda request: None)
+    monkeypatch.setattr(backtest_sweep_handler, "run_sweep", fake_run_sweep)
+    monkeypatch.setenv("BACKTEST_SWEEP_WORKERS", "3")
+
+    result = backtest_sweep_handler.run_backtest_sweep_job(
+        {
+            **PAYLOAD_IDS,
+            "config": {
+                "year": 2024,
+                "step_days": 7,
+                "underlying": "ndx",
+                "grid": {"roll_dte": [14, 21, 28], "width_steps": [[1, 2]]},
+            },
+        },
+        session_factory=lambda: session,
+    )
+
+    assert result == {"variants": 3, "completed": 1, "failed": 1, "skipped": 1}
+    assert calls["config"] == SweepConfig("NDX", "NDX", date(2024, 1, 1), date(2024, 12, 31), 100000.0, 7)
+    assert calls["variants"][2] == {"roll_dte": 28, "width_steps": (1, 2)}
+    assert calls["max_workers"] == 3 and calls["skip"] == {1}
+    done, failed = (e["params"] for e in session.executions[1:])
+    assert (done["variant_index"], done["status"], done["error"]) == (0, "done", None)
+    assert '"final_equity": "101250.5"' in done["summary"]
+    assert done["params"] == '{"roll_dte": 14, "width_steps": [1, 2]}'
+    assert (failed["variant_index"], failed["status"], failed["summary"]) == (2, "failed", None)
+    assert session.commits == 2
+    assert JOB_HANDLERS["backtest_sweep"] is backtest_sweep_handler.run_backtest_sweep_job
+
+
+@pytest.mark.parametrize(
+    ("grid", "message"),
+    [
+        (None, "non-empty grid"),
+        ({"roll_dte": 21}, "must be lists"),
+        ({"delta": [0.5]}, "Unknown sweep parameters"),
+        ({"roll_dte": list(range(17)), "ic_target_dte": list(range(16))}, "the limit is 256"),
+    ],
+)
+def test_sweep_job_rejects_bad_grids(grid: Any, message: str) -> None:
+    """Invalid grids fail validation before any data sync or worker fan-out."""
+
+    with pytest.raises(ValueError, match=message):
+        backtest_sweep_handler.run_backtest_sweep_job({**PAYLOAD_IDS, "config": {"year": 2024, "grid": grid}})
@@ -0,0 +1,138 @@
+"""Tests for the non-blocking market-data gateway used by the analyze API."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from fastapi import HTTPException
+import pytest
+
+from app.api import analyze
+from app.services import cache
+from app.services.market_data import FakeMarketDataProvider, MarketDataGateway, MarketDataTimeout
+
+
+def _info(provider, ticker: str) -> dict:  # type: ignore[no-untyped-def]
+    return provider.info(ticker)
+
+
+@pytest.fixture
+def fake_gateway(monkeypatch: pytest.MonkeyPatch):  # type: ignore[no-untyped-def]
+    """Route the analyze API through a gateway over a slow fake provider."""
+
+    provider = FakeMarketDataProvider(latency=0.05)
+    gateway = MarketDataGateway(provider, max_workers=4, rate_per_second=0, timeout=5.0)
+    monkeypatch.setattr(analyze, "market_data_gateway", gateway)
+    monkeypatch.setattr(cache, "_l2", None)
+    cache.clear_cache()
+    yield gateway
+    gateway.shutdown()
+
+
+async def test_concurrent_identical_requests_are_coalesced() -> None:
+    provider = FakeMarketDataProvider(latency=0.1)
+    gateway = MarketDataGateway(provider, rate_per_second=0)
+
+    results = await asyncio.gather(*(gateway.fetch("info", "AAPL", _info) for _ in range(10)))
+
+    assert provider.calls == {"info": 1}
+    assert all(result == results[0] for result in results)
+    assert gateway.stats()["coalesced"] == 9
+    assert gateway.stats()["in_flight"] == 0
+
+    await gateway.fetch("info", "AAPL", _info)
+    assert provider.calls == {"info": 2}, "completed calls are not cached by the gateway"
+    gateway.shutdown()
+
+
+async def test_provider_calls_do_not_block_event_loop() -> None:
+    provider = FakeMarketDataProvider(latency=0.3)
+    gateway = MarketDataGateway(provider, rate_per_second=0)
+    ticks = 0
+
+    async def heartbeat() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    beat = asyncio.create_task(heartbeat())
+    await gateway.fetch("info", "MSFT", _info)
+    beat.cancel()
+
+    assert ticks >= 15
+    gateway.shutdown()
+
+
+async def test_thread_pool_bounds_concurrency() -> None:
+    provider = FakeMarketDataProvider(latency=0.05)
+    gateway = MarketDataGateway(provider, max_workers=2, rate_per_second=0)
+
+    await asyncio.gather(*(gateway.fetch("info", f"T{i}", _info) for i in range(6)))
+
+    assert provider.calls == {"info": 6}
+    assert provider.max_concurrency == 2
+    gateway.shutdown()
+
+
+async def test_rate_limit_spaces_provider_calls() -> None:
+    provider = FakeMarketDataProvider()
+    gateway = MarketDataGateway(provider, rate_per_second=20, burst=1)
+
+    started = time.monotonic()
+    await asyncio.gather(*(gateway.fetch("info", f"T{i}", _info) for i in range(5)))
+
+    assert time.monotonic() - started >= 0.18
+    gateway.shutdown()
+
+
+async def test_timeout_raises_and_keeps_shared_call_running() -> None:
+    provider = FakeMarketDataProvider(latency=0.3)
+    gateway = MarketDataGateway(provider, rate_per_second=0, timeout=0.05)
+
+    with pytest.raises(MarketDataTimeout):
+        await gateway.fetch("info", "SLOW", _info)
+    assert gateway.stats()["timeouts"] == 1
+
+    gateway.timeout = 5.0
+    await gateway.fetch("info", "SLOW", _info)
+    assert provider.calls == {"info": 1}, "a waiter after the timeout joins the still-running call"
+    gateway.shutdown()
+
+
+async def test_analyze_routes_share_one_history_fetch(fake_gateway: MarketDataGateway) -> None:
+    provider = fake_gateway.provider
+
+    technicals, history, *_ = await asyncio.gather(
+        analyze.get_technicals("qqq"),
+        analyze.get_price_history("QQQ", period="6mo", interval="1d"),
+        analyze.get_technicals("QQQ"),
+        analyze.get_price_history("QQQ", period="6mo", interval="1d"),
+    )
+
+    assert technicals.status_code == 200 and history.status_code == 200
+    assert provider.calls == {"history": 1}
+
+
+async def test_analyze_routes_use_gateway_for_every_section(fake_gateway: MarketDataGateway) -> None:
+    provider = fake_gateway.provider
+
+    await asyncio.gather(
+        analyze.get_fundamentals("NVDA"),
+        analyze.get_option_chain("NVDA", expiry=None),
+        analyze.get_synthesis("NVDA"),
+    )
+
+    assert provider.calls == {"info": 3, "financial_statements": 1, "options": 1, "option_chain": 1}
+    assert "coalesced" in cache.get_cache_stats()["market_data"]
+
+
+async def test_analyze_route_timeout_maps_to_504(fake_gateway: MarketDataGateway) -> None:
+    fake_gateway.timeout = 0.01
+    fake_gateway.provider.latency = 0.2
+
+    with pytest.raises(HTTPException) as excinfo:
+        await analyze.get_price_history("SPY", period="1y", interval="1d")
+
+    assert excinfo.value.status_code == 504
@@ -0,0 +1,226 @@
+"""Tests for the vectorized Monte Carlo plan engine."""
+
+from __future__ import annotations
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+from app.services.plan_monte_carlo import MonteCarloOptions, compile_plan, run_monte_carlo
+from app.services.plan_service import PlanService
+from app.services.tax_calculator import TaxBracketTable, calculate_marginal_tax, calculate_tax_on_additional_income
+
+MONTE_CARLO_BUDGET_S = float(os.getenv("PERF_MONTE_CARLO_BUDGET_S", "1.0"))
+
+SETTINGS = {"primaryUser": {"birthYear": 1985}, "spouse": {"birthYear": 1988}, "mainCurrency": "ILS"}
+
+PLAN = {
+    "items": [
+        {
+            "id": "job",
+            "name": "Job",
+            "category": "Income",
+            "value": 300000,
+            "growth_rate": 2,
+            "tax_rate": 25,
+            "end_condition": "Milestone",
+            "end_reference": "ret",
+        },
+        {
+            "id": "rent",
+            "name": "Rent",
+            "category": "Expense",
+            "value": 8000,
+            "frequency": "Monthly",
+            "growth_rate": 2.5,
+        },
+        {
+            "id": "car",
+            "name": "Car",
+            "category": "Asset",
+            "value": 150000,
+            "start_condition": "Age",
+            "start_reference": "45",
+            "recurrence": {"rule": "Replace", "period_years": 8},
+            "depreciation_rate": 10,
+        },
+        {
+            "id": "gig",
+            "name": "Side gig",
+            "category": "Income",
+            "value": 40000,
+            "tax_rate": 30,
+            "start_condition": "Milestone",
+            "start_reference": "fi",
+        },
+        {
+            "id": "broker",
+            "name": "Broker",
+            "category": "Account",
+            "value": 400000,
+            "growth_rate": 6,
+            "account_settings": {
+                "type": "Broker",
+                "withdrawal_priority": 2,
+                "dividend_yield": 2,
+                "dividend_policy": "Payout",
+                "dividend_payout_start_condition": "Milestone",
+                "dividend_payout_start_reference": "fi",
+                "dividend_tax_rate": 25,
+                "fees": 0.3,
+            },
+        },
+        {
+            "id": "rsu",
+            "name": "RSU",
+            "category": "Account",
+            "value": 300000,
+            "growth_rate": 8,
+            "account_settings": {
+                "type": "RSU",
+                "withdrawal_priority": 1,
+                "current_price": 100,
+                "rsu_grants": [{"shares": 1000, "price": 60}, {"shares": 500, "price": 120}],
+                "max_withdrawal_rate": 30,
+            },
+        },
+        {
+            "id": "savings",
+            "name": "Savings",
+            "category": "Account",
+            "value": 50000,
+            "growth_rate": 2,
+            "account_settings": {"type": "Savings", "inflow_priority": 1, "savings_goal": 120000},
+        },
+        {
+            "id": "pension",
+            "name": "Pension",
+            "category": "Account",
+            "owner": "Spouse",
+            "value": 500000,
+            "growth_rate": 5,
+            "account_settings": {
+                "type": "Pension",
+                "draw_income": True,
+                "starting_age": 64,
+                "monthly_contribution": 3000,
+                "tax_rate": 15,
+            },
+        },
+    ],
+    "milestones": [
+        {"id": "ret", "name": "Retire", "type": "Retirement", "details": {"age": 55}},
+        {"id": "fi", "name": "FI", "type": "Financial Independence"},
+    ],
+}
+
+DEPLETING_PLAN = {
+    "items": [
+        {"id": "life", "name": "Life", "category": "Expense", "owner": "You", "value": 120000},
+        {
+            "id": "broker",
+            "name": "Broker",
+            "category": "Account",
+            "owner": "You",
+            "value": 3000000,
+            "growth_rate": 5,
+            "account_settings": {"type": "Broker"},
+        },
+    ],
+    "milestones": [],
+}
+
+
+def _options(**overrides) -> MonteCarloOptions:  # type: ignore[no-untyped-def]
+    return MonteCarloOptions(**{"paths": 500, "seed": 42, **overrides})
+
+
+@pytest.mark.parametrize("plan", [PLAN, DEPLETING_PLAN])
+def test_zero_volatility_matches_deterministic_projection(plan: dict) -> None:
+    projection = PlanService.calculate_projection(plan, None, SETTINGS)
+    result = PlanService.simulate_monte_carlo(
+        plan, None, SETTINGS, options=_options(paths=3, return_volatility=0, inflation_volatility=0)
+    )
+
+    assert result.years == [p["year"] for p in projection]
+    for band in ("p5", "p50", "p95"):
+        np.testing.assert_allclose(result.net_worth[band], [p["net_worth"] for p in projection], atol=0.02)
+        np.testing.assert_allclose(
+            result.liquid_net_worth[band], [p["liquid_net_worth"] for p in projection], atol=0.02
+        )
+
+
+def test_seed_makes_runs_reproducible() -> None:
+    compiled = compile_plan(PLAN, None, SETTINGS)
+
+    first = run_monte_carlo(compiled, _options())
+    second = run_monte_carlo(compiled, _options())
+    other = run_monte_carlo(compiled, _options(seed=7))
+
+    assert first == second
+    assert first.net_worth != other.net_worth
+
+
+def test_percentile_bands_are_ordered() -> None:
+    result = run_monte_carlo(compile_plan(PLAN, None, SETTINGS), _options())
+
+    bands = np.array([result.net_worth[f"p{p:g}"] for p in result.percentiles])
+    assert (np.diff(bands, axis=0) >= 0).all()
+    assert bands[0, -1] < bands[-1, -1]
+
+
+def test_probability_of_depletion() -> None:
+    compiled = compile_plan(DEPLETING_PLAN, None, SETTINGS)
+
+    deterministic = run_monte_carlo(compiled, _options(return_volatility=0, inflation_volatility=0))
+    volatile = run_monte_carlo(compiled, _options(return_volatility=20))
+
+    assert deterministic.probability_of_depletion == 0.0
+    assert 0.0 < volatile.probability_of_depletion < 1.0
+    assert volatile.depletion_probability_by_year[-1] == pytest.approx(volatile.probability_of_depletion)
+    assert np.all(np.diff(volatile.depletion_probability_by_year) >= 0)
+
+
+def test_tax_bracket_table_matches_scalar_calculator() -> None:
+    years = np.arange(2026, 2040)
+    table = TaxBracketTable.for_years(years)
+    incomes = np.array([0.0, 5000.0, 12000.0, 30000.0, 90000.0])
+
+    for i, year in enumerate(years):
+        expected = [calculate_marginal_tax(m, int(year)) for m in incomes]
+        np.testing.assert_allclose(table.monthly_tax(incomes, i), expected, rtol=1e-12)
+        additional = [calculate_tax_on_additional_income(m * 12, 50000.0, int(year)) for m in incomes]
+        np.testing.assert_allclose(
+            table.tax_on_additional_income(incomes * 12, np.full(len(incomes), 50000.0), i), additional, rtol=1e-12
+        )
+
+
+def test_ten_thousand_paths_within_budget() -> None:
+    compiled = compile_plan(PLAN, None, SETTINGS)
+    run_monte_carlo(compiled, _options(paths=100))
+
+    start = time.perf_counter()
+    result = run_monte_carlo(compiled, _options(paths=10_000))
+    elapsed = time.perf_counter() - start
+
+    assert result.paths == 10_000
+    assert elapsed < MONTE_CARLO_BUDGET_S, f"10k Monte Carlo paths took {elapsed:.2f}s"
+
+
+def test_simulate_endpoint_monte_carlo_mode(client) -> None:  # type: ignore[no-untyped-def]
+    payload = {"plan": DEPLETING_PLAN, "settings": SETTINGS, "monte_carlo": {"paths": 200, "seed": 3}}
+
+    response = client.post("/api/plans/simulate", json=payload)
+    again = client.post("/api/plans/simulate", json=payload)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body["net_worth"]) == {"p5", "p25", "p50", "p75", "p95"}
+    assert len(body["years"]) == len(body["net_worth"]["p50"]) == len(body["depletion_probability_by_year"])
+    assert 0.0 <= body["probability_of_depletion"] <= 1.0
+    assert again.json() == body
+
+    deterministic = client.post("/api/plans/simulate", json={"plan": DEPLETING_PLAN, "settings": SETTINGS})
+    assert isinstance(deterministic.json(), list)
@@ -7,12 +7,16 @@ Covers:
 - Retry-after-failure path (job re-runs after failure, succeeds)
 - Idempotency: re-running with same input produces same cooked output
 - Missing household_id raises ValueError
+- Incremental mode recomputes only days whose raw events changed
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
+from collections import Counter
 from contextlib import AbstractContextManager
-from datetime import date
+from datetime import date, datetime, timezone
 from decimal import Decimal
 from typing import Any
 
@@ -59,6 +63,8 @@ class FakeSession(AbstractContextManager["FakeSession"]):
         self.executions: list[dict[str, Any]] = []
         self.commits = 0
         self._run_id = _RUN_ID
+        self.stored_watermarks: list[dict[str, Any]] = []
+        self.stored_day_hashes: list[dict[str, Any]] = []
 
     def __enter__(self) -> "FakeSession":
         return self
@@ -74,9 +80,25 @@ class FakeSession(AbstractContextManager["FakeSession"]):
         if "insert into compute.pnl_runs" in sql:
             return FakeMappings([{"run_id": self._run_id}])
 
+        # Per-account watermark and per-(account, day) hash summaries of the raw rows
+        if "from raw.broker_trade_events" in sql and "max(_loaded_at)" in sql:
+            return FakeMappings(_account_summaries(self.raw_event_rows))
+        if "from raw.broker_trade_events" in sql and "content_hash" in sql:
+            return FakeMappings(_day_fingerprints(self.raw_event_rows))
+
+        # Stored incremental state, when a test seeds it
+        if "from compute.pnl_watermarks" in sql:
+            return FakeMappings(self.stored_watermarks)
+        if "from compute.pnl_day_hashes" in sql:
+            return FakeMappings(self.stored_day_hashes)
+
         # Return raw event rows on SELECT from raw.broker_trade_events
         if "from raw.broker_trade_events" in sql:
-            return FakeMappings(self.raw_event_rows)
+            days = (params or {}).get("days")
+            rows = self.raw_event_rows
+            if days is not None:
+                rows = [r for r in rows if str(r["trade_date"]) in days]
+            return FakeMappings(rows)
 
         return FakeMappings([])
 
@@ -89,14 +111,42 @@ class FakeSession(AbstractContextManager["FakeSession"]):
         raise NotImplementedError
 
 
+_LOADED_AT = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _account_summaries(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    counts = Counter(row.get("source_account_id") or "" for row in rows)
+    return [
+        {"account_id": account_id, "event_count": count, "loaded_through": _LOADED_AT}
+        for account_id, count in counts.items()
+    ]
+
+
+def _day_fingerprints(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    by_key: dict[tuple[str, date], list[str]] = {}
+    for row in rows:
+        key = (row.get("source_account_id") or "", row["trade_date"])
+        by_key.setdefault(key, []).append(f"{row['id']}|{row['side']}|{row['quantity']}|{row['price']}")
+    return [
+        {
+            "account_id": account_id,
+            "trade_date": trade_date,
+            "event_count": len(parts),
+            "content_hash": hashlib.md5(",".join(sorted(parts)).encode()).hexdigest(),
+        }
+        for (account_id, trade_date), parts in by_key.items()
+    ]
+
+
 def _make_trade_row(
     trade_date: date,
     side: str,
     quantity: str = "10",
     price: str = "100.0",
+    event_id: str = "00000000-0000-0000-0000-000000000001",
 ) -> dict[str, Any]:
     return {
-        "id": "00000000-0000-0000-0000-000000000001",
+        "id": event_id,
         "trade_date": trade_date,
         "symbol": "AAPL",
         "asset_category": "STK",
@@ -353,3 +403,115 @@ def test_handle_pnl_daily_idempotent_cooked_output() -> None:
     cooked_sql = [e["sql"] for e in s2.executions if "insert into cooked.daily_performance" in e["sql"]]
     assert len(cooked_sql) >= 1
     assert "on conflict" in cooked_sql[0]
+
+
+# ---------------------------------------------------------------------------
+# Incremental mode
+# ---------------------------------------------------------------------------
+
+
+def _seed_state_from(session: FakeSession, rows: list[dict[str, Any]]) -> None:
+    """Store watermarks / day hashes as a previous successful run over ``rows`` would."""
+
+    session.stored_watermarks = _account_summaries(rows)
+    session.stored_day_hashes = [
+        {"account_id": fp["account_id"], "date": fp["trade_date"], "content_hash": fp["content_hash"]}
+        for fp in _day_fingerprints(rows)
+    ]
+
+
+def test_incremental_run_skips_unchanged_accounts() -> None:
+    """With watermarks matching the raw table, nothing is hashed, read or published."""
+
+    raw_rows = [_make_trade_row(date(2025, 3, 10), "SELL"), _make_trade_row(date(2025, 3, 11), "BUY")]
+    session = FakeSession(raw_event_rows=raw_rows)
+    _seed_state_from(session, raw_rows)
+
+    result = handle_pnl_daily({"household_id": _HOUSEHOLD_ID}, session_factory=_session_factory(session))
+
+    assert result["mode"] == "incremental"
+    assert result["days_written"] == 0
+    assert result["raw_events"] == 0
+    sql_statements = [e["sql"] for e in session.executions]
+    assert not any("content_hash" in s and "from raw.broker_trade_events" in s for s in sql_statements)
+    assert not any("insert into cooked.daily_performance" in s for s in sql_statements)
+
+
+def test_incremental_run_recomputes_only_changed_days() -> None:
+    """An edited event and an appended event dirty just their own days; cooked is one upsert."""
+
+    day1, day2, day3 = date(2025, 3, 10), date(2025, 3, 11), date(2025, 3, 12)
+    before = [
+        _make_trade_row(day1, "SELL", event_id="e1"),
+        _make_trade_row(day2, "BUY", event_id="e2"),
+        _make_trade_row(day3, "SELL", event_id="e3"),
+    ]
+    after = [
+        before[0],
+        _make_trade_row(day2, "BUY", price="101.0", event_id="e2"),  # same count, edited price
+        before[2],
+        _make_trade_row(day3, "BUY", event_id="e4"),
+    ]
+    session = FakeSession(raw_event_rows=after)
+    _seed_state_from(session, before)
+
+    result = handle_pnl_daily({"household_id": _HOUSEHOLD_ID}, session_factory=_session_factory(session))
+
+    assert result["days_written"] == 2
+    assert result["raw_events"] == 3
+    cooked = [e for e in session.executions if "insert into cooked.daily_performance" in e["sql"]]
+    assert len(cooked) == 1
+    assert {row["date"] for row in json.loads(cooked[0]["params"]["rows"])} == {"2025-03-11", "2025-03-12"}
+    hashes = [e for e in session.executions if "insert into compute.pnl_day_hashes" in e["sql"]]
+    assert {row["date"] for row in json.loads(hashes[0]["params"]["rows"])} == {"2025-03-11", "2025-03-12"}
+    assert any("insert into compute.pnl_watermarks" in e["sql"] for e in session.executions)
+
+
+def test_incremental_run_deletes_days_without_events() -> None:
+    """A day whose events disappeared is removed from cooked.daily_performance."""
+
+    before = [_make_trade_row(date(2025, 3, 10), "SELL", event_id="e1"), _make_trade_row(date(2025, 3, 11), "BUY")]
+    session = FakeSession(raw_event_rows=before[:1])
+    _seed_state_from(session, before)
+
+    result = handle_pnl_daily({"household_id": _HOUSEHOLD_ID}, session_factory=_session_factory(session))
+
+    assert result["days_written"] == 0
+    assert result["days_deleted"] == 1
+    deletes = [e for e in session.executions if "delete from cooked.daily_performance" in e["sql"]]
+    assert deletes[0]["params"]["days"] == ["2025-03-11"]
+
+
+def test_full_mode_rebuilds_every_day_and_resets_state() -> None:
+    """mode=full ignores stored hashes and republishes the whole history."""
+
+    raw_rows = [_make_trade_row(date(2025, 3, 10), "SELL"), _make_trade_row(date(2025, 3, 11), "BUY")]
+    session = FakeSession(raw_event_rows=raw_rows)
+    _seed_state_from(session, raw_rows)
+
+    result = handle_pnl_daily(
+        {"household_id": _HOUSEHOLD_ID, "mode": "full"}, session_factory=_session_factory(session)
+    )
+
+    assert result["mode"] == "full"
+    assert result["days_written"] == 2
+    assert result["raw_events"] == 2
+    sql_statements = [e["sql"] for e in session.executions]
+    assert any("delete from compute.pnl_day_hashes" in s for s in sql_statements)
+    assert any("delete from compute.pnl_watermarks" in s for s in sql_statements)
+
+
+def test_handle_pnl_daily_rejects_unknown_mode() -> None:
+    with pytest.raises(ValueError, match="mode"):
+        handle_pnl_daily(
+            {"household_id": _HOUSEHOLD_ID, "mode": "sometimes"}, session_factory=_session_factory(FakeSession())
+        )
+
+
+def test_input_hash_changes_with_watermarks() -> None:
+    """A re-imported event moves the watermark and the input hash even at equal counts."""
+
+    h1 = _input_hash(_HOUSEHOLD_ID, None, None, 10, watermarks=["U1:10:2025-01-01"])
+    h2 = _input_hash(_HOUSEHOLD_ID, None, None, 10, watermarks=["U1:10:2025-01-02"])
+    assert h1 != h2
+    assert _input_hash(_HOUSEHOLD_ID, None, None, 10) == _input_hash(_HOUSEHOLD_ID, None, None, 10, watermarks=[])
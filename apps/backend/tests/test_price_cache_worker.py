@@ -3,12 +3,22 @@
 from __future__ import annotations
 
 from contextlib import AbstractContextManager
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
+import json
 from decimal import Decimal
 from typing import Any
 from unittest.mock import MagicMock, patch
 
-from app.services.price_cache import PriceCacheRefresher, PriceQuote, _yfinance_yield_to_percent
+import pandas as pd
+
+from app.services.price_cache import (
+    CachedPriceState,
+    PriceCacheRefresher,
+    PriceQuote,
+    _yfinance_yield_to_percent,
+    lookup_cached_price_data_many,
+    staleness_tier,
+)
 from app.worker.registry import JOB_SCHEDULES
 from app.worker.runtime import start_worker  # noqa: F401 - imports schedule registration
 
@@ -28,8 +38,9 @@ class FakeMappings:
 class FakeSession(AbstractContextManager["FakeSession"]):
     """Minimal SQLAlchemy session fake for refresh assertions."""
 
-    def __init__(self, rows: list[dict[str, Any]]) -> None:
+    def __init__(self, rows: list[dict[str, Any]], cache_rows: list[dict[str, Any]] | None = None) -> None:
         self.rows = rows
+        self.cache_rows = cache_rows or []
         self.executions: list[dict[str, Any]] = []
         self.commits = 0
         self.rollbacks = 0
@@ -45,15 +56,17 @@ class FakeSession(AbstractContextManager["FakeSession"]):
         self.executions.append({"sql": sql, "params": params or {}})
         if "with referenced_symbols as" in sql:
             return FakeMappings(self.rows)
+        if "from public.price_cache" in sql.lower():
+            return FakeMappings(self.cache_rows)
         return FakeMappings([])
 
     def commit(self) -> None:
-        """Record a successful per-symbol commit."""
+        """Record a successful cycle commit."""
 
         self.commits += 1
 
     def rollback(self) -> None:
-        """Record isolated per-symbol failure rollback."""
+        """Record a failed cycle rollback."""
 
         self.rollbacks += 1
 
@@ -90,19 +103,19 @@ def test_price_refresher_fetches_and_upserts_symbols() -> None:
 
     result = refresher.refresh_once()
 
-    assert result == {"symbols": 2, "refreshed": 2, "failed": 0}
-    assert seen_symbols == ["AAPL", "MSFT"]
+    assert result == {"symbols": 2, "refreshed": 2, "failed": 0, "skipped": 0}
+    assert sorted(seen_symbols) == ["AAPL", "MSFT"]
     upserts = [call for call in session.executions if "insert into public.price_cache" in call["sql"]]
-    assert len(upserts) == 2
-    assert upserts[0]["params"] == {
+    assert len(upserts) == 1
+    assert json.loads(upserts[0]["params"]["quotes"])[0] == {
         "symbol": "AAPL",
         "currency": "USD",
-        "price": Decimal("123.45"),
-        "as_of": datetime(2026, 5, 3, 12, tzinfo=UTC),
+        "price": "123.45",
+        "as_of": "2026-05-03T12:00:00+00:00",
         "dividend_yield": None,
     }
     assert "on conflict (symbol, currency) do update" in upserts[0]["sql"]
-    assert session.commits == 2
+    assert session.commits == 1
 
 
 def test_price_refresher_continues_after_symbol_failure() -> None:
@@ -129,10 +142,142 @@ def test_price_refresher_continues_after_symbol_failure() -> None:
 
     result = refresher.refresh_once()
 
-    assert result == {"symbols": 2, "refreshed": 1, "failed": 1}
-    assert session.rollbacks == 1
+    assert result == {"symbols": 2, "refreshed": 1, "failed": 1, "skipped": 0}
+    assert session.rollbacks == 0
     assert session.commits == 1
-    assert any(call["params"].get("symbol") == "GOOD" for call in session.executions)
+    upsert = next(call for call in session.executions if "insert into public.price_cache" in call["sql"])
+    assert [quote["symbol"] for quote in json.loads(upsert["params"]["quotes"])] == ["GOOD"]
+
+
+# Wednesday 2026-10-14 15:00 UTC is 11:00 in New York (NYSE open).
+_MARKET_OPEN = datetime(2026, 10, 14, 15, tzinfo=UTC)
+# Saturday — every configured market is closed.
+_WEEKEND = datetime(2026, 10, 17, 12, tzinfo=UTC)
+
+
+def _state(refreshed_at: datetime, unchanged: int = 0, currency: str = "USD") -> CachedPriceState:
+    return CachedPriceState(symbol="X", currency=currency, refreshed_at=refreshed_at, unchanged_refreshes=unchanged)
+
+
+def test_staleness_tier_open_market_refreshes_every_cycle() -> None:
+    assert staleness_tier(None, _MARKET_OPEN) == ("new", True)
+    assert staleness_tier(_state(_MARKET_OPEN - timedelta(hours=1)), _MARKET_OPEN) == ("open", True)
+    assert staleness_tier(_state(_MARKET_OPEN - timedelta(minutes=10)), _MARKET_OPEN) == ("open", False)
+
+
+def test_staleness_tier_backs_off_quiet_symbols() -> None:
+    """A price that has not moved for several refreshes is refreshed every few hours."""
+
+    assert staleness_tier(_state(_MARKET_OPEN - timedelta(hours=1), unchanged=3), _MARKET_OPEN) == ("quiet", False)
+    assert staleness_tier(_state(_MARKET_OPEN - timedelta(hours=7), unchanged=3), _MARKET_OPEN) == ("quiet", True)
+
+
+def test_staleness_tier_closed_market_refreshes_once_after_close() -> None:
+    """Friday's close is picked up once; the weekend then skips the symbol."""
+
+    friday_close = datetime(2026, 10, 16, 20, tzinfo=UTC)  # 16:00 New York
+    assert staleness_tier(_state(friday_close - timedelta(minutes=30)), _WEEKEND) == ("closed", True)
+    assert staleness_tier(_state(friday_close + timedelta(hours=1)), _WEEKEND) == ("closed", False)
+    assert staleness_tier(_state(_WEEKEND - timedelta(hours=25)), _WEEKEND) == ("closed", True)
+
+
+def test_staleness_tier_unknown_currency_ignores_market_hours() -> None:
+    assert staleness_tier(_state(_WEEKEND - timedelta(hours=1), currency="XYZ"), _WEEKEND) == ("open", True)
+
+
+def test_price_refresher_skips_fresh_symbols_and_batches_the_rest() -> None:
+    """Only due symbols reach the batch fetcher, in a single call."""
+
+    session = FakeSession(
+        [
+            {"symbol": "aapl", "currency": "USD"},
+            {"symbol": "msft", "currency": "USD"},
+            {"symbol": "new", "currency": "USD"},
+        ],
+        cache_rows=[
+            {
+                "symbol": "AAPL",
+                "currency": "USD",
+                "refreshed_at": _MARKET_OPEN - timedelta(minutes=5),
+                "unchanged_refreshes": 0,
+            },
+            {
+                "symbol": "MSFT",
+                "currency": "USD",
+                "refreshed_at": _MARKET_OPEN - timedelta(hours=2),
+                "unchanged_refreshes": 0,
+            },
+        ],
+    )
+    batches: list[list[str]] = []
+
+    def batch_fetcher(symbols: list[str]) -> dict[str, PriceQuote]:
+        batches.append(list(symbols))
+        return {s: PriceQuote(symbol=s, currency="USD", price=Decimal("1.5"), as_of=_MARKET_OPEN) for s in symbols}
+
+    refresher = PriceCacheRefresher(
+        session_factory=lambda: session, batch_fetcher=batch_fetcher, clock=lambda: _MARKET_OPEN
+    )
+
+    result = refresher.refresh_once()
+
+    assert result == {"symbols": 3, "refreshed": 2, "failed": 0, "skipped": 1}
+    assert batches == [["MSFT", "NEW"]]
+    assert sum("insert into public.price_cache" in call["sql"] for call in session.executions) == 1
+
+
+def test_fetch_external_prices_downloads_prices_in_one_call() -> None:
+    """Prices come from one multi-ticker download; metadata lookups reuse them."""
+
+    from app.services.price_cache import fetch_external_prices
+
+    index = pd.to_datetime(["2026-10-13", "2026-10-14"])
+    frame = pd.concat(
+        {
+            "AAPL": pd.DataFrame({"Close": [200.0, 201.5]}, index=index),
+            "MSFT": pd.DataFrame({"Close": [410.0, float("nan")]}, index=index),
+        },
+        axis=1,
+    )
+
+    def make_ticker(symbol: str) -> MagicMock:
+        ticker = MagicMock()
+        ticker.fast_info.last_price = 999.0
+        ticker.fast_info.currency = "USD"
+        ticker.info = {"trailingAnnualDividendYield": 0.005}
+        return ticker
+
+    with patch("yfinance.download", return_value=frame) as download, patch("yfinance.Ticker", side_effect=make_ticker):
+        quotes = fetch_external_prices(["aapl", "msft"])
+
+    download.assert_called_once()
+    assert download.call_args.args[0] == ["AAPL", "MSFT"]
+    assert quotes["AAPL"].price == Decimal("201.5")
+    assert quotes["MSFT"].price == Decimal("410.0")
+    assert quotes["AAPL"].dividend_yield == Decimal("0.5")
+
+
+def test_lookup_cached_price_data_many_reads_all_symbols_in_one_query() -> None:
+    session = FakeSession(
+        [],
+        cache_rows=[
+            {
+                "symbol": "MSFT",
+                "currency": "USD",
+                "price": "410.5",
+                "dividend_yield": "0.87",
+                "refreshed_at": _MARKET_OPEN,
+            },
+            {"symbol": "WIX", "currency": "USD", "price": "150", "dividend_yield": None, "refreshed_at": _MARKET_OPEN},
+        ],
+    )
+
+    result = lookup_cached_price_data_many(["msft", "wix", "msft"], "usd", session)  # type: ignore[arg-type]
+
+    assert set(result) == {"MSFT", "WIX"}
+    assert result["MSFT"].dividend_yield == Decimal("0.87")
+    assert len(session.executions) == 1
+    assert session.executions[0]["params"] == {"symbols": ["MSFT", "WIX"], "currency": "USD"}
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,198 @@
+"""Verified-token and household caches behind request authentication."""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from sqlmodel import Session
+
+from app.dal.notifications import NotificationListener, direct_listen_connection
+from app.dependencies import get_current_user, get_current_user_optional, get_request_context
+from app.request_context import (
+    HouseholdCache,
+    VerifiedTokenCache,
+    household_cache,
+    household_membership_listener,
+    invalidate_household_membership,
+)
+from app.schema.household_models import Household, HouseholdMember
+from app.services.household_service import get_user_household_id
+from app.supabase_auth import SupabaseAuthSettings, SupabaseClaims
+from conftest import TEST_HOUSEHOLD_ID, TEST_USER_ID
+
+_SETTINGS = SupabaseAuthSettings(supabase_url="https://test.supabase.co")
+
+
+def _claims(exp: int | None = None, sub: UUID | None = None) -> SupabaseClaims:
+    return SupabaseClaims(
+        sub=sub or uuid4(), role="authenticated", aud="authenticated", exp=exp or int(time.time()) + 3600
+    )
+
+
+def _request(token: str) -> MagicMock:
+    request = MagicMock()
+    request.headers = {"Authorization": f"Bearer {token}"}
+    request.url.path = "/test"
+    request.method = "GET"
+    return request
+
+
+async def test_each_token_is_verified_once_per_process() -> None:
+    claims = _claims()
+    verify = AsyncMock(return_value=claims)
+    with patch("app.dependencies.verify_supabase_jwt", verify):
+        for _ in range(12):
+            assert await get_current_user(_request("token-a"), _SETTINGS) == claims
+        assert await get_current_user_optional(_request("token-a"), _SETTINGS) == claims
+        await get_current_user(_request("token-b"), _SETTINGS)
+
+    assert [call.args[0] for call in verify.await_args_list] == ["token-a", "token-b"]
+
+
+async def test_failed_verifications_are_not_cached() -> None:
+    verify = AsyncMock(side_effect=HTTPException(status_code=401, detail="Invalid or expired token"))
+    with patch("app.dependencies.verify_supabase_jwt", verify):
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                await get_current_user(_request("bad-token"), _SETTINGS)
+            assert await get_current_user_optional(_request("bad-token"), _SETTINGS) is None
+
+    assert verify.await_count == 4
+
+
+def test_token_cache_expires_entries_and_evicts_least_recently_used() -> None:
+    cache = VerifiedTokenCache(maxsize=2)
+    cache.put("expired", _claims(exp=int(time.time()) - 1))
+    assert cache.get("expired") is None
+
+    first, second, third = _claims(), _claims(), _claims()
+    cache.put("first", first)
+    cache.put("second", second)
+    assert cache.get("first") == first
+    cache.put("third", third)
+
+    assert (cache.get("first"), cache.get("second"), cache.get("third")) == (first, None, third)
+    assert len(cache) == 2
+
+
+def test_household_membership_is_cached_until_invalidated(session: Session) -> None:
+    assert get_user_household_id(session, TEST_USER_ID) == TEST_HOUSEHOLD_ID
+    member = session.get(HouseholdMember, (TEST_HOUSEHOLD_ID, TEST_USER_ID))
+    member.left_at = date.today()
+    session.add(member)
+    new_household = Household(id=uuid4(), name="New", created_by=TEST_USER_ID)
+    session.add(new_household)
+    session.add(
+        HouseholdMember(household_id=new_household.id, user_id=TEST_USER_ID, role="owner", invited_by=TEST_USER_ID)
+    )
+    session.commit()
+
+    assert get_user_household_id(session, TEST_USER_ID) == TEST_HOUSEHOLD_ID
+    invalidate_household_membership(TEST_USER_ID)
+    assert get_user_household_id(session, TEST_USER_ID) == new_household.id
+
+
+def test_membership_notifications_invalidate_the_notified_user() -> None:
+    listener = household_membership_listener(connect=lambda: None)
+    changed, unchanged = uuid4(), uuid4()
+    household_cache.put(changed, TEST_HOUSEHOLD_ID)
+    household_cache.put(unchanged, TEST_HOUSEHOLD_ID)
+
+    assert listener.channel == "household_members"
+    listener.on_notify(str(changed))
+    assert (household_cache.get(changed), household_cache.get(unchanged)) == (None, TEST_HOUSEHOLD_ID)
+
+    listener.on_notify("not-a-uuid")
+    assert household_cache.get(unchanged) is None
+
+    household_cache.put(unchanged, TEST_HOUSEHOLD_ID)
+    listener.on_connect()  # changes made while disconnected were missed
+    assert household_cache.get(unchanged) is None
+
+
+def test_direct_listen_connection_returns_an_open_detached_connection(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = create_engine("sqlite://", poolclass=QueuePool)
+    monkeypatch.setattr("app.dal.database.direct_engine", engine)
+
+    connection = direct_listen_connection()
+    try:
+        assert connection is not None
+        assert connection.execute("select 1").fetchone() == (1,)
+        assert engine.pool.checkedout() == 0  # detached: never returned to the pool
+    finally:
+        connection.close()
+
+
+def test_listener_retries_when_connect_returns_nothing() -> None:
+    attempts = threading.Semaphore(0)
+
+    def connect() -> None:
+        attempts.release()
+
+    listener = NotificationListener(
+        "household_members", on_notify=lambda _: None, connect=connect, reconnect_seconds=0.01
+    )
+    listener.start()
+    try:
+        assert attempts.acquire(timeout=2.0) and attempts.acquire(timeout=2.0)
+    finally:
+        listener.stop(timeout=2.0)
+    assert listener._thread is not None and not listener._thread.is_alive()
+
+
+@pytest.mark.integration
+def test_membership_listener_invalidates_on_postgres_notify(postgres_direct_engine: Engine) -> None:
+    connected = threading.Event()
+    listener = household_membership_listener()
+    invalidate_all = listener.on_connect
+
+    def on_connect() -> None:
+        invalidate_all()
+        connected.set()
+
+    listener.on_connect = on_connect
+    changed = uuid4()
+    listener.start()
+    try:
+        assert connected.wait(5.0), "listener should LISTEN over the real direct connection"
+        household_cache.put(changed, TEST_HOUSEHOLD_ID)
+        with postgres_direct_engine.begin() as conn:
+            conn.execute(text("select pg_notify('household_members', :user_id)"), {"user_id": str(changed)})
+        deadline = time.monotonic() + 5.0
+        while household_cache.get(changed) is not None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert household_cache.get(changed) is None
+    finally:
+        listener.stop(timeout=5.0)
+
+
+def test_users_without_a_household_are_not_cached(session: Session) -> None:
+    stranger = uuid4()
+    assert get_user_household_id(session, stranger) is None
+    assert household_cache.get(stranger) is None
+
+
+def test_household_cache_entries_expire() -> None:
+    cache = HouseholdCache(ttl_seconds=0.01)
+    user_id, household_id = uuid4(), uuid4()
+    cache.put(user_id, household_id)
+    assert cache.get(user_id) == household_id
+    time.sleep(0.02)
+    assert cache.get(user_id) is None
+
+
+def test_request_context_carries_claims_and_household(session: Session) -> None:
+    claims = _claims(sub=TEST_USER_ID)
+
+    context = get_request_context(claims, session)
+
+    assert (context.claims, context.user_id, context.household_id) == (claims, TEST_USER_ID, TEST_HOUSEHOLD_ID)
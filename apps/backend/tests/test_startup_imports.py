@@ -0,0 +1,107 @@
+"""Import-time budget for the API process and lazily loaded routers."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.dependencies import get_current_user_optional
+from app.middleware.lazy_routers import LazyRouterMiddleware, LazyRouterRegistry
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+STARTUP_IMPORT_BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "2500"))
+HEAVY_MODULES = ("copilot", "scipy", "yfinance", "pandas", "ib_async", "openpyxl", "grpc")
+
+_IMPORT_MAIN = f"""
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed_ms, "heavy": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def _import_main() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _IMPORT_MAIN], cwd=BACKEND_ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(not os.getenv("RUN_SLOW_TESTS"), reason="Set RUN_SLOW_TESTS=1 to check the import-time budget")
+def test_importing_main_stays_within_budget_and_skips_heavy_dependencies() -> None:
+    runs = [_import_main() for _ in range(2)]
+
+    assert runs[0]["heavy"] == []
+    best_ms = min(run["ms"] for run in runs)
+    assert best_ms < STARTUP_IMPORT_BUDGET_MS, (
+        f"import main took {best_ms:.0f}ms >= {STARTUP_IMPORT_BUDGET_MS:.0f}ms; "
+        "run scripts/profile_imports.py to find the new heavy import"
+    )
+
+
+def _metrics_app() -> tuple[FastAPI, LazyRouterRegistry]:
+    app = FastAPI()
+    registry = LazyRouterRegistry(app)
+    registry.add("app.api.metrics", path_prefixes=["/api/metrics/"])
+    app.add_middleware(LazyRouterMiddleware, registry=registry)
+    app.dependency_overrides[get_current_user_optional] = lambda: None
+    return app, registry
+
+
+def test_lazy_router_is_included_on_first_matching_request() -> None:
+    app, registry = _metrics_app()
+    client = TestClient(app)
+
+    assert client.get("/api/other").status_code == 404
+    assert registry.pending == ["app.api.metrics"]
+
+    response = client.post("/api/metrics/page-load", json={"path": "/plan", "ttfb_ms": 120})
+
+    assert response.status_code == 200
+    assert registry.pending == []
+
+
+def test_warmup_loads_pending_routers_in_the_background() -> None:
+    app, registry = _metrics_app()
+
+    registry.start_warmup().join(timeout=30)
+
+    assert registry.pending == []
+    assert registry.start_warmup() is None
+    assert any(getattr(route, "path", "") == "/api/metrics/page-load" for route in app.routes)
+
+
+def test_main_openapi_includes_every_lazy_router_under_its_prefixes() -> None:
+    from main import app, lazy_routers
+
+    paths = app.openapi()["paths"]
+
+    assert lazy_routers.pending == []
+    assert any(path.startswith("/api/pension/") for path in paths)
+    for router in lazy_routers._routers:
+        served = [
+            route.path
+            for route in app.routes
+            if getattr(getattr(route, "endpoint", None), "__module__", None) == router.module
+        ]
+        assert served, router.module
+        assert all(router.serves(path) for path in served), router.module
+
+    lazy_modules = {router.module for router in lazy_routers._routers}
+    eager_paths = [
+        route.path
+        for route in app.routes
+        if getattr(getattr(route, "endpoint", None), "__module__", None) not in lazy_modules
+    ]
+    for router in lazy_routers._routers:
+        shadowed = [path for path in eager_paths if router.serves(path)]
+        assert shadowed == [], f"{router.module} prefixes also match eager routes {shadowed}"
@@ -0,0 +1,113 @@
+"""
+Equivalence tests: vectorized technicals engine vs. the reference list functions.
+
+Random-walk price histories (several tickers, ~10 years of daily closes) are
+run through both implementations.  The reference rounds every intermediate
+EMA to 4 decimals and RSI to 2; tolerances below cover that rounding only.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from app.services.analysis import technicals_engine as engine
+from app.services.analysis.technicals import (
+    calculate_bollinger_bands,
+    calculate_ema,
+    calculate_macd,
+    calculate_rsi,
+    detect_support_resistance,
+)
+
+N_DAYS = 2520
+HALF_ULP_4DP = 5e-5  # worst-case error of one round(x, 4)
+
+
+def _ema_rounding_bound(period: int) -> float:
+    """Worst-case accumulated rounding of the reference EMA: each step adds at
+    most HALF_ULP_4DP, decayed by (1 - k) per step → HALF_ULP_4DP / k."""
+    return HALF_ULP_4DP * (period + 1) / 2 + HALF_ULP_4DP
+
+
+@pytest.fixture(scope="module")
+def histories() -> np.ndarray:
+    """Four tickers of daily closes, rounded to cents like real quotes."""
+    rng = np.random.default_rng(42)
+    returns = rng.normal(0.0003, 0.015, size=(4, N_DAYS))
+    start = np.array([[12.0], [95.0], [310.0], [2400.0]])
+    return np.round(start * np.exp(np.cumsum(returns, axis=1)), 2)
+
+
+def _assert_matches(reference, values, atol):
+    reference = np.array(reference, dtype=float)
+    assert reference.shape == values.shape
+    np.testing.assert_array_equal(np.isnan(reference), np.isnan(values))
+    np.testing.assert_allclose(values, reference, rtol=0, atol=atol, equal_nan=True)
+
+
+class TestEquivalence:
+    @pytest.mark.parametrize("period", [1, 12, 50, 200])
+    def test_ema(self, histories, period):
+        result = engine.ema(histories, period)
+        for row, values in zip(histories, result):
+            _assert_matches(calculate_ema(row.tolist(), period), values, atol=_ema_rounding_bound(period))
+
+    def test_bollinger_bands(self, histories):
+        upper, middle, lower = engine.bollinger_bands(histories, 20, 2.0)
+        for i, row in enumerate(histories):
+            bb = calculate_bollinger_bands(row.tolist(), 20, 2.0)
+            _assert_matches(bb.upper, upper[i], atol=1e-4)
+            _assert_matches(bb.middle, middle[i], atol=1e-4)
+            _assert_matches(bb.lower, lower[i], atol=1e-4)
+
+    def test_rsi(self, histories):
+        result = engine.rsi(histories, 14)
+        for row, values in zip(histories, result):
+            _assert_matches(calculate_rsi(row.tolist(), 14), values, atol=0.005 + 1e-9)
+
+    def test_macd(self, histories):
+        line, signal, histogram = engine.macd(histories)
+        atol = _ema_rounding_bound(12) + _ema_rounding_bound(26) + _ema_rounding_bound(9) + 2 * HALF_ULP_4DP
+        for i, row in enumerate(histories):
+            ref = calculate_macd(row.tolist())
+            _assert_matches(ref.macd_line, line[i], atol=atol)
+            _assert_matches(ref.signal_line, signal[i], atol=atol)
+            _assert_matches(ref.histogram, histogram[i], atol=atol)
+
+    @pytest.mark.parametrize("window", [3, 5, 10])
+    def test_support_resistance(self, histories, window):
+        levels = engine.support_resistance(histories, window=window)
+        for row, row_levels in zip(histories, levels):
+            assert row_levels == detect_support_resistance(row.tolist(), window=window)
+
+    def test_one_dimensional_input_matches_row(self, histories):
+        np.testing.assert_array_equal(engine.rsi(histories[1]), engine.rsi(histories)[1])
+        assert engine.support_resistance(histories[1]) == engine.support_resistance(histories)[1:2]
+
+
+class TestEdgeCases:
+    def test_short_series_is_all_nan(self):
+        prices = [10.0, 11.0, 12.0]
+        assert np.isnan(engine.ema(prices, 5)).all()
+        assert np.isnan(engine.rsi(prices, 14)).all()
+        assert all(np.isnan(band).all() for band in engine.bollinger_bands(prices, 20))
+        assert all(np.isnan(part).all() for part in engine.macd(prices))
+        assert engine.support_resistance(prices) == [[]]
+
+    def test_flat_prices(self):
+        prices = [50.0] * 30
+        rsi = engine.rsi(prices, 14)
+        assert (rsi[14:] == 100.0).all()
+        upper, middle, lower = engine.bollinger_bands(prices, 20)
+        assert upper[-1] == middle[-1] == lower[-1] == 50.0
+        assert engine.support_resistance(prices, window=3) == [detect_support_resistance(prices, window=3)]
+
+    def test_invalid_period(self):
+        with pytest.raises(ValueError):
+            engine.ema([1.0, 2.0], 0)
+
+    def test_rolling_std_matches_numpy(self, histories):
+        _, std = engine.rolling_mean_std(histories[3], 30)
+        window = histories[3][-30:]
+        assert math.isclose(std[-1], float(np.std(window)), rel_tol=1e-9)
@@ -3,11 +3,20 @@
 from __future__ import annotations
 
 from contextlib import AbstractContextManager
+import json
+import socket
+import threading
+import time
 from types import TracebackType
 from typing import Any
 from uuid import UUID
 
-from app.worker.job_queue import JobQueuePoller
+import pytest
+from psycopg2.extensions import Notify
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.worker.job_queue import ComputeJob, JobNotificationListener, JobQueuePoller, JobWorkerPool
 
 
 class FakeMappings:
@@ -34,6 +43,7 @@ class FakeSession(AbstractContextManager["FakeSession"]):
         self.rows = rows
         self.executions: list[dict[str, Any]] = []
         self.committed = False
+        self.commits = 0
 
     def __enter__(self) -> "FakeSession":
         return self
@@ -57,6 +67,7 @@ class FakeSession(AbstractContextManager["FakeSession"]):
         """Record that the poller committed its batch."""
 
         self.committed = True
+        self.commits += 1
 
 
 def test_poller_dispatches_handler_and_marks_done() -> None:
@@ -205,3 +216,286 @@ def test_poller_reclaims_stale_running_jobs() -> None:
         c for c in session.executions if "next_retry_at = now()" in c["sql"] and "status = 'pending'" in c["sql"]
     ]
     assert len(reclaim_calls) == 1, "Expected exactly one stale-running reclaim UPDATE"
+
+
+def _job(job_type: str, number: int) -> ComputeJob:
+    return ComputeJob(
+        id=UUID(int=number),
+        household_id=UUID("10000000-0000-0000-0000-000000000001"),
+        job_type=job_type,
+        payload={},
+        attempts=0,
+    )
+
+
+def test_poller_commits_claim_and_each_job_separately() -> None:
+    """A failing job's outcome is committed on its own, apart from its neighbours."""
+
+    rows = [
+        {"id": UUID(int=n), "household_id": UUID(int=100), "job_type": "fake", "payload": {"n": n}, "attempts": 0}
+        for n in range(3)
+    ]
+    claim_session = FakeSession(rows)
+    job_sessions: list[FakeSession] = []
+
+    def session_factory() -> FakeSession:
+        if not claim_session.committed:
+            return claim_session
+        job_sessions.append(FakeSession([]))
+        return job_sessions[-1]
+
+    def handler(payload: dict[str, object]) -> dict[str, object]:
+        if payload["n"] == 1:
+            raise RuntimeError("boom")
+        return {"n": payload["n"]}
+
+    poller = JobQueuePoller(handlers={"fake": handler}, session_factory=session_factory)
+
+    assert poller.poll_once() == 3
+    assert claim_session.commits == 1
+    assert [session.commits for session in job_sessions] == [1, 1, 1]
+    statuses = [session.executions[-1]["sql"] for session in job_sessions]
+    assert "status = 'done'" in statuses[0] and "status = 'done'" in statuses[2]
+    assert job_sessions[1].executions[-1]["params"]["status"] == "pending"
+
+
+def test_claim_passes_limit_and_type_slots() -> None:
+    """Per-type free slots are bound into the claim query as JSON."""
+
+    session = FakeSession([])
+    poller = JobQueuePoller(handlers={}, session_factory=lambda: session)
+
+    poller.claim_jobs(limit=3, type_slots={"backtest": 0, "pnl_daily": 2})
+
+    claim = next(call for call in session.executions if "for update skip locked" in call["sql"])
+    assert claim["params"]["batch_size"] == 3
+    assert json.loads(claim["params"]["type_slots"]) == {"backtest": 0, "pnl_daily": 2}
+
+
+class FakePoller:
+    """Records claim arguments and returns queued jobs."""
+
+    def __init__(self, jobs: list[ComputeJob]) -> None:
+        self.jobs = jobs
+        self.claims: list[tuple[int | None, dict[str, int]]] = []
+        self.ran: list[ComputeJob] = []
+
+    def claim_jobs(self, limit: int | None = None, type_slots: dict[str, int] | None = None) -> list[ComputeJob]:
+        self.claims.append((limit, dict(type_slots or {})))
+        claimed, self.jobs = self.jobs[: limit or 0], self.jobs[limit or 0 :]
+        return claimed
+
+    def run_job(self, job: ComputeJob) -> None:
+        self.ran.append(job)
+
+
+def test_pool_claims_only_free_slots_per_job_type() -> None:
+    """In-flight jobs reduce both overall capacity and their type's slots."""
+
+    poller = FakePoller([_job("pnl_daily", n) for n in range(5)])
+    pool = JobWorkerPool(poller, max_workers=4, type_limits={"backtest": 1}, listen=False)  # type: ignore[arg-type]
+    pool._in_flight.update({"backtest": 1, "pnl_daily": 1})
+
+    assert pool.dispatch_once() == 2
+    assert poller.claims == [(2, {"backtest": 0})]
+    assert [job.id.int for job in poller.ran] == [0, 1]
+    assert pool.stats() == {"in_flight": {"backtest": 1, "pnl_daily": 1}, "started": 2, "finished": 2}
+
+
+def test_pool_skips_claim_when_saturated() -> None:
+    poller = FakePoller([_job("pnl_daily", 0)])
+    pool = JobWorkerPool(poller, max_workers=1, type_limits={}, listen=False)  # type: ignore[arg-type]
+    pool._in_flight["backtest"] = 1
+
+    assert pool.dispatch_once() == 0
+    assert poller.claims == []
+
+
+class FakeListenConnection:
+    """psycopg2-like connection whose socket becomes readable on notify."""
+
+    def __init__(self) -> None:
+        self._read, self._write = socket.socketpair()
+        self.autocommit = False
+        self.executed: list[str] = []
+        self.notifies: list[Notify] = []
+        self._pending: list[str] = []
+        self.closed = False
+
+    def fileno(self) -> int:
+        return self._read.fileno()
+
+    def cursor(self) -> FakeListenConnection:
+        return self
+
+    def __enter__(self) -> FakeListenConnection:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        return None
+
+    def execute(self, sql: str) -> None:
+        self.executed.append(sql)
+
+    def notify(self, payload: str) -> None:
+        self._pending.append(payload)
+        self._write.send(b"x")
+
+    def poll(self) -> None:
+        self._read.recv(64)
+        while self._pending:
+            self.notifies.append(Notify(0, "compute_jobs", self._pending.pop(0)))
+
+    def close(self) -> None:
+        self.closed = True
+        self._read.close()
+        self._write.close()
+
+
+def test_listener_sets_wake_event_on_notify() -> None:
+    """LISTEN is issued on an autocommit connection and each NOTIFY wakes the pool."""
+
+    wake = threading.Event()
+    connection = FakeListenConnection()
+    listener = JobNotificationListener(wake, connect=lambda: connection)
+    listener.start()
+    try:
+        assert wake.wait(2.0), "listener should wake once after (re)connecting"
+        wake.clear()
+        connection.notify("pnl_daily")
+        assert wake.wait(2.0)
+    finally:
+        listener.stop(timeout=5.0)
+
+    assert connection.autocommit is True
+    assert connection.executed == ["LISTEN compute_jobs"]
+    assert connection.notifies == []
+    assert connection.closed
+
+
+class TimedPoller(FakePoller):
+    """FakePoller that timestamps each claim and satisfies the lease heartbeat."""
+
+    lease_seconds = 120.0
+
+    def __init__(self) -> None:
+        super().__init__([])
+        self.claimed = threading.Condition()
+        self.claim_times: list[float] = []
+
+    def claim_jobs(self, limit: int | None = None, type_slots: dict[str, int] | None = None) -> list[ComputeJob]:
+        with self.claimed:
+            self.claim_times.append(time.monotonic())
+            self.claimed.notify_all()
+        return super().claim_jobs(limit, type_slots)
+
+    def renew_leases(self) -> None:
+        return None
+
+    def wait_for_claims(self, count: int, timeout: float) -> bool:
+        with self.claimed:
+            return self.claimed.wait_for(lambda: len(self.claim_times) >= count, timeout)
+
+
+@pytest.mark.integration
+def test_postgres_notify_wakes_waiting_pool_before_poll_interval(postgres_direct_engine: Engine) -> None:
+    """A NOTIFY on the real direct connection triggers a claim long before the next poll."""
+
+    poll_interval = 30.0
+    poller = TimedPoller()
+    pool = JobWorkerPool(poller, max_workers=1, type_limits={}, poll_interval=poll_interval)  # type: ignore[arg-type]
+    pool.start()
+    try:
+        # One claim at startup and one when the listener connects; then the pool waits.
+        assert poller.wait_for_claims(2, timeout=10.0), "listener never connected to Postgres"
+        time.sleep(0.5)
+        settled = len(poller.claim_times)
+        sent_at = time.monotonic()
+        with postgres_direct_engine.begin() as conn:
+            conn.execute(text("select pg_notify('compute_jobs', 'pnl_daily')"))
+
+        assert poller.wait_for_claims(settled + 1, timeout=5.0)
+        assert poller.claim_times[settled] - sent_at < poll_interval / 10
+    finally:
+        pool.stop()
+
+
+class LeaseTable:
+    """In-memory compute_jobs rows applying the claim/renew/reclaim/finalize SQL semantics."""
+
+    def __init__(self, job_ids: list[UUID]) -> None:
+        self.lock = threading.Lock()
+        self.rows = {job_id: {"status": "pending", "lease": 0.0} for job_id in job_ids}
+        self.claims: list[UUID] = []
+
+    def session(self) -> LeaseSession:
+        return LeaseSession(self)
+
+
+class LeaseSession(FakeSession):
+    def __init__(self, table: LeaseTable) -> None:
+        super().__init__([])
+        self.table = table
+
+    def execute(self, statement: object, params: dict[str, Any] | None = None) -> FakeMappings:
+        sql, params = str(statement), params or {}
+        now = time.monotonic()
+        with self.table.lock:
+            rows = self.table.rows
+            if "for update skip locked" in sql:
+                claimed = [job_id for job_id, row in rows.items() if row["status"] == "pending"]
+                for job_id in claimed:
+                    rows[job_id] = {"status": "running", "lease": now + params["lease_seconds"]}
+                self.table.claims.extend(claimed)
+                return FakeMappings(
+                    [
+                        {"id": job_id, "household_id": UUID(int=100), "job_type": "slow", "payload": {}, "attempts": 0}
+                        for job_id in claimed
+                    ]
+                )
+            if "any(cast(:job_ids" in sql:
+                for job_id in map(UUID, params["job_ids"]):
+                    if rows[job_id]["status"] == "running":
+                        rows[job_id]["lease"] = now + params["lease_seconds"]
+            elif "next_retry_at = now()" in sql:
+                held = set(map(UUID, params["held_ids"]))
+                for job_id, row in rows.items():
+                    if row["status"] == "running" and row["lease"] < now and job_id not in held:
+                        row["status"] = "pending"
+            elif "status = 'done'" in sql:
+                rows[params["job_id"]]["status"] = "done"
+        return FakeMappings([])
+
+
+def test_job_running_past_its_lease_is_not_claimed_again() -> None:
+    """Heartbeats keep a slow job leased, so another replica never reclaims it."""
+
+    table = LeaseTable([UUID(int=1)])
+
+    def slow(_payload: dict[str, object]) -> dict[str, object]:
+        time.sleep(0.6)
+        return {}
+
+    worker = JobQueuePoller(handlers={"slow": slow}, session_factory=table.session, lease_seconds=0.2)
+    other_replica = JobQueuePoller(handlers={}, session_factory=table.session, lease_seconds=0.2)
+    runner = threading.Thread(target=worker.poll_once)
+    runner.start()
+    while runner.is_alive():
+        assert other_replica.claim_jobs() == []
+        time.sleep(0.02)
+
+    assert table.claims == [UUID(int=1)]
+    assert table.rows[UUID(int=1)]["status"] == "done"
+    assert worker.held_job_ids == []
+
+
+def test_job_whose_worker_stopped_renewing_is_reclaimed() -> None:
+    table = LeaseTable([UUID(int=1)])
+    crashed = JobQueuePoller(handlers={}, session_factory=table.session, lease_seconds=0.05)
+    survivor = JobQueuePoller(handlers={}, session_factory=table.session, lease_seconds=0.05)
+
+    assert [job.id for job in crashed.claim_jobs()] == [UUID(int=1)]
+    assert survivor.claim_jobs() == []
+    time.sleep(0.1)
+
+    assert [job.id for job in survivor.claim_jobs()] == [UUID(int=1)]
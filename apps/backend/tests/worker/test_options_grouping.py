@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 from datetime import date, datetime, timezone
 from decimal import Decimal
 from typing import Any
@@ -77,6 +78,69 @@ def test_compute_options_strategy_groups_persists_groups_rolls_and_trade_links()
     }
 
 
+class FakeStoredSession(FakeSession):
+    """Fake session that keeps upserted group metadata as the stored snapshot."""
+
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        super().__init__()
+        self.rows = rows
+        self.stored: dict[str, str] = {}
+        self.writes = 0
+
+    def execute(self, statement: object, params: dict[str, Any] | None = None) -> FakeMappings:
+        sql = str(statement)
+        if "from public.options_trades t" in sql:
+            return FakeMappings(self.rows)
+        if "from public.options_strategy_groups" in sql and "insert" not in sql:
+            return FakeMappings(
+                [
+                    {"id": group_id, "fingerprint": json.loads(meta)["fingerprint"]}
+                    for group_id, meta in self.stored.items()
+                ]
+            )
+        if sql.lstrip().startswith(("insert", "update", "delete")):
+            self.writes += 1
+        if "insert into public.options_strategy_groups" in sql and params:
+            self.stored[str(params["id"])] = str(params["metadata"])
+        return super().execute(statement, params)
+
+
+def test_rerun_only_rewrites_groups_whose_output_changed() -> None:
+    """Groups matching the stored fingerprint are skipped; a new leg rewrites just its group."""
+
+    rows = _trade_rows()
+    extra = dict(rows[0], trade_id="lone-short", strike=Decimal(480))
+    session = FakeStoredSession([*rows, extra])
+
+    first = compute_options_strategy_groups(session)  # type: ignore[arg-type]
+    assert first["accounts"][0]["groups_changed"] == 2
+    assert session.writes > 0
+
+    session.writes = 0
+    session.groups.clear()
+    second = compute_options_strategy_groups(session)  # type: ignore[arg-type]
+    assert second["accounts"][0]["groups_changed"] == 0
+    assert second["group_count"] == 2
+    assert session.writes == 0
+
+    session.rows = [
+        *session.rows,
+        dict(
+            extra,
+            trade_id="lone-close",
+            trade_time=datetime(2025, 3, 3, 10, 0, tzinfo=timezone.utc),
+            trade_date=date(2025, 3, 3),
+            side="buy",
+            open_close_indicator="C",
+            event_type="close",
+        ),
+    ]
+    third = compute_options_strategy_groups(session)  # type: ignore[arg-type]
+    assert third["accounts"][0]["groups_changed"] == 1
+    assert [group["status"] for group in session.groups] == ["closed"]
+    assert session.trade_updates["lone-close"] == session.trade_updates["lone-short"]
+
+
 def _trade_rows() -> list[dict[str, Any]]:
     household_id = "10000000-0000-0000-0000-000000000001"
 
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime, timezone
 from decimal import Decimal
 from typing import Any
 
@@ -72,3 +72,107 @@ def test_monthly_metrics_include_assignment_synthetic_cash_events() -> None:
     assert result["row_count"] == 1
     assert session.monthly_rows[0]["cash_flow_total"] == Decimal("300")
     assert session.monthly_rows[0]["cash_flow_cumulative"] == Decimal("300")
+
+
+class FakeIncrementalSession(FakeSession):
+    """Account with stored dashboard rows and a fact changed in February."""
+
+    def __init__(self, changed_on: date | None) -> None:
+        super().__init__()
+        self.changed_on = changed_on
+        self.statements: list[tuple[str, dict[str, Any]]] = []
+
+    def execute(self, statement: object, params: dict[str, Any] | None = None) -> FakeMappings:
+        sql = str(statement)
+        self.statements.append((sql, dict(params or {})))
+        if "max(last_computed_at)" in sql:
+            return FakeMappings([{"last_computed_at": datetime(2026, 3, 1, tzinfo=timezone.utc)}])
+        if "min(changed_on)" in sql:
+            return FakeMappings([{"changed_on": self.changed_on}])
+        if "order by period_start desc" in sql:
+            return FakeMappings([{"cash_flow_cumulative": Decimal(1000), "realized_pnl_cumulative": Decimal(400)}])
+        if "from public.options_trades" in sql and "union all" in sql:
+            return FakeMappings(
+                [
+                    {
+                        "trade_date": date(2026, 2, 9),
+                        "net_cash_flow": Decimal(250),
+                        "realized_pnl": Decimal(100),
+                        "trade_count": 1,
+                    }
+                ]
+            )
+        return super().execute(statement, params)
+
+
+def test_incremental_run_rebuilds_only_months_from_the_earliest_change() -> None:
+    """Months before the change are kept and cumulatives continue from the stored row."""
+
+    session = FakeIncrementalSession(changed_on=date(2026, 2, 9))
+
+    result = compute_options_monthly_metrics(session)  # type: ignore[arg-type]
+
+    assert result["accounts"][0]["recomputed_from"] == "2026-02-01"
+    trade_load = next(params for sql, params in session.statements if "union all" in sql and "trade_count" in sql)
+    assert trade_load["from_date"] == date(2026, 2, 1)
+    delete = next(sql for sql, _ in session.statements if "delete from public.options_dashboard_monthly" in sql)
+    assert "period_start >= :start" in delete
+    assert [(row["period_start"], row["cash_flow_cumulative"]) for row in session.monthly_rows] == [
+        (date(2026, 2, 1), Decimal(1250))
+    ]
+    assert session.monthly_rows[0]["realized_pnl_cumulative"] == Decimal(500)
+
+
+def test_incremental_run_skips_accounts_without_changes() -> None:
+    """No fact written since the last run means no reads of facts and no writes."""
+
+    session = FakeIncrementalSession(changed_on=None)
+
+    result = compute_options_monthly_metrics(session)  # type: ignore[arg-type]
+
+    assert result["accounts"][0]["months"] == 0
+    assert session.monthly_rows == []
+    assert not any("delete" in sql or "trade_count" in sql for sql, _ in session.statements)
+
+
+class FakeChangeLogSession(FakeIncrementalSession):
+    """Facts written since the last run plus old dates from options_metric_changes."""
+
+    def __init__(self, written_on: date | None, logged_on: date | None) -> None:
+        super().__init__(changed_on=written_on)
+        self.logged_on = logged_on
+
+    def execute(self, statement: object, params: dict[str, Any] | None = None) -> FakeMappings:
+        if "from public.options_metric_changes" in str(statement) and "min(changed_on)" in str(statement):
+            self.statements.append((str(statement), dict(params or {})))
+            return FakeMappings([{"changed_on": self.logged_on}])
+        return super().execute(statement, params)
+
+
+def test_incremental_run_rebuilds_from_the_old_date_of_a_re_dated_trade() -> None:
+    """A trade moved from January to February was written in February but logged under January."""
+
+    session = FakeChangeLogSession(written_on=date(2026, 2, 9), logged_on=date(2026, 1, 20))
+
+    result = compute_options_monthly_metrics(session)  # type: ignore[arg-type]
+
+    assert result["accounts"][0]["recomputed_from"] == "2026-01-01"
+    trade_load = next(params for sql, params in session.statements if "union all" in sql and "trade_count" in sql)
+    assert trade_load["from_date"] == date(2026, 1, 1)
+    prune_sql, prune_params = next(
+        (sql, params) for sql, params in session.statements if "delete from public.options_metric_changes" in sql
+    )
+    assert "changed_at < :since" in prune_sql
+    assert prune_params["since"] == datetime(2026, 2, 28, 23, tzinfo=timezone.utc)
+
+
+def test_incremental_run_rebuilds_after_a_deleted_fact() -> None:
+    """A deleted trade leaves no updated_at behind; its logged date still triggers a rebuild."""
+
+    session = FakeChangeLogSession(written_on=None, logged_on=date(2026, 2, 3))
+
+    result = compute_options_monthly_metrics(session)  # type: ignore[arg-type]
+
+    assert result["accounts"][0]["recomputed_from"] == "2026-02-01"
+    delete = next(params for sql, params in session.statements if "delete from public.options_dashboard_monthly" in sql)
+    assert delete["start"] == date(2026, 2, 1)
@@ -336,3 +336,91 @@ def test_failed_flex_sync_does_not_update_last_synced_for_failing_account(
 
     assert 10 in last_synced_updates, "config 10 (A_GOOD) should have been stamped before the failure"
     assert 20 not in last_synced_updates, "config 20 (B_FAIL) must NOT be stamped when ingest raises"
+
+
+class _BulkCursor:
+    """DB-API cursor stand-in for statements sent outside ``session.execute``."""
+
+    def __init__(self, session: BulkSession) -> None:
+        self.session = session
+
+    def execute(self, sql: str, params: dict[str, Any] | None = None) -> None:
+        self.session.cursor_statements.append(sql)
+
+    def close(self) -> None:
+        pass
+
+
+class _BulkConnection:
+    """Mimics ``session.connection()`` exposing the raw DB-API connection."""
+
+    def __init__(self, session: BulkSession) -> None:
+        self.connection = self
+        self.session = session
+
+    def cursor(self) -> _BulkCursor:
+        return _BulkCursor(self.session)
+
+
+class BulkSession(FakeSession):
+    """FakeSession that also records the bulk path's staged batches."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.staged_legs: list[dict[str, Any]] = []
+        self.cursor_statements: list[str] = []
+        self.batches: list[tuple[str, int]] = []
+        self.leg_merges = 0
+
+    def connection(self) -> _BulkConnection:
+        return _BulkConnection(self)
+
+    def execute(self, statement: object, params: dict[str, Any] | None = None) -> FakeScalar | FakeMappings:
+        if "insert into public.options_legs" in str(statement):
+            self.leg_merges += 1
+            columns = ("account_id", "underlying_symbol", "expiry", "strike", "right", "multiplier", "currency")
+            return FakeMappings(
+                [{"id": f"leg-{row['ord'] + 1}", **{key: row[key] for key in columns}} for row in self.staged_legs]
+            )
+        return super().execute(statement, params)
+
+
+def test_bulk_ingest_writes_each_table_in_one_batch(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The set-based path sends one statement per table regardless of row count."""
+
+    import psycopg2.extras
+
+    from app.worker.handlers import options_sync as mod
+
+    session = BulkSession()
+
+    def fake_execute_values(cursor: _BulkCursor, sql: str, rows: list[dict[str, Any]], **_: Any) -> None:
+        table = sql.split("insert into ", 1)[1].split()[0]
+        if table == "options_legs_stage":
+            session.staged_legs = list(rows)
+        session.batches.append((table, len(rows)))
+
+    monkeypatch.setenv("OPTIONS_FLEX_SOURCE", "synthetic")
+    monkeypatch.setattr(mod, "_supports_bulk_ingest", lambda _session: True)
+    monkeypatch.setattr(psycopg2.extras, "execute_values", fake_execute_values)
+
+    result = run_flex_options_sync(session)  # type: ignore[arg-type]
+
+    assert result["trade_count"] == 18
+    assert session.leg_merges == 1
+    assert session.batches == [
+        ("options_legs_stage", result["leg_count"]),
+        ("public.options_trades", 18),
+        ("public.options_cash_events", 2),
+        ("public.options_positions", 1),
+    ]
+    assert len(session.cursor_statements) == 1
+    assert session.sync_states == 1
+
+
+def test_bulk_ingest_requires_psycopg2_session() -> None:
+    """Fake or non-psycopg2 sessions keep the per-row path."""
+
+    from app.worker.handlers.options_sync import _supports_bulk_ingest
+
+    assert _supports_bulk_ingest(FakeSession()) is False  # type: ignore[arg-type]
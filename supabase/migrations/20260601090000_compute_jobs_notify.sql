@@ -0,0 +1,24 @@
+-- Migration: 20260601090000_compute_jobs_notify
+-- Purpose: Wake idle compute workers as soon as a job is enqueued.
+--   * AFTER INSERT trigger on public.compute_jobs sends NOTIFY compute_jobs
+--     with the job_type as payload (jobs are inserted by the frontend through
+--     Supabase and by backend helpers, so the trigger covers every producer).
+--   * Workers LISTEN on the channel and fall back to polling every
+--     WORKER_POLL_INTERVAL_SECONDS when the listener is disconnected.
+
+create or replace function public.notify_compute_job_enqueued()
+returns trigger
+language plpgsql
+as $$
+begin
+  perform pg_notify('compute_jobs', new.job_type);
+  return null;
+end;
+$$;
+
+drop trigger if exists compute_jobs_notify_enqueued on public.compute_jobs;
+create trigger compute_jobs_notify_enqueued
+  after insert on public.compute_jobs
+  for each row
+  when (new.status = 'pending')
+  execute function public.notify_compute_job_enqueued();
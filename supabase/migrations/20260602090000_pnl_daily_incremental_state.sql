@@ -0,0 +1,38 @@
+-- Migration: 20260602090000_pnl_daily_incremental_state
+-- Purpose: Let the pnl_daily compute job recompute only the days whose raw
+-- trade events changed instead of re-aggregating the full history.
+--   * compute.pnl_watermarks — per household/account event count and latest
+--     raw._loaded_at seen by the last successful run; an account whose numbers
+--     are unchanged is skipped without hashing its events.
+--   * compute.pnl_day_hashes — md5 over the raw events of each
+--     household/account/day as last published; a different hash marks the day
+--     for recomputation.
+-- Both tables are written in the same transaction as cooked.daily_performance.
+-- A job payload with mode = 'full' rebuilds every day and resets both tables.
+
+create table if not exists compute.pnl_watermarks (
+    household_id   uuid        not null references public.households(id) on delete cascade,
+    account_id     text        not null default '',
+    event_count    bigint      not null default 0,
+    loaded_through timestamptz,
+    source_run_id  uuid        references compute.pnl_runs(run_id) on delete set null,
+    updated_at     timestamptz not null default now(),
+    primary key (household_id, account_id)
+);
+
+revoke all on compute.pnl_watermarks from public;
+grant  all on compute.pnl_watermarks to   service_role;
+
+create table if not exists compute.pnl_day_hashes (
+    household_id  uuid        not null references public.households(id) on delete cascade,
+    account_id    text        not null default '',
+    date          date        not null,
+    content_hash  text        not null,
+    event_count   integer     not null default 0,
+    source_run_id uuid        references compute.pnl_runs(run_id) on delete set null,
+    updated_at    timestamptz not null default now(),
+    primary key (household_id, account_id, date)
+);
+
+revoke all on compute.pnl_day_hashes from public;
+grant  all on compute.pnl_day_hashes to   service_role;
@@ -0,0 +1,15 @@
+-- Migration: price_cache_staleness_tiers
+-- Purpose: Let the hourly prices_refresh worker back off on symbols whose price
+-- is not moving (illiquid / suspended tickers).
+--
+-- unchanged_refreshes counts consecutive refreshes that wrote the same price;
+-- the bulk upsert in apps/backend/app/services/price_cache.py resets it to 0
+-- whenever the price changes.  Symbols at or above QUIET_AFTER_UNCHANGED are
+-- refreshed every QUIET_MAX_AGE instead of every cycle.
+
+alter table public.price_cache
+  add column if not exists unchanged_refreshes integer not null default 0;
+
+comment on column public.price_cache.unchanged_refreshes is
+  'Consecutive refreshes that saw an unchanged price; drives the quiet '
+  'staleness tier of the prices_refresh worker.';
@@ -0,0 +1,68 @@
+-- Migration: expense_monthly_rollups
+-- Purpose: Serve GET /api/expenses/monthly-summary from a materialized
+-- household × month × category rollup instead of a GROUP BY over every
+-- credit-card transaction on each dashboard load, and give the drill-down /
+-- statement list date-range filters composite indexes to use.
+--
+-- The rollup is maintained by a trigger on credit_card_transactions
+-- (20260609090000_expense_monthly_rollups_trigger).  This migration backfills
+-- it from the existing transactions.
+
+create table if not exists public.expense_monthly_rollups (
+    household_id  uuid          not null references public.households(id) on delete cascade,
+    month         date          not null,   -- first day of the calendar month
+    category_id   uuid          not null references public.expense_categories(id),
+    amount_ils    numeric(14,2) not null default 0,
+    txn_count     integer       not null default 0,
+    primary key (household_id, month, category_id)
+);
+
+comment on table  public.expense_monthly_rollups            is 'Materialized monthly spend per household and category; backs the monthly summary endpoint.';
+comment on column public.expense_monthly_rollups.month      is 'First day of the calendar month (date_trunc(''month'', txn_date)).';
+comment on column public.expense_monthly_rollups.amount_ils is 'Sum of credit_card_transactions.amount_ils for the cell (ILS shekels). NUMERIC(14,2).';
+comment on column public.expense_monthly_rollups.txn_count  is 'Number of categorized transactions in the cell.';
+
+insert into public.expense_monthly_rollups (household_id, month, category_id, amount_ils, txn_count)
+select household_id,
+       date_trunc('month', txn_date)::date,
+       category_id,
+       sum(amount_ils),
+       count(*)
+  from public.credit_card_transactions
+ where category_id is not null
+ group by household_id, date_trunc('month', txn_date)::date, category_id
+on conflict (household_id, month, category_id) do update
+   set amount_ils = excluded.amount_ils,
+       txn_count  = excluded.txn_count;
+
+-- Drill-down: household + category + sargable txn_date range, newest first.
+create index if not exists credit_card_transactions_household_category_txn_date_idx
+    on public.credit_card_transactions (household_id, category_id, txn_date desc);
+-- Statement list: household + period_from range, newest first.
+create index if not exists credit_card_statements_household_period_idx
+    on public.credit_card_statements (household_id, period_from desc);
+
+-- ============================================================
+-- RLS: expense_monthly_rollups (same shape as credit_card_transactions)
+-- ============================================================
+alter table public.expense_monthly_rollups enable row level security;
+
+revoke all on table public.expense_monthly_rollups from anon;
+revoke all on table public.expense_monthly_rollups from authenticated;
+grant select on table public.expense_monthly_rollups to authenticated;
+grant select, insert, update, delete on table public.expense_monthly_rollups to service_role;
+
+drop policy if exists expense_monthly_rollups_household_select on public.expense_monthly_rollups;
+create policy expense_monthly_rollups_household_select
+    on public.expense_monthly_rollups
+    for select
+    to authenticated
+    using (public.is_household_member(household_id));
+
+drop policy if exists expense_monthly_rollups_service_all on public.expense_monthly_rollups;
+create policy expense_monthly_rollups_service_all
+    on public.expense_monthly_rollups
+    for all
+    to service_role
+    using (true)
+    with check (true);
@@ -0,0 +1,40 @@
+-- Migration: analyze_cache
+-- Purpose: Shared (L2) tier of the analyze-page market-data cache, used when
+-- the backend runs with ANALYZE_CACHE_L2=postgres (see
+-- apps/backend/app/services/cache.py and cache_store.py).
+--
+-- UNLOGGED: the contents are a disposable cache of yfinance responses, so
+-- writes skip the WAL and the table is simply emptied after a crash.  Rows
+-- carry their own freshness deadlines; expired rows are pruned by the
+-- backend.  Backend-only — not exposed to anon/authenticated.
+
+create unlogged table if not exists public.analyze_cache (
+    namespace   text        not null,
+    key         text        not null,
+    value       jsonb       not null,
+    negative    boolean     not null default false,
+    fresh_until timestamptz not null,
+    stale_until timestamptz not null,
+    primary key (namespace, key)
+);
+
+comment on table public.analyze_cache is
+  'L2 cache for /api/analyze responses shared by all backend processes; '
+  'negative rows remember unknown tickers.';
+
+create index if not exists analyze_cache_namespace_fresh_idx
+    on public.analyze_cache (namespace, fresh_until desc);
+
+alter table public.analyze_cache enable row level security;
+
+revoke all on table public.analyze_cache from anon;
+revoke all on table public.analyze_cache from authenticated;
+grant select, insert, update, delete on table public.analyze_cache to service_role;
+
+drop policy if exists analyze_cache_service_all on public.analyze_cache;
+create policy analyze_cache_service_all
+    on public.analyze_cache
+    for all
+    to service_role
+    using (true)
+    with check (true);
@@ -0,0 +1,40 @@
+-- Migration: 20260606090000_backtest_sweep_results
+-- Purpose: Per-variant results of queued backtest_sweep jobs, written as each variant finishes.
+
+create table if not exists public.backtest_sweep_results (
+  id uuid primary key default gen_random_uuid(),
+  household_id uuid not null references public.households(id) on delete cascade,
+  compute_job_id uuid not null references public.compute_jobs(id) on delete cascade,
+  variant_index integer not null check (variant_index >= 0),
+  params jsonb not null,
+  status text not null check (status in ('done', 'failed')),
+  summary jsonb,
+  error text,
+  finished_at timestamptz not null default now(),
+  unique (compute_job_id, variant_index)
+);
+
+create index if not exists backtest_sweep_results_household_finished_at_idx
+  on public.backtest_sweep_results (household_id, finished_at desc);
+
+alter table public.backtest_sweep_results enable row level security;
+
+revoke all on table public.backtest_sweep_results from anon;
+revoke all on table public.backtest_sweep_results from authenticated;
+grant select on table public.backtest_sweep_results to authenticated;
+grant select, insert, update on table public.backtest_sweep_results to service_role;
+
+drop policy if exists backtest_sweep_results_member_select on public.backtest_sweep_results;
+create policy backtest_sweep_results_member_select
+  on public.backtest_sweep_results
+  for select
+  to authenticated
+  using (public.is_household_member(household_id));
+
+do $$
+begin
+  alter publication supabase_realtime add table public.backtest_sweep_results;
+exception
+  when duplicate_object then null;
+  when undefined_object then null;
+end $$;
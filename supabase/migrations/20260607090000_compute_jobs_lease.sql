@@ -0,0 +1,20 @@
+-- Migration: 20260607090000_compute_jobs_lease
+-- Purpose: Stop long compute jobs from being reclaimed while they still run.
+--   * lease_expires_at — set when a worker claims a job and pushed forward by
+--     the worker's heartbeat while the job runs; cleared when it finishes.
+--   * The stale-run reclaim only resets 'running' rows whose lease has lapsed
+--     (their worker died).  Rows claimed before this column existed fall back
+--     to started_at + 10 minutes.
+
+alter table public.compute_jobs
+  add column if not exists lease_expires_at timestamptz;
+
+-- Partial index: speeds up the reclaim scan
+--   WHERE status = 'running' AND lease_expires_at < now()
+create index if not exists idx_compute_jobs_running_lease
+  on public.compute_jobs (lease_expires_at)
+  where status = 'running';
+
+comment on column public.compute_jobs.lease_expires_at is
+  'While running: when the claiming worker''s lease lapses unless its heartbeat renews it. '
+  'NULL once the job is no longer running.';
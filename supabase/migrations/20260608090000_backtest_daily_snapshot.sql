@@ -0,0 +1,29 @@
+-- Migration: 20260608090000_backtest_daily_snapshot
+-- Purpose: Supabase pair of Alembic d0e1f2a3b4c5 (backtestdailysnapshot).
+--   * One row per simulated day of a backtest run, bulk-written by
+--     BacktestEngine.save_results alongside the run's backtesttrade rows.
+--   * Like backtesttrade, the table has no household_id/owner_user_id; read access
+--     inherits from the parent backtestrun.owner_user_id. Writes use service_role.
+
+create table if not exists public.backtestdailysnapshot (
+  run_id integer not null references public.backtestrun(id),
+  date timestamptz not null,
+  equity numeric(18,6),
+  cash numeric(18,6),
+  realized_pnl numeric(18,6),
+  unrealized_pnl numeric(18,6),
+  primary key (run_id, date)
+);
+
+alter table public.backtestdailysnapshot enable row level security;
+
+drop policy if exists backtestdailysnapshot_select on public.backtestdailysnapshot;
+create policy backtestdailysnapshot_select on public.backtestdailysnapshot for select to authenticated
+  using (
+    exists (
+      select 1
+      from public.backtestrun r
+      where r.id = backtestdailysnapshot.run_id
+        and r.owner_user_id = auth.uid()
+    )
+  );
@@ -0,0 +1,80 @@
+-- Migration: 20260609090000_expense_monthly_rollups_trigger
+-- Purpose: Maintain expense_monthly_rollups in the database instead of in the
+-- backend writers, so every path that changes credit_card_transactions keeps it
+-- current:
+--   * the frontend /api/expenses/resolve route updates category_id directly;
+--   * deleting a statement cascades to its transactions;
+--   * backend ingest, POST /resolve and the recategorize script.
+--
+-- A row trigger moves each transaction's amount out of its old
+-- (household, month, category) cell and into its new one.  Increments are an
+-- additive upsert, so concurrent writers to the same cell commute.  Decrements
+-- only update an existing cell (never insert), so cascaded deletes that run
+-- while the household itself is being deleted cannot trip the households FK.
+-- Cells that drop to zero transactions are removed.
+--
+-- The rollup is rebuilt from credit_card_transactions here, since writes made
+-- outside the backend before this migration were never counted.
+
+create or replace function public.tg_expense_monthly_rollup()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  if tg_op = 'UPDATE'
+     and (old.household_id, old.category_id, old.amount_ils, old.txn_date)
+         is not distinct from (new.household_id, new.category_id, new.amount_ils, new.txn_date) then
+    return null;
+  end if;
+
+  if tg_op in ('UPDATE', 'DELETE') and old.category_id is not null then
+    update public.expense_monthly_rollups
+       set amount_ils = amount_ils - old.amount_ils,
+           txn_count  = txn_count - 1
+     where household_id = old.household_id
+       and month = date_trunc('month', old.txn_date)::date
+       and category_id = old.category_id;
+    delete from public.expense_monthly_rollups
+     where household_id = old.household_id
+       and month = date_trunc('month', old.txn_date)::date
+       and category_id = old.category_id
+       and txn_count <= 0;
+  end if;
+
+  if tg_op in ('INSERT', 'UPDATE') and new.category_id is not null then
+    insert into public.expense_monthly_rollups (household_id, month, category_id, amount_ils, txn_count)
+    values (new.household_id, date_trunc('month', new.txn_date)::date, new.category_id, new.amount_ils, 1)
+    on conflict (household_id, month, category_id) do update
+       set amount_ils = public.expense_monthly_rollups.amount_ils + excluded.amount_ils,
+           txn_count  = public.expense_monthly_rollups.txn_count + excluded.txn_count;
+  end if;
+
+  return null;
+end;
+$$;
+
+-- Statement deletes cascade row by row, so DELETE covers them too.
+drop trigger if exists trg_credit_card_transactions_monthly_rollup on public.credit_card_transactions;
+create trigger trg_credit_card_transactions_monthly_rollup
+  after insert or delete or update of household_id, category_id, amount_ils, txn_date
+  on public.credit_card_transactions
+  for each row execute function public.tg_expense_monthly_rollup();
+
+-- ============================================================
+-- Rebuild: block writers while the rollup is recomputed.
+-- ============================================================
+lock table public.credit_card_transactions in share row exclusive mode;
+
+delete from public.expense_monthly_rollups;
+
+insert into public.expense_monthly_rollups (household_id, month, category_id, amount_ils, txn_count)
+select household_id,
+       date_trunc('month', txn_date)::date,
+       category_id,
+       sum(amount_ils),
+       count(*)
+  from public.credit_card_transactions
+ where category_id is not null
+ group by household_id, date_trunc('month', txn_date)::date, category_id;
@@ -0,0 +1,30 @@
+-- Migration: 20260610090000_household_members_notify
+-- Purpose: Let API processes drop cached household memberships as soon as they change.
+--   * AFTER INSERT/UPDATE/DELETE trigger on public.household_members sends
+--     NOTIFY household_members with the affected user_id as payload
+--     (memberships are edited through Supabase, not the backend API).
+--   * An update that moves a membership to another user notifies both users.
+--   * Each API process LISTENs on the channel and invalidates that user's
+--     entry; HOUSEHOLD_CACHE_TTL_SECONDS still bounds staleness while the
+--     listener is disconnected.
+
+create or replace function public.notify_household_member_changed()
+returns trigger
+language plpgsql
+as $$
+begin
+  if tg_op in ('UPDATE', 'DELETE') then
+    perform pg_notify('household_members', old.user_id::text);
+  end if;
+  if tg_op = 'INSERT' or (tg_op = 'UPDATE' and new.user_id is distinct from old.user_id) then
+    perform pg_notify('household_members', new.user_id::text);
+  end if;
+  return null;
+end;
+$$;
+
+drop trigger if exists household_members_notify_changed on public.household_members;
+create trigger household_members_notify_changed
+  after insert or update or delete on public.household_members
+  for each row
+  execute function public.notify_household_member_changed();
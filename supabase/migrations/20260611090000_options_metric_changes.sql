@@ -0,0 +1,142 @@
+-- Migration: 20260611090000_options_metric_changes
+-- Purpose: Let the incremental options_metrics job see changes that leave no
+-- updated_at behind.
+--   * The job rebuilds options_dashboard_monthly from the earliest fact date
+--     written since its last run (updated_at >= watermark).  A deleted fact, or
+--     one moved to an earlier date / another account, leaves nothing there for
+--     its old month, so that month kept stale totals.
+--   * Triggers on the metric inputs append the OLD fact date to
+--     options_metric_changes on DELETE, and on UPDATE when the date, account
+--     or other row-placing column changes.  The NEW side stays covered by
+--     updated_at.
+--   * Deleting (or re-homing) a strategy group logs its earliest capital
+--     history date from a BEFORE trigger, while the cascaded history rows
+--     are still readable.
+--   * The job reads the log next to updated_at and prunes entries older than
+--     its watermark.  Service-role only; triggers run as security definer
+--     because authenticated users may edit capital history.
+
+create table if not exists public.options_metric_changes (
+  id bigint generated always as identity primary key,
+  household_id uuid not null references public.households(id) on delete cascade,
+  account_id text not null,
+  changed_on date not null,
+  changed_at timestamptz not null default now()
+);
+
+create index if not exists options_metric_changes_account_changed_at_idx
+  on public.options_metric_changes (household_id, account_id, changed_at);
+
+comment on table public.options_metric_changes is 'Old fact dates of deleted or re-dated options metric inputs; read and pruned by the options_metrics job.';
+
+alter table public.options_metric_changes enable row level security;
+
+revoke all on table public.options_metric_changes from anon;
+revoke all on table public.options_metric_changes from authenticated;
+grant select, insert, delete on table public.options_metric_changes to service_role;
+
+-- ============================================================
+-- Trigger function: log the OLD date of a metric input row.
+-- ============================================================
+create or replace function public.tg_options_metric_change()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  if tg_table_name = 'options_trades' then
+    if tg_op = 'DELETE'
+       or (old.household_id, old.account_id, old.trade_date)
+          is distinct from (new.household_id, new.account_id, new.trade_date) then
+      insert into public.options_metric_changes (household_id, account_id, changed_on)
+      values (old.household_id, old.account_id, old.trade_date);
+    end if;
+
+  elsif tg_table_name = 'options_cash_events' then
+    if old.event_category::text in ('option_related', 'assignment_synthetic')
+       and (tg_op = 'DELETE'
+            or (old.household_id, old.account_id, old.event_date, old.event_category::text)
+               is distinct from (new.household_id, new.account_id, new.event_date, new.event_category::text)) then
+      insert into public.options_metric_changes (household_id, account_id, changed_on)
+      values (old.household_id, old.account_id, old.event_date);
+    end if;
+
+  elsif tg_table_name = 'options_roll_events' then
+    -- A roll counts on its closed trade's date.  When that trade is deleted in
+    -- the same statement its own trigger has already logged the date.
+    if tg_op = 'DELETE'
+       or (old.household_id, old.account_id, old.closed_trade_id)
+          is distinct from (new.household_id, new.account_id, new.closed_trade_id) then
+      insert into public.options_metric_changes (household_id, account_id, changed_on)
+      select old.household_id, old.account_id, t.trade_date
+        from public.options_trades t
+       where t.id = old.closed_trade_id;
+    end if;
+
+  elsif tg_table_name = 'options_strategy_capital_history' then
+    if tg_op = 'DELETE'
+       or (old.group_id, old.effective_at) is distinct from (new.group_id, new.effective_at) then
+      insert into public.options_metric_changes (household_id, account_id, changed_on)
+      select g.household_id, g.account_id, old.effective_at::date
+        from public.options_strategy_groups g
+       where g.id = old.group_id;
+    end if;
+
+  elsif tg_table_name = 'options_strategy_groups' then
+    if tg_op = 'DELETE'
+       or (old.household_id, old.account_id) is distinct from (new.household_id, new.account_id) then
+      insert into public.options_metric_changes (household_id, account_id, changed_on)
+      select old.household_id, old.account_id, min(h.effective_at)::date
+        from public.options_strategy_capital_history h
+       where h.group_id = old.id
+      having min(h.effective_at) is not null;
+    end if;
+
+  elsif tg_table_name = 'options_margin_snapshots' then
+    if tg_op = 'DELETE'
+       or (old.household_id, old.account_id, old.captured_at::date)
+          is distinct from (new.household_id, new.account_id, new.captured_at::date) then
+      insert into public.options_metric_changes (household_id, account_id, changed_on)
+      values (old.household_id, old.account_id, old.captured_at::date);
+    end if;
+  end if;
+
+  if tg_when = 'AFTER' then
+    return null;
+  elsif tg_op = 'DELETE' then
+    return old;
+  end if;
+  return new;
+end;
+$$;
+
+drop trigger if exists trg_options_trades_metric_change on public.options_trades;
+create trigger trg_options_trades_metric_change
+  after update or delete on public.options_trades
+  for each row execute function public.tg_options_metric_change();
+
+drop trigger if exists trg_options_cash_events_metric_change on public.options_cash_events;
+create trigger trg_options_cash_events_metric_change
+  after update or delete on public.options_cash_events
+  for each row execute function public.tg_options_metric_change();
+
+drop trigger if exists trg_options_roll_events_metric_change on public.options_roll_events;
+create trigger trg_options_roll_events_metric_change
+  after update or delete on public.options_roll_events
+  for each row execute function public.tg_options_metric_change();
+
+drop trigger if exists trg_options_strategy_capital_history_metric_change on public.options_strategy_capital_history;
+create trigger trg_options_strategy_capital_history_metric_change
+  after update or delete on public.options_strategy_capital_history
+  for each row execute function public.tg_options_metric_change();
+
+drop trigger if exists trg_options_strategy_groups_metric_change on public.options_strategy_groups;
+create trigger trg_options_strategy_groups_metric_change
+  before update of household_id, account_id or delete on public.options_strategy_groups
+  for each row execute function public.tg_options_metric_change();
+
+drop trigger if exists trg_options_margin_snapshots_metric_change on public.options_margin_snapshots;
+create trigger trg_options_margin_snapshots_metric_change
+  after update or delete on public.options_margin_snapshots
+  for each row execute function public.tg_options_metric_change();